@@ -6,22 +6,10 @@ __version__ = '2.5.1.8'
 global shared_app
 shared_app = tapp
 
-global batch
-batch = False
 global reopen
 reopen = False
 
 
-def getBatch():
-    global batch
-    return batch
-
-
-def setBatch(is_batch):
-    global batch
-    batch = is_batch
-
-
 def getReopen():
     global reopen
     return reopen
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""Run a job on many cadnano designs in parallel without the GUI.
+
+run with:
+
+    python bin/batch.py export-staples designs/ -o staples/ --scaffold M13mp18
+
+Inputs are design files, directories searched recursively for `.json` and
+`.c25` files, or glob patterns.  Each design is loaded into its own headless
+Document in a worker process of a `ProcessPoolExecutor` and the job writes
+its output file, if any, from the worker.  A result line per design, with the
+time it took, is printed and appended to the `--report` JSON lines file as
+the designs finish.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+LOCAL_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.dirname(LOCAL_DIR)
+sys.path.append(os.path.dirname(ROOT_DIR))
+
+from cadnano.fileio.sequenceexport import EXPORT_FORMATS
+
+DESIGN_EXTENSIONS = ('.json', '.c25')
+DEFAULT_SCAFFOLD = 'M13mp18'
+
+
+def loadDesign(filename):
+    """Load a design into a new headless Document
+
+    Args:
+        filename (str): path of the design
+
+    Returns:
+        NucleicAcidPart: the active part of the Document
+    """
+    from cadnano.document import Document
+    doc = Document()
+    doc.readFile(filename)
+    return doc.activePart()
+# end def
+
+
+def scaffoldOligo(part):
+    """Get the longest oligo of a part, taken to be the scaffold.  Ties go
+    to a forward 5' strand on the lowest virtual helix and index so the
+    choice does not depend on the order of the oligo set
+
+    Args:
+        part (NucleicAcidPart):
+
+    Returns:
+        Oligo:
+    """
+    def key(oligo):
+        strand5p = oligo.strand5p()
+        return (oligo.length(), strand5p.isForward(),
+                -strand5p.idNum(), -strand5p.idx5Prime())
+    return max(part.oligos(), key=key)
+# end def
+
+
+def applyScaffold(part, name):
+    """Apply a scaffold sequence from `cadnano.data.dnasequences` to the
+    scaffold oligo of a part
+
+    Args:
+        part (NucleicAcidPart):
+        name (str): name of the sequence
+
+    Returns:
+        int: length of the scaffold oligo
+
+    Raises:
+        KeyError: unknown sequence name
+    """
+    from cadnano.data.dnasequences import sequences
+    scaffold = scaffoldOligo(part)
+    scaffold.applySequence(sequences[name], use_undostack=False)
+    return scaffold.length()
+# end def
+
+
+def jobApplyScaffold(part, output, options):
+    """Apply the scaffold sequence and save the design as v3 JSON"""
+    length = applyScaffold(part, options['scaffold'])
+    part.document().writeToFile(output)
+    return {'scaffold_length': length}
+# end def
+
+
+def jobExportStaples(part, output, options):
+    """Export the staple sequences, applying the scaffold sequence first if
+    one is given
+    """
+    if options['scaffold']:
+        applyScaffold(part, options['scaffold'])
+    with io.open(output, 'w', encoding='utf-8') as f:
+        num_rows = part.writeSequences(f, fmt=options['format'],
+                                       sort=options['sort'],
+                                       dedupe=options['dedupe'])
+    return {'staples': num_rows}
+# end def
+
+
+def jobSaveV3(part, output, options):
+    """Save the design as v3 JSON"""
+    part.document().writeToFile(output)
+    return {}
+# end def
+
+
+def jobValidate(part, output, options):
+    """Check that the length of each oligo is the summed length of its
+    strands and that its strands all belong to it, and count the loop
+    oligos
+    """
+    num_errors = 0
+    num_loops = 0
+    for oligo in part.oligos():
+        strands = list(oligo.strand5p().generator3pStrand())
+        if oligo.isLoop():
+            num_loops += 1
+        if (oligo.length() != sum(strand.totalLength() for strand in strands) or
+                any(strand.oligo() is not oligo for strand in strands)):
+            num_errors += 1
+    return {'oligos': len(part.oligos()), 'errors': num_errors, 'loops': num_loops,
+            'ok': num_errors == 0}
+# end def
+
+
+def jobStats(part, output, options):
+    """Count the virtual helices, strands, oligos, bases and insertions"""
+    id_nums = list(part.getIdNums())
+    num_strands = 0
+    for id_num in id_nums:
+        for strandset in part.getStrandSets(id_num):
+            num_strands += len(strandset.strands())
+    lengths = [oligo.length() for oligo in part.oligos()]
+    insertions = [insertion for id_num in id_nums
+                  for insertion in part.insertions()[id_num].values()]
+    return {'virtual_helices': len(id_nums),
+            'strands': num_strands,
+            'oligos': len(lengths),
+            'bases': sum(lengths),
+            'longest_oligo': max(lengths) if lengths else 0,
+            'loops': len(part.getLoopOligos()),
+            'insertions': sum(1 for insertion in insertions if insertion.length() > 0),
+            'skips': sum(1 for insertion in insertions if insertion.length() < 0)}
+# end def
+
+
+JOBS = {
+    'apply-scaffold': (jobApplyScaffold, '.json'),
+    'export-staples': (jobExportStaples, '.csv'),
+    'save-v3': (jobSaveV3, '.json'),
+    'stats': (jobStats, None),
+    'validate': (jobValidate, None),
+}
+"""dict: job name: (function, extension of its output file or None)"""
+
+
+def runJob(job, filename, output, options):
+    """Run a job on one design, in a worker process
+
+    Args:
+        job (str): a key of `JOBS`
+        filename (str): path of the design
+        output (str): path of the file to write or None
+        options (dict): the job options
+
+    Returns:
+        dict: the result, with the `file`, whether it is `ok`, the `error`
+        if it failed and the `load_time` and `time` in seconds
+    """
+    result = {'file': filename, 'output': output, 'ok': True}
+    t0 = time.perf_counter()
+    try:
+        part = loadDesign(filename)
+        result['load_time'] = time.perf_counter() - t0
+        if output is not None:
+            if os.path.realpath(output) == os.path.realpath(filename):
+                raise ValueError("the output would overwrite the design")
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        result.update(JOBS[job][0](part, output, options))
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = "%s: %s" % (type(e).__name__, e)
+    result['time'] = time.perf_counter() - t0
+    return result
+# end def
+
+
+def runJobs(tasks, workers=None):
+    """Run jobs across a process pool
+
+    Args:
+        tasks (list): of the argument tuples of `runJob`
+        workers (int): number of worker processes, default the number of
+            CPUs.  1 runs the jobs in this process
+
+    Yields:
+        dict: the result of each job as it finishes
+    """
+    if workers == 1:
+        for task in tasks:
+            yield runJob(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(runJob, *task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+# end def
+
+
+def findDesigns(inputs):
+    """Expand files, directories and glob patterns to design files
+
+    Args:
+        inputs (list): of :obj:`str` paths and patterns
+
+    Returns:
+        list: of (:obj:`str`, :obj:`str`) tuples of the path of each design
+        and the path relative to its input directory for naming its output
+    """
+    designs = []
+    seen = set()
+    for path in inputs:
+        if os.path.isdir(path):
+            found = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if os.path.splitext(name)[1].lower() in DESIGN_EXTENSIONS:
+                        filename = os.path.join(dirpath, name)
+                        found.append((filename, os.path.relpath(filename, path)))
+        elif glob.has_magic(path):
+            found = [(filename, os.path.basename(filename))
+                     for filename in sorted(glob.glob(path, recursive=True))
+                     if os.path.isfile(filename)]
+        else:
+            found = [(path, os.path.basename(path))]
+        for filename, relpath in found:
+            if filename not in seen:
+                seen.add(filename)
+                designs.append((filename, relpath))
+    return designs
+# end def
+
+
+def outputPath(output_dir, relpath, extension):
+    """Get the path of the output of a design
+
+    Args:
+        output_dir (str):
+        relpath (str): path of the design relative to its input directory
+        extension (str): of the output or None if the job writes no file
+
+    Returns:
+        str: or None
+    """
+    if extension is None:
+        return None
+    return os.path.join(output_dir, os.path.splitext(relpath)[0] + extension)
+# end def
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a job on many cadnano designs in parallel without the GUI")
+    parser.add_argument("job", choices=sorted(JOBS), help="the job to run on each design")
+    parser.add_argument("inputs", nargs='+',
+                        help="design files, directories of .json and .c25 files or "
+                             "glob patterns")
+    parser.add_argument("-o", "--output-dir", default='.',
+                        help="directory of the files written by the job, default: .")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of worker processes, default: number of CPUs. "
+                             "1 runs the designs in this process")
+    parser.add_argument("--report", default=None,
+                        help="JSON lines file the result of each design is appended to")
+    parser.add_argument("--scaffold", default=None,
+                        help="name of the scaffold sequence to apply, default: %s for "
+                             "apply-scaffold, none for export-staples" % DEFAULT_SCAFFOLD)
+    parser.add_argument("--format", default='csv', choices=EXPORT_FORMATS,
+                        help="staple export format, default: csv")
+    parser.add_argument("--sort", action='store_true',
+                        help="sort exported staples by their 5' end")
+    parser.add_argument("--dedupe", action='store_true',
+                        help="skip exported staples with a sequence already written")
+    args = parser.parse_args(argv)
+
+    options = {'scaffold': args.scaffold, 'format': args.format,
+               'sort': args.sort, 'dedupe': args.dedupe}
+    if args.job == 'apply-scaffold' and options['scaffold'] is None:
+        options['scaffold'] = DEFAULT_SCAFFOLD
+    extension = JOBS[args.job][1]
+    if args.job == 'export-staples' and args.format == 'tsv':
+        extension = '.tsv'
+    designs = findDesigns(args.inputs)
+    tasks = [(args.job, filename, outputPath(args.output_dir, relpath, extension), options)
+             for filename, relpath in designs]
+
+    num_failed = 0
+    t0 = time.perf_counter()
+    with open(args.report or os.devnull, 'a', encoding='utf-8') as report:
+        for result in runJobs(tasks, args.workers):
+            if not result['ok']:
+                num_failed += 1
+            print("%8.3fs  %s  %s" % (result['time'],
+                                      "ok    " if result['ok'] else "FAILED",
+                                      result['file']) +
+                  ("  %s" % result['error'] if 'error' in result else ''))
+            report.write(json.dumps(result) + '\n')
+            report.flush()
+    print("%d designs, %d failed in %0.3fs" % (len(tasks), num_failed,
+                                               time.perf_counter() - t0))
+    return 1 if num_failed else 0
+# end def
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""Convert cadnano designs between the v3 JSON and binary `.npz` formats.
+
+run with:
+
+    python bin/convert.py design.json design.npz
+
+v3 files are converted directly and losslessly.  Legacy v2 and c25 files are
+decoded into a Document first and so are upgraded to the v3 layout.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+LOCAL_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.dirname(LOCAL_DIR)
+sys.path.append(os.path.dirname(ROOT_DIR))
+
+from cadnano.fileio import npzdecode, npzencode, nnoencode
+from cadnano.fileio.nnodecode import decodeFile
+
+
+def readObject(filename):
+    """Read the v3 document dictionary of a design file
+
+    Args:
+        filename (str): path of a `.npz`, v3 JSON or legacy design file
+
+    Returns:
+        dict: the v3 document dictionary
+    """
+    if os.path.splitext(filename)[1] == npzencode.NPZ_EXTENSION:
+        return npzdecode.readObject(filename)
+    with io.open(filename, 'r', encoding='utf-8') as fd:
+        obj = json.load(fd)
+    if 'format' not in obj:
+        # legacy designs are upgraded through the model
+        obj = json.loads(nnoencode.encode(decodeFile(filename)))
+    return obj
+# end def
+
+
+def writeObject(filename, obj):
+    """Write a v3 document dictionary in the format given by the extension
+    of `filename`
+
+    Args:
+        filename (str): path of the `.npz` or `.json` file to write
+        obj (dict): the v3 document dictionary
+    """
+    if os.path.splitext(filename)[1] == npzencode.NPZ_EXTENSION:
+        npzencode.writeObject(filename, obj)
+    else:
+        json_string = json.dumps(obj, separators=(',', ':'),
+                                 cls=nnoencode.EncoderforPandas)
+        with io.open(filename, 'w', encoding='utf-8') as fd:
+            fd.write(json_string)
+# end def
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert cadnano designs between the v3 JSON (.json) and "
+                    "binary (%s) formats" % npzencode.NPZ_EXTENSION)
+    parser.add_argument("input", help="design file to convert")
+    parser.add_argument("output", help="file to write, the format is set by the extension")
+    args = parser.parse_args(argv)
+    writeObject(args.output, readObject(args.input))
+# end def
+
+if __name__ == '__main__':
+    main()
@@ -85,6 +85,15 @@ class StrandType:
     REV = 1
 
 
+class CommandId:
+    """`id()` of the undo commands an undo stack offers to merge with the
+    next command of the same id, as `QUndoCommand.id`
+    """
+    NONE = -1
+    RESIZE_STRAND = 1
+    TRANSLATE_VIRTUAL_HELICES = 2
+
+
 class ModType:
     END_5PRIME = 0
     END_3PRIME = 1
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import count
 
 from cadnano import undostack
 from cadnano import undocommand
@@ -56,10 +59,264 @@ class DummySignal(object):
         self.targets.remove(target)
 
     def emit(self, *args):
+        if not self.targets:
+            return
+        if _signal_batch is not None:
+            _signal_batch.queue(self, self.name, args, self._deliver)
+            return
         for t in self.targets:
             t(*args)
+
+    def _deliver(self, *args):
+        for t in list(self.targets):
+            t(*args)
+# end class
+
+
+class BatchedSignal(object):
+    """Class attribute wrapping a signal that is bound per instance, as a
+    `pyqtSignal` is, so that the emissions of the instances are queued in
+    an open batch like those of a `DummySignal`.
+
+    The wrapped signal must also be set on the class under the attribute
+    name with a leading underscore, where Qt finds it when it creates the
+    meta object of the class, which the subclasses of a
+    :func:`batchedBaseObject` do.
+
+    Args:
+        signal (pyqtSignal): the signal to wrap
+        name (str): name of the signal
+    """
+    def __init__(self, signal, name):
+        self.signal = signal
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self.signal
+        return BoundBatchedSignal(self, obj)
+# end class
+
+
+class BoundBatchedSignal(object):
+    """A `BatchedSignal` bound to an instance, emitting through the bound
+    wrapped signal or queueing the emission in the open batch
+    """
+    __slots__ = '_signal', '_obj', '_bound'
+
+    def __init__(self, signal, obj):
+        self._signal = signal
+        self._obj = obj
+        self._bound = signal.signal.__get__(obj, type(obj))
+
+    def connect(self, *args, **kwargs):
+        return self._bound.connect(*args, **kwargs)
+
+    def disconnect(self, *args):
+        return self._bound.disconnect(*args)
+
+    def emit(self, *args):
+        if _signal_batch is not None:
+            _signal_batch.queue((self._signal, self._obj), self._signal.name, args,
+                                self._bound.emit)
+            return
+        self._bound.emit(*args)
+
+    def __getattr__(self, attr):
+        return getattr(self._bound, attr)
+# end class
+
+
+def batchedSignal(signal_type):
+    """
+    Args:
+        signal_type (type): of signal bound per instance, like `pyqtSignal`
+
+    Returns:
+        function: with the signature of `signal_type` making a
+        `BatchedSignal` of it
+    """
+    def newsignal(*args, **kwargs):
+        name = kwargs.get('name')
+        if name is None:
+            raise ValueError("missing name")
+        return BatchedSignal(signal_type(*args, **kwargs), name)
+    return newsignal
+# end def
+
+
+def batchedBaseObject(base):
+    """Make a base class whose subclasses set the signal wrapped by each of
+    their `BatchedSignal` under the attribute name with a leading
+    underscore, before the class is created
+
+    Args:
+        base (type): to derive, like `QObject`
+
+    Returns:
+        type: subclass of `base` with a metaclass deriving that of `base`
+    """
+    class BatchedSignalType(type(base)):
+        def __new__(mcs, name, bases, namespace, **kwargs):
+            for attr_name, value in list(namespace.items()):
+                if isinstance(value, BatchedSignal):
+                    namespace['_' + attr_name] = value.signal
+            return super(BatchedSignalType, mcs).__new__(mcs, name, bases,
+                                                          namespace, **kwargs)
+    # end class
+    return BatchedSignalType(base.__name__, (base,), {})
+# end def
+
+
+COALESCED_SIGNALS = {
+    'oligoPropertyChangedSignal': 2,
+    'oligoSequenceAddedSignal': 1,
+    'oligoSequenceClearedSignal': 1,
+    'partActiveBaseInfoSignal': 1,
+    'partActiveChangedSignal': 1,
+    'partActiveVirtualHelixChangedSignal': 1,
+    'partPropertyChangedSignal': 2,
+    'partStrandChangedSignal': 2,
+    'partVirtualHelixResizedSignal': 2,
+    'partZDimensionsChangedSignal': 1,
+    'strandHasNewOligoSignal': 1,
+    'strandResizedSignal': 1,
+    'strandSelectedChangedSignal': 1,
+    'strandUpdateSignal': 1,
+}
+"""dict: name of a signal whose last emission in a batch supersedes the
+earlier ones with the same leading arguments: number of leading arguments,
+the sender and what of it changed
+"""
+
+ADDED_SIGNALS = {'partOligoAddedSignal': 1, 'strandsetStrandAddedSignal': 1}
+"""dict: name of a signal announcing a new object: index of the object in
+its arguments
+"""
+
+REMOVED_SIGNALS = {'oligoRemovedSignal': 1, 'strandRemovedSignal': 0}
+"""dict: name of a signal announcing a removed object: index of the object
+in its arguments
+"""
+
+
+class SignalBatch(object):
+    """Queue of the signal emissions of a batch of model mutations,
+    flushed in order when the outermost :func:`batchUpdates` exits.
+
+    Emissions are coalesced as they are queued:
+
+    1. an emission identical to a queued one replaces it
+    2. an emission of a `COALESCED_SIGNALS` signal replaces the queued one
+       with the same sender
+    3. the removal of an object added in the same batch drops its addition
+       and the emissions it sent in between, so the views never see it
+
+    A replaced emission moves to the end of the queue, after the emissions
+    it may depend on.
+    """
+    __slots__ = 'depth', '_queue', '_sender_keys', '_added', '_unique'
+
+    def __init__(self):
+        self.depth = 0
+        self._queue = OrderedDict()
+        self._sender_keys = {}
+        self._added = {}
+        self._unique = count()
+    # end def
+
+    def __len__(self):
+        return len(self._queue)
+    # end def
+
+    def _key(self, signal, name, args):
+        num_args = COALESCED_SIGNALS.get(name)
+        key = (signal, args if num_args is None else args[:num_args])
+        try:
+            hash(key)
+        except TypeError:   # unhashable arguments are never duplicates
+            key = (signal, next(self._unique))
+        return key
+    # end def
+
+    def queue(self, signal, name, args, deliver):
+        """Queue an emission
+
+        Args:
+            signal (object): hashable identity of the signal, the
+                `DummySignal` or the `BatchedSignal` and its instance
+            name (str): name of the signal
+            args (tuple): the arguments of `emit`
+            deliver (function): emitting `args` to the targets on flush
+        """
+        queue = self._queue
+        if name in REMOVED_SIGNALS:
+            obj_id = id(args[REMOVED_SIGNALS[name]])
+            added_key = self._added.pop(obj_id, None)
+            if added_key is not None and added_key in queue:
+                del queue[added_key]
+                for key in self._sender_keys.pop(obj_id, ()):
+                    queue.pop(key, None)
+                return
+        key = self._key(signal, name, args)
+        if key in queue:
+            del queue[key]
+        queue[key] = deliver, args
+        if args:
+            self._sender_keys.setdefault(id(args[0]), set()).add(key)
+        if name in ADDED_SIGNALS:
+            self._added[id(args[ADDED_SIGNALS[name]])] = key
+    # end def
+
+    def flush(self):
+        """Emit the queued emissions to the current targets of each signal"""
+        queue = self._queue
+        self._queue = OrderedDict()
+        self._sender_keys = {}
+        self._added = {}
+        for deliver, args in queue.values():
+            deliver(*args)
+    # end def
 # end class
 
+_signal_batch = None
+
+
+@contextmanager
+def batchUpdates():
+    """Context manager queueing the proxy signals emitted in its block and
+    flushing them coalesced, once, when the outermost block exits.
+
+    In the PyQt configuration the signals are `BatchedSignal` wrapping
+    `pyqtSignal` on a :func:`batchedBaseObject` of `QObject`, so they are
+    queued the same way.
+
+    Yields:
+        SignalBatch: the open batch
+    """
+    global _signal_batch
+    batch = _signal_batch
+    if batch is None:
+        batch = _signal_batch = SignalBatch()
+    batch.depth += 1
+    try:
+        yield batch
+    finally:
+        batch.depth -= 1
+        if batch.depth == 0:
+            _signal_batch = None
+            batch.flush()
+# end def
+
+
+def isBatching():
+    """
+    Returns:
+        bool: whether a :func:`batchUpdates` block is open
+    """
+    return _signal_batch is not None
+# end def
+
 ProxySignal = DummySignal
 BaseObject = ProxyObject
 UndoCommand = undocommand.UndoCommand
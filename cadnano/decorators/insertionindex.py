@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# encoding: utf-8
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+class InsertionIndex(dict):
+    """The :class:`Insertion` objects of one virtual helix keyed by base
+    index, with a sorted index to answer range queries in O(log n).
+
+    The sorted indices, insertions and cumulative insertion lengths are
+    rebuilt on the first query after the dictionary changes, so bulk edits
+    such as a file import cost a single sort.  Code changing the length of
+    an `Insertion` in the index must call :meth:`lengthChanged`.
+    """
+    __slots__ = '_idxs', '_sorted', '_cumulative'
+
+    def __init__(self, *args, **kwargs):
+        super(InsertionIndex, self).__init__(*args, **kwargs)
+        self._idxs = None
+    # end def
+
+    def __setitem__(self, idx, insertion):
+        super(InsertionIndex, self).__setitem__(idx, insertion)
+        self._idxs = None
+    # end def
+
+    def __delitem__(self, idx):
+        super(InsertionIndex, self).__delitem__(idx)
+        self._idxs = None
+    # end def
+
+    def pop(self, *args):
+        self._idxs = None
+        return super(InsertionIndex, self).pop(*args)
+    # end def
+
+    def clear(self):
+        super(InsertionIndex, self).clear()
+        self._idxs = None
+    # end def
+
+    def update(self, *args, **kwargs):
+        super(InsertionIndex, self).update(*args, **kwargs)
+        self._idxs = None
+    # end def
+
+    def setdefault(self, idx, insertion=None):
+        self._idxs = None
+        return super(InsertionIndex, self).setdefault(idx, insertion)
+    # end def
+
+    def lengthChanged(self):
+        """Invalidate the cumulative lengths after `Insertion.setLength`
+        """
+        self._idxs = None
+    # end def
+
+    def _build(self):
+        idxs = self._idxs = sorted(self)
+        insertions = self._sorted = [self[idx] for idx in idxs]
+        self._cumulative = [0]
+        self._cumulative.extend(accumulate(insertion.length() for insertion in insertions))
+    # end def
+
+    def _range(self, idx_low, idx_high):
+        """Get the span of the sorted insertions between two indices
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+
+        Returns:
+            tuple: (:obj:`int`, :obj:`int`) of start and stop
+        """
+        if self._idxs is None:
+            self._build()
+        start = bisect_left(self._idxs, idx_low)
+        stop = bisect_right(self._idxs, idx_high, lo=start)
+        return start, stop
+    # end def
+
+    def insertionsBetween(self, idx_low, idx_high):
+        """Get the insertions between two indices
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+
+        Returns:
+            list: of :class:`Insertion` sorted by index
+        """
+        if not self:
+            return []
+        start, stop = self._range(idx_low, idx_high)
+        return self._sorted[start:stop]
+    # end def
+
+    def lengthBetween(self, idx_low, idx_high):
+        """Get the total length of the insertions between two indices,
+        skips counting as -1
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+
+        Returns:
+            int: the total length
+        """
+        if not self:
+            return 0
+        start, stop = self._range(idx_low, idx_high)
+        if start >= stop:
+            return 0
+        cumulative = self._cumulative
+        return cumulative[stop] - cumulative[start]
+    # end def
+# end class
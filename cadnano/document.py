@@ -6,7 +6,7 @@ from uuid import uuid4
 from cadnano import app
 from cadnano import util
 from cadnano.addinstancecmd import AddInstanceCommand
-from cadnano.cnproxy import ProxySignal
+from cadnano.cnproxy import ProxySignal, batchUpdates
 from cadnano.cnobject import CNObject
 from cadnano.cnproxy import UndoStack
 from cadnano.docmodscmd import AddModCommand, RemoveModCommand, ModifyModCommand
@@ -16,7 +16,6 @@ from cadnano.part import Part
 from cadnano.part.refreshsegmentscmd import RefreshSegmentsCommand
 from cadnano.part.nucleicacidpart import NucleicAcidPart
 from cadnano.strand import Strand
-from cadnano import setBatch
 from cadnano.fileio.nnodecode import decodeFile
 from cadnano.fileio.nnoencode import encodeToFile
 
@@ -37,7 +36,7 @@ class Document(CNObject):
         super(Document, self).__init__(parent)
 
         self._undostack = us = UndoStack()  # notice NO parent, what does this mean?
-        us.setUndoLimit(30)
+        us.setUndoLimit(30)     # the headless UndoStack is also bounded by memory
         self._children = set()     # for storing a reference to Parts (and Assemblies)
         self._instances = set()    # for storing instances of Parts (and Assemblies)
         self._controller = None
@@ -82,6 +81,20 @@ class Document(CNObject):
         """
         return self._undostack
 
+    def batchUpdates(self):
+        """Context manager for a bulk mutation of the model.  The signals
+        emitted in its block are queued and coalesced, and the views are
+        notified once when the outermost block exits::
+
+            with document.batchUpdates():
+                for strand in strands:
+                    strand.strandSet().removeStrand(strand)
+
+        Returns:
+            contextmanager: of a `cadnano.cnproxy.SignalBatch`
+        """
+        return batchUpdates()
+
     def children(self):
         """Returns a list of parts associated with the document.
 
@@ -183,14 +196,31 @@ class Document(CNObject):
         encodeToFile(filename, self)
     # end def
 
-    def readFile(self, filename):
+    def readFile(self, filename, prebuild_xovers=False,
+                 stream=False, progress_callback=None, read_only=False):
         """ Convenience wrapper for `decodeFile` to always emit_signals and
         set the `document` argument to `self`
 
         Args:
             filename (str): full path file name
-        """
-        return decodeFile(filename, document=self, emit_signals=True)
+            prebuild_xovers (bool): optional, compute the potential crossovers
+                of every `NucleicAcidPart` in a background thread after loading
+            stream (bool): optional, parse the file incrementally to bound
+                the peak memory of loading large designs
+            progress_callback (function): optional, called as
+                ``progress_callback(bytes_read, total_bytes)`` while streaming
+            read_only (bool): optional, memory-map a binary `.npz` file and
+                only create the strands and oligos of a Part when touched
+        """
+        document = decodeFile(filename, document=self, emit_signals=True,
+                              stream=stream,
+                              progress_callback=progress_callback,
+                              read_only=read_only)
+        if prebuild_xovers:
+            for part in self.children():
+                if isinstance(part, NucleicAcidPart):
+                    part.prebuildCrossoverMap(background=True)
+        return document
     # end def
 
     # def assemblies(self):
@@ -528,26 +558,27 @@ class Document(CNObject):
                     if not strand5p:  # idx5p is a selected endpoint
                         strand_dict[strand] = True
 
-        if use_undostack and xoList:
-            self.undoStack().beginMacro("Delete xovers")
-        for part, strand, strand3p, useUndo in xoList:
-            NucleicAcidPart.removeXover(part, strand, strand3p, useUndo)
-            self.removeStrandFromSelection(strand)
-            self.removeStrandFromSelection(strand3p)
-        self._selection_dict = {}
-        self.documentClearSelectionsSignal.emit(self)
-        if use_undostack:
-            if xoList:  # end xover macro if it was started
+        with self.batchUpdates():
+            if use_undostack and xoList:
+                self.undoStack().beginMacro("Delete xovers")
+            for part, strand, strand3p, useUndo in xoList:
+                NucleicAcidPart.removeXover(part, strand, strand3p, useUndo)
+                self.removeStrandFromSelection(strand)
+                self.removeStrandFromSelection(strand3p)
+            self._selection_dict = {}
+            self.documentClearSelectionsSignal.emit(self)
+            if use_undostack:
+                if xoList:  # end xover macro if it was started
+                    self.undoStack().endMacro()
+                if True in strand_dict.values():
+                    self.undoStack().beginMacro("Delete selection")
+                else:
+                    return  # nothing left to do
+            for strand, delete in strand_dict.items():
+                if delete:
+                    strand.strandSet().removeStrand(strand)
+            if use_undostack:
                 self.undoStack().endMacro()
-            if True in strand_dict.values():
-                self.undoStack().beginMacro("Delete selection")
-            else:
-                return  # nothing left to do
-        for strand, delete in strand_dict.items():
-            if delete:
-                strand.strandSet().removeStrand(strand)
-        if use_undostack:
-            self.undoStack().endMacro()
     # end def
 
     def resizeSelection(self, delta, use_undostack=True):
@@ -598,24 +629,25 @@ class Document(CNObject):
         # end for
 
         # execute the resize commands
-        us = self.undoStack()
-        if use_undostack:
-            us.beginMacro("Resize Selection")
-
-        for strand, idx_low, idx_high in resize_list:
-            Strand.resize(strand,
-                          (idx_low, idx_high),
-                          use_undostack,
-                          update_segments=False)
-        if resize_list:
-            cmd = RefreshSegmentsCommand(part, vh_set)
+        with self.batchUpdates():
+            us = self.undoStack()
             if use_undostack:
-                us.push(cmd)
-            else:
-                cmd.redo()
+                us.beginMacro("Resize Selection")
+
+            for strand, idx_low, idx_high in resize_list:
+                Strand.resize(strand,
+                              (idx_low, idx_high),
+                              use_undostack,
+                              update_segments=False)
+            if resize_list:
+                cmd = RefreshSegmentsCommand(part, vh_set)
+                if use_undostack:
+                    us.push(cmd)
+                else:
+                    cmd.redo()
 
-        if use_undostack:
-            us.endMacro()
+            if use_undostack:
+                us.endMacro()
     # end def
 
     def updateStrandSelection(self):
@@ -645,9 +677,8 @@ class Document(CNObject):
 
     def makeNew(self, fname=None):
         self.resetViews()
-        setBatch(True)
-        self.removeAllChildren()  # clear out old parts
-        setBatch(False)
+        with self.batchUpdates():
+            self.removeAllChildren()  # clear out old parts
         self.undoStack().clear()  # reset undostack
         self.deactivateActivePart()
         self._filename = fname if fname else "untitled.json"
@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
-from collections import defaultdict
 from cadnano.cnenum import StrandType, LatticeType
-from cadnano.part.refresholigoscmd import RefreshOligosCommand
 
 from cadnano import preferences as prefs
-from cadnano import setBatch, getReopen, setReopen
+from cadnano import setReopen
 from cadnano.color import intToColorHex
 from cadnano.part.nucleicacidpart import DEFAULT_RADIUS
 
@@ -25,14 +23,129 @@ def decode(document, obj, emit_signals=True):
     Parses a dictionary (obj) created from reading a json file and uses it
     to populate the given document with model data.
     """
-    num_bases = len(obj['vstrands'][0]['fwd_ss'])
+    helices = [readHelix(helix) for helix in obj['vstrands']]
+    decodeHelices(document, helices,
+                  oligos=obj.get('oligos'),
+                  modifications=obj.get('modifications'),
+                  emit_signals=emit_signals)
+# end def
+
+ENCODED_KEYS = ['eulerZ', 'repeats', 'bases_per_repeat',
+                'turns_per_repeat', 'z']
+MODEL_KEYS = ['eulerZ', 'repeat_hint', 'bases_per_repeat',
+              'turns_per_repeat', 'z']
+
+def readHelix(helix):
+    """Reduce a deserialized helix of a c25 file to the properties, strand
+    segments, crossovers, insertions and colors it describes, which is all
+    `decodeHelices` needs.  The per base lists of the helix can then be
+    released before the next helix is read
+
+    Args:
+        helix (dict): one item of the 'vstrands' list
+
+    Returns:
+        dict: of form::
+
+            {'num': int, 'row': int, 'col': int, 'num_bases': int,
+            'properties': [value, ...],
+            'fwd_ss_segs': [(idx_low, idx_high), ...],
+            'fwd_ss_xo': [(idx, to_vh_num, to_strand3p, to_idx), ...],
+            'rev_ss_segs': ..., 'rev_ss_xo': ...,
+            'insertions': [(idx, length), ...],
+            'colors': [(strand_type, idx, color), ...]}
+
+        where 'fwd_ss' and 'rev_ss' refer to the strand sets of the model
+    """
+    vh_num = helix['num']
+    row = helix['row']
+    col = helix['col']
+    insertions = helix['insertions']
+    deletions = helix['deletions']
+
+    # parity matters still despite the fwd and rev naming of
+    # this format.  The centering of `decodeHelices` shifts rows and
+    # columns by even numbers so the parity is known here
+    if HoneycombDnaPart.isEvenParity(row, col):
+        fwd_ss = helix['fwd_ss']
+        rev_ss = helix['rev_ss']
+    else:
+        rev_ss = helix['fwd_ss']
+        fwd_ss = helix['rev_ss']
+    try:
+        # validate file serialization of lists
+        assert( len(fwd_ss) == len(rev_ss) and
+                len(fwd_ss) == len(insertions) and
+                len(insertions) == len(deletions) )
+        fwd_ss_segs, fwd_ss_xo = _readSegmentsAndXovers(StrandType.SCAFFOLD, vh_num, fwd_ss)
+        rev_ss_segs, rev_ss_xo = _readSegmentsAndXovers(StrandType.STAPLE, vh_num, rev_ss)
+    except AssertionError:
+        print("Unrecognized file format.")
+        raise
+    return {'num': vh_num,
+            'row': row,
+            'col': col,
+            'num_bases': len(helix['fwd_ss']),
+            'properties': [helix[key] for key in ENCODED_KEYS],
+            'fwd_ss_segs': fwd_ss_segs,
+            'fwd_ss_xo': fwd_ss_xo,
+            'rev_ss_segs': rev_ss_segs,
+            'rev_ss_xo': rev_ss_xo,
+            'insertions': [(base_idx, insertion + deletion) for base_idx, (insertion, deletion)
+                           in enumerate(zip(insertions, deletions)) if insertion + deletion != 0],
+            'colors': helix['colors']}
+# end def
+
+def _readSegmentsAndXovers(strand_type, vh_num, base_list):
+    """Find the strand segments and 3' crossovers of one strand set of a
+    helix
+
+    Args:
+        strand_type (StrandType): SCAFFOLD or STAPLE
+        vh_num (int): virtual helix number
+        base_list (list): of [five_vh, five_strand, five_idx, three_vh,
+            three_strand, three_idx] per base
+
+    Returns:
+        tuple: list of (idx_low, idx_high) segments, list of
+        (idx, three_vh, three_strand, three_idx) crossovers
+    """
+    seg = []
+    xo = []
+    for i, base in enumerate(base_list):
+        five_vh, five_strand, five_idx, three_vh, three_strand, three_idx = base
+        if five_vh == -1 and three_vh == -1:
+            continue  # null base
+        if isSegmentStartOrEnd(strand_type, vh_num, i,
+                                five_vh, five_idx, three_vh, three_idx):
+            seg.append(i)
+        if five_vh != vh_num and three_vh != vh_num:  # special case
+            seg.append(i)  # end segment on a double crossover
+        if is3primeXover(strand_type, vh_num, i, three_vh, three_idx):
+            xo.append((i, three_vh, three_strand, three_idx))
+    assert (len(seg) % 2 == 0)
+    return [(seg[i], seg[i + 1]) for i in range(0, len(seg), 2)], xo
+# end def
+
+def decodeHelices(document, helices, oligos=None, modifications=None,
+                  emit_signals=True):
+    """Populate the given document with the helices of a c25 file
+
+    Args:
+        document (Document):
+        helices (list): of :obj:`dict` returned by `readHelix` in file order
+        oligos (list): optional, the 'oligos' item of the file
+        modifications (dict): optional, the 'modifications' item of the file
+        emit_signals (bool): optional, default True
+    """
+    num_bases = helices[0]['num_bases']
 
     lattice_type = LatticeType.HONEYCOMB
 
     part = None
     # DETERMINE MAX ROW,COL
     max_row_json = max_col_json = 0
-    for helix in obj['vstrands']:
+    for helix in helices:
         max_row_json = max(max_row_json, int(helix['row']) + 1)
         max_col_json = max(max_col_json, int(helix['col']) + 1)
 
@@ -47,7 +160,6 @@ def decode(document, obj, emit_signals=True):
         raise TypeError("Lattice type not recognized")
     part = document.createNucleicAcidPart(use_undostack=False)
     part.setActive(True)
-    setBatch(True)
     delta = num_bases - 42
     # POPULATE VIRTUAL HELICES
     ordered_id_list = []
@@ -57,7 +169,7 @@ def decode(document, obj, emit_signals=True):
     min_col, max_col = 10000, -10000
 
     # find row, column limits
-    for helix in obj['vstrands']:
+    for helix in helices:
         row = helix['row']
         if row < min_row:
             min_row = row
@@ -81,11 +193,7 @@ def decode(document, obj, emit_signals=True):
     # print("\trows(%d, %d): avg: %d" % (min_row, max_row, delta_row))
     # print("\tcolumns(%d, %d): avg: %d" % (min_col, max_col, delta_column))
 
-    encoded_keys = ['eulerZ', 'repeats', 'bases_per_repeat',
-                    'turns_per_repeat', 'z']
-    model_keys = ['eulerZ', 'repeat_hint', 'bases_per_repeat',
-                    'turns_per_repeat', 'z']
-    for helix in obj['vstrands']:
+    for helix in helices:
         vh_num = helix['num']
         row = helix['row']
         col = helix['col']
@@ -93,173 +201,73 @@ def decode(document, obj, emit_signals=True):
         coord = (row -  delta_row, col - delta_column)
         vh_num_to_coord[vh_num] = coord
         ordered_id_list.append(vh_num)
-        property_dict[vh_num] = [helix[key] for key in encoded_keys]
+        property_dict[vh_num] = list(helix['properties'])
     # end for
 
     radius = DEFAULT_RADIUS
-    for vh_num in sorted(vh_num_to_coord.keys()):
+    vh_nums = sorted(vh_num_to_coord.keys())
+    vh_origins = []
+    zs = []
+    props_list = []
+    for vh_num in vh_nums:
         row, col = vh_num_to_coord[vh_num]
-        x, y = doLattice(radius, row, col)
+        vh_origins.append(doLattice(radius, row, col))
         props = property_dict[vh_num]
         z = convertToModelZ(props[-1])
         props[-1] = z
-        # print("%d:" % vh_num, x, y, z)
-        # print({k:v for k, v in zip(encoded_keys, props)})
-        part.createVirtualHelix(x, y, z, num_bases,
-                                id_num=vh_num,
-                                properties=(model_keys, props),
-                                use_undostack=False)
-    if not getReopen():
-        setBatch(False)
+        zs.append(z)
+        props_list.append(props)
+    with document.batchUpdates():
+        part.createVirtualHelices(vh_origins, zs, [num_bases]*len(vh_nums),
+                                  id_nums=vh_nums,
+                                  properties=(MODEL_KEYS, props_list),
+                                  use_undostack=False)
     part.setImportedVHelixOrder(ordered_id_list)
     # zoom to fit
     if emit_signals:
         part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
     setReopen(False)
-    setBatch(False)
 
-    # INSTALL STRANDS AND COLLECT XOVER LOCATIONS
-    fwd_ss_seg = defaultdict(list)
-    fwd_ss_xo = defaultdict(list)
-    rev_ss_seg = defaultdict(list)
-    rev_ss_xo = defaultdict(list)
-    try:
-        for helix in obj['vstrands']:
-            vh_num = helix['num']
-            row, col = vh_num_to_coord[vh_num]
-            insertions = helix['insertions']
-            deletions = helix['deletions']
-
-            if isEven(row, col):
-                # parity matters still despite the fwd and rev naming of
-                # this format
-                fwd_strandset, rev_strandset = part.getStrandSets(vh_num)
-                fwd_ss = helix['fwd_ss']
-                rev_ss = helix['rev_ss']
-            else:
-                rev_strandset, fwd_strandset = part.getStrandSets(vh_num)
-                rev_ss = helix['fwd_ss']
-                fwd_ss = helix['rev_ss']
-
-            # validate file serialization of lists
-            assert( len(fwd_ss) == len(rev_ss) and
-                    len(fwd_ss) == len(insertions) and
-                    len(insertions) == len(deletions) )
-
-            # read fwd_strandset segments and xovers
-            for i in range(len(fwd_ss)):
-                five_vh, five_strand, five_idx, three_vh, three_strand, three_idx = fwd_ss[i]
-
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.SCAFFOLD, vh_num, i,
-                                        five_vh, five_idx, three_vh, three_idx):
-                    fwd_ss_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    fwd_ss_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.SCAFFOLD, vh_num, i, three_vh, three_idx):
-                    fwd_ss_xo[vh_num].append((i, three_vh, three_strand, three_idx))
-            assert (len(fwd_ss_seg[vh_num]) % 2 == 0)
-
-            # install fwd_strandset segments
-            for i in range(0, len(fwd_ss_seg[vh_num]), 2):
-                low_idx = fwd_ss_seg[vh_num][i]
-                high_idx = fwd_ss_seg[vh_num][i + 1]
-                fwd_strandset.createStrand(low_idx, high_idx, use_undostack=False)
-
-            # read rev_strandset segments and xovers
-            for i in range(len(rev_ss)):
-                five_vh, five_strand, five_idx, three_vh, three_strand, three_idx = rev_ss[i]
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.STAPLE, vh_num, i,
-                                        five_vh, five_idx, three_vh, three_idx):
-                    rev_ss_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    rev_ss_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.STAPLE, vh_num, i, three_vh, three_idx):
-                    rev_ss_xo[vh_num].append((i, three_vh, three_strand, three_idx))
-            assert (len(rev_ss_seg[vh_num]) % 2 == 0)
-
-            # install rev_strandset segments
-            for i in range(0, len(rev_ss_seg[vh_num]), 2):
-                low_idx = rev_ss_seg[vh_num][i]
-                high_idx = rev_ss_seg[vh_num][i + 1]
-                rev_strandset.createStrand(low_idx, high_idx, use_undostack=False)
-            part.refreshSegments(vh_num)
-        # end for
-    except AssertionError:
-        print("Unrecognized file format.")
-        raise
-
-    """ INSTALL XOVERS
+    """ COLLECT STRANDS AND XOVERS
     parity matters for the from idx but is already encoded in
     the `to_strand3p` parameter of the tuple in `fwd_ss_xo` and `rev_ss_xo`
     """
-    for helix in obj['vstrands']:
+    strand_dict = {}
+    xovers = []
+    for helix in helices:
         vh_num = helix['num']
-        row, col = vh_num_to_coord[vh_num]
-        if isEven(row, col):
-            fwd_strandset, rev_strandset = part.getStrandSets(vh_num)
-        else:
-            rev_strandset, fwd_strandset = part.getStrandSets(vh_num)
-
-        # install fwd_strandset xovers
-        for (idx5p, to_vh_num, to_strand3p, idx3p) in fwd_ss_xo[vh_num]:
+        fwd_ss_is_fwd = isEven(*vh_num_to_coord[vh_num])
+        strand_dict[(vh_num, fwd_ss_is_fwd)] = [(low_idx, high_idx, None)
+                                                for low_idx, high_idx in helix['fwd_ss_segs']]
+        strand_dict[(vh_num, not fwd_ss_is_fwd)] = [(low_idx, high_idx, None)
+                                                    for low_idx, high_idx in helix['rev_ss_segs']]
+
+        # fwd_strandset xovers
+        for (idx5p, to_vh_num, to_strand3p, idx3p) in helix['fwd_ss_xo']:
             # idx3p is 3' end of strand5p, idx5p is 5' end of strand3p
-            strand5p = fwd_strandset.getStrand(idx5p)
-            to_fwd_strandset, to_rev_strandset = part.getStrandSets(to_vh_num)
-
-            if to_strand3p == 0:
-                strand3p = to_fwd_strandset.getStrand(idx3p)
-            else:
-                strand3p = to_rev_strandset.getStrand(idx3p)
-            part.createXover(   strand5p, idx5p,
-                                strand3p, idx3p,
-                                allow_reordering=True,
-                                update_oligo=False,
-                                use_undostack=False)
+            xovers.append((vh_num, fwd_ss_is_fwd, idx5p, to_vh_num, to_strand3p == 0, idx3p))
 
-        # install rev_strandset xovers
-        for (idx5p, to_vh_num, to_strand3p, idx3p) in rev_ss_xo[vh_num]:
+        # rev_strandset xovers
+        for (idx5p, to_vh_num, to_strand3p, idx3p) in helix['rev_ss_xo']:
             # idx3p is 3' end of strand5p, idx5p is 5' end of strand3p
-            strand5p = rev_strandset.getStrand(idx5p)
-            to_fwd_strandset, to_rev_strandset = part.getStrandSets(to_vh_num)
-            coord = vh_num_to_coord[to_vh_num]
-
-            if to_strand3p == 0:
-                strand3p = to_fwd_strandset.getStrand(idx3p)
-            else:
-                strand3p = to_rev_strandset.getStrand(idx3p)
-            part.createXover(   strand5p, idx5p,
-                                strand3p, idx3p,
-                                allow_reordering=True,
-                                update_oligo=False,
-                                use_undostack=False)
+            xovers.append((vh_num, not fwd_ss_is_fwd, idx5p, to_vh_num, to_strand3p == 0, idx3p))
 
-    # need to heal all oligo connections into a continuous
-    # oligo for the next steps
-    RefreshOligosCommand(part).redo()
+    # install strands and xovers at once, healing all oligo connections into
+    # continuous oligos for the next steps
+    part.importStrands(strand_dict, xovers, allow_reordering=True, use_undostack=False)
 
     # COLORS, INSERTIONS, deletions
-    for helix in obj['vstrands']:
+    for helix in helices:
         vh_num = helix['num']
-        row, col = vh_num_to_coord[vh_num]
-        fwd_ss = helix['fwd_ss']
-        rev_ss = helix['rev_ss']
-        insertions = helix['insertions']
-        deletions = helix['deletions']
 
         fwd_strandset, rev_strandset = part.getStrandSets(vh_num)
 
         # install insertions and deletions
-        for base_idx in range(len(rev_ss)):
-            sum_of_insert_deletion = insertions[base_idx] + deletions[base_idx]
-            if sum_of_insert_deletion != 0:
-                strand = fwd_strandset.getStrand(base_idx)
-                strand.addInsertion(base_idx,
-                                    sum_of_insert_deletion,
-                                    use_undostack=False)
+        for base_idx, sum_of_insert_deletion in helix['insertions']:
+            strand = fwd_strandset.getStrand(base_idx)
+            strand.addInsertion(base_idx,
+                                sum_of_insert_deletion,
+                                use_undostack=False)
         # end for
 
         # populate colors
@@ -268,8 +276,8 @@ def decode(document, obj, emit_signals=True):
             strand = strandset.getStrand(base_idx)
             strand.oligo().applyColor(color, use_undostack=False)
 
-    if 'oligos' in obj:
-        for oligo in obj['oligos']:
+    if oligos is not None:
+        for oligo in oligos:
             vh_num = oligo['vh_num']
             idx = oligo['idx']
             seq = str(oligo['seq']) if oligo['seq'] is not None else ''
@@ -279,11 +287,11 @@ def decode(document, obj, emit_signals=True):
                 strand = fwd_strandset.getStrand(idx)
                 strand.oligo().applySequence(seq, use_undostack=False)
 
-    if 'modifications' in obj:
-        for mod_id, item in obj['modifications'].items():
+    if modifications is not None:
+        for mod_id, item in modifications.items():
             if mod_id != 'int_instances' and mod_id != 'ext_instances':
                 part.createMod(item, mod_id)
-        for key, mid in obj['modifications']['ext_instances'].items():
+        for key, mid in modifications['ext_instances'].items():
             # strand, idx, coord, isstaple = part.getModStrandIdx(key)
             strand, idx = part.getModStrandIdx(key)
             try:
@@ -291,7 +299,7 @@ def decode(document, obj, emit_signals=True):
             except:
                 print(strand, idx)
                 raise
-        for key in obj['modifications']['int_instances'].items():
+        for key in modifications['int_instances'].items():
             # strand, idx, coord, isstaple  = part.getModStrandIdx(key)
             strand, idx = part.getModStrandIdx(key)
             try:
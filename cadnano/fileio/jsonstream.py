@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class JSONStreamReader(object):
+    """Pull parser for reading a JSON document incrementally from a binary
+    file object.
+
+    The structure of the document is walked with :meth:`beginObject`,
+    :meth:`nextKey`, :meth:`beginArray` and :meth:`nextItem` while the leaves
+    of interest, for instance one virtual helix of a legacy design, are read
+    whole with :meth:`readValue` using the C accelerated
+    :class:`json.JSONDecoder`.  Only the unread part of the current chunk and
+    the value being read are held in memory rather than the whole file text
+    and every decoded object at once.
+
+    Args:
+        fd (file): binary file object open for reading
+        chunk_size (int): optional, number of bytes to read at a time
+        progress_callback (function): optional, called as
+            ``progress_callback(bytes_read, total_bytes)`` after each chunk is
+            read
+        total_bytes (int): optional, size of the file passed to the
+            `progress_callback`
+    """
+    def __init__(self, fd, chunk_size=DEFAULT_CHUNK_SIZE,
+                 progress_callback=None, total_bytes=None):
+        self._fd = fd
+        self._chunk_size = chunk_size
+        self._progress_callback = progress_callback
+        self._total_bytes = total_bytes
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._bytes_read = 0
+        self._is_eof = False
+        # one flag per open container, True until its first key or item
+        self._is_first = []
+    # end def
+
+    def bytesRead(self):
+        """Get the number of bytes read from the file so far
+
+        Returns:
+            int:
+        """
+        return self._bytes_read
+    # end def
+
+    def _fill(self, size=None):
+        """Read more of the file into the buffer, dropping the consumed text
+
+        Args:
+            size (int): optional, number of bytes to read.  default is the
+                chunk size
+
+        Returns:
+            bool: False if the end of the file has been reached
+        """
+        if self._is_eof:
+            return False
+        data = self._fd.read(size or self._chunk_size)
+        self._bytes_read += len(data)
+        self._is_eof = not data
+        self._buffer = (self._buffer[self._pos:] +
+                        self._text_decoder.decode(data, final=self._is_eof))
+        self._pos = 0
+        if self._progress_callback is not None:
+            self._progress_callback(self._bytes_read, self._total_bytes)
+        return not self._is_eof
+    # end def
+
+    def _peek(self):
+        """Skip whitespace and get the next character without consuming it
+
+        Returns:
+            str: the next character or '' at the end of the file
+        """
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+    # end def
+
+    def _consume(self, char):
+        """Consume the next non whitespace character
+
+        Args:
+            char (str): the expected character
+
+        Raises:
+            ValueError: if the next character is not `char`
+        """
+        next_char = self._peek()
+        if next_char != char:
+            raise ValueError("Expected %r at byte ~%d, got %r" %
+                             (char, self._bytes_read, next_char))
+        self._pos += 1
+    # end def
+
+    def _isNextInContainer(self, close_char):
+        """Consume the separator before the next key or item of the open
+        container or the closing character at its end
+
+        Args:
+            close_char (str): '}' or ']'
+
+        Returns:
+            bool: False if the container was closed
+        """
+        if self._peek() == close_char:
+            self._pos += 1
+            self._is_first.pop()
+            return False
+        if self._is_first[-1]:
+            self._is_first[-1] = False
+        else:
+            self._consume(',')
+        return True
+    # end def
+
+    def beginObject(self):
+        """Start reading an object.  Call :meth:`nextKey` until it returns
+        None to read its keys
+        """
+        self._consume('{')
+        self._is_first.append(True)
+    # end def
+
+    def nextKey(self):
+        """Get the next key of the current object.  The value must be read
+        with :meth:`readValue` or walked before calling this again
+
+        Returns:
+            str: the key or None at the end of the object
+        """
+        if not self._isNextInContainer('}'):
+            return None
+        key = self.readValue()
+        self._consume(':')
+        return key
+    # end def
+
+    def beginArray(self):
+        """Start reading an array.  Call :meth:`nextItem` until it returns
+        False to read its items
+        """
+        self._consume('[')
+        self._is_first.append(True)
+    # end def
+
+    def nextItem(self):
+        """Advance to the next item of the current array.  The item must be
+        read with :meth:`readValue` or walked before calling this again
+
+        Returns:
+            bool: False at the end of the array
+        """
+        return self._isNextInContainer(']')
+    # end def
+
+    def iterItems(self):
+        """Read an array one decoded item at a time
+
+        Yields:
+            object: each item of the array
+        """
+        self.beginArray()
+        while self.nextItem():
+            yield self.readValue()
+    # end def
+
+    def readValue(self):
+        """Decode the next whole value
+
+        Returns:
+            object: the decoded JSON value
+
+        Raises:
+            ValueError: if the value is not valid JSON
+        """
+        self._peek()
+        raw_decode = self._decoder.raw_decode
+        while True:
+            buffer = self._buffer
+            try:
+                value, end = raw_decode(buffer, self._pos)
+                # a value running to the end of the buffer such as a
+                # number may continue in the next chunk
+                if end < len(buffer) or self._is_eof:
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._is_eof:
+                    raise
+            # read at least as much again as is buffered so that reading a
+            # large value takes amortized linear time
+            self._fill(max(self._chunk_size, len(buffer) - self._pos))
+    # end def
+# end class
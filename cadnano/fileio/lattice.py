@@ -57,16 +57,25 @@ class HoneycombDnaPart(object):
 
     @staticmethod
     def positionToLatticeCoord(radius, x, y, scale_factor=1.0):
-        column = int(x / (radius*root3*scale_factor) + 0.5)
-
-        row_temp = y / (radius*scale_factor)
-        if (row_temp % 3) + 0.5 > 1.0:
-            # odd parity
-            row = int((row_temp - 1)/3 + 0.5)
-        else:
-            # even parity
-            row = int(row_temp/3 + 0.5)
-        return row, column
+        """Get the lattice coordinate of the site closest to a position, the
+        inverse of latticeCoordToPositionXY.  The site is the closest of the
+        candidates in the nearest column and its neighbors, since the y of a
+        site depends on the parity of its column
+        """
+        r = radius*scale_factor
+        column_temp = floor(x / (r*root3) + 0.5)
+        row_temp = floor(y / (3*r))
+        best = None
+        for column in (column_temp - 1, column_temp, column_temp + 1):
+            dx = x - column*r*root3
+            for row in (row_temp - 1, row_temp, row_temp + 1):
+                dy = y - row*r*3
+                if HoneycombDnaPart.isOddParity(row, column):
+                    dy -= r
+                distance = dx*dx + dy*dy
+                if best is None or distance < best[0]:
+                    best = (distance, row, column)
+        return best[1], best[2]
     # end def
 
     @staticmethod
@@ -134,8 +143,8 @@ class SquareDnaPart(object):
     def positionToLatticeCoord(radius, x, y, scale_factor=1.0):
         """
         """
-        row = int(y/(2.*radius*scale_factor) + 0.5)
-        column = int(x/(2.*radius*scale_factor) + 0.5)
+        row = floor(y/(2.*radius*scale_factor) + 0.5)
+        column = floor(x/(2.*radius*scale_factor) + 0.5)
         return row, column
     # end def
 
@@ -6,15 +6,58 @@ import os.path
 import cadnano.fileio.v2decode as v2decode
 import cadnano.fileio.c25decode as c25decode
 import cadnano.fileio.v3decode as v3decode
+import cadnano.fileio.npzdecode as npzdecode
+from cadnano.fileio.npzencode import NPZ_EXTENSION
+from cadnano.fileio.jsonstream import JSONStreamReader
 
-def decodeFile(filename, document=None, emit_signals=False):
-    with io.open(filename, 'r', encoding='utf-8') as fd:
-        nno_dict = json.load(fd)
+def decodeFile(filename, document=None, emit_signals=False,
+               stream=False, progress_callback=None, read_only=False):
+    """Decode a cadnano file into a Document
+
+    Args:
+        filename (str): full path file name
+        document (Document): optional, the Document to decode into.
+            default creates a new Document
+        emit_signals (bool): optional, default False
+        stream (bool): optional, parse the file incrementally with
+            `streamDecode` rather than loading the whole file first, which
+            bounds the peak memory of decoding large designs. Ignored for
+            binary `NPZ_EXTENSION` files. default False
+        progress_callback (function): optional, called as
+            ``progress_callback(bytes_read, total_bytes)`` while streaming
+        read_only (bool): optional, memory-map a binary `NPZ_EXTENSION` file
+            with `npzdecode.openFile` rather than decoding it. default False
+
+    Returns:
+        Document:
+
+    Raises:
+        ValueError: if `read_only` is set for a JSON file
+    """
     if document is None:
         from cadnano.document import Document
         document = Document()
+    extension = os.path.splitext(filename)[1]
+    if extension == NPZ_EXTENSION:
+        return npzdecode.decodeFile(filename, document=document,
+                                    emit_signals=emit_signals,
+                                    read_only=read_only)
+    if read_only:
+        raise ValueError("read only loading needs a binary %s file, not %s" %
+                         (NPZ_EXTENSION, filename))
+    is_c25 = extension == '.c25'
+    if stream:
+        with io.open(filename, 'rb') as fd:
+            streamDecode(fd, document,
+                         is_c25=is_c25,
+                         emit_signals=emit_signals,
+                         progress_callback=progress_callback,
+                         total_bytes=os.path.getsize(filename))
+        return document
+    with io.open(filename, 'r', encoding='utf-8') as fd:
+        nno_dict = json.load(fd)
     if 'format' not in nno_dict:
-        if os.path.splitext(filename)[1] == '.c25':
+        if is_c25:
             c25decode.decode(document, nno_dict, emit_signals=emit_signals)
         else:
             v2decode.decode(document, nno_dict, emit_signals=emit_signals)
@@ -23,6 +66,54 @@ def decodeFile(filename, document=None, emit_signals=False):
     return document
 # end def
 
+def streamDecode(fd, document, is_c25=False, emit_signals=False,
+                 progress_callback=None, total_bytes=None):
+    """Decode a cadnano file while parsing it incrementally.
+
+    Each Part of a version 3 file is read and decoded before the next one is
+    parsed.  Each helix of a legacy file is reduced to its strands,
+    crossovers and insertions as soon as it is read so the per base lists of
+    the file are never all in memory at once.
+
+    Args:
+        fd (file): binary file object open for reading
+        document (Document): the Document to decode into
+        is_c25 (bool): optional, the legacy helices are in the c25 format.
+            default False
+        emit_signals (bool): optional, default False
+        progress_callback (function): optional, called as
+            ``progress_callback(bytes_read, total_bytes)`` as the file is read
+        total_bytes (int): optional, file size passed to `progress_callback`
+    """
+    reader = JSONStreamReader(fd, progress_callback=progress_callback,
+                              total_bytes=total_bytes)
+    legacy_decode = c25decode if is_c25 else v2decode
+    obj = {}
+    reader.beginObject()
+    key = reader.nextKey()
+    while key is not None:
+        if key == 'vstrands':
+            obj[key] = [legacy_decode.readHelix(helix) for helix in reader.iterItems()]
+        elif key == 'parts':
+            reader.beginArray()
+            while reader.nextItem():
+                part_dict = v3decode.readPart(reader)
+                v3decode.decodePart(document, part_dict, emit_signals=emit_signals)
+            obj[key] = None
+        else:
+            obj[key] = reader.readValue()
+        key = reader.nextKey()
+    if 'vstrands' in obj:
+        legacy_decode.decodeHelices(document, obj['vstrands'],
+                                    oligos=obj.get('oligos'),
+                                    modifications=obj.get('modifications'),
+                                    emit_signals=emit_signals)
+    elif 'parts' in obj:
+        v3decode.decodeModifications(document, obj['modifications'])
+    else:
+        raise IOError("Unrecognized file format.")
+# end def
+
 def loadtest():
     import os
     root_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -1,3 +1,4 @@
+import os
 from os.path import basename
 import numpy as np
 
@@ -8,8 +9,19 @@ import io
 # from cadnano.document import Document
 
 import cadnano.fileio.v3encode as v3encode
+import cadnano.fileio.npzencode as npzencode
 
 def encodeToFile(filename, document):
+    """Save a Document as v3 JSON or, for file names ending in
+    `npzencode.NPZ_EXTENSION`, in the binary columnar format
+
+    Args:
+        filename (str): full path file name
+        document (Document):
+    """
+    if os.path.splitext(filename)[1] == npzencode.NPZ_EXTENSION:
+        npzencode.encodeToFile(filename, document)
+        return
     json_string = encode(document)
     with io.open(filename, 'w', encoding='utf-8') as fd:
         fd.write(json_string)
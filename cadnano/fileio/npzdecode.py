@@ -0,0 +1,552 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import struct
+import zipfile
+from functools import partial
+
+import numpy as np
+from numpy.lib import format as npformat
+
+from cadnano.cnenum import PointType
+import cadnano.fileio.v3decode as v3decode
+from cadnano.fileio.npzencode import (META_KEY, DATA_KEY, ARRAYS_KEY, LAYOUT_KEY,
+                                      POINTS_KEY, SEQUENCES_KEY, POINT_ARRAY_NAMES)
+
+# size of the fixed part of a zip local file header
+ZIP_HEADER_SIZE = 30
+
+def decodeFile(filename, document=None, emit_signals=False, read_only=False):
+    """Load a Document saved in the binary columnar format
+
+    Args:
+        filename (str): full path file name
+        document (Document): optional, the Document to decode into.
+            default creates a new Document
+        emit_signals (bool): optional, default False
+        read_only (bool): optional, memory-map the file with `openFile`
+            rather than decoding it.  default False
+
+    Returns:
+        Document:
+    """
+    if document is None:
+        from cadnano.document import Document
+        document = Document()
+    if read_only:
+        return openFile(filename, document=document, emit_signals=emit_signals)
+    with np.load(filename) as npz_file:
+        obj = json.loads(npz_file[META_KEY].tobytes().decode('utf-8'))
+        arrays = unpackArrays(obj.pop(ARRAYS_KEY), npz_file[DATA_KEY])
+    decodeArrays(document, obj, arrays, emit_signals=emit_signals)
+    return document
+# end def
+
+def decodeArrays(document, obj, arrays, emit_signals=False):
+    """Decode the Parts of a file in the binary columnar format into a
+    Document the way `v3decode.decode` does, passing the typed columns to
+    `NucleicAcidPart.createVirtualHelices` and
+    `NucleicAcidPart.importStrands` rather than rebuilding the v3 document
+    dictionary first
+
+    Args:
+        document (Document):
+        obj (dict): the JSON metadata with layout descriptors in place of
+            the tables
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        emit_signals (bool): optional, default False
+    """
+    names = set(arrays.keys())
+    for part_meta in obj['parts']:
+        part = document.createNucleicAcidPart(use_undostack=False)
+        part.setActive(True)
+        if part_meta.get('point_type') != PointType.ARBITRARY:
+            _createVirtualHelices(part, part_meta, arrays, names)
+            if emit_signals:
+                part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
+        _importPartStrands(part, part_meta, arrays, names)
+        vh_order = part_meta['virtual_helix_order']
+        if vh_order:
+            part.setImportedVHelixOrder(vh_order)
+    v3decode.decodeModifications(document, obj['modifications'])
+# end def
+
+def _createVirtualHelices(part, part_meta, arrays, names):
+    """Create the virtual helices of a Part from its typed columns, indexed
+    by virtual helix ID number, as `v3decode.decodePart` creates them
+
+    Args:
+        part (NucleicAcidPart):
+        part_meta (dict): Part dictionary from the JSON metadata
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+    """
+    vh_list = _rowColumns(part_meta['vh_list'], arrays, names)
+    if not vh_list:
+        return
+    id_nums = np.asarray(vh_list[0], dtype=int)
+    lengths = np.asarray(vh_list[1], dtype=int).tolist()
+    origin_columns = _rowColumns(part_meta['origins'], arrays, names)
+    origins = np.column_stack([np.asarray(column, dtype=float)
+                               for column in origin_columns[:2]])[id_nums]
+    vh_props = part_meta['virtual_helices']
+    if isinstance(vh_props, dict) and vh_props.get(LAYOUT_KEY) == 'columns':
+        vh_props = dict(zip(vh_props['keys'],
+                            _decodeColumnList(vh_props, arrays, names, typed=True)))
+    keys = list(vh_props.keys())
+    columns = []
+    for key in keys:
+        column = vh_props[key]
+        if key == 'eulerZ':
+            column = np.full(len(id_nums), 0.5*(360./10.5))
+        elif isinstance(column, np.ndarray):
+            column = column[id_nums]
+        else:
+            column = [column[id_num] for id_num in id_nums.tolist()]
+        columns.append(column)
+    zs = np.asarray(columns[keys.index('z')], dtype=float)
+    part.createVirtualHelices(origins, zs, lengths,
+                              id_nums=id_nums.tolist(),
+                              property_columns=(keys, columns),
+                              safe=False,
+                              use_undostack=False)
+# end def
+
+def _importPartStrands(part, part_meta, arrays, names):
+    """Import the strands, crossovers, oligo sequences and insertions of a
+    Part, building the strands of `NucleicAcidPart.importStrands` straight
+    from the strand table
+
+    Args:
+        part (NucleicAcidPart): with its virtual helices
+        part_meta (dict): Part dictionary from the JSON metadata
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+    """
+    strands = part_meta['strands']
+    if isinstance(strands, dict) and strands.get(LAYOUT_KEY) == 'strands':
+        strand_dict = _strandDict(strands['name'], arrays, names)
+    else:
+        strand_dict = v3decode.decodeStrands(strands['indices'], strands['properties'])
+    xovers = list(zip(*_rowColumns(part_meta['xovers'], arrays, names, typed=False)))
+    part.importStrands(strand_dict, xovers, use_undostack=False)
+    oligos = part_meta['oligos']
+    if isinstance(oligos, dict) and oligos.get(LAYOUT_KEY) == 'records':
+        # only the columns needed, the names and colors are not restored
+        kinds = dict(zip(oligos['keys'], oligos['kinds']))
+        oligo_sequences = zip(*[oligos['json'][key] if kinds[key] == 'json' else
+                                _decodeColumn('%s/%s' % (oligos['name'], key), kinds[key],
+                                              arrays, names)
+                                for key in ('id_num', 'idx5p', 'is_5p_fwd', 'sequence')])
+    else:
+        oligo_sequences = [(oligo['id_num'], oligo['idx5p'], oligo['is_5p_fwd'], oligo['sequence'])
+                           for oligo in oligos]
+    insertions = zip(*_rowColumns(part_meta['insertions'], arrays, names, typed=False))
+    v3decode.decodeOligosAndInsertions(part, oligo_sequences, insertions)
+# end def
+
+def _rowColumns(value, arrays, names, typed=True):
+    """Get the columns of a table stored by `npzencode._encodeRows`
+
+    Args:
+        value (object): the layout descriptor or the rows stored as JSON
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+        typed (bool): optional, numeric columns as the stored arrays rather
+            than lists. default True
+
+    Returns:
+        list: of :obj:`list` or :obj:`ndarray` per column, empty for an
+        empty table
+    """
+    if isinstance(value, dict) and value.get(LAYOUT_KEY) == 'rows':
+        return _decodeColumnList(value, arrays, names, typed=typed)
+    return [list(column) for column in zip(*value)]
+# end def
+
+def _strandDict(name, arrays, names):
+    """Read the strands of a Part stored by `npzencode._encodeStrands` in
+    the form taken by `NucleicAcidPart.importStrands`, see
+    `v3decode.decodeStrands`
+
+    Args:
+        name (str): prefix of the names of the arrays
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+
+    Returns:
+        dict: of form::
+
+            {(id_num, is_fwd): [(idx_low, idx_high, color), ...], ...}
+    """
+    idxs = arrays[name + '/idxs']
+    lows = idxs[:, 0].tolist()
+    highs = idxs[:, 1].tolist()
+    colors = _strandColors(name, arrays, names)
+    strand_dict = {}
+    i = 0
+    for id_num, (num_fwd, num_rev) in enumerate(arrays[name + '/counts'].tolist()):
+        if num_fwd == -1:
+            continue
+        j = i + num_fwd
+        k = j + num_rev
+        strand_dict[(id_num, True)] = list(zip(lows[i:j], highs[i:j], colors[i:j]))
+        strand_dict[(id_num, False)] = list(zip(lows[j:k], highs[j:k], colors[j:k]))
+        i = k
+    return strand_dict
+# end def
+
+def _strandColors(name, arrays, names):
+    """
+    Args:
+        name (str): prefix of the names of the strand arrays
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+
+    Returns:
+        list: of :obj:`str` color of each strand
+    """
+    if name + '/colors.codes' in names:
+        return _decodeColumn(name + '/colors', 'category', arrays, names)
+    elif name + '/colors.blob' in names:
+        return _decodeColumn(name + '/colors', 'str', arrays, names)
+    return []
+# end def
+
+def openFile(filename, document=None, emit_signals=False):
+    """Open a Document read-only, adding a :class:`ReadOnlyNucleicAcidPart`
+    per Part whose point arrays and strand tables are views of the
+    memory-mapped file.  Only the properties of the virtual helices are
+    decoded up front, the `Strand` and `Oligo` objects of a Part are created
+    the first time they are touched.  Parts of files written by
+    `npzencode.writeObject` without the Part objects have their points
+    computed instead.
+
+    Args:
+        filename (str): full path file name
+        document (Document): optional, the Document to decode into.
+            default creates a new Document
+        emit_signals (bool): optional, default False
+
+    Returns:
+        Document:
+    """
+    if document is None:
+        from cadnano.document import Document
+        document = Document()
+    from cadnano.part.readonlypart import ReadOnlyNucleicAcidPart
+    obj, arrays = mapObject(filename)
+    names = set(arrays.keys())
+    for part_meta in obj['parts']:
+        part = ReadOnlyNucleicAcidPart(document=document)
+        document._addPart(part, use_undostack=False)
+        part.setActive(True)
+        _loadVirtualHelices(part, part_meta, arrays, names)
+        if emit_signals:
+            part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
+        sequence_loader = None
+        if SEQUENCES_KEY in part_meta:
+            descriptor = part_meta[SEQUENCES_KEY]
+            sequence_loader = partial(_decodeTable, descriptor, arrays, names)
+        part.setStrandLoader(partial(_decodePartStrands, part_meta, arrays, names),
+                             sequence_loader)
+        vh_order = part_meta['virtual_helix_order']
+        if vh_order:
+            part.setImportedVHelixOrder(vh_order)
+    v3decode.decodeModifications(document, obj['modifications'])
+    return document
+# end def
+
+def mapObject(filename):
+    """Memory-map the packed arrays of a file in the binary columnar format.
+    The arrays are read-only views of the file so only the pages that are
+    accessed are read
+
+    Args:
+        filename (str): full path file name
+
+    Returns:
+        tuple: the JSON metadata :obj:`dict` with layout descriptors in place
+        of the tables and the :obj:`dict` of :obj:`ndarray` keyed by array
+        name
+    """
+    with np.load(filename) as npz_file:
+        obj = json.loads(npz_file[META_KEY].tobytes().decode('utf-8'))
+    data = _mapMember(filename, DATA_KEY + '.npy')
+    if data is None:
+        # compressed archives can not be mapped
+        with np.load(filename) as npz_file:
+            data = npz_file[DATA_KEY]
+    return obj, unpackArrays(obj.pop(ARRAYS_KEY), data)
+# end def
+
+def _mapMember(filename, member):
+    """Memory-map a 1D array stored uncompressed in a zip archive
+
+    Args:
+        filename (str): full path file name
+        member (str): name of the `.npy` file in the archive
+
+    Returns:
+        ndarray: read-only :obj:`numpy.memmap` or None if the member is
+        compressed
+    """
+    with zipfile.ZipFile(filename) as zip_file:
+        info = zip_file.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with io.open(filename, 'rb') as fd:
+        # the local header may have different extra fields than the
+        # central directory
+        fd.seek(info.header_offset)
+        header = fd.read(ZIP_HEADER_SIZE)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        fd.seek(info.header_offset + ZIP_HEADER_SIZE + name_length + extra_length)
+        version = npformat.read_magic(fd)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npformat.read_array_header_1_0(fd)
+        else:
+            shape, fortran_order, dtype = npformat.read_array_header_2_0(fd)
+        offset = fd.tell()
+    if len(shape) != 1 or shape[0] == 0:
+        return None
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+# end def
+
+def _loadVirtualHelices(part, part_meta, arrays, names):
+    """Set up the virtual helices of a :class:`ReadOnlyNucleicAcidPart`.
+    Saved points are used with the saved properties as is, otherwise the
+    points are computed the way `v3decode.decodePart` creates them
+
+    Args:
+        part (ReadOnlyNucleicAcidPart):
+        part_meta (dict): Part dictionary from the JSON metadata
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+    """
+    part_dict = decodePart(dict(part_meta), arrays, names,
+                           keys=('vh_list', 'virtual_helices', 'origins'))
+    vh_props = part_dict['virtual_helices']
+    origins = part_dict['origins']
+    keys = list(vh_props.keys())
+    points = None
+    if POINTS_KEY in part_meta:
+        name = part_meta[POINTS_KEY]['name']
+        points = [arrays['%s/%s' % (name, array_name)] for array_name in POINT_ARRAY_NAMES]
+    id_nums = []
+    lengths = []
+    vh_origins = []
+    for id_num, size in part_dict['vh_list']:
+        if points is None:
+            vh_props['eulerZ'][id_num] = 0.5*(360./10.5)
+        id_nums.append(id_num)
+        lengths.append(size)
+        vh_origins.append(tuple(origins[id_num][:2]) + (vh_props['z'][id_num],))
+    columns = [[vh_props[key][id_num] for id_num in id_nums] for key in keys]
+    part.loadVirtualHelices(id_nums, vh_origins, lengths, keys, columns, points=points)
+# end def
+
+def _decodePartStrands(part_meta, arrays, names, part):
+    """Create the strands of a :class:`ReadOnlyNucleicAcidPart` from the
+    strand tables
+
+    Args:
+        part_meta (dict): Part dictionary from the JSON metadata
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+        part (ReadOnlyNucleicAcidPart):
+    """
+    _importPartStrands(part, part_meta, arrays, names)
+# end def
+
+def _decodeTable(descriptor, arrays, names):
+    """Read a dictionary of columns stored by `npzencode._encodeColumnList`
+
+    Args:
+        descriptor (dict): layout descriptor of the table
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+
+    Returns:
+        dict: of :obj:`list` keyed by column name
+    """
+    return dict(zip(descriptor['keys'], _decodeColumnList(descriptor, arrays, names)))
+# end def
+
+def readObject(filename):
+    """Read the v3 document dictionary of a file in the binary columnar
+    format
+
+    Args:
+        filename (str): full path file name
+
+    Returns:
+        dict: the v3 document dictionary
+    """
+    with np.load(filename) as arrays:
+        return decodeObject(arrays)
+# end def
+
+def decodeObject(arrays):
+    """Rebuild the v3 document dictionary from its typed arrays.  Inverse of
+    `npzencode.encodeObject`
+
+    Args:
+        arrays (object): mapping of the `META_KEY` and `DATA_KEY` arrays
+            such as an open :class:`numpy.lib.npyio.NpzFile`
+
+    Returns:
+        dict: the v3 document dictionary
+    """
+    obj = json.loads(arrays[META_KEY].tobytes().decode('utf-8'))
+    columns = unpackArrays(obj.pop(ARRAYS_KEY), arrays[DATA_KEY])
+    names = set(columns.keys())
+    for part_dict in obj['parts']:
+        # drop the arrays only read by `openFile`
+        part_dict.pop(POINTS_KEY, None)
+        part_dict.pop(SEQUENCES_KEY, None)
+    obj['parts'] = [decodePart(part_dict, columns, names) for part_dict in obj['parts']]
+    return obj
+# end def
+
+def unpackArrays(index, data):
+    """Get views of the arrays packed by `npzencode._packArrays`
+
+    Args:
+        index (dict): of [dtype str, shape, offset] keyed by array name
+        data (ndarray): uint8 packed arrays
+
+    Returns:
+        dict: of :obj:`ndarray` keyed by array name
+    """
+    columns = {}
+    for name, (dtype_str, shape, offset) in index.items():
+        dtype = np.dtype(dtype_str)
+        count = int(np.prod(shape)) if shape else 1
+        end = offset + count*dtype.itemsize
+        columns[name] = data[offset:end].view(dtype).reshape(shape)
+    return columns
+# end def
+
+def decodePart(part_dict, arrays, names, keys=None):
+    """Replace the layout descriptors of a Part dictionary with the tables
+    they describe
+
+    Args:
+        part_dict (dict): Part dictionary from the JSON metadata
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+        keys (tuple): optional, of :obj:`str` keys of the tables to decode.
+            default decodes every table
+
+    Returns:
+        dict: deserialized dictionary describing the Part
+    """
+    for key, value in part_dict.items():
+        if not isinstance(value, dict) or LAYOUT_KEY not in value:
+            continue
+        if keys is not None and key not in keys:
+            continue
+        layout = value[LAYOUT_KEY]
+        if layout == 'strands':
+            part_dict[key] = _decodeStrands(value['name'], arrays, names)
+            continue
+        columns = _decodeColumnList(value, arrays, names)
+        if layout == 'columns':
+            part_dict[key] = dict(zip(value['keys'], columns))
+        elif layout == 'rows':
+            part_dict[key] = list(map(list, zip(*columns))) if columns else \
+                             [[] for i in range(value['length'])]
+        elif layout == 'records':
+            record_keys = value['keys']
+            part_dict[key] = [dict(zip(record_keys, row)) for row in zip(*columns)] if columns else \
+                             [{} for i in range(value['length'])]
+        else:
+            raise IOError("Unknown layout %s of %s" % (layout, key))
+    return part_dict
+# end def
+
+def _decodeColumn(name, kind, arrays, names, typed=False):
+    """Read a column stored by `npzencode._encodeColumn`
+
+    Args:
+        name (str): name of the array
+        kind (str): 'bool', 'int', 'float', 'str' or 'category'
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+        typed (bool): optional, return a 'bool', 'int' or 'float' column as
+            the stored array. default False
+
+    Returns:
+        list: the values of the column, or the :obj:`ndarray` if `typed`
+    """
+    if kind not in ('str', 'category'):
+        return arrays[name] if typed else arrays[name].tolist()
+    text = arrays[name + '.blob'].tobytes().decode('utf-8')
+    offsets = arrays[name + '.offsets'].tolist()
+    values = [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+    if name + '.none' in names:
+        for i in np.flatnonzero(arrays[name + '.none']).tolist():
+            values[i] = None
+    if kind == 'category':
+        palette = np.empty(len(values), dtype=object)
+        palette[:] = values
+        return palette[arrays[name + '.codes']].tolist()
+    return values
+# end def
+
+def _decodeColumnList(descriptor, arrays, names, typed=False):
+    """Read the columns of a table stored by `npzencode._encodeColumnList`
+
+    Args:
+        descriptor (dict): layout descriptor of the table
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+        typed (bool): optional, see `_decodeColumn`. default False
+
+    Returns:
+        list: of :obj:`list` of values per column
+    """
+    name = descriptor['name']
+    json_columns = descriptor['json']
+    columns = []
+    for key, kind in zip(descriptor['keys'], descriptor['kinds']):
+        if kind == 'json':
+            columns.append(json_columns[key])
+        else:
+            columns.append(_decodeColumn('%s/%s' % (name, key), kind, arrays, names, typed))
+    return columns
+# end def
+
+def _decodeStrands(name, arrays, names):
+    """Read the strands of a Part stored by `npzencode._encodeStrands`
+
+    Args:
+        name (str): prefix of the names of the arrays
+        arrays (object): mapping of :obj:`ndarray` keyed by array name
+        names (set): of :obj:`str` names of the arrays
+
+    Returns:
+        dict: of form::
+
+            {'indices': [None or [fwd_idxs, rev_idxs], ...],
+            'properties': [None or [fwd_colors, rev_colors], ...]}
+    """
+    counts = arrays[name + '/counts'].tolist()
+    idxs = arrays[name + '/idxs'].tolist()
+    colors = _strandColors(name, arrays, names)
+    indices = []
+    properties = []
+    i = 0
+    for num_fwd, num_rev in counts:
+        if num_fwd == -1:
+            indices.append(None)
+            properties.append(None)
+            continue
+        j = i + num_fwd
+        k = j + num_rev
+        indices.append([idxs[i:j], idxs[j:k]])
+        properties.append([colors[i:j], colors[j:k]])
+        i = k
+    return {'indices': indices, 'properties': properties}
+# end def
@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""Binary columnar counterpart of the v3 JSON format.
+
+A v3 document dictionary is split into typed arrays saved in an uncompressed
+numpy `.npz` archive.  The large tables of each Part (the virtual helix
+properties, origins, strand indices and colors, insertions, crossovers and
+oligos with their sequences) are stored one column per array and everything
+else is kept as JSON text in the `META_KEY` array, with a layout descriptor in
+place of each table.  The columns are packed into the single `DATA_KEY` array
+at the offsets listed under `ARRAYS_KEY` in the JSON text, since reading one
+zip member per column costs more than decoding the column.
+`npzdecode.decodeObject` inverts `encodeObject` exactly so files convert to
+and from v3 JSON losslessly.
+
+Files saved from a Document also hold the per base point arrays and the
+sequence export table of each Part, which are not part of the v3 dictionary
+and are only read by `npzdecode.openFile` to memory-map a design read-only.
+"""
+import io
+import json
+from operator import itemgetter
+
+import numpy as np
+
+import cadnano.fileio.v3encode as v3encode
+import cadnano.fileio.nnoencode as nnoencode
+
+NPZ_EXTENSION = '.npz'
+META_KEY = 'document'
+DATA_KEY = 'data'
+ARRAYS_KEY = '$arrays'
+LAYOUT_KEY = '$layout'
+ALIGNMENT = 8
+POINTS_KEY = '$points'
+SEQUENCES_KEY = '$sequences'
+POINT_ARRAY_NAMES = ('axis_pts', 'fwd_pts', 'rev_pts', 'id_nums', 'indices')
+
+# Part keys stored as tables, by layout
+ROW_KEYS = ('origins', 'vh_list', 'insertions', 'xovers')
+RECORD_KEYS = ('oligos',)
+COLUMN_KEYS = ('virtual_helices',)
+STRAND_KEYS = ('strands',)
+
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+NONE_TYPE = type(None)
+
+def encodeToFile(filename, document):
+    """Save a Document in the binary columnar format
+
+    Args:
+        filename (str): full path file name
+        document (Document):
+    """
+    writeObject(filename, v3encode.encodeDocument(document),
+                parts=list(document.getParts()))
+# end def
+
+def writeObject(filename, obj, parts=None):
+    """Save a v3 document dictionary in the binary columnar format
+
+    Args:
+        filename (str): full path file name
+        obj (dict): v3 document dictionary
+        parts (list): optional, see `encodeObject`
+    """
+    with io.open(filename, 'wb') as fd:
+        np.savez(fd, **encodeObject(obj, parts=parts))
+# end def
+
+def encodeObject(obj, parts=None):
+    """Split a v3 document dictionary into typed arrays
+
+    Args:
+        obj (dict): as returned by `v3encode.encodeDocument` or read from a
+            v3 JSON file
+        parts (list): optional, the :obj:`NucleicAcidPart` encoded in each
+            Part dictionary of `obj` to also store their point arrays and
+            sequence export table
+
+    Returns:
+        dict: of form::
+
+            {META_KEY: ndarray, DATA_KEY: ndarray}
+
+        the uint8 encoded JSON metadata and the packed columns
+    """
+    arrays = {}
+    meta = dict(obj)
+    meta['parts'] = [encodePart(part_dict, 'part%d/' % i, arrays)
+                     for i, part_dict in enumerate(obj['parts'])]
+    for i, part in enumerate(parts or ()):
+        encodePartArrays(part, meta['parts'][i], 'part%d/' % i, arrays)
+    meta[ARRAYS_KEY], data = _packArrays(arrays)
+    meta_json = json.dumps(meta, separators=(',', ':'), cls=nnoencode.EncoderforPandas)
+    return {META_KEY: np.frombuffer(meta_json.encode('utf-8'), dtype=np.uint8),
+            DATA_KEY: data}
+# end def
+
+def _packArrays(arrays):
+    """Concatenate arrays into one byte array with each array aligned to
+    `ALIGNMENT` bytes
+
+    Args:
+        arrays (dict): of :obj:`ndarray` keyed by array name
+
+    Returns:
+        tuple: index :obj:`dict` of [dtype str, shape, offset] keyed by array
+        name and the uint8 :obj:`ndarray` of the packed arrays
+    """
+    index = {}
+    chunks = []
+    offset = 0
+    for name, array in arrays.items():
+        pad = -offset % ALIGNMENT
+        if pad:
+            chunks.append(bytes(pad))
+            offset += pad
+        array = np.ascontiguousarray(array)
+        index[name] = [array.dtype.str, list(array.shape), offset]
+        chunks.append(array.tobytes())
+        offset += array.nbytes
+    return index, np.frombuffer(b''.join(chunks), dtype=np.uint8)
+# end def
+
+def encodePart(part_dict, prefix, arrays):
+    """Move the tables of a v3 Part dictionary into typed arrays
+
+    Args:
+        part_dict (dict): deserialized dictionary describing the Part
+        prefix (str): prefix of the names of the arrays of the Part
+        arrays (dict): the arrays to add to
+
+    Returns:
+        dict: the Part dictionary with a layout descriptor in place of each
+        table
+    """
+    meta = {}
+    for key, value in part_dict.items():
+        name = prefix + key
+        if key in ROW_KEYS:
+            meta[key] = _encodeRows(name, value, arrays)
+        elif key in RECORD_KEYS:
+            meta[key] = _encodeRecords(name, value, arrays)
+        elif key in COLUMN_KEYS:
+            meta[key] = _encodeColumns(name, value, arrays)
+        elif key in STRAND_KEYS:
+            meta[key] = _encodeStrands(name, value, arrays)
+        else:
+            meta[key] = value
+    return meta
+# end def
+
+def encodePartArrays(part, part_meta, prefix, arrays):
+    """Store the point arrays of a Part, with the points of each virtual
+    helix contiguous in the order of the `vh_list` of the Part, and the
+    columns of `NucleicAcidPart.getSequenceTable` unless the Part has loop
+    oligos which can not be exported
+
+    Args:
+        part (NucleicAcidPart):
+        part_meta (dict): the Part dictionary returned by `encodePart`
+        prefix (str): prefix of the names of the arrays of the Part
+        arrays (dict): the arrays to add to
+    """
+    id_nums = []
+    offsets = []
+    sizes = []
+    for id_num in range(part.getIdNumMax() + 1):
+        offset_and_size = part.getOffsetAndSize(id_num)
+        if offset_and_size is not None:
+            id_nums.append(id_num)
+            offsets.append(offset_and_size[0])
+            sizes.append(offset_and_size[1])
+    sizes = np.asarray(sizes, dtype=int)
+    starts = np.cumsum(sizes) - sizes
+    point_idxs = np.repeat(np.asarray(offsets, dtype=int) - starts, sizes) + \
+        np.arange(int(sizes.sum()))
+    name = prefix + POINTS_KEY
+    for array_name in POINT_ARRAY_NAMES:
+        arrays['%s/%s' % (name, array_name)] = getattr(part, array_name)[point_idxs]
+    part_meta[POINTS_KEY] = {'name': name}
+
+    if not part.getLoopOligos():
+        table = part.getSequenceTable()
+        keys = list(table.keys())
+        part_meta[SEQUENCES_KEY] = _encodeColumnList(prefix + SEQUENCES_KEY, keys,
+                                                     [table[key] for key in keys], arrays)
+# end def
+
+def _intArray(values):
+    """Get `values` as an array of the smallest signed integer type that
+    holds them
+
+    Args:
+        values (object): :obj:`list` or :obj:`ndarray` of :obj:`int`
+
+    Returns:
+        ndarray:
+    """
+    array = np.asarray(values, dtype=np.int64)
+    if array.size == 0:
+        return array.astype(np.int8)
+    low, high = array.min(), array.max()
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+# end def
+
+def _columnKind(values):
+    """Get the kind of typed array a column of values can be stored as
+    exactly
+
+    Args:
+        values (list): of JSON serializable values
+
+    Returns:
+        str: 'bool', 'int', 'float', 'str' or None if the values can not be
+        stored as a typed array
+    """
+    if len(values) == 0:
+        return None
+    types = set(map(type, values))
+    if types <= {bool, np.bool_}:
+        return 'bool'
+    if all(issubclass(t, (int, np.integer)) and t is not bool for t in types):
+        return 'int'
+    if all(issubclass(t, (float, np.floating)) for t in types):
+        return 'float'
+    if types <= {str, type(None)}:
+        return 'str'
+    return None
+# end def
+
+def _encodeColumn(name, values, arrays):
+    """Store a column of values as a typed array.  Strings are stored as one
+    utf-8 blob with the offsets of each string and a mask of None values
+
+    Args:
+        name (str): name of the array
+        values (list): of JSON serializable values
+        arrays (dict): the arrays to add to
+
+    Returns:
+        str: the kind of the column, see `_columnKind`, or 'category'.  None
+        if the column was not stored
+    """
+    kind = _columnKind(values)
+    if kind == 'bool':
+        arrays[name] = np.asarray(values, dtype=bool)
+    elif kind == 'int':
+        try:
+            arrays[name] = _intArray(values)
+        except OverflowError:
+            return None
+    elif kind == 'float':
+        arrays[name] = np.asarray(values, dtype=float)
+    elif kind == 'str':
+        index, palette, codes = {}, [], []
+        for value in values:
+            if value not in index:
+                index[value] = len(palette)
+                palette.append(value)
+            codes.append(index[value])
+        if 2*len(palette) <= len(values):
+            # store repeated strings such as colors once
+            kind = 'category'
+            arrays[name + '.codes'] = _intArray(codes)
+            values = palette
+        is_none = np.fromiter(map(NONE_TYPE.__instancecheck__, values), dtype=bool,
+                              count=len(values))
+        strings = ['' if value is None else value for value in values]
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        np.cumsum(list(map(len, strings)), out=offsets[1:])
+        arrays[name + '.blob'] = np.frombuffer(''.join(strings).encode('utf-8'),
+                                               dtype=np.uint8)
+        arrays[name + '.offsets'] = _intArray(offsets)
+        if is_none.any():
+            arrays[name + '.none'] = is_none
+    return kind
+# end def
+
+def _encodeColumnList(name, keys, columns, arrays):
+    """Store columns as typed arrays falling back to JSON for columns that
+    can not be stored exactly
+
+    Args:
+        name (str): prefix of the names of the arrays
+        keys (list): of :obj:`str` column names
+        columns (list): of :obj:`list` of values in the order of `keys`
+        arrays (dict): the arrays to add to
+
+    Returns:
+        dict: the layout descriptor without the layout type
+    """
+    kinds = []
+    json_columns = {}
+    for key, values in zip(keys, columns):
+        kind = _encodeColumn('%s/%s' % (name, key), values, arrays)
+        if kind is None:
+            json_columns[key] = values
+            kind = 'json'
+        kinds.append(kind)
+    return {'name': name, 'keys': keys, 'kinds': kinds, 'json': json_columns}
+# end def
+
+def _encodeRows(name, rows, arrays):
+    """Store a table of equal length rows such as the crossovers of a Part
+    one array per column
+
+    Args:
+        name (str): prefix of the names of the arrays
+        rows (object): :obj:`list` of :obj:`list` or 2D :obj:`ndarray`
+        arrays (dict): the arrays to add to
+
+    Returns:
+        object: the layout descriptor or `rows` if they are not a table
+    """
+    if isinstance(rows, np.ndarray):
+        rows = rows.tolist()
+    if (len(rows) == 0 or
+            not set(map(type, rows)) <= {list, tuple} or
+            len(set(map(len, rows))) != 1):
+        return rows
+    keys = [str(i) for i in range(len(rows[0]))]
+    descriptor = _encodeColumnList(name, keys, [list(c) for c in zip(*rows)], arrays)
+    descriptor[LAYOUT_KEY] = 'rows'
+    descriptor['length'] = len(rows)
+    return descriptor
+# end def
+
+def _encodeRecords(name, records, arrays):
+    """Store a list of dictionaries with the same keys such as the oligos
+    of a Part one array per key
+
+    Args:
+        name (str): prefix of the names of the arrays
+        records (list): of :obj:`dict`
+        arrays (dict): the arrays to add to
+
+    Returns:
+        object: the layout descriptor or `records` if they are not a table
+    """
+    if len(records) == 0 or not all(isinstance(r, dict) for r in records):
+        return records
+    keys = list(records[0].keys())
+    if any(list(record) != keys for record in records):
+        return records
+    columns = [list(map(itemgetter(key), records)) for key in keys]
+    descriptor = _encodeColumnList(name, keys, columns, arrays)
+    descriptor[LAYOUT_KEY] = 'records'
+    descriptor['length'] = len(records)
+    return descriptor
+# end def
+
+def _encodeColumns(name, columns, arrays):
+    """Store a dictionary of equal length columns such as the virtual helix
+    properties of a Part one array per key
+
+    Args:
+        name (str): prefix of the names of the arrays
+        columns (dict): of :obj:`list` keyed by column name
+        arrays (dict): the arrays to add to
+
+    Returns:
+        object: the layout descriptor or `columns` if they are not a table
+    """
+    if (not isinstance(columns, dict) or
+            len(set(len(values) for values in columns.values())) > 1):
+        return columns
+    keys = list(columns.keys())
+    descriptor = _encodeColumnList(name, keys, [list(columns[key]) for key in keys], arrays)
+    descriptor[LAYOUT_KEY] = 'columns'
+    return descriptor
+# end def
+
+def _encodeStrands(name, strands, arrays):
+    """Store the strands of a Part as a table of strand indices and colors
+    with the number of forward and reverse strands of each virtual helix
+
+    Args:
+        name (str): prefix of the names of the arrays
+        strands (dict): of form::
+
+            {'indices': [None or (fwd_idxs, rev_idxs), ...],
+            'properties': [None or (fwd_colors, rev_colors), ...]}
+
+        arrays (dict): the arrays to add to
+
+    Returns:
+        object: the layout descriptor or `strands` if not of this form
+    """
+    try:
+        indices = strands['indices']
+        properties = strands['properties']
+        if set(strands.keys()) != {'indices', 'properties'}:
+            return strands
+        counts = []
+        idxs = []
+        colors = []
+        for idx_set, color_set in zip(indices, properties):
+            if idx_set is None:
+                if color_set is not None:
+                    return strands
+                counts.append((-1, -1))
+                continue
+            fwd_idxs, rev_idxs = idx_set
+            fwd_colors, rev_colors = color_set
+            if len(fwd_idxs) != len(fwd_colors) or len(rev_idxs) != len(rev_colors):
+                return strands
+            counts.append((len(fwd_idxs), len(rev_idxs)))
+            idxs += fwd_idxs
+            idxs += rev_idxs
+            colors += fwd_colors
+            colors += rev_colors
+        if len(indices) != len(properties):
+            return strands
+        strand_arrays = {name + '/counts': _intArray(counts).reshape(-1, 2),
+                         name + '/idxs': _intArray(idxs).reshape(-1, 2)}
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return strands
+    if colors and _encodeColumn(name + '/colors', colors, strand_arrays) not in ('str', 'category'):
+        return strands
+    arrays.update(strand_arrays)
+    return {LAYOUT_KEY: 'strands', 'name': name}
+# end def
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Streaming export of the oligo sequences of a Part.
+
+Rows come from `NucleicAcidPart.iterSequenceRows` and are written to a file
+object one at a time as the oligos are visited, so the export holds a single
+row in memory unless it is sorted.  The formats are:
+
+- ``csv`` and ``tsv``: the `SEQUENCE_EXPORT_KEYS` columns, comma or tab
+  separated with a header line
+- ``plate96`` and ``plate384``: CSV plate maps for ordering, one row per
+  well filled across rows (A1, A2, ... A12, B1, ...) with further plates
+  started when one is full
+"""
+import csv
+from string import ascii_uppercase
+
+SEQUENCE_EXPORT_KEYS = ['Start', 'End', 'Color', 'Mod5',
+                        'Sequence', 'Mod3', 'AbstractSequence']
+"""list: columns of a sequence export row"""
+
+PLATE_EXPORT_KEYS = ['Plate Name', 'Well Position', 'Name', 'Sequence']
+"""list: columns of a plate map row"""
+
+PLATE_SHAPES = {'plate96': (8, 12), 'plate384': (16, 24)}
+"""dict: plate format name: (number of rows, number of columns)"""
+
+DELIMITERS = {'csv': ',', 'tsv': '\t'}
+
+EXPORT_FORMATS = tuple(DELIMITERS) + tuple(PLATE_SHAPES)
+
+START_COLUMN = SEQUENCE_EXPORT_KEYS.index('Start')
+END_COLUMN = SEQUENCE_EXPORT_KEYS.index('End')
+SEQUENCE_COLUMN = SEQUENCE_EXPORT_KEYS.index('Sequence')
+
+
+def startKey(row):
+    """Sort key of a row by the virtual helix and index of its 5' end
+
+    Args:
+        row (tuple): a row in `SEQUENCE_EXPORT_KEYS` order
+
+    Returns:
+        tuple: (:obj:`int`, :obj:`int`) of the id_num and index
+    """
+    id_num, idx = row[START_COLUMN][:-1].split('[')
+    return int(id_num), int(idx)
+# end def
+
+
+def iterWells(num_rows, num_columns):
+    """Iterate the wells of consecutive plates
+
+    Args:
+        num_rows (int): rows per plate
+        num_columns (int): columns per plate
+
+    Yields:
+        tuple: (:obj:`str`, :obj:`str`) plate name and well position
+    """
+    plate = 1
+    while True:
+        plate_name = "Plate %d" % plate
+        for row in ascii_uppercase[:num_rows]:
+            for column in range(1, num_columns + 1):
+                yield plate_name, "%s%d" % (row, column)
+        plate += 1
+# end def
+
+
+def writeSequences(f, rows, fmt='csv', sort=False, dedupe=False):
+    """Write sequence export rows to a file object
+
+    Args:
+        f (file): text file object to write to
+        rows (iterable): of rows in `SEQUENCE_EXPORT_KEYS` order
+        fmt (:obj:`str`, optional): one of `EXPORT_FORMATS`, default='csv'
+        sort (:obj:`bool`, optional): order the rows by their 5' end, which
+            holds every row in memory, default=False
+        dedupe (:obj:`bool`, optional): skip rows with a sequence already
+            written, default=False
+
+    Returns:
+        int: the number of rows written
+
+    Raises:
+        ValueError: unknown `fmt`
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("writeSequences: unknown format %r, expected one of %s" %
+                         (fmt, ', '.join(EXPORT_FORMATS)))
+    if sort:
+        rows = sorted(rows, key=startKey)
+    if dedupe:
+        rows = _dedupe(rows)
+
+    writer = csv.writer(f, delimiter=DELIMITERS.get(fmt, ','), lineterminator='\n')
+    count = 0
+    if fmt in PLATE_SHAPES:
+        writer.writerow(PLATE_EXPORT_KEYS)
+        for (plate_name, well), row in zip(iterWells(*PLATE_SHAPES[fmt]), rows):
+            writer.writerow((plate_name, well,
+                             "%s-%s" % (row[START_COLUMN], row[END_COLUMN]),
+                             row[SEQUENCE_COLUMN]))
+            count += 1
+    else:
+        writer.writerow(SEQUENCE_EXPORT_KEYS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+# end def
+
+
+def _dedupe(rows):
+    seen = set()
+    for row in rows:
+        sequence = row[SEQUENCE_COLUMN]
+        if sequence not in seen:
+            seen.add(sequence)
+            yield row
+# end def
@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
-from collections import defaultdict
 from cadnano.cnenum import StrandType, LatticeType
-from cadnano.part.refresholigoscmd import RefreshOligosCommand
 
 from cadnano import preferences as prefs
-from cadnano import setBatch, getReopen, setReopen
+from cadnano import setReopen
 from cadnano.color import intToColorHex
 from cadnano.part.nucleicacidpart import DEFAULT_RADIUS
 
@@ -14,7 +12,100 @@ def decode(document, obj, emit_signals=False):
     """Parses a dictionary (obj) created from reading a json file and uses it
     to populate the given document with model data.
     """
-    num_bases = len(obj['vstrands'][0]['scaf'])
+    helices = [readHelix(helix) for helix in obj['vstrands']]
+    decodeHelices(document, helices,
+                  oligos=obj.get('oligos'),
+                  modifications=obj.get('modifications'),
+                  emit_signals=emit_signals)
+# end def
+
+def readHelix(helix):
+    """Reduce a deserialized helix of a legacy file to the strand segments,
+    crossovers, insertions and colors it describes, which is all
+    `decodeHelices` needs.  The per base lists of the helix can then be
+    released before the next helix is read
+
+    Args:
+        helix (dict): one item of the 'vstrands' list
+
+    Returns:
+        dict: of form::
+
+            {'num': int, 'row': int, 'col': int, 'num_bases': int,
+            'scaf_segs': [(idx_low, idx_high), ...],
+            'scaf_xo': [(idx, to_vh_num, to_idx), ...],
+            'stap_segs': ..., 'stap_xo': ...,
+            'insertions': [(idx, length), ...],
+            'stap_colors': [(idx, color_number), ...]}
+    """
+    vh_num = helix['num']
+    scaf = helix['scaf']
+    stap = helix['stap']
+    insertions = helix['loop']
+    skips = helix['skip']
+    try:
+        # validate file serialization of lists
+        assert( len(scaf) == len(stap) and
+                len(scaf) == len(insertions) and
+                len(insertions) == len(skips) )
+        scaf_segs, scaf_xo = _readSegmentsAndXovers(StrandType.SCAFFOLD, vh_num, scaf)
+        stap_segs, stap_xo = _readSegmentsAndXovers(StrandType.STAPLE, vh_num, stap)
+    except AssertionError:
+        print("Unrecognized file format.")
+        raise
+    return {'num': vh_num,
+            'row': helix['row'],
+            'col': helix['col'],
+            'num_bases': len(scaf),
+            'scaf_segs': scaf_segs,
+            'scaf_xo': scaf_xo,
+            'stap_segs': stap_segs,
+            'stap_xo': stap_xo,
+            'insertions': [(base_idx, insertion + skip) for base_idx, (insertion, skip)
+                           in enumerate(zip(insertions, skips)) if insertion + skip != 0],
+            'stap_colors': helix['stap_colors']}
+# end def
+
+def _readSegmentsAndXovers(strand_type, vh_num, base_list):
+    """Find the strand segments and 3' crossovers of one strand of a helix
+
+    Args:
+        strand_type (StrandType): SCAFFOLD or STAPLE
+        vh_num (int): virtual helix number
+        base_list (list): of [five_vh, five_idx, three_vh, three_idx] per base
+
+    Returns:
+        tuple: list of (idx_low, idx_high) segments, list of
+        (idx, three_vh, three_idx) crossovers
+    """
+    seg = []
+    xo = []
+    for i, (five_vh, five_idx, three_vh, three_idx) in enumerate(base_list):
+        if five_vh == -1 and three_vh == -1:
+            continue  # null base
+        if isSegmentStartOrEnd(strand_type, vh_num, i, five_vh,\
+                               five_idx, three_vh, three_idx):
+            seg.append(i)
+        if five_vh != vh_num and three_vh != vh_num:  # special case
+            seg.append(i)  # end segment on a double crossover
+        if is3primeXover(strand_type, vh_num, i, three_vh, three_idx):
+            xo.append((i, three_vh, three_idx))
+    assert (len(seg) % 2 == 0)
+    return [(seg[i], seg[i + 1]) for i in range(0, len(seg), 2)], xo
+# end def
+
+def decodeHelices(document, helices, oligos=None, modifications=None,
+                  emit_signals=False):
+    """Populate the given document with the helices of a legacy file
+
+    Args:
+        document (Document):
+        helices (list): of :obj:`dict` returned by `readHelix` in file order
+        oligos (list): optional, the 'oligos' item of the file
+        modifications (dict): optional, the 'modifications' item of the file
+        emit_signals (bool): optional, default False
+    """
+    num_bases = helices[0]['num_bases']
     if num_bases % 32 == 0:
         lattice_type = LatticeType.SQUARE
     elif num_bases % 21 == 0:
@@ -25,7 +116,7 @@ def decode(document, obj, emit_signals=False):
     part = None
     # DETERMINE MAX ROW,COL
     max_row_json = max_col_json = 0
-    for helix in obj['vstrands']:
+    for helix in helices:
         max_row_json = max(max_row_json, int(helix['row'])+1)
         max_col_json = max(max_col_json, int(helix['col'])+1)
 
@@ -40,7 +131,6 @@ def decode(document, obj, emit_signals=False):
         raise TypeError("Lattice type not recognized")
     part = document.createNucleicAcidPart(use_undostack=False)
     part.setActive(True)
-    setBatch(True)
     delta = num_bases - 42
     # POPULATE VIRTUAL HELICES
     ordered_id_list = []
@@ -49,7 +139,7 @@ def decode(document, obj, emit_signals=False):
     min_col, max_col = 10000, -10000
 
     # find row, column limits
-    for helix in obj['vstrands']:
+    for helix in helices:
         row = helix['row']
         if row < min_row:
             min_row = row
@@ -74,11 +164,10 @@ def decode(document, obj, emit_signals=False):
     # print("\trows(%d, %d): avg: %d" % (min_row, max_row, delta_row))
     # print("\tcolumns(%d, %d): avg: %d" % (min_col, max_col, delta_column))
 
-    for helix in obj['vstrands']:
+    for helix in helices:
         vh_num = helix['num']
         row = helix['row']
         col = helix['col']
-        scaf= helix['scaf']
         # align row and columns to the center 0, 0
         coord = (row -  delta_row, col - delta_column)
         vh_num_to_coord[vh_num] = coord
@@ -87,150 +176,48 @@ def decode(document, obj, emit_signals=False):
 
     # make sure we retain the original order
     radius = DEFAULT_RADIUS
-    for vh_num in sorted(vh_num_to_coord.keys()):
-        row, col = vh_num_to_coord[vh_num]
-        x, y = doLattice(radius, row, col)
-        # print("%d:" % vh_num, x, y)
-        part.createVirtualHelix(x, y, 0., num_bases,
-                                id_num=vh_num, use_undostack=False)
-    # zoom to fit
-    if emit_signals:
-        part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
-    if not getReopen():
-        setBatch(False)
+    vh_nums = sorted(vh_num_to_coord.keys())
+    vh_origins = [doLattice(radius, *vh_num_to_coord[vh_num]) for vh_num in vh_nums]
+    with document.batchUpdates():
+        part.createVirtualHelices(vh_origins, [0.]*len(vh_nums), [num_bases]*len(vh_nums),
+                                  id_nums=vh_nums, use_undostack=False)
+        # zoom to fit
+        if emit_signals:
+            part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
     part.setImportedVHelixOrder(ordered_id_list)
     setReopen(False)
-    setBatch(False)
-
-    # INSTALL STRANDS AND COLLECT XOVER LOCATIONS
-    scaf_seg = defaultdict(list)
-    scaf_xo = defaultdict(list)
-    stap_seg = defaultdict(list)
-    stap_xo = defaultdict(list)
-    try:
-        for helix in obj['vstrands']:
-            vh_num = helix['num']
-            row, col = vh_num_to_coord[vh_num]
-            scaf = helix['scaf']
-            stap = helix['stap']
-            insertions = helix['loop']
-            skips = helix['skip']
-
-            if isEven(row, col):
-                scaf_strand_set, stap_strand_set = part.getStrandSets(vh_num)
-            else:
-                stap_strand_set, scaf_strand_set = part.getStrandSets(vh_num)
-
-            # validate file serialization of lists
-            assert( len(scaf) == len(stap) and
-                    len(scaf) == len(insertions) and
-                    len(insertions) == len(skips) )
-
-            # read scaffold segments and xovers
-            for i in range(len(scaf)):
-                five_vh, five_idx, three_vh, three_idx = scaf[i]
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.SCAFFOLD, vh_num, i, five_vh,\
-                                       five_idx, three_vh, three_idx):
-                    scaf_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    scaf_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.SCAFFOLD, vh_num, i, three_vh, three_idx):
-                    scaf_xo[vh_num].append((i, three_vh, three_idx))
-            assert (len(scaf_seg[vh_num]) % 2 == 0)
-
-            # install scaffold segments
-            for i in range(0, len(scaf_seg[vh_num]), 2):
-                low_idx = scaf_seg[vh_num][i]
-                high_idx = scaf_seg[vh_num][i + 1]
-                scaf_strand_set.createStrand(low_idx, high_idx, use_undostack=False)
-
-            # read staple segments and xovers
-            for i in range(len(stap)):
-                five_vh, five_idx, three_vh, three_idx = stap[i]
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.STAPLE, vh_num, i, five_vh,\
-                                       five_idx, three_vh, three_idx):
-                    stap_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    stap_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.STAPLE, vh_num, i, three_vh, three_idx):
-                    stap_xo[vh_num].append((i, three_vh, three_idx))
-            assert (len(stap_seg[vh_num]) % 2 == 0)
 
-            # install staple segments
-            for i in range(0, len(stap_seg[vh_num]), 2):
-                low_idx = stap_seg[vh_num][i]
-                high_idx = stap_seg[vh_num][i + 1]
-                stap_strand_set.createStrand(low_idx, high_idx, use_undostack=False)
-            part.refreshSegments(vh_num)
-        # end for
-    except AssertionError:
-        print("Unrecognized file format.")
-        raise
-
-    # INSTALL XOVERS
-    for helix in obj['vstrands']:
+    # COLLECT STRANDS AND XOVERS
+    strand_dict = {}
+    xovers = []
+    for helix in helices:
         vh_num = helix['num']
-        row, col = vh_num_to_coord[vh_num]
+        scaf_is_fwd = isEven(*vh_num_to_coord[vh_num])
+        strand_dict[(vh_num, scaf_is_fwd)] = [(low_idx, high_idx, None)
+                                              for low_idx, high_idx in helix['scaf_segs']]
+        strand_dict[(vh_num, not scaf_is_fwd)] = [(low_idx, high_idx, None)
+                                                  for low_idx, high_idx in helix['stap_segs']]
 
-        if isEven(row, col):
-            scaf_strand_set, stap_strand_set = part.getStrandSets(vh_num)
-        else:
-            stap_strand_set, scaf_strand_set = part.getStrandSets(vh_num)
-
-        # install scaffold xovers
-        for (idx5p, to_vh_num, idx3p) in scaf_xo[vh_num]:
+        # scaffold xovers
+        for (idx5p, to_vh_num, idx3p) in helix['scaf_xo']:
             # idx3p is 3' end of strand5p, idx5p is 5' end of strand3p
-            try:
-                strand5p = scaf_strand_set.getStrand(idx5p)
-            except:
-                print(vh_num, idx5p)
-                print(scaf_strand_set.strand_heap)
-                print(stap_strand_set.strand_heap)
-                raise
-            coord = vh_num_to_coord[to_vh_num]
-            if isEven(*coord):
-                to_scaf_strand_set, to_stap_strand_set = part.getStrandSets(to_vh_num)
-            else:
-                to_stap_strand_set, to_scaf_strand_set = part.getStrandSets(to_vh_num)
-            strand3p = to_scaf_strand_set.getStrand(idx3p)
-            part.createXover(   strand5p, idx5p,
-                                strand3p, idx3p,
-                                allow_reordering=True,
-                                update_oligo=False,
-                                use_undostack=False)
+            to_scaf_is_fwd = isEven(*vh_num_to_coord[to_vh_num])
+            xovers.append((vh_num, scaf_is_fwd, idx5p, to_vh_num, to_scaf_is_fwd, idx3p))
 
-        # install staple xovers
-        for (idx5p, to_vh_num, idx3p) in stap_xo[vh_num]:
+        # staple xovers
+        for (idx5p, to_vh_num, idx3p) in helix['stap_xo']:
             # idx3p is 3' end of strand5p, idx5p is 5' end of strand3p
-            strand5p = stap_strand_set.getStrand(idx5p)
-            coord = vh_num_to_coord[to_vh_num]
-            if isEven(*coord):
-                to_scaf_strand_set, to_stap_strand_set = part.getStrandSets(to_vh_num)
-            else:
-                to_stap_strand_set, to_scaf_strand_set = part.getStrandSets(to_vh_num)
-            strand3p = to_stap_strand_set.getStrand(idx3p)
-            part.createXover(   strand5p, idx5p,
-                                strand3p, idx3p,
-                                allow_reordering=True,
-                                update_oligo=False,
-                                use_undostack=False)
+            to_scaf_is_fwd = isEven(*vh_num_to_coord[to_vh_num])
+            xovers.append((vh_num, not scaf_is_fwd, idx5p, to_vh_num, not to_scaf_is_fwd, idx3p))
 
-    # need to heal all oligo connections into a continuous
-    # oligo for the next steps
-    RefreshOligosCommand(part).redo()
+    # install strands and xovers at once, healing all oligo connections into
+    # continuous oligos for the next steps
+    part.importStrands(strand_dict, xovers, allow_reordering=True, use_undostack=False)
 
     # COLORS, INSERTIONS, SKIPS
-    for helix in obj['vstrands']:
+    for helix in helices:
         vh_num = helix['num']
         row, col = vh_num_to_coord[vh_num]
-        scaf = helix['scaf']
-        stap = helix['stap']
-        insertions = helix['loop']
-        skips = helix['skip']
 
         if isEven(row, col):
             scaf_strand_set, stap_strand_set = part.getStrandSets(vh_num)
@@ -238,13 +225,11 @@ def decode(document, obj, emit_signals=False):
             stap_strand_set, scaf_strand_set = part.getStrandSets(vh_num)
 
         # install insertions and skips
-        for base_idx in range(len(stap)):
-            sum_of_insert_skip = insertions[base_idx] + skips[base_idx]
-            if sum_of_insert_skip != 0:
-                strand = scaf_strand_set.getStrand(base_idx)
-                strand.addInsertion(base_idx,
-                                    sum_of_insert_skip,
-                                    use_undostack=False)
+        for base_idx, sum_of_insert_skip in helix['insertions']:
+            strand = scaf_strand_set.getStrand(base_idx)
+            strand.addInsertion(base_idx,
+                                sum_of_insert_skip,
+                                use_undostack=False)
         # end for
         # populate colors
         for base_idx, color_number in helix['stap_colors']:
@@ -252,8 +237,8 @@ def decode(document, obj, emit_signals=False):
             strand = stap_strand_set.getStrand(base_idx)
             strand.oligo().applyColor(color, use_undostack=False)
 
-    if 'oligos' in obj:
-        for oligo in obj['oligos']:
+    if oligos is not None:
+        for oligo in oligos:
             vh_num = oligo['vh_num']
             idx = oligo['idx']
             seq = str(oligo['seq']) if oligo['seq'] is not None else ''
@@ -266,11 +251,11 @@ def decode(document, obj, emit_signals=False):
                 strand = scaf_ss.getStrand(idx)
                 # print "sequence", seq, vh, idx,  strand.oligo()._strand5p
                 strand.oligo().applySequence(seq, use_undostack=False)
-    if 'modifications' in obj:
-        for mod_id, item in obj['modifications'].items():
+    if modifications is not None:
+        for mod_id, item in modifications.items():
             if mod_id != 'int_instances' and mod_id != 'ext_instances':
                 part.createMod(item, mod_id)
-        for key, mid in obj['modifications']['ext_instances'].items():
+        for key, mid in modifications['ext_instances'].items():
             # strand, idx, coord, isstaple = part.getModStrandIdx(key)
             strand, idx = part.getModStrandIdx(key)
             try:
@@ -278,7 +263,7 @@ def decode(document, obj, emit_signals=False):
             except:
                 print(strand, idx)
                 raise
-        for key, mid in obj['modifications']['int_instances'].items():
+        for key, mid in modifications['int_instances'].items():
             # strand, idx, coord, isstaple  = part.getModStrandIdx(key)
             strand, idx = part.getModStrandIdx(key)
             try:
@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
-from cadnano.part.refresholigoscmd import RefreshOligosCommand
 from cadnano import preferences as prefs
-from cadnano import setBatch, getReopen, setReopen
 from cadnano.cnenum import PointType
 
 def decode(document, obj, emit_signals=False):
@@ -15,14 +13,24 @@ def decode(document, obj, emit_signals=False):
     for part_dict in obj['parts']:
         part_dict = decodePart(document, part_dict, emit_signals=emit_signals)
 
-    modifications = obj['modifications']
+    decodeModifications(document, obj['modifications'])
+    return
+# end def
+
+def decodeModifications(document, modifications):
+    """ Decode the deserialized modifications of a Document.  Call after
+    decoding every Part
+
+    Args:
+        document (Document):
+        modifications (dict): deserialized modifications keyed by mod_id
+    """
     for mod_id, item in modifications.items():
         document.createMod(item['props'], mod_id)
         ext_locations = item['ext_locations']
         for key in ext_locations:
             part, strand, idx = document.getModStrandIdx(key)
             part.addModStrandInstance(strand, idx, mod_id)
-    return
 # end def
 
 def decodePart(document, part_dict, emit_signals=False):
@@ -46,56 +54,66 @@ def decodePart(document, part_dict, emit_signals=False):
         # TODO add code to deserialize parts
         pass
     else:
+        id_nums = []
+        lengths = []
+        vh_origins = []
+        zs = []
+        vals_list = []
         for id_num, size in vh_id_list:
-            x, y = origins[id_num]
-            z = vh_props['z'][id_num]
             vh_props['eulerZ'][id_num] = 0.5*(360./10.5)
-            vals = [vh_props[k][id_num] for k in keys]
-            part.createVirtualHelix(x, y, z, size,
-                                    id_num=id_num,
-                                    properties=(keys, vals),
-                                    safe=False,
-                                    use_undostack=False)
+            id_nums.append(id_num)
+            lengths.append(size)
+            vh_origins.append(origins[id_num])
+            zs.append(vh_props['z'][id_num])
+            vals_list.append([vh_props[k][id_num] for k in keys])
         # end for
+        part.createVirtualHelices(vh_origins, zs, lengths,
+                                  id_nums=id_nums,
+                                  properties=(keys, vals_list),
+                                  safe=False,
+                                  use_undostack=False)
         # zoom to fit
         if emit_signals:
             part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
 
+    decodePartStrands(part, part_dict)
+
+    # TODO fix this to set position
+    instance_props = part_dict['instance_properties']    # list
+
+    vh_order = part_dict['virtual_helix_order']
+    if vh_order:
+        # print("import order", vh_order)
+        part.setImportedVHelixOrder(vh_order)
+# end def
+
+def decodePartStrands(part, part_dict):
+    """ Decode the strands, crossovers, oligo sequences and insertions of a
+    deserialized Part dictionary into a Part whose virtual helices exist
+
+    Args:
+        part (NucleicAcidPart):
+        part_dict (dict): deserialized dictionary describing the Part
+    """
     strands = part_dict['strands']
-    strand_index_list = strands['indices']
-    color_list = strands['properties']
-    for id_num, idx_set in enumerate(strand_index_list):
-        if idx_set is not None:
-            fwd_strand_set, rev_strand_set = part.getStrandSets(id_num)
-            fwd_idxs, rev_idxs = idx_set
-            fwd_colors, rev_colors = color_list[id_num]
-            for idxs, color in zip(fwd_idxs, fwd_colors):
-                low_idx, high_idx = idxs
-                fwd_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                        use_undostack=False)
-            for idxs, color in zip(rev_idxs, rev_colors):
-                low_idx, high_idx = idxs
-                rev_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                        use_undostack=False)
-        part.refreshSegments(id_num)   # update segments
-    # end def
-
-    xovers = part_dict['xovers']
-    for from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx in xovers:
-        from_strand = part.getStrand(from_is_fwd, from_id, from_idx)
-        to_strand = part.getStrand(to_is_fwd, to_id, to_idx)
-        part.createXover(   from_strand, from_idx,
-                            to_strand, to_idx,
-                            update_oligo=False,
-                            use_undostack=False)
-
-    RefreshOligosCommand(part).redo()
-    for oligo in part_dict['oligos']:
-        id_num = oligo['id_num']
-        idx = oligo['idx5p']
-        is_fwd = oligo['is_5p_fwd']
-        color = oligo['color']
-        sequence = oligo['sequence']
+    strand_dict = decodeStrands(strands['indices'], strands['properties'])
+    part.importStrands(strand_dict, part_dict['xovers'], use_undostack=False)
+    oligo_sequences = ((oligo['id_num'], oligo['idx5p'], oligo['is_5p_fwd'], oligo['sequence'])
+                       for oligo in part_dict['oligos'])
+    decodeOligosAndInsertions(part, oligo_sequences, part_dict['insertions'])
+# end def
+
+def decodeOligosAndInsertions(part, oligo_sequences, insertions):
+    """ Apply the deserialized oligo sequences and insertions of a Part to
+    its imported strands
+
+    Args:
+        part (NucleicAcidPart):
+        oligo_sequences (iterable): of (id_num, idx5p, is_5p_fwd, sequence)
+            of the deserialized oligos
+        insertions (iterable): of (id_num, idx, length)
+    """
+    for id_num, idx, is_fwd, sequence in oligo_sequences:
         strand5p = part.getStrand(is_fwd, id_num, idx)
         this_oligo = strand5p.oligo()
         # this_oligo.applyColor(color, use_undostack=False)
@@ -103,17 +121,69 @@ def decodePart(document, part_dict, emit_signals=False):
             this_oligo.applySequence(sequence, use_undostack=False)
 
     # INSERTIONS, SKIPS
-    for id_num, idx, length in part_dict['insertions']:
+    for id_num, idx, length in insertions:
         strand = part.getStrand(True, id_num, idx)
         strand.addInsertion(idx, length, use_undostack=False)
+# end def
 
-    # TODO fix this to set position
-    instance_props = part_dict['instance_properties']    # list
+def readPart(reader):
+    """ Read a serialized Part dictionary from a stream.  The large lists
+    of the Part are read one item at a time so that only the text of one
+    item is buffered at once
 
-    vh_order = part_dict['virtual_helix_order']
-    if vh_order:
-        # print("import order", vh_order)
-        part.setImportedVHelixOrder(vh_order)
+    Args:
+        reader (JSONStreamReader): positioned at the start of the Part
+
+    Returns:
+        dict: deserialized dictionary describing the Part for `decodePart`
+    """
+    part_dict = {}
+    reader.beginObject()
+    key = reader.nextKey()
+    while key is not None:
+        if key == 'strands':
+            strands = part_dict[key] = {}
+            reader.beginObject()
+            strands_key = reader.nextKey()
+            while strands_key is not None:
+                strands[strands_key] = list(reader.iterItems())
+                strands_key = reader.nextKey()
+        elif key == 'xovers':
+            part_dict[key] = [tuple(xover) for xover in reader.iterItems()]
+        elif key in ('oligos', 'insertions'):
+            part_dict[key] = list(reader.iterItems())
+        else:
+            part_dict[key] = reader.readValue()
+        key = reader.nextKey()
+    return part_dict
+# end def
+
+def decodeStrands(strand_index_list, color_list, id_num_offset=0):
+    """Convert the serialized strand indices and colors of a Part into the
+    form taken by `NucleicAcidPart.importStrands`
+
+    Args:
+        strand_index_list (list): per virtual helix None or of form
+            (fwd_idxs, rev_idxs)
+        color_list (list): per virtual helix of form (fwd_colors, rev_colors)
+        id_num_offset (int): optional, added to every virtual helix ID number
+
+    Returns:
+        dict: of form::
+
+            {(id_num, is_fwd): [(idx_low, idx_high, color), ...], ...}
+    """
+    strand_dict = {}
+    for id_num, idx_set in enumerate(strand_index_list):
+        if idx_set is not None:
+            fwd_idxs, rev_idxs = idx_set
+            fwd_colors, rev_colors = color_list[id_num]
+            new_id_num = id_num + id_num_offset
+            strand_dict[(new_id_num, True)] = [(low_idx, high_idx, color) for
+                                               (low_idx, high_idx), color in zip(fwd_idxs, fwd_colors)]
+            strand_dict[(new_id_num, False)] = [(low_idx, high_idx, color) for
+                                                (low_idx, high_idx), color in zip(rev_idxs, rev_colors)]
+    return strand_dict
 # end def
 
 def importToPart(part_instance, copy_dict, use_undostack=True):
@@ -136,50 +206,33 @@ def importToPart(part_instance, copy_dict, use_undostack=True):
     keys = list(vh_props.keys())
     name_index = keys.index('name')
     new_vh_id_set = set()
+    new_id_nums = []
+    lengths = []
+    zs = []
+    vals_list = []
     for i, pair in enumerate(vh_id_list):
         id_num, size = pair
-        x, y = origins[i]
-        z = vh_props['z'][id_num]
+        zs.append(vh_props['z'][id_num])
         vals = [vh_props[k][i] for k in keys]
         new_id_num = i + id_num_offset
         vals[name_index] += (name_suffix % new_id_num)
-        part.createVirtualHelix(x, y, z, size,
-                                id_num=new_id_num,
-                                properties=(keys, vals),
-                                safe=use_undostack,
-                                use_undostack=use_undostack)
+        new_id_nums.append(new_id_num)
+        lengths.append(size)
+        vals_list.append(vals)
         new_vh_id_set.add(new_id_num)
     # end for
+    part.createVirtualHelices(origins[:len(vh_id_list)], zs, lengths,
+                              id_nums=new_id_nums,
+                              properties=(keys, vals_list),
+                              safe=use_undostack,
+                              use_undostack=use_undostack)
     strands = copy_dict['strands']
-    strand_index_list = strands['indices']
-    color_list = strands['properties']
-    for id_num, idx_set in enumerate(strand_index_list):
-        if idx_set is not None:
-            fwd_strand_set, rev_strand_set = part.getStrandSets(
-                                                        id_num + id_num_offset)
-            fwd_idxs, rev_idxs = idx_set
-            fwd_colors, rev_colors = color_list[id_num]
-            for idxs, color in zip(fwd_idxs, fwd_colors):
-                low_idx, high_idx = idxs
-                fwd_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                    use_undostack=use_undostack)
-
-            for idxs, color in zip(rev_idxs, rev_colors):
-                low_idx, high_idx = idxs
-                rev_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                    use_undostack=use_undostack)
-    # end def
-
-    xovers = copy_dict['xovers']
-    for from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx in xovers:
-        from_strand = part.getStrand(from_is_fwd, from_id + id_num_offset, from_idx)
-        to_strand = part.getStrand(to_is_fwd, to_id + id_num_offset, to_idx)
-        part.createXover(   from_strand, from_idx,
-                            to_strand, to_idx,
-                            update_oligo=use_undostack,
-                            use_undostack=use_undostack)
-    if not use_undostack:
-        RefreshOligosCommand(part).redo()
+    strand_dict = decodeStrands(strands['indices'], strands['properties'],
+                                id_num_offset=id_num_offset)
+    xovers = [(from_id + id_num_offset, from_is_fwd, from_idx,
+               to_id + id_num_offset, to_is_fwd, to_idx)
+              for from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx in copy_dict['xovers']]
+    part.importStrands(strand_dict, xovers, use_undostack=use_undostack)
 
     # INSERTIONS, SKIPS
     for id_num, idx, length in copy_dict['insertions']:
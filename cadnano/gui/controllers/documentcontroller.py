@@ -14,7 +14,7 @@ from PyQt5.QtSvg import QSvgGenerator
 from cadnano.gui.views.documentwindow import DocumentWindow
 from cadnano.gui.ui.dialogs.ui_about import Ui_About
 from cadnano.gui.views import styles
-from cadnano import app, setReopen, setBatch, util
+from cadnano import app, setReopen, util
 
 DEFAULT_VHELIX_FILTER = True
 ONLY_ONE = True
@@ -618,9 +618,8 @@ class DocumentController():
         # write the file
         ap = self._document.activePart()
         if ap is not None:
-            output = ap.getSequences()
             with open(fname, 'w') as f:
-                f.write(output)
+                ap.writeSequences(f)
     # end def
 
     def newClickedCallback(self):
@@ -662,7 +661,7 @@ class DocumentController():
         if ONLY_ONE:
             self.newDocument(fname=fname)
 
-        self._document.readFile(fname)
+        self._document.readFile(fname, prebuild_xovers=True)
 
         self.win.path_graphics_view.setViewportUpdateOn(True)
         self.win.slice_graphics_view.setViewportUpdateOn(True)
@@ -13,6 +13,7 @@ class NucleicAcidPartItemController(PartItemController):
     ('partInstancePropertySignal',              'partInstancePropertySlot'),
 
     ('partVirtualHelixAddedSignal',             'partVirtualHelixAddedSlot'),
+    ('partVirtualHelicesAddedSignal',           'partVirtualHelicesAddedSlot'),
     ('partVirtualHelixRemovingSignal',          'partVirtualHelixRemovingSlot'),
     ('partVirtualHelixRemovedSignal',           'partVirtualHelixRemovedSlot'),
     ('partVirtualHelixResizedSignal',           'partVirtualHelixResizedSlot'),
@@ -21,6 +22,7 @@ class NucleicAcidPartItemController(PartItemController):
     ('partVirtualHelicesSelectedSignal',        'partVirtualHelicesSelectedSlot'),
     ('partVirtualHelixPropertyChangedSignal',   'partVirtualHelixPropertyChangedSlot'),
 
-    ('partOligoAddedSignal',                    'partOligoAddedSlot')
+    ('partOligoAddedSignal',                    'partOligoAddedSlot'),
+    ('partOligosRefreshedSignal',               'partOligosRefreshedSlot')
     ]
 # end class
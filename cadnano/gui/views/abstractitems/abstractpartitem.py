@@ -87,6 +87,9 @@ class QAbstractPartItem(QGraphicsRectItem):
     def partOligoAddedSlot(self, part, oligo):
         pass
 
+    def partOligosRefreshedSlot(self, part, strands):
+        pass
+
     def partParentChangedSlot(self, sender):
         pass
 
@@ -117,6 +120,13 @@ class QAbstractPartItem(QGraphicsRectItem):
     def partVirtualHelixAddedSlot(self, model_part, id_num, virtual_helix, neighbors):
         pass
 
+    def partVirtualHelicesAddedSlot(self, model_part, id_nums, virtual_helices, neighbors_list):
+        """Default to handling each virtual helix added in bulk individually
+        """
+        for id_num, virtual_helix, neighbors in zip(id_nums, virtual_helices, neighbors_list):
+            self.partVirtualHelixAddedSlot(model_part, id_num, virtual_helix, neighbors)
+    # end def
+
     def partVirtualHelixRemovingSlot(self, sender, id_num, virtual_helix, neighbors):
         pass
 
@@ -200,6 +210,9 @@ class AbstractPartItem(object):
     def partOligoAddedSlot(self, part, oligo):
         pass
 
+    def partOligosRefreshedSlot(self, part, strands):
+        pass
+
     def partParentChangedSlot(self, sender):
         pass
 
@@ -227,6 +240,13 @@ class AbstractPartItem(object):
     def partVirtualHelixAddedSlot(self, model_part, id_num, virtual_helix, neighbors):
         pass
 
+    def partVirtualHelicesAddedSlot(self, model_part, id_nums, virtual_helices, neighbors_list):
+        """Default to handling each virtual helix added in bulk individually
+        """
+        for id_num, virtual_helix, neighbors in zip(id_nums, virtual_helices, neighbors_list):
+            self.partVirtualHelixAddedSlot(model_part, id_num, virtual_helix, neighbors)
+    # end def
+
     def partVirtualHelixRemovingSlot(self, sender, id_num, virtual_helix, neighbors):
         pass
 
@@ -5,7 +5,8 @@ from __future__ import division
 from PyQt5.QtCore import QRectF
 from PyQt5.QtWidgets import QGraphicsItem, QGraphicsRectItem
 
-from cadnano import getBatch, util
+from cadnano import util
+from cadnano.cnproxy import isBatching
 from cadnano.gui.palette import getPenObj, getBrushObj
 from cadnano.gui.controllers.itemcontrollers.nucleicacidpartitemcontroller import NucleicAcidPartItemController
 from cadnano.gui.views.abstractitems.abstractpartitem import QAbstractPartItem
@@ -299,7 +300,7 @@ class PathNucleicAcidPartItem(QAbstractPartItem):
             # self.setPos(p.x() + _VH_XOFFSET, p.y() + _p*3)
 
         vhi_list.append(vhi)
-        ztf = not getBatch()
+        ztf = not isBatching()
         self._setVirtualHelixItemList(vhi_list, zoom_to_fit=ztf)
     # end def
 
@@ -331,7 +332,7 @@ class PathNucleicAcidPartItem(QAbstractPartItem):
     def partVirtualHelixRemovedSlot(self, sender, id_num):
         """ Step 2 of removing a VHI
         """
-        ztf = not getBatch()
+        ztf = not isBatching()
         self._setVirtualHelixItemList(self._virtual_helix_item_list,
             zoom_to_fit=ztf)
     # end def
@@ -353,6 +354,19 @@ class PathNucleicAcidPartItem(QAbstractPartItem):
             vh_i.virtualHelixPropertyChangedSlot(keys, values)
     # end def
 
+    def partOligosRefreshedSlot(self, sender, strands):
+        """Update every strand item once after the oligos of the part are
+        refreshed in bulk, instead of per strand signals
+
+        Args:
+            sender (obj): Model object that emitted the signal.
+            strands (list): of :class:`Strand` whose oligo or connections may
+                have changed
+        """
+        for vhi in self._virtual_helix_item_hash.values():
+            vhi.oligosRefreshedSlot()
+    # end def
+
     def partVirtualHelicesSelectedSlot(self, sender, vh_set, is_adding):
         """is_adding (bool): adding (True) virtual helices to a selection
         or removing (False)
@@ -5,7 +5,7 @@ from math import floor
 from PyQt5.QtCore import QRectF, Qt
 from PyQt5.QtWidgets import QGraphicsItem, QGraphicsRectItem
 from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsSimpleTextItem
-from cadnano import getBatch
+from cadnano.cnproxy import isBatching
 from cadnano.gui.controllers.itemcontrollers.strand.stranditemcontroller import StrandItemController
 from cadnano.gui.palette import getColorObj, getPenObj, getBrushObj, getNoPen
 from cadnano.gui.views.pathview import pathstyles as styles
@@ -55,7 +55,7 @@ class StrandItem(QGraphicsLineItem):
         self._seq_label = QGraphicsSimpleTextItem(self)
 
         self.refreshInsertionItems(model_strand)
-        if not getBatch():
+        if not isBatching():
             self._updateSequenceText()
 
         # create a larger click area rect to capture mouse events
@@ -70,7 +70,7 @@ class StrandItem(QGraphicsLineItem):
 
         # xover comming from the 3p end
         self.xover_3p_end = XoverItem(self, virtual_helix_item)
-        if not getBatch():
+        if not isBatching():
             # initial refresh
             self._updateColor(model_strand)
             self._updateAppearance(model_strand)
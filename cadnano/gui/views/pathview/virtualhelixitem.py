@@ -39,6 +39,67 @@ def v2DistanceAndAngle(a, b):
     return dist, angle
 
 
+_MINOR_GRID_PATHS = {}
+"""dict: (canvas_size, sub_step_size): QPainterPath of the minor grid lines"""
+
+
+def minorGridPath(canvas_size, sub_step_size):
+    """Get the QPainterPath of the minor grid lines of a virtual helix.
+    The path also includes a border outline and a midline for dividing
+    scaffold and staple bases.
+
+    Paths are cached by size and implicitly shared by Qt, so the items of
+    all the virtual helices of a size draw one path rather than each
+    building and holding their own
+
+    Args:
+        canvas_size (int): number of bases of the virtual helix
+        sub_step_size (int): bases between major tick marks
+
+    Returns:
+        QPainterPath:
+    """
+    path_key = (canvas_size, sub_step_size)
+    path = _MINOR_GRID_PATHS.get(path_key)
+    if path is not None:
+        return path
+    bw = _BASE_WIDTH
+    bw2 = 2 * bw
+    path = QPainterPath()
+    # border
+    path.addRect(0, 0, bw * canvas_size, 2 * bw)
+    # minor tick marks
+    for i in range(canvas_size):
+        x = round(bw * i) + .5
+        if i % sub_step_size == 0:
+            path.moveTo(x - .5, 0)
+            path.lineTo(x - .5, bw2)
+            path.lineTo(x - .25, bw2)
+            path.lineTo(x - .25, 0)
+            path.lineTo(x, 0)
+            path.lineTo(x, bw2)
+            path.lineTo(x + .25, bw2)
+            path.lineTo(x + .25, 0)
+            path.lineTo(x + .5, 0)
+            path.lineTo(x + .5, bw2)
+
+            # path.moveTo(x-.5, 0)
+            # path.lineTo(x-.5, 2 * bw)
+            # path.lineTo(x+.5, 2 * bw)
+            # path.lineTo(x+.5, 0)
+
+        else:
+            path.moveTo(x, 0)
+            path.lineTo(x, 2 * bw)
+
+    # staple-scaffold divider
+    path.moveTo(0, bw)
+    path.lineTo(bw * canvas_size, bw)
+    _MINOR_GRID_PATHS[path_key] = path
+    return path
+# end def
+
+
 class PathVirtualHelixItem(AbstractVirtualHelixItem, QGraphicsPathItem):
     """VirtualHelixItem for PathView
 
@@ -83,6 +144,7 @@ class PathVirtualHelixItem(AbstractVirtualHelixItem, QGraphicsPathItem):
 
         self.is_active = False
 
+        self._path_key = None
         self.refreshPath()
         self.setAcceptHoverEvents(True)  # for pathtools
         self.setZValue(styles.ZPATHHELIX)
@@ -126,6 +188,17 @@ class PathVirtualHelixItem(AbstractVirtualHelixItem, QGraphicsPathItem):
         StrandItem(strand, self, self._viewroot)
     # end def
 
+    def oligosRefreshedSlot(self):
+        """Update the color, connections and endpoints of the strand items
+        after the oligos of the part are refreshed
+        """
+        for item in self.childItems():
+            if isinstance(item, StrandItem):
+                strand = item.strand()
+                item.strandHasNewOligoSlot(strand)
+                item.strandUpdateSlot(strand)
+    # end def
+
     def virtualHelixRemovedSlot(self):
         """Summary
 
@@ -290,48 +363,13 @@ class PathVirtualHelixItem(AbstractVirtualHelixItem, QGraphicsPathItem):
     # end def
 
     def refreshPath(self):
+        """Set the path of the minor grid lines, shared by every
+        VirtualHelixItem of the same size, see `minorGridPath`
         """
-        Returns a QPainterPath object for the minor grid lines.
-        The path also includes a border outline and a midline for
-        dividing scaffold and staple bases.
-        """
-        bw = _BASE_WIDTH
-        bw2 = 2 * bw
-        part = self.part()
-        path = QPainterPath()
-        sub_step_size = part.subStepSize()
-        canvas_size = self._model_vh.getSize()
-        # border
-        path.addRect(0, 0, bw * canvas_size, 2 * bw)
-        # minor tick marks
-        for i in range(canvas_size):
-            x = round(bw * i) + .5
-            if i % sub_step_size == 0:
-                path.moveTo(x - .5, 0)
-                path.lineTo(x - .5, bw2)
-                path.lineTo(x - .25, bw2)
-                path.lineTo(x - .25, 0)
-                path.lineTo(x, 0)
-                path.lineTo(x, bw2)
-                path.lineTo(x + .25, bw2)
-                path.lineTo(x + .25, 0)
-                path.lineTo(x + .5, 0)
-                path.lineTo(x + .5, bw2)
-
-                # path.moveTo(x-.5, 0)
-                # path.lineTo(x-.5, 2 * bw)
-                # path.lineTo(x+.5, 2 * bw)
-                # path.lineTo(x+.5, 0)
-
-            else:
-                path.moveTo(x, 0)
-                path.lineTo(x, 2 * bw)
-
-        # staple-scaffold divider
-        path.moveTo(0, bw)
-        path.lineTo(bw * canvas_size, bw)
-
-        self.setPath(path)
+        path_key = (self._model_vh.getSize(), self.part().subStepSize())
+        if path_key != self._path_key:
+            self._path_key = path_key
+            self.setPath(minorGridPath(*path_key))
     # end def
 
     def resize(self):
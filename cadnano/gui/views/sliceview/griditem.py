@@ -1,38 +1,41 @@
 
-from PyQt5.QtCore import Qt, QPointF
-from PyQt5.QtGui import QPainterPath, QColor
-from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsEllipseItem
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainterPath, QColor, QPen
+from PyQt5.QtWidgets import QGraphicsItem
 
 from cadnano.fileio.lattice import HoneycombDnaPart, SquareDnaPart
-from cadnano.gui.palette import getPenObj, getBrushObj, getNoPen
+from cadnano.gui.palette import getPenObj, getBrushObj, getNoBrush
 from cadnano.cnenum import GridType
 
 from . import slicestyles as styles
 _RADIUS = styles.SLICE_HELIX_RADIUS
-_ZVALUE = styles.ZSLICEHELIX + 1
 HIGHLIGHT_WIDTH = styles.SLICE_HELIX_MOD_HILIGHT_WIDTH
 DELTA = (HIGHLIGHT_WIDTH - styles.SLICE_HELIX_STROKE_WIDTH)/2.
 
 
-class GridItem(QGraphicsPathItem):
-    """Summary
+class GridItem(QGraphicsItem):
+    """A single item drawing the lattice of a part in the slice view.
+
+    Only the lattice sites in the exposed rect are drawn, so the cost of a
+    paint follows the size of the viewport rather than the bounds of the
+    part, and no item is created per site.  Sites are hit tested
+    analytically with `positionToLatticeCoord` of the lattice, within
+    `styles.SLICE_HELIX_RADIUS` of a site, for hovering and clicking.
 
     Attributes:
-        allow_snap (TYPE): Description
-        bounds (TYPE): Description
-        dots (TYPE): Description
-        draw_lines (bool): Description
-        grid_type (TYPE): Description
-        part_item (TYPE): Description
-        points (list): Description
+        allow_snap (bool): whether clicks on sites are handled
+        bounds (tuple): x_low, x_high, y_low, y_high of the part item
+        dots (tuple): dot size and half the dot size
+        draw_lines (bool): draw the lattice lines as well as the sites
+        grid_type (GridType):
+        part_item (NucleicAcidPartItem):
     """
 
     def __init__(self, part_item, grid_type):
-        """Summary
-
+        """
         Args:
-            part_item (TYPE): Description
-            grid_type (TYPE): Description
+            part_item (NucleicAcidPartItem):
+            grid_type (GridType):
         """
         super(GridItem, self).__init__(parent=part_item)
         self.part_item = part_item
@@ -40,345 +43,361 @@ class GridItem(QGraphicsPathItem):
         self.dots = (dot_size, dot_size / 2)
         self.allow_snap = part_item.window().action_vhelix_snap.isChecked()
         self.draw_lines = True
-        self.points = []
         color = QColor(Qt.blue)
         color.setAlphaF(0.1)
-        self.setPen(color)
+        self._line_pen = QPen(color)
+        self._rows = self._columns = (0, 0)
+        self._rect = QRectF()
+        self._window = None         # (rows, columns) of the cached paths
+        self._window_paths = None   # (lines, dots) QPainterPaths
+        self._highlight = None      # (row, column) of the hovered site
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
         self.setGridType(grid_type)
     # end def
 
     def updateGrid(self):
-        """Summary
-
-        Returns:
-            TYPE: Description
+        """Find the lattice sites within the bounds of the part item
         """
         part_item = self.part_item
-        part = part_item.part()
-        radius = part.radius()
-        self.bounds = bounds = part_item.bounds()
-        self.removePoints()
-        if self.grid_type == GridType.HONEYCOMB:
-            self.doHoneycomb(part_item, radius, bounds)
-        elif self.grid_type == GridType.SQUARE:
-            self.doSquare(part_item, radius, bounds)
+        self.bounds = x_l, x_h, y_l, y_h = part_item.bounds()
+        if self.grid_type in (GridType.HONEYCOMB, GridType.SQUARE):
+            rows, columns = self._latticeRange(x_l, x_h, -y_l, -y_h)
         else:
-            self.setPath(QPainterPath())
+            rows, columns = (0, 0), (0, 0)
+        self._rows, self._columns = rows, columns
+        self._window = self._window_paths = None
+        self._highlight = None
+        self.prepareGeometryChange()
+        self._rect = self._siteRect(rows, columns)
+        self.update()
     # end def
 
     def setGridType(self, grid_type):
-        """Summary
-
-        Args:
-            grid_type (TYPE): Description
-
+        """
         Args:
-            TYPE: Description
+            grid_type (GridType):
         """
         self.grid_type = grid_type
         self.updateGrid()
     # end def
 
     def setDrawlines(self, draw_lines):
-        """Summary
-
+        """
         Args:
-            draw_lines (TYPE): Description
-
-        Returns:
-            TYPE: Description
+            draw_lines (bool):
         """
         self.draw_lines = draw_lines
         self.updateGrid()
     # end def
 
-    def doHoneycomb(self, part_item, radius, bounds):
-        """Summary
+    def _latticeRange(self, x_l, x_h, y_l, y_h):
+        """Get the rows and columns of the sites in a rectangle in model
+        orientation
 
         Args:
-            part_item (TYPE): Description
-            radius (TYPE): Description
-            bounds (TYPE): Description
+            x_l (float): low x
+            x_h (float): high x
+            y_l (float): low y, +y is up
+            y_h (float): high y
 
         Returns:
-            TYPE: Description
+            tuple: ((row_low, row_high), (column_low, column_high)) half open
+            ranges
         """
-        doLattice = HoneycombDnaPart.latticeCoordToPositionXY
-        doPosition = HoneycombDnaPart.positionToLatticeCoordRound
-        isEven = HoneycombDnaPart.isEvenParity
-        x_l, x_h, y_l, y_h = bounds
-        dot_size, half_dot_size = self.dots
-        sf = part_item.scale_factor
-        points = self.points
-        row_l, col_l = doPosition(radius, x_l, -y_l, False, False, scale_factor=sf)
-        row_h, col_h = doPosition(radius, x_h, -y_h, True, True, scale_factor=sf)
-        # print(row_l, row_h, col_l, col_h)
-
-        path = QPainterPath()
-        is_pen_down = False
-        draw_lines = self.draw_lines
-        for i in range(row_l, row_h):
-            for j in range(col_l, col_h+1):
-                x, y = doLattice(radius, i, j, scale_factor=sf)
-                if draw_lines:
-                    if is_pen_down:
-                        path.lineTo(x, -y)
-                    else:
-                        is_pen_down = True
-                        path.moveTo(x, -y)
-                """ +x is Left and +y is down
-                origin of ellipse is Top Left corner so we subtract half in X
-                and subtract in y
-                """
-                pt = GridPoint(x - half_dot_size,
-                               -y - half_dot_size,
-                               dot_size, self)
-                pt.setPen(getPenObj(Qt.blue, 1.0))
-                points.append(pt)
-            is_pen_down = False
-        # end for i
-        # DO VERTICAL LINES
-        if draw_lines:
-            for j in range(col_l, col_h+1):
-                # print("newcol")
-                for i in range(row_l, row_h):
-                    x, y = doLattice(radius, i, j, scale_factor=sf)
-                    if is_pen_down and isEven(i, j):
-                        path.lineTo(x, -y)
-                        is_pen_down = False
-                    else:
-                        is_pen_down = True
-                        path.moveTo(x, -y)
-                is_pen_down = False
-            # end for j
-        self.setPath(path)
+        radius = self.part_item.part().radius()
+        sf = self.part_item.scale_factor
+        if self.grid_type == GridType.HONEYCOMB:
+            doPosition = HoneycombDnaPart.positionToLatticeCoordRound
+            row_l, col_l = doPosition(radius, x_l, y_l, False, False, scale_factor=sf)
+            row_h, col_h = doPosition(radius, x_h, y_h, True, True, scale_factor=sf)
+            return (row_l, row_h), (col_l, col_h + 1)
+        else:
+            doPosition = SquareDnaPart.positionToLatticeCoordRound
+            row_l, col_l = doPosition(radius, x_l, y_l, scale_factor=sf)
+            row_h, col_h = doPosition(radius, x_h, y_h, scale_factor=sf)
+            return (row_l, row_h + 1), (col_l, col_h + 1)
     # end def
 
-    def doSquare(self, part_item, radius, bounds):
-        """Summary
+    def _sitePos(self, row, column):
+        """
+        Returns:
+            tuple: (x, y) of a site in item coordinates, +y is down
+        """
+        radius = self.part_item.part().radius()
+        sf = self.part_item.scale_factor
+        if self.grid_type == GridType.HONEYCOMB:
+            x, y = HoneycombDnaPart.latticeCoordToPositionXY(radius, row, column, scale_factor=sf)
+        else:
+            x, y = SquareDnaPart.latticeCoordToPositionXY(radius, row, column, scale_factor=sf)
+        return x, -y
+    # end def
+
+    def _siteRect(self, rows, columns):
+        """
+        Returns:
+            QRectF: bounding the sites of the ranges and the hit area
+                around them
+        """
+        row_l, row_h = rows
+        col_l, col_h = columns
+        if row_l >= row_h or col_l >= col_h:
+            return QRectF()
+        # both parities of the first and last rows and columns
+        edge_columns = {column for column in (col_l, col_l + 1, col_h - 2, col_h - 1)
+                        if col_l <= column < col_h}
+        corners = [self._sitePos(row, column)
+                   for row in (row_l, row_h - 1) for column in edge_columns]
+        xs = [x for x, _ in corners]
+        ys = [y for _, y in corners]
+        rect = QRectF(QPointF(min(xs), min(ys)), QPointF(max(xs), max(ys)))
+        return rect.adjusted(-_RADIUS, -_RADIUS, _RADIUS, _RADIUS)
+    # end def
+
+    def _windowPaths(self, rows, columns):
+        """Build the paths of the lines and dots of the sites of a window of
+        the lattice, cached for the last window
 
         Args:
-            part_item (TYPE): Description
-            radius (TYPE): Description
-            bounds (TYPE): Description
+            rows (tuple): (row_low, row_high) half open range
+            columns (tuple): (column_low, column_high) half open range
 
         Returns:
-            TYPE: Description
+            tuple: (lines, dots) of :obj:`QPainterPath`
         """
-        doLattice = SquareDnaPart.latticeCoordToPositionXY
-        doPosition = SquareDnaPart.positionToLatticeCoordRound
-        x_l, x_h, y_l, y_h = bounds
+        window = (rows, columns, self.draw_lines)
+        if window == self._window:
+            return self._window_paths
+        sitePos = self._sitePos
+        is_honeycomb = self.grid_type == GridType.HONEYCOMB
+        isEven = HoneycombDnaPart.isEvenParity
         dot_size, half_dot_size = self.dots
-        sf = part_item.scale_factor
-        points = self.points
-        row_l, col_l = doPosition(radius, x_l, -y_l, scale_factor=sf)
-        row_h, col_h = doPosition(radius, x_h, -y_h, scale_factor=sf)
-        # print(row_l, row_h, col_l, col_h)
-
-        path = QPainterPath()
-        is_pen_down = False
+        row_range = range(*rows)
+        column_range = range(*columns)
         draw_lines = self.draw_lines
-
-        for i in range(row_l, row_h + 1):
-            for j in range(col_l, col_h + 1):
-                x, y = doLattice(radius, i, j, scale_factor=sf)
+        lines = QPainterPath()
+        dots = QPainterPath()
+        for i in row_range:
+            is_pen_down = False
+            for j in column_range:
+                x, y = sitePos(i, j)
                 if draw_lines:
                     if is_pen_down:
-                        path.lineTo(x, -y)
+                        lines.lineTo(x, y)
                     else:
                         is_pen_down = True
-                        path.moveTo(x, -y)
+                        lines.moveTo(x, y)
                 """ +x is Left and +y is down
                 origin of ellipse is Top Left corner so we subtract half in X
                 and subtract in y
                 """
-                pt = GridPoint(x - half_dot_size,
-                               -y - half_dot_size,
-                               dot_size, self)
-                pt.setPen(getPenObj(Qt.blue, 1.0))
-                points.append(pt)
-            is_pen_down = False  # pen up
-        # DO VERTICAL LINES
+                dots.addEllipse(x - half_dot_size, y - half_dot_size, dot_size, dot_size)
+        # DO VERTICAL LINES, in a honeycomb only up to the even parity sites
         if draw_lines:
-            for j in range(col_l, col_h + 1):
-                for i in range(row_l, row_h + 1):
-                    x, y = doLattice(radius, i, j, scale_factor=sf)
-                    if is_pen_down:
-                        path.lineTo(x, -y)
-                    else:
-                        is_pen_down = True
-                        path.moveTo(x, -y)
-                is_pen_down = False  # pen up
-        self.setPath(path)
+            for j in column_range:
+                for i in row_range[1:]:
+                    if is_honeycomb and not isEven(i, j):
+                        continue
+                    lines.moveTo(*sitePos(i - 1, j))
+                    lines.lineTo(*sitePos(i, j))
+        self._window = window
+        self._window_paths = lines, dots
+        return lines, dots
     # end def
 
-    def removePoints(self):
-        """Summary
+    def _visibleRange(self, rect):
+        """Get the rows and columns of the sites to draw for a rect, with a
+        margin of one site for the lines entering it
+
+        Args:
+            rect (QRectF): in item coordinates
 
         Returns:
-            TYPE: Description
+            tuple: ((row_low, row_high), (column_low, column_high)) half open
+            ranges clipped to the lattice of the bounds
         """
-        points = self.points
-        scene = self.scene()
-        while points:
-            scene.removeItem(points.pop())
+        rows, columns = self._latticeRange(rect.left(), rect.right(),
+                                           -rect.bottom(), -rect.top())
+        row_l, row_h = self._rows
+        col_l, col_h = self._columns
+        return ((max(rows[0] - 1, row_l), min(rows[1] + 1, row_h)),
+                (max(columns[0] - 1, col_l), min(columns[1] + 1, col_h)))
     # end def
-# end class
-
 
-class ClickArea(QGraphicsEllipseItem):
-    """Summary
-
-    Attributes:
-        parent_obj (TYPE): Description
-    """
-    _RADIUS = styles.SLICE_HELIX_RADIUS
-
-    def __init__(self, diameter, parent):
-        nd = 2*self._RADIUS
-        offset = -0.5*nd + diameter/2
-        super(ClickArea, self).__init__(offset, offset, nd, nd, parent=parent)
-        self.parent_obj = parent
-        self.setAcceptHoverEvents(True)
-        self.setPen(getNoPen())
+    def boundingRect(self):
+        return self._rect
     # end def
 
-    def mousePressEvent(self, event):
-        return self.parent_obj.mousePressEvent(event)
-# end class
-
-
-class GridPoint(QGraphicsEllipseItem):
-    """Summary
-
-    Attributes:
-        clickarea (TYPE): Description
-        grid (TYPE): Description
-        offset (TYPE): Description
-    """
-    __slots__ = 'grid', 'offset'
-
-    def __init__(self, x, y, diameter, parent_grid):
-        super(GridPoint, self).__init__(0., 0.,
-                                        diameter, diameter, parent=parent_grid)
-        self.offset = diameter / 2
-        self.grid = parent_grid
-
-        self.clickarea = ClickArea(diameter, parent=self)
+    def paint(self, painter, option, widget=None):
+        """Draw the sites in the exposed rect
+        """
+        if self._rect.isEmpty():
+            return
+        rows, columns = self._visibleRange(option.exposedRect)
+        if rows[0] >= rows[1] or columns[0] >= columns[1]:
+            return
+        lines, dots = self._windowPaths(rows, columns)
+        painter.setBrush(getNoBrush())
+        if self.draw_lines:
+            painter.setPen(self._line_pen)
+            painter.drawPath(lines)
+        painter.setPen(getPenObj(styles.DEFAULT_GRID_DOT_COLOR, 1.0))
+        painter.drawPath(dots)
+        if self._highlight is not None:
+            painter.setPen(getPenObj(styles.ACTIVE_GRID_DOT_COLOR, 1.0))
+            painter.setBrush(getBrushObj(styles.ACTIVE_GRID_DOT_COLOR))
+            painter.drawEllipse(self._dotRect(*self._highlight))
+    # end def
 
-        self.setPos(x, y)
-        self.setZValue(_ZVALUE)
-        self.setAcceptHoverEvents(True)
+    def _dotRect(self, row, column):
+        dot_size, half_dot_size = self.dots
+        x, y = self._sitePos(row, column)
+        return QRectF(x - half_dot_size, y - half_dot_size, dot_size, dot_size)
     # end def
 
-    def mousePressEvent(self, event):
-        """Handler for user mouse press.
+    def siteAt(self, pos):
+        """Get the lattice site within `styles.SLICE_HELIX_RADIUS` of a point
 
         Args:
-            event (QGraphicsSceneMouseEvent): Contains item, scene, and screen
-            coordinates of the the event, and previous event.
+            pos (QPointF): in item coordinates
 
         Returns:
-            TYPE: Description
+            tuple: (row, column, center) of the site with the center as a
+            :obj:`QPointF` in item coordinates, or None
         """
-        if self.grid.allow_snap:
-            part_item = self.grid.part_item
-            tool = part_item._getActiveTool()
-            if tool.FILTER_NAME not in part_item.part().document().filter_set:
-                return
-            tool_method_name = tool.methodPrefix() + "MousePress"
-            if hasattr(self, tool_method_name):
-                getattr(self, tool_method_name)(tool, part_item, event)
+        if self.grid_type == GridType.HONEYCOMB:
+            doCoord = HoneycombDnaPart.positionToLatticeCoord
+        elif self.grid_type == GridType.SQUARE:
+            doCoord = SquareDnaPart.positionToLatticeCoord
         else:
-            QGraphicsEllipseItem.mousePressEvent(self, event)
+            return None
+        radius = self.part_item.part().radius()
+        sf = self.part_item.scale_factor
+        row, column = doCoord(radius, pos.x(), -pos.y(), scale_factor=sf)
+        if not (self._rows[0] <= row < self._rows[1] and
+                self._columns[0] <= column < self._columns[1]):
+            return None
+        x, y = self._sitePos(row, column)
+        dx, dy = pos.x() - x, pos.y() - y
+        if dx*dx + dy*dy > _RADIUS*_RADIUS:
+            return None
+        return row, column, QPointF(x, y)
     # end def
 
-    def hoverEnterEvent(self, event):
-        """Summary
+    def highlightAt(self, pos):
+        """Highlight the site under a hovering point and move the hint of
+        the active tool to it
 
         Args:
-            event (QGraphicsSceneHoverEvent): Description
+            pos (QPointF): in item coordinates
+
+        Returns:
+            bool: whether a site is under the point
         """
-        self.setBrush(getBrushObj(styles.ACTIVE_GRID_DOT_COLOR))
-        self.setPen(getPenObj(styles.ACTIVE_GRID_DOT_COLOR, 1.0))
-        part_item = self.grid.part_item
-        tool = part_item._getActiveTool()
-        tool.setHintPos(self.scenePos())
+        site = self.siteAt(pos)
+        highlight = None if site is None else site[:2]
+        if highlight != self._highlight:
+            if self._highlight is not None:
+                self.update(self._dotRect(*self._highlight).adjusted(-1, -1, 1, 1))
+            self._highlight = highlight
+            if highlight is not None:
+                self.update(self._dotRect(*highlight).adjusted(-1, -1, 1, 1))
+        if site is None:
+            return False
+        half_dot_size = self.dots[1]
+        tool = self.part_item._getActiveTool()
+        tool.setHintPos(self.mapToScene(site[2] - QPointF(half_dot_size, half_dot_size)))
+        return True
     # end def
 
-    def hoverLeaveEvent(self, event):
-        """Summary
+    def clearHighlight(self):
+        """Remove the hover highlight"""
+        if self._highlight is not None:
+            self.update(self._dotRect(*self._highlight).adjusted(-1, -1, 1, 1))
+            self._highlight = None
+    # end def
+
+    def mousePressEvent(self, event):
+        """Handler for user mouse press.  Presses away from a site, or when
+        snapping is off, are left to the part item
 
         Args:
-            event (QGraphicsSceneHoverEvent): Description
+            event (QGraphicsSceneMouseEvent): Contains item, scene, and screen
+            coordinates of the the event, and previous event.
         """
-        self.setBrush(getBrushObj(styles.DEFAULT_GRID_DOT_COLOR))
-        self.setPen(getPenObj(styles.DEFAULT_GRID_DOT_COLOR, 1.0))
+        site = self.siteAt(event.pos()) if self.allow_snap else None
+        if site is None:
+            event.ignore()
+            return
+        part_item = self.part_item
+        tool = part_item._getActiveTool()
+        if tool.FILTER_NAME not in part_item.part().document().filter_set:
+            return
+        tool_method_name = tool.methodPrefix() + "MousePress"
+        if hasattr(self, tool_method_name):
+            getattr(self, tool_method_name)(tool, part_item, event, site[2])
     # end def
 
-    def selectToolMousePress(self, tool, part_item, event):
-        """Summary
-
+    def selectToolMousePress(self, tool, part_item, event, center):
+        """
         Args:
-            tool (TYPE): Description
-            part_item (TYPE): Description
-            event (TYPE): Description
+            tool (SelectSliceTool):
+            part_item (NucleicAcidPartItem):
+            event (QGraphicsSceneMouseEvent):
+            center (QPointF): of the site clicked
         """
         part = part_item.part()
         part.setSelected(True)
-        # print("monkey")
-        alt_event = GridEvent(self, self.offset)
+        alt_event = GridEvent(self, center)
         tool.selectOrSnap(part_item, alt_event, event)
-        return QGraphicsEllipseItem.mousePressEvent(self, event)
+        return QGraphicsItem.mousePressEvent(self, event)
     # end def
 
-    def createToolMousePress(self, tool, part_item, event):
-        """Summary
-
+    def createToolMousePress(self, tool, part_item, event, center):
+        """
         Args:
-            tool (TYPE): Description
-            part_item (TYPE): Description
-            event (TYPE): Description
+            tool (CreateSliceTool):
+            part_item (NucleicAcidPartItem):
+            event (QGraphicsSceneMouseEvent):
+            center (QPointF): of the site clicked
         """
         part = part_item.part()
         part.setSelected(True)
-        # print("paws")
-        alt_event = GridEvent(self, self.offset)
+        alt_event = GridEvent(self, center)
         part_item.createToolMousePress(tool, event, alt_event)
     # end def
+# end class
 
 
 class GridEvent(object):
-    """Summary
+    """A click on a lattice site of a GridItem
 
     Attributes:
-        grid_pt (TYPE): Description
-        offset (QPointF): Description
+        grid (GridItem):
+        center (QPointF): of the site in the coordinates of the grid
     """
-    __slots__ = 'grid_pt', 'offset'
-
-    def __init__(self, grid_pt, offset):
-        """Summary
+    __slots__ = 'grid', 'center'
 
+    def __init__(self, grid, center):
+        """
         Args:
-            grid_pt (TYPE): Description
-            offset (TYPE): Description
+            grid (GridItem):
+            center (QPointF): of the site in the coordinates of the grid
         """
-        self.grid_pt = grid_pt
-        self.offset = QPointF(offset, offset)
+        self.grid = grid
+        self.center = center
 
     def scenePos(self):
-        """Scene position, with offset.
+        """Scene position of the center of the site
 
         Returns:
             QPointF: Description
         """
-        return self.grid_pt.scenePos() + self.offset
+        return self.grid.mapToScene(self.center)
 
     def pos(self):
-        """Local position, with offset.
+        """Local position of the center of the site
 
         Returns:
             QPointF: Description
         """
-        return self.grid_pt.pos() + self.offset
+        return QPointF(self.center)
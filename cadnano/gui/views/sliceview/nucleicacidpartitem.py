@@ -606,7 +606,8 @@ class SliceNucleicAcidPartItem(QAbstractPartItem):
         Args:
             TYPE: Description
         """
-
+        if self.griditem.highlightAt(self.mapToItem(self.griditem, event.pos())):
+            return
         tool = self._getActiveTool()
         tool_method_name = tool.methodPrefix() + "HoverMove"
         if hasattr(self, tool_method_name):
@@ -617,6 +618,7 @@ class SliceNucleicAcidPartItem(QAbstractPartItem):
     # end def
 
     def hoverLeaveEvent(self, event):
+        self.griditem.clearHighlight()
         tool = self._getActiveTool()
         tool.hideLineItem()
 
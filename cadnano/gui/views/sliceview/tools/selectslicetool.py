@@ -376,6 +376,42 @@ class SelectSliceTool(AbstractSliceTool):
                                      use_undostack=use_undostack)
     # end def
 
+    def beginMoveSelection(self):
+        """Start a drag of the selection.  The SliceSelectionGroup moves the
+        items while the model previews the translation, see
+        `NucleicAcidPart.beginTranslatePreview`
+        """
+        self.part_item.part().beginTranslatePreview(self.selection_set)
+    # end def
+
+    def previewMoveSelection(self, dx, dy):
+        """Y-axis is inverted in Qt +y === DOWN
+
+        Args:
+            dx (float): scene delta x of a step of the drag
+            dy (float): scene delta y of a step of the drag
+        """
+        part_item = self.part_item
+        part = part_item.part()
+        if part.translatePreview() is None:
+            return
+        sf = part_item.scaleFactor()
+        part.previewTranslateVirtualHelices(dx / sf, -dy / sf, 0)
+    # end def
+
+    def endMoveSelection(self, commit, threshold):
+        """Apply the drag of the selection to the model as one undoable
+        translation
+
+        Args:
+            commit (bool): apply the translation or drop it
+            threshold (float): ignore drags within this scene distance
+        """
+        part_item = self.part_item
+        sf = part_item.scaleFactor()
+        part_item.part().endTranslatePreview(commit, threshold=threshold / sf)
+    # end def
+
     def deactivate(self):
         """Summary
 
@@ -539,6 +575,7 @@ class SliceSelectionGroup(QGraphicsItemGroup):
                                 item.mousePressEvent(event)
             self.drag_start_position = sp = self.pos()
             self.drag_last_position = sp
+            tool.beginMoveSelection()
 
             return QGraphicsItemGroup.mousePressEvent(self, event)
     # end def
@@ -547,7 +584,9 @@ class SliceSelectionGroup(QGraphicsItemGroup):
         """because SliceSelectionGroup has the flag
         QGraphicsItem.ItemIsMovable
         we need only get the position of the item to figure
-        out what to submit to the model
+        out what to submit to the model.  The steps only update the
+        translation previewed by the model, so a step costs the same however
+        large the part is
 
         Args:
             event (TYPE): Description
@@ -561,7 +600,7 @@ class SliceSelectionGroup(QGraphicsItemGroup):
             delta = new_pos - self.drag_last_position
             self.drag_last_position = new_pos
             dx, dy = delta.x(), delta.y()
-            self.tool.moveSelection(dx, dy, False, use_undostack=False)
+            self.tool.previewMoveSelection(dx, dy)
         return res
     # end def
 
@@ -569,20 +608,16 @@ class SliceSelectionGroup(QGraphicsItemGroup):
         """because SliceSelectionGroup has the flag
         QGraphicsItem.ItemIsMovable
         we need only get the position of the item to figure
-        out what to submit to the model
+        out what to submit to the model, as one translation of the whole drag
 
         Args:
             event (TYPE): Description
         """
         MOVE_THRESHOLD = 0.01   # ignore small moves
         # print("mouse mouseReleaseEvent", self.tool.individual_pick)
-        if not self.tool.individual_pick and event.button() == Qt.LeftButton:
-            delta = self.pos() - self.drag_start_position
-            dx, dy = delta.x(), delta.y()
-            # print(abs(dx), abs(dy))
-            if abs(dx) > MOVE_THRESHOLD or abs(dy) > MOVE_THRESHOLD:
-                # print("finalizling", dx, dy)
-                self.tool.moveSelection(dx, dy, True)
+        if event.button() == Qt.LeftButton:
+            is_commit = not self.tool.individual_pick
+            self.tool.endMoveSelection(is_commit, MOVE_THRESHOLD)
         self.tool.individual_pick = False
         return QGraphicsItemGroup.mouseReleaseEvent(self, event)
     # end def
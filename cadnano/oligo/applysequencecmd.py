@@ -1,7 +1,16 @@
 from cadnano.cnproxy import UndoCommand
-from cadnano import util
+from cadnano.strand.basearray import stringToBases
 
 class ApplySequenceCommand(UndoCommand):
+    """Set the bases of the strands of an oligo from a sequence read 5' to
+    3', and the bases of the complementary strands they pair with.
+
+    The sequence is converted to ``uint8`` codes once and each strand's
+    share of it is scattered into the base array of its
+    :class:`StrandSet`; the pairing strands copy the complement of the
+    overlapping range from that array.  A sequence shorter than the oligo
+    leaves the remaining bases blank and `None` clears them.
+    """
     def __init__(self, oligo, sequence):
         super(ApplySequenceCommand, self).__init__("apply sequence")
         self._oligo = oligo
@@ -10,43 +19,37 @@ class ApplySequenceCommand(UndoCommand):
     # end def
 
     def redo(self):
-        olg = self._oligo
-        n_s = ''.join(self._new_sequence) if self._new_sequence else None
-        n_s_original = self._new_sequence
-        oligo_list = [olg]
-        for strand in olg.strand5p().generator3pStrand():
-            used_seq, n_s = strand.setSequence(n_s)
-            # get the compliment ahead of time
-            used_seq = util.comp(used_seq) if used_seq else None
-            for comp_strand in strand.getComplementStrands():
-                sub_used_seq = comp_strand.setComplementSequence(used_seq, strand)
-                oligo_list.append(comp_strand.oligo())
-            # end for
-            # as long as the new Applied Sequence is not None
-            if n_s is None and n_s_original:
-                break
-        # end for
-        for oligo in oligo_list:
-            oligo.oligoSequenceAddedSignal.emit(oligo)
+        self._applySequence(self._new_sequence)
     # end def
 
     def undo(self):
-        olg = self._oligo
-        o_s = ''.join(self._old_sequence) if self._old_sequence else None
+        self._applySequence(self._old_sequence)
+    # end def
 
+    def _applySequence(self, sequence):
+        olg = self._oligo
+        strands = list(olg.strand5p().generator3pStrand())
+        if sequence:
+            values = stringToBases(''.join(sequence),
+                                   sum(strand.totalLength() for strand in strands))
         oligo_list = [olg]
-
-        for strand in olg.strand5p().generator3pStrand():
-            used_seq, o_s = strand.setSequence(o_s)
-
-            # get the compliment ahead of time
-            used_seq = util.comp(used_seq) if used_seq else None
+        notified = {olg}
+        i = 0
+        for strand in strands:
+            if sequence:
+                length = strand.totalLength()
+                strand._setBases(values[i:i + length])
+                i += length
+            else:
+                strand.setSequence(None)
             for comp_strand in strand.getComplementStrands():
-                sub_used_seq = comp_strand.setComplementSequence(used_seq, strand)
-                oligo_list.append(comp_strand.oligo())
+                comp_strand.applyComplementSequence(strand)
+                comp_oligo = comp_strand.oligo()
+                if comp_oligo not in notified:
+                    notified.add(comp_oligo)
+                    oligo_list.append(comp_oligo)
             # end for
-        # for
-
+        # end for
         for oligo in oligo_list:
             oligo.oligoSequenceAddedSignal.emit(oligo)
     # end def
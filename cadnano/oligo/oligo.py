@@ -2,11 +2,16 @@
 import sys
 import traceback
 
+import numpy as np
+
 from cadnano import util
 from cadnano.cnobject import CNObject
 from cadnano.cnproxy import ProxySignal
 from cadnano.cnenum import ModType
+from cadnano.fileio.sequenceexport import SEQUENCE_EXPORT_KEYS
 from cadnano.strand import Strand
+from cadnano.strand.basearray import basesToString
+from cadnano.strand.oligonode import OligoNode
 from .applycolorcmd import ApplyColorCommand
 from .applysequencecmd import ApplySequenceCommand
 from .removeoligocmd import RemoveOligoCommand
@@ -28,9 +33,13 @@ class Oligo(CNObject):
     Commands that affect Strands (e.g. create, remove, merge, split) are also
     responsible for updating the affected Oligos.
 
+    Strands find their oligo through the root of a shared
+    :class:`OligoNode` tree, see :mod:`cadnano.strand.oligonode`.
+
     Args:
         part (Part): the model :class:`Part`
         color (str): optional, color property of the :class:`Oligo`
+        length (int): optional, total length of the strands of the oligo
     """
     editable_properties = ['name', 'color']
 
@@ -39,9 +48,10 @@ class Oligo(CNObject):
         self._part = part
         self._strand5p = None
         self._is_loop = False
+        self._node = None
         self._props = {'name': "oligo%s" % str(id(self))[-4:],
                        'color': "#cc0000" if color is None else color,
-                       'length': 0,
+                       'length': length,
                        'is_visible': True
                        }
     # end def
@@ -201,6 +211,19 @@ class Oligo(CNObject):
         self._strand5p = strand
     # end def
 
+    def _rootNode(self):
+        """Get the root :class:`OligoNode` labeled with this oligo, creating
+        it if the oligo has none
+
+        Returns:
+            OligoNode:
+        """
+        node = self._node
+        if node is None or node.parent is not None or node.oligo is not self:
+            node = self._node = OligoNode(self)
+        return node
+    # end def
+
     def undoStack(self):
         return self._part.undoStack()
     # end def
@@ -223,9 +246,9 @@ class Oligo(CNObject):
         temp = self.strand5p()
         if not temp:
             return None
-        if temp.sequence():
-            return ''.join([Strand.sequence(strand)
-                           for strand in self.strand5p().generator3pStrand()])
+        if temp.bases().any():
+            return basesToString(np.concatenate([strand.bases()
+                                                 for strand in temp.generator3pStrand()]))
         else:
             return None
     # end def
@@ -240,43 +263,44 @@ class Oligo(CNObject):
         Returns:
             dict:
         """
+        for key, value in zip(SEQUENCE_EXPORT_KEYS, self.sequenceRow()):
+            output[key].append(value)
+        return output
+    # end def
+
+    def sequenceRow(self):
+        """Get the row of this oligo in the sequence export
+
+        Returns:
+            tuple: of :obj:`str` in `SEQUENCE_EXPORT_KEYS` order
+
+        Raises:
+            ValueError: if the oligo is a loop, which has no 5' end to
+                export from
+        """
         part = self.part()
         vh_num5p = self.strand5p().idNum()
         strand5p = self.strand5p()
         idx5p = strand5p.idx5Prime()
-        seq = []
-        a_seq = []
         if self.isLoop():
-            # print("A loop exists")
-            raise Exception
-        for strand in strand5p.generator3pStrand():
-            seq.append(Strand.sequence(strand, for_export=True))
-            a_seq.append(Strand.abstractSeq(strand))
-            if strand.connection3p() is None:  # last strand in the oligo
-                vh_num3p = strand.idNum()
-                idx3p = strand.idx3Prime()
-        a_seq = ','.join(a_seq)
+            raise ValueError("Oligo.sequenceRow: can not export loop oligo %s" % self)
+        strands = list(strand5p.generator3pStrand())
+        # one conversion of the bases of the whole oligo, marking bases
+        # without a sequence as Strand.sequence(for_export=True) does
+        seq = util.markwhite(basesToString(np.concatenate([strand.bases()
+                                                           for strand in strands])))
+        a_seq = ','.join([Strand.abstractSeq(strand) for strand in strands])
         a_seq = "(%s)" % (a_seq)
+        strand = strands[-1]  # last strand in the oligo
+        vh_num3p = strand.idNum()
+        idx3p = strand.idx3Prime()
         modseq5p, modseq5p_name = part.getStrandModSequence(strand5p, idx5p,
                                                             ModType.END_5PRIME)
         modseq3p, modseq3p_name = part.getStrandModSequence(strand, idx3p,
                                                             ModType.END_3PRIME)
-        seq = ''.join(seq)
         seq = modseq5p + seq + modseq3p
-        # output = "%d[%d]\t%d[%d]\t%s\t%s\t%s\t%s\t(%s)\n" % \
-        #          (vh_num5p, idx5p, vh_num3p, idx3p, self.getColor(),
-        #           modseq5p_name, seq, modseq3p_name, a_seq)
-        # these are the keys
-        # keys = ['Start','End','Color', 'Mod5',
-        #         'Sequence','Mod3','AbstractSequence']
-        output['Start'].append("%d[%d]" % (vh_num5p, idx5p))
-        output['End'].append("%d[%d]" % (vh_num3p, idx3p))
-        output['Color'].append(self.getColor())
-        output['Mod5'].append(modseq5p_name)
-        output['Sequence'].append(seq)
-        output['Mod3'].append(modseq3p_name)
-        output['AbstractSequence'].append(a_seq)
-        return output
+        return ("%d[%d]" % (vh_num5p, idx5p), "%d[%d]" % (vh_num3p, idx3p),
+                self.getColor(), modseq5p_name, seq, modseq3p_name, a_seq)
     # end def
 
     def shouldHighlight(self):
@@ -1,5 +1,8 @@
 from ast import literal_eval
 import bisect
+
+import numpy as np
+
 from cadnano.cnproxy import UndoCommand
 
 
@@ -50,13 +53,13 @@ class CreateVirtualHelixCommand(UndoCommand):
                 self.neighbors = part._getVirtualHelixOriginNeighbors(id_num, self.threshold)
 
             neighbors = self.neighbors
-            part.vh_properties.loc[id_num, 'neighbors'] = str(list(neighbors))
+            part.vh_properties.set(id_num, 'neighbors', str(list(neighbors)))
             for neighbor_id in neighbors:
                 nneighbors = literal_eval(
                     part.getVirtualHelixProperties(neighbor_id, 'neighbors')
                 )
                 bisect.insort_left(nneighbors, id_num)
-                part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+                part.vh_properties.set(neighbor_id, 'neighbors', str(list(nneighbors)))
         else:
             neighbors = self.neighbors
         if self.keys is not None:
@@ -76,7 +79,7 @@ class CreateVirtualHelixCommand(UndoCommand):
                             part.getVirtualHelixProperties(neighbor_id, 'neighbors')
                         )
             nneighbors.remove(id_num)
-            part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+            part.vh_properties.set(neighbor_id, 'neighbors', str(list(nneighbors)))
 
         # signaling the view is two parts to clean up signals properly
         # and then allow the views to refresh
@@ -87,3 +90,108 @@ class CreateVirtualHelixCommand(UndoCommand):
         part.partVirtualHelixRemovedSignal.emit(part, id_num)
     # end def
 # end class
+
+
+class CreateVirtualHelicesCommand(UndoCommand):
+    def __init__(self, part, origins, zs, lengths,
+                 id_nums=None, properties=None, property_columns=None,
+                 safe=True):
+        """
+        Args:
+            origins (list): of (x, y) :obj:`tuple`
+            zs (list): of :obj:`float` z coordinates
+            lengths (list): of :obj:`int` sizes of the virtual helices
+            id_nums (list): optional, of :obj:`int` ID numbers
+            properties (tuple): optional, Tuple of two lists: `keys` and
+                `values` where `values` holds one list of values per virtual
+                helix matching the order of `keys`
+            property_columns (tuple): optional, in place of `properties`,
+                Tuple of `keys` and `columns` where `columns` holds one list
+                or :obj:`ndarray` of values per key in the order of the
+                virtual helices
+            safe (bool): safe must be True to update neighbors
+            otherwise, neighbors need to be explicitly updated
+        """
+        super(CreateVirtualHelicesCommand, self).__init__("create virtual helices")
+        self.part = part
+        if id_nums is None:
+            id_nums = []
+            for _ in range(len(lengths)):
+                id_num = part._getNewIdNum()
+                part._reserveIdNum(id_num)
+                id_nums.append(id_num)
+        else:
+            id_nums = list(id_nums)
+            for id_num in id_nums:
+                part._reserveIdNum(id_num)
+        self.id_nums = id_nums
+        origin_pts = np.zeros((len(id_nums), 3))
+        if id_nums:
+            origin_pts[:, :2] = np.asarray(origins, dtype=float)[:, :2]
+            origin_pts[:, 2] = zs
+        self.origin_pts = origin_pts
+        self.lengths = list(lengths)
+        self.color = part.getColor()
+        self.keys = None
+        self.columns = None
+        if properties is not None:
+            self.keys, values = properties
+            self.keys = list(self.keys)
+            self.columns = [list(column) for column in zip(*values)] or [[] for _ in self.keys]
+        elif property_columns is not None:
+            self.keys, self.columns = map(list, property_columns)
+        if safe:
+            self.neighbors_list = None
+        else:
+            neighbor_column = self.columns[self.keys.index('neighbors')]
+            self.neighbors_list = [literal_eval(x) for x in neighbor_column]
+
+        self.threshold = 2.1*part.radius()
+        self.safe = safe
+    # end def
+
+    def redo(self):
+        part = self.part
+        id_nums = self.id_nums
+        vh_list = part._createHelices(id_nums, self.origin_pts, self.lengths,
+                                      self.color, self.keys, self.columns)
+
+        if self.safe:   # update all neighbors
+            if self.neighbors_list is None:
+                self.neighbors_list = [sorted(part._getVirtualHelixOriginNeighbors(id_num, self.threshold))
+                                       for id_num in id_nums]
+            new_id_set = set(id_nums)
+            for id_num, neighbors in zip(id_nums, self.neighbors_list):
+                part.vh_properties.set(id_num, 'neighbors', str(list(neighbors)))
+                for neighbor_id in neighbors:
+                    if neighbor_id in new_id_set:
+                        continue
+                    nneighbors = literal_eval(
+                        part.getVirtualHelixProperties(neighbor_id, 'neighbors')
+                    )
+                    bisect.insort_left(nneighbors, id_num)
+                    part.vh_properties.set(neighbor_id, 'neighbors', str(list(nneighbors)))
+        part.partVirtualHelicesAddedSignal.emit(part, id_nums, vh_list, self.neighbors_list)
+    # end def
+
+    def undo(self):
+        part = self.part
+        new_id_set = set(self.id_nums)
+        for id_num, neighbors in zip(reversed(self.id_nums), reversed(self.neighbors_list)):
+            for neighbor_id in neighbors:
+                if neighbor_id in new_id_set:
+                    continue
+                nneighbors = literal_eval(
+                                part.getVirtualHelixProperties(neighbor_id, 'neighbors')
+                            )
+                nneighbors.remove(id_num)
+                part.vh_properties.set(neighbor_id, 'neighbors', str(list(nneighbors)))
+
+            # signaling the view is two parts to clean up signals properly
+            # and then allow the views to refresh
+            part.partVirtualHelixRemovingSignal.emit(
+                part, id_num, part.getVirtualHelix(id_num), neighbors)
+            part._removeHelix(id_num)
+            part.partVirtualHelixRemovedSignal.emit(part, id_num)
+    # end def
+# end class
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+from cadnano.cnproxy import UndoCommand
+from cadnano.oligo import Oligo
+from cadnano.strand import Strand
+
+
+class ImportStrandsCommand(UndoCommand):
+    """Create many deserialized :class:`Strand` objects and the crossovers
+    between them in one pass.
+
+    Strands are inserted into each :class:`StrandSet` at once, crossovers
+    that join the 3' end of one new strand to the 5' end of another are
+    linked directly, and one :class:`Oligo` is created per resulting chain
+    of strands so no oligos need to be merged afterwards.  Segments are
+    refreshed once per virtual helix.
+
+    Crossovers that do not join the ends of two new strands can not be
+    linked directly and are returned by :meth:`unlinkedXovers` for the caller
+    to install with :meth:`NucleicAcidPart.createXover`.
+
+    Args:
+        part (NucleicAcidPart):
+        strands (dict): of form::
+
+                {(id_num, is_fwd): [(idx_low, idx_high, color), ...], ...}
+
+            where color may be None for the part color
+        xovers (list): of :obj:`tuple` of form::
+
+                (from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx)
+
+            where `from_idx` is the 3' end of the 5' strand and `to_idx` is
+            the 5' end of the 3' strand
+        allow_reordering (bool): optional, link crossovers listed from the 5'
+            end of one strand to the 3' end of another in reverse as
+            :meth:`NucleicAcidPart.createXover` does.  default False
+    """
+    def __init__(self, part, strands, xovers, allow_reordering=False):
+        super(ImportStrandsCommand, self).__init__("import strands")
+        self._part = part
+        default_color = part.getProperty('color')
+        self._strands = new_strands = {}
+        colors = {}
+        ends5p = {}
+        ends3p = {}
+        for (id_num, is_fwd), idx_list in strands.items():
+            fwd_ss, rev_ss = part.getStrandSets(id_num)
+            strandset = fwd_ss if is_fwd else rev_ss
+            strand_list = []
+            for idx_low, idx_high, color in sorted(idx_list, key=lambda x: x[0]):
+                strand = Strand(strandset, idx_low, idx_high)
+                colors[strand] = default_color if color is None else color
+                strand_list.append(strand)
+                ends5p[(id_num, is_fwd, strand.idx5Prime())] = strand
+                ends3p[(id_num, is_fwd, strand.idx3Prime())] = strand
+            if strand_list:
+                new_strands[strandset] = strand_list
+
+        self._links = links = []
+        self._unlinked_xovers = unlinked_xovers = []
+        for xover in xovers:
+            from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx = xover
+            from_key = (from_id, from_is_fwd, from_idx)
+            to_key = (to_id, to_is_fwd, to_idx)
+            if allow_reordering and from_key in ends5p and to_key in ends3p:
+                strand5p = ends3p[to_key]
+                strand3p = ends5p[from_key]
+            else:
+                strand5p = ends3p.get(from_key)
+                strand3p = ends5p.get(to_key)
+            if (strand5p is None or strand3p is None or
+                    strand5p._strand3p is not None or strand3p._strand5p is not None):
+                unlinked_xovers.append(xover)
+            else:
+                # link now so that the oligos can be traced
+                strand5p._strand3p = strand3p
+                strand3p._strand5p = strand5p
+                links.append((strand5p, strand3p))
+
+        self._oligos = self._createOligos(colors)
+    # end def
+
+    def unlinkedXovers(self):
+        """Get the crossovers that could not be linked directly
+
+        Returns:
+            list: of :obj:`tuple` in the form of the `xovers` argument
+        """
+        return self._unlinked_xovers
+    # end def
+
+    def _createOligos(self, colors):
+        """Create one :class:`Oligo` per chain of linked new strands with the
+        color of the 5' strand of the chain
+
+        Args:
+            colors (dict): of color :obj:`str` keyed by :class:`Strand`
+
+        Returns:
+            list: of :obj:`tuple` of form (oligo, strand list)
+        """
+        part = self._part
+        oligos = []
+        visited = set()
+        for strand_list in self._strands.values():
+            for strand in strand_list:
+                if strand in visited:
+                    continue
+                # find the 5' end of the chain or detect a loop
+                strand5p = strand
+                is_loop = False
+                while strand5p._strand5p is not None:
+                    strand5p = strand5p._strand5p
+                    if strand5p is strand:
+                        is_loop = True
+                        break
+                chain = list(strand5p.generator3pStrand())
+                visited.update(chain)
+                oligo = Oligo(part, colors[strand5p])
+                oligo._setLoop(is_loop)
+                oligo.setStrand5p(strand5p)
+                length = 0
+                for chain_strand in chain:
+                    chain_strand.setOligo(oligo)
+                    length += chain_strand.totalLength()
+                oligo._setLength(length, emit_signals=False)
+                oligos.append((oligo, chain))
+        return oligos
+    # end def
+
+    def redo(self):
+        part = self._part
+        id_nums = set()
+        for strandset, strand_list in self._strands.items():
+            strandset._addStrandsToStrandList(strand_list)
+            id_nums.add(strandset.idNum())
+        for strand5p, strand3p in self._links:
+            strand5p.setConnection3p(strand3p)
+            strand3p.setConnection5p(strand5p)
+        for oligo, chain in self._oligos:
+            for strand in chain:
+                strand.setOligo(oligo)
+            oligo.addToPart(part, emit_signals=True)
+        for id_num in id_nums:
+            part.refreshSegments(id_num)
+
+        # Emit signals to notify on completion
+        for strandset, strand_list in self._strands.items():
+            for strand in strand_list:
+                strandset.strandsetStrandAddedSignal.emit(strandset, strand)
+        for id_num in id_nums:
+            # for updating the Slice View displayed helices
+            part.partStrandChangedSignal.emit(part, id_num)
+        # draw the crossovers now that every strand exists
+        for strand_list in self._strands.values():
+            for strand in strand_list:
+                strand.strandUpdateSignal.emit(strand)
+    # end def
+
+    def undo(self):
+        part = self._part
+        id_nums = set()
+        for strand5p, strand3p in self._links:
+            strand5p.setConnection3p(None)
+            strand3p.setConnection5p(None)
+        for strandset, strand_list in self._strands.items():
+            strandset._removeStrandsFromStrandList(strand_list)
+            id_nums.add(strandset.idNum())
+        for oligo, chain in self._oligos:
+            oligo.removeFromPart(emit_signals=True)
+        for strand_list in self._strands.values():
+            for strand in strand_list:
+                strand.strandRemovedSignal.emit(strand)
+                strand.setOligo(None)
+        for id_num in id_nums:
+            part.refreshSegments(id_num)
+            part.partStrandChangedSignal.emit(part, id_num)
+    # end def
+# end class
@@ -1,24 +1,32 @@
 # -*- coding: utf-8 -*-
+import io
 import math
 from ast import literal_eval
 from bisect import bisect_left
 from collections import defaultdict, deque
 from heapq import heapify, heappush, nsmallest
 from itertools import count as icount
+import threading
 
 import numpy as np
-import pandas as pd
 
 from cadnano import util
 from cadnano.cnobject import CNObject
+from cadnano.pointquadtree import ArrayQuadtree
+from cadnano.decorators.insertionindex import InsertionIndex
+from cadnano.fileio.sequenceexport import SEQUENCE_EXPORT_KEYS, writeSequences
 from .virtualhelix import VirtualHelix
+from .pointgrid import PointGrid
+from .vhpropertystore import VHPropertyStore
 from cadnano.cnproxy import ProxySignal
 from cadnano.cnenum import GridType, PartType, PointType
 from cadnano.oligo import RemoveOligoCommand
 from cadnano.part.part import Part
 from cadnano.strandset import StrandSet
 from cadnano.strandset import SplitCommand
-from .createvhelixcmd import CreateVirtualHelixCommand
+from .createvhelixcmd import CreateVirtualHelixCommand, CreateVirtualHelicesCommand
+from .importstrandscmd import ImportStrandsCommand
+from .refresholigoscmd import RefreshOligosCommand
 from .removevhelixcmd import RemoveVirtualHelixCommand
 from .resizevirtualhelixcmd import ResizeVirtualHelixCommand
 from .translatevhelixcmd import TranslateVirtualHelicesCommand
@@ -58,18 +66,20 @@ def _defaultProperties(id_num):
 VH_PROPERTY_KEYS = set([x for x in _defaultProperties(0)[0]])
 
 
-Z_PROP_INDEX = -1  # index for Dataframe.iloc calls
-
-
-def _defaultDataFrame(size):
+def _defaultPropertyStore(size):
     dummy_id_num = 999
-    columns, row = _defaultProperties(dummy_id_num)
-    df = pd.DataFrame([row for i in range(size)], columns=columns)
-    return df
+    keys, defaults = _defaultProperties(dummy_id_num)
+    return VHPropertyStore(keys, defaults, size)
 # end def
 DEFAULT_SIZE = 256
 DEFAULT_FULL_SIZE = DEFAULT_SIZE * 48
 DEFAULT_RADIUS = 1.125  # nm
+DEFAULT_GRID_CELL_SIZE = 2*DEFAULT_RADIUS  # nm, edge of a PointGrid cell
+MIN_CHUNK_SLACK = 64  # minimum free points on each side of a virtual helix
+
+# changing these properties invalidates the cached crossover hits
+XOVER_PROPERTY_KEYS = frozenset(['eulerZ', 'bases_per_repeat', 'turns_per_repeat',
+                                 'minor_groove_angle'])
 
 
 class NucleicAcidPart(Part):
@@ -114,7 +124,7 @@ class NucleicAcidPart(Part):
             return
 
         self._radius = DEFAULT_RADIUS     # probably a property???
-        self._insertions = defaultdict(dict)  # dict of insertions per virtualhelix
+        self._insertions = defaultdict(InsertionIndex)  # dict of insertions per virtualhelix
         self._mods = {'int_instances': {},
                       'ext_instances': {}}
         self._oligos = set()
@@ -145,7 +155,12 @@ class NucleicAcidPart(Part):
         ############################
 
         # 1. per virtual base pair allocations
+        # each virtual helix owns a chunk of the point arrays with slack on
+        # both ends, free points are inf and have an id_num of -1
         self.total_points = 0
+        self._points_end = 0  # end of the last allocated chunk
+        self._points_in_chunks = 0  # number of points in allocated chunks
+        self._point_chunks = {}  # id_num: (chunk_lo, chunk_hi)
         self.axis_pts = np.full((DEFAULT_FULL_SIZE, 3), np.inf, dtype=float)
         # self.axis_pts[:, 2] = 0.0
         self.fwd_pts = np.full((DEFAULT_FULL_SIZE, 3), np.inf, dtype=float)
@@ -160,6 +175,12 @@ class NucleicAcidPart(Part):
         """For doing 2D X,Y manipulation for now.  keep track of
         XY position of virtual helices
         """
+        # spatial index of _origin_pts for the origin queries
+        self._origin_tree = ArrayQuadtree()
+        # see _translationIndex
+        self._translate_cache = None
+        # [vh_set, dx, dy, dz] of a translation being previewed
+        self._translate_preview = None
 
         self.origin_limits = (0., 0., 0., 0.)
 
@@ -173,12 +194,15 @@ class NucleicAcidPart(Part):
 
         self.reserved_ids = set()
 
-        self.vh_properties = _defaultDataFrame(DEFAULT_SIZE)
+        self.vh_properties = _defaultPropertyStore(DEFAULT_SIZE)
 
         self.fwd_strandsets = [None] * DEFAULT_SIZE
         self.rev_strandsets = [None] * DEFAULT_SIZE
         self.segment_dict = {}  # for tracking strand segments
 
+        # spatial index of axis_pts for radius queries
+        self._point_grid = PointGrid(DEFAULT_GRID_CELL_SIZE)
+
         # Cache Stuff
         self._point_cache = None
         self._point_cache_keys = None
@@ -186,6 +210,12 @@ class NucleicAcidPart(Part):
         self._origin_cache = None
         self._origin_cache_keys = None
         self._resetOriginCache()
+        self._neighbors_cache = {}
+        self._xover_cache = None
+        self._xover_cache_keys = None
+        self._xover_cache_version = 0
+        self._xover_cache_lock = threading.Lock()
+        self._resetCrossoverMap()
 
         # scratch allocations for vector calculations
         self.m3_scratch0 = np.zeros((3, 3), dtype=float)
@@ -210,6 +240,9 @@ class NucleicAcidPart(Part):
     partVirtualHelixAddedSignal = ProxySignal(object, int, object, object, name='partVirtualHelixAddedSignal')
     """self, virtual_helix id_num, virtual_helix, neighbor list"""
 
+    partVirtualHelicesAddedSignal = ProxySignal(object, object, object, object, name='partVirtualHelicesAddedSignal')
+    """self, list of virtual_helix id_nums, list of virtual_helix, list of neighbor lists"""
+
     partVirtualHelixRemovingSignal = ProxySignal(object, int, object, object, name='partVirtualHelixRemovingSignal')
     """self, virtual_helix id_num, virtual_helix, neighbor list"""
 
@@ -233,6 +266,9 @@ class NucleicAcidPart(Part):
     # C. Oligo
     partOligoAddedSignal = ProxySignal(CNObject, object, name='partOligoAddedSignal')
     """self, oligo"""
+
+    partOligosRefreshedSignal = ProxySignal(CNObject, object, name='partOligosRefreshedSignal')
+    """self, list of strands whose oligo or connections may have changed"""
     # D. Strand
     partStrandChangedSignal = ProxySignal(object, int, name='partStrandChangedSignal')
     """self, virtual_helix"""
@@ -251,6 +287,58 @@ class NucleicAcidPart(Part):
         self._point_cache_keys = deque([None] * DEFAULT_CACHE_SIZE)
     # end def
 
+    def _resetCrossoverMap(self):
+        """Clear the cache of crossover hits of every virtual helix on its
+        neighbors.  The `_xover_cache` looks like::
+
+            _xover_cache[(id_num, neighbor_id)] = (fwd_axis_hits, fwd_idxs,
+                                                   rev_axis_hits, rev_idxs)
+
+        and `_xover_cache_keys` maps each ID number to the set of cache keys
+        it is part of
+        """
+        with self._xover_cache_lock:
+            self._xover_cache_version += 1
+            self._xover_cache = {}
+            self._xover_cache_keys = defaultdict(set)
+    # end def
+
+    def _invalidateCrossoverMap(self, id_nums):
+        """Remove the cached crossover hits of the virtual helices whose
+        geometry changed, both as the active virtual helix and as a neighbor
+
+        Args:
+            id_nums (iterable): of :obj:`int` virtual helix ID numbers
+        """
+        with self._xover_cache_lock:
+            # discard entries being computed by `prebuildCrossoverMap`
+            self._xover_cache_version += 1
+            xover_cache = self._xover_cache
+            xover_cache_keys = self._xover_cache_keys
+            for id_num in id_nums:
+                for key in xover_cache_keys.pop(id_num, ()):
+                    del xover_cache[key]
+                    other_id_num = key[1] if key[0] == id_num else key[0]
+                    if other_id_num != id_num:
+                        xover_cache_keys[other_id_num].discard(key)
+    # end def
+
+    def _storeNeighborHits(self, key, entry, version):
+        """Add an entry to the crossover hits cache unless the cache has
+        been invalidated since `version`
+
+        Args:
+            key (tuple): of :obj:`int`, (id_num, neighbor_id)
+            entry (tuple): as returned by `_computeNeighborHits`
+            version (int): `_xover_cache_version` when computing started
+        """
+        with self._xover_cache_lock:
+            if version == self._xover_cache_version:
+                self._xover_cache[key] = entry
+                self._xover_cache_keys[key[0]].add(key)
+                self._xover_cache_keys[key[1]].add(key)
+    # end def
+
     def copy(self, document, new_object=None):
         """Copy all arrays and counters and create new StrandSets
 
@@ -269,21 +357,31 @@ class NucleicAcidPart(Part):
         if not isinstance(new_vhg, NucleicAcidPart):
             raise ValueError("new_vhg {} is not an instance of a NucleicAcidPart".format(new_vhg))
         new_vhg.total_points = self.total_points
+        new_vhg._points_end = self._points_end
+        new_vhg._points_in_chunks = self._points_in_chunks
+        new_vhg._point_chunks = self._point_chunks.copy()
         new_vhg.axis_pts = self.axis_pts.copy()
         new_vhg.fwd_pts = self.fwd_pts.copy()
         new_vhg.rev_pts = self.rev_pts.copy()
         new_vhg.id_nums = self.id_nums.copy()
         new_vhg.indices = self.indices.copy()
+        new_vhg._point_grid = self._point_grid.copy()
+        new_vhg._neighbors_cache = {}
+        new_vhg._xover_cache_version = 0
+        new_vhg._xover_cache_lock = threading.Lock()
+        new_vhg._resetCrossoverMap()
 
         new_vhg.total_id_nums = self.total_id_nums
         new_vhg._origin_pts = self._origin_pts
+        new_vhg._origin_tree = self._origin_tree
+        new_vhg._translate_cache = None
         new_vhg.origin_limits = self.origin_limits
         new_vhg.directions = self.directions
 
         new_vhg.offset_and_size = self._offset_and_size.copy()
         new_vhg.reserved_ids = self.reserved_ids.copy()
 
-        new_vhg.vh_properties = _defaultDataFrame(DEFAULT_SIZE)
+        new_vhg.vh_properties = _defaultPropertyStore(DEFAULT_SIZE)
 
         new_vhg.fwd_strandsets = [x.simpleCopy(new_vhg) for x in self.fwd_strandsets]
         new_vhg.rev_strandsets = [x.simpleCopy(new_vhg) for x in self.rev_strandsets]
@@ -536,25 +634,45 @@ class NucleicAcidPart(Part):
     # end def
 
     def refreshSegments(self, id_num):
-        """Partition strandsets into overlapping segments
+        """Start a new set of abstract segment IDs for a virtual helix after
+        an edit.  The segments of its strands are kept up to date
+        incrementally by the :class:`SegmentIndex` of its StrandSets and
+        computed when read so this does not partition the strands.
 
-        Returns:
-            tuple: of segments for the forward and reverse strand of form::
+        Args:
+            id_num (int): virtual helix ID number
 
-                ( [ [(start, end),...], ...], [ [(start, end),...], ...])
+        Raises:
+            KeyError: id_num is not in the part
         """
         offset_and_size_tuple = self.getOffsetAndSize(id_num)
         if offset_and_size_tuple is None:
             raise KeyError("id_num {} not in NucleicAcidPart".format(id_num))
-        fwd_ss = self.fwd_strandsets[id_num]
-        rev_ss = self.rev_strandsets[id_num]
-
         self.segment_dict[id_num] = {}
-        return self._refreshSegments(fwd_ss, rev_ss)
+    # end def
+
+    def getSegments(self, id_num):
+        """Partition strandsets into overlapping segments
+
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            tuple: of segments for the forward and reverse strand of form::
+
+                ( [ [(start, end),...], ...], [ [(start, end),...], ...])
+
+        Raises:
+            KeyError: id_num is not in the part
+        """
+        fwd_ss, rev_ss = self.getStrandSets(id_num)
+        return ([strand.segments for strand in fwd_ss.strand_heap],
+                [strand.segments for strand in rev_ss.strand_heap])
     # end def
 
     def _refreshSegments(self, fwd_ss, rev_ss):
-        """Testable private version
+        """Testable private version partitioning all the strands from
+        scratch.  Reference for the incremental :class:`SegmentIndex`
 
         Returns:
             list: of :obj:`tuple`: of segments of form::
@@ -676,32 +794,96 @@ class NucleicAcidPart(Part):
         return ret
     # end def
 
+    def _translationIndex(self, id_nums):
+        """Get the ranges of the point arrays holding the points of virtual
+        helices, and the origin limits of the other virtual helices.  Both
+        are cached for the consecutive translations of a drag, until the
+        selection, the chunks of its points or the set of virtual helices
+        changes
+
+        Args:
+            id_nums (list): of :obj:`int` sorted virtual helix ID numbers
+
+        Returns:
+            tuple: of the form::
+
+                (point_slices, sizes, other_limits)
+
+            of the :obj:`list` of :obj:`slice` of the points, with adjacent
+            chunks merged, in the order of `id_nums`, the :obj:`list` of the
+            number of points of each virtual helix and the origin limits
+            (xLL, yLL, xUR, yUR) of the others, None if there are none
+        """
+        offset_and_size = self._offset_and_size
+        layout = [offset_and_size[id_num] for id_num in id_nums]
+        cache = self._translate_cache
+        if cache is not None and cache[0] == id_nums and cache[1] == layout:
+            return cache[2]
+
+        runs = []
+        for offset, size in layout:
+            if runs and runs[-1][1] == offset:
+                runs[-1][1] = offset + size
+            else:
+                runs.append([offset, offset + size])
+        point_slices = [slice(start, stop) for start, stop in runs]
+        sizes = [size for _, size in layout]
+
+        origin_pts = self._origin_pts
+        is_other = np.isfinite(origin_pts[:, 0])
+        is_other[id_nums] = False
+        other_pts = origin_pts[is_other]
+        if len(other_pts):
+            other_limits = (*np.amin(other_pts, axis=0).tolist(),
+                            *np.amax(other_pts, axis=0).tolist())
+        else:
+            other_limits = None
+        res = point_slices, sizes, other_limits
+        self._translate_cache = (id_nums, layout, res)
+        return res
+    # end def
+
     def _translateCoordinates(self, id_nums, delta):
         """delta is a :obj:`array-like` of floats of length 3
         for now support XY translation
 
+        The points of all the virtual helices are moved with an add per run
+        of adjacent chunks of each point array, only the virtual helices
+        with points that change cells are reindexed in the `PointGrid`, and
+        the origin limits are combined from the moved origins and the cached
+        limits of the other origins
+
         Args:
             id_nums (array-like): of :obj:`int` virtual helix ID numbers
             delta (array-like):  of :obj:`float` of length 3
         """
         self._resetOriginCache()
         self._resetPointCache()
+        id_nums = sorted(id_nums)
+        if not id_nums:
+            return
+        point_slices, sizes, other_limits = self._translationIndex(id_nums)
+        delta = np.asarray(delta, dtype=float)
+        old_axis_pts = np.concatenate([self.axis_pts[point_slice] for point_slice in point_slices])
+        for point_arr in (self.axis_pts, self.fwd_pts, self.rev_pts):
+            for point_slice in point_slices:
+                point_arr[point_slice] += delta
+
         origin_pts = self._origin_pts
-        delta_origin = delta[:2]  # x, y only
-        for id_num in id_nums:
-            coord_pts, fwd_pts, rev_pts = self.getCoordinates(id_num)
-            coord_pts += delta  # use += to modify the view
-            fwd_pts += delta  # use += to modify the view
-            rev_pts += delta  # use += to modify the view
-            # print("old origin", self.locationQt(id_num, 15./self.radius()))
-            origin_pts[id_num, :] += delta_origin
-            # print("new origin", self.locationQt(id_num, 15./self.radius()))
-        try:
-            self.vh_properties.iloc[list(id_nums), Z_PROP_INDEX] += delta[2]
-        except:
-            print(list(id_nums), Z_PROP_INDEX)
-            raise
-        self._setVirtualHelixOriginLimits()
+        origin_pts[id_nums] += delta[:2]  # x, y only
+        moved_pts = origin_pts[id_nums]
+        self._origin_tree.insert(id_nums, moved_pts)
+        self.vh_properties.column('z')[id_nums] += delta[2]
+
+        xLL, yLL = np.amin(moved_pts, axis=0).tolist()
+        xUR, yUR = np.amax(moved_pts, axis=0).tolist()
+        if other_limits is not None:
+            xLL, yLL = min(xLL, other_limits[0]), min(yLL, other_limits[1])
+            xUR, yUR = max(xUR, other_limits[2]), max(yUR, other_limits[3])
+        self.origin_limits = (xLL, yLL, xUR, yUR)
+
+        self._point_grid.moveIdNums(id_nums, old_axis_pts, old_axis_pts + delta, sizes)
+        self._invalidateCrossoverMap(id_nums)
     # end def
 
     def getIndices(self, id_num):
@@ -774,6 +956,10 @@ class NucleicAcidPart(Part):
         not internally.  NO GAPS!
         handles reindex the points in self.indices
 
+        Points are written into the slack of the chunk of the virtual helix
+        so no other virtual helix's points move.  When the slack runs out the
+        virtual helix is moved to a new larger chunk.
+
         Args:
             id_num (int): virtual helix ID number
             points (array-like): n x 3 shaped numpy ndarray of floats or
@@ -787,9 +973,6 @@ class NucleicAcidPart(Part):
         if offset_and_size_tuple is None:
             raise IndexError("id_num {} does not exists".format(id_num))
 
-        offset_and_size = self._offset_and_size
-        len_axis_pts = len(self.axis_pts)
-
         new_axis_pts, new_fwd_pts, new_rev_pts = points
         num_points = len(new_axis_pts)  # number of points being added
 
@@ -797,67 +980,185 @@ class NucleicAcidPart(Part):
 
         # 1. existing id_num
         offset, size = offset_and_size_tuple
-        lo_idx_limit, hi_idx_limit = offset, offset + size
+        chunk_lo, chunk_hi = self._point_chunks[id_num]
+        if size == 0:
+            is_right = True
+
+        # 2. Did exceed the slack of the chunk???
         if is_right:
-            insert_idx = hi_idx_limit
+            has_room = offset + size + num_points <= chunk_hi
+        else:
+            has_room = offset - num_points >= chunk_lo
+        if not has_room:
+            offset = self._movePointChunk(id_num, size + num_points,
+                                          0 if is_right else num_points)
+        if is_right:
+            insert_idx = offset + size
         else:  # prepend
+            offset -= num_points
             insert_idx = offset
+        self._offset_and_size[id_num] = (offset, size + num_points)
 
-        # new_lims = (hi_idx_limit, hi_idx_limit + num_points)
-        # print("{} settting offset {} and size {}".format(id_num, offset, size + num_points))
-        # print("length before {}".format(len_axis_pts))
-        offset_and_size[id_num] = (offset, size + num_points)
-        # increment the offset for every higher index
-        for i, o_and_s in enumerate(offset_and_size[id_num + 1:], start=id_num + 1):
-            if o_and_s is not None:
-                offset_and_size[i] = (o_and_s[0] + num_points, o_and_s[1])
-
-        # 2. Did exceed allocation???
-        total_points = self.total_points
-        if total_points + num_points > len_axis_pts:
-            diff = self.total_points + num_points - len_axis_pts
-            number_of_new_elements = math.ceil(diff / DEFAULT_FULL_SIZE) * DEFAULT_FULL_SIZE
-            total_rows = len_axis_pts + number_of_new_elements
-            # resize per virtual base allocations
-            self.axis_pts.resize((total_rows, 3))
-            self.axis_pts[len_axis_pts:] = [np.inf, np.inf, np.inf]
-
-            self.fwd_pts.resize((total_rows, 3))
-            self.fwd_pts[len_axis_pts:] = np.inf
-
-            self.rev_pts.resize((total_rows, 3))
-            self.rev_pts[len_axis_pts:] = np.inf
-
-            self.id_nums.resize((total_rows,))
-            self.id_nums[len_axis_pts:] = -1
-
-            self.indices.resize((total_rows,))
-            self.indices[len_axis_pts:] = 0
-        # end if exceeded allocation
-        axis_pts = self.axis_pts
-        fwd_pts = self.fwd_pts
-        rev_pts = self.rev_pts
-        id_nums = self.id_nums
-        indices = self.indices
-
-        # 3. Move Existing data
-        move_idx_start = insert_idx + num_points
-        move_idx_end = total_points + num_points
-
-        axis_pts[move_idx_start:move_idx_end] = axis_pts[insert_idx:total_points]
-        axis_pts[insert_idx:move_idx_start] = new_axis_pts
-        fwd_pts[move_idx_start:move_idx_end] = fwd_pts[insert_idx:total_points]
-        fwd_pts[insert_idx:move_idx_start] = new_fwd_pts
-        rev_pts[move_idx_start:move_idx_end] = rev_pts[insert_idx:total_points]
-        rev_pts[insert_idx:move_idx_start] = new_rev_pts
-
-        # just overwrite everything for indices and id_nums no need to move
-        id_nums[move_idx_start:move_idx_end] = id_nums[insert_idx:total_points]
-        id_nums[insert_idx:move_idx_start] = id_num
-        indices[move_idx_start:move_idx_end] = indices[insert_idx:total_points]
-        indices[lo_idx_limit:lo_idx_limit + num_points + size] = list(range(num_points + size))
+        # 3. Write the new data
+        hi = insert_idx + num_points
+        self.axis_pts[insert_idx:hi] = new_axis_pts
+        self.fwd_pts[insert_idx:hi] = new_fwd_pts
+        self.rev_pts[insert_idx:hi] = new_rev_pts
+        self.id_nums[insert_idx:hi] = id_num
+        self.indices[offset:offset + size + num_points] = np.arange(size + num_points)
 
         self.total_points += num_points
+        self._updatePointGrid(id_num)
+    # end def
+
+    def _allocPointChunk(self, id_num, size, shift=0):
+        """Allocate a chunk of the point arrays for a virtual helix after the
+        last allocated chunk, growing the arrays as required
+
+        Args:
+            id_num (int): virtual helix ID number
+            size (int): number of points to hold
+            shift (int): optional, extra free points to leave before the
+                offset returned
+
+        Returns:
+            int: the offset for the first point of the virtual helix
+        """
+        slack = max(MIN_CHUNK_SLACK, size // 2)
+        capacity = shift + size + 2*slack
+        self._reservePoints(capacity)
+        points_end = self._points_end
+        self._point_chunks[id_num] = (points_end, points_end + capacity)
+        self._points_end = points_end + capacity
+        self._points_in_chunks += capacity
+        return points_end + slack + shift
+    # end def
+
+    @staticmethod
+    def _chunkCapacity(size):
+        """The number of points of the point arrays a chunk for a virtual
+        helix of a given size occupies, including its slack
+
+        Args:
+            size (int): number of points to hold
+
+        Returns:
+            int: capacity of the chunk
+        """
+        return size + 2*max(MIN_CHUNK_SLACK, size // 2)
+    # end def
+
+    def _reservePoints(self, num_points):
+        """Grow the point arrays so at least `num_points` free points follow
+        the last allocated chunk
+
+        Args:
+            num_points (int): number of points required
+        """
+        points_end = self._points_end
+        len_axis_pts = len(self.axis_pts)
+        if points_end + num_points > len_axis_pts:
+            total_rows = max(points_end + num_points, 2*len_axis_pts)
+            # grow per virtual base allocations geometrically
+            pad = total_rows - len_axis_pts
+            self.axis_pts = np.vstack((self.axis_pts, np.full((pad, 3), np.inf)))
+            self.fwd_pts = np.vstack((self.fwd_pts, np.full((pad, 3), np.inf)))
+            self.rev_pts = np.vstack((self.rev_pts, np.full((pad, 3), np.inf)))
+            self.id_nums = np.concatenate((self.id_nums, np.full((pad,), -1, dtype=int)))
+            self.indices = np.concatenate((self.indices, np.zeros((pad,), dtype=int)))
+    # end def
+
+    def _clearPoints(self, lo, hi):
+        """Mark a range of the point arrays as free
+
+        Args:
+            lo (int): start of the range
+            hi (int): end of the range
+        """
+        self.axis_pts[lo:hi] = np.inf
+        self.fwd_pts[lo:hi] = np.inf
+        self.rev_pts[lo:hi] = np.inf
+        self.id_nums[lo:hi] = -1
+        self.indices[lo:hi] = 0
+    # end def
+
+    def _freePointChunk(self, id_num):
+        """Release the chunk of a virtual helix, clearing its points
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        chunk_lo, chunk_hi = self._point_chunks.pop(id_num)
+        self._clearPoints(chunk_lo, chunk_hi)
+        self._points_in_chunks -= chunk_hi - chunk_lo
+    # end def
+
+    def _movePointChunk(self, id_num, new_size, shift):
+        """Move the points of a virtual helix to a new chunk large enough for
+        `new_size` points
+
+        Args:
+            id_num (int): virtual helix ID number
+            new_size (int): number of points the new chunk must hold
+            shift (int): number of free points to leave before the existing
+                points for prepending
+
+        Returns:
+            int: the new offset of the existing points
+        """
+        self._maybeCompactPoints()
+        offset, size = self._offset_and_size[id_num]
+        old_lo, old_hi = self._point_chunks[id_num]
+        new_offset = self._allocPointChunk(id_num, new_size, shift)
+        hi, new_hi = offset + size, new_offset + size
+        for arr in (self.axis_pts, self.fwd_pts, self.rev_pts, self.id_nums, self.indices):
+            arr[new_offset:new_hi] = arr[offset:hi]
+        self._clearPoints(old_lo, old_hi)
+        self._points_in_chunks -= old_hi - old_lo
+        self._offset_and_size[id_num] = (new_offset, size)
+        return new_offset
+    # end def
+
+    def _maybeCompactPoints(self):
+        """Compact the point arrays when the free chunks outnumber the
+        allocated points.  Freed chunks are only reclaimed here so the cost
+        is amortized against the points allocated since the last compaction
+        """
+        wasted = self._points_end - self._points_in_chunks
+        if wasted <= max(self._points_in_chunks, DEFAULT_FULL_SIZE):
+            return
+        old_arrays = (self.axis_pts, self.fwd_pts, self.rev_pts, self.id_nums, self.indices)
+        self.axis_pts = np.full_like(self.axis_pts, np.inf)
+        self.fwd_pts = np.full_like(self.fwd_pts, np.inf)
+        self.rev_pts = np.full_like(self.rev_pts, np.inf)
+        self.id_nums = np.full_like(self.id_nums, -1)
+        self.indices = np.zeros_like(self.indices)
+        new_arrays = (self.axis_pts, self.fwd_pts, self.rev_pts, self.id_nums, self.indices)
+        offset_and_size = self._offset_and_size
+        point_chunks = self._point_chunks
+        new_lo = 0
+        for id_num, (chunk_lo, chunk_hi) in sorted(point_chunks.items(), key=lambda x: x[1]):
+            offset, size = offset_and_size[id_num]
+            new_offset = new_lo + offset - chunk_lo
+            for old_arr, new_arr in zip(old_arrays, new_arrays):
+                new_arr[new_offset:new_offset + size] = old_arr[offset:offset + size]
+            offset_and_size[id_num] = (new_offset, size)
+            point_chunks[id_num] = (new_lo, new_lo + chunk_hi - chunk_lo)
+            new_lo += chunk_hi - chunk_lo
+        self._points_end = new_lo
+    # end def
+
+    def _updatePointGrid(self, id_num):
+        """Reindex the axis points of a virtual helix in the spatial index
+        used by `queryBasePoint` and drop its cached crossover hits.  Call
+        after changing the coordinates or the size of a virtual helix
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        offset, size = self._offset_and_size[id_num]
+        self._point_grid.setIdNum(id_num, self.axis_pts[offset:offset + size])
+        self._invalidateCrossoverMap((id_num,))
     # end def
 
     def getDirections(self, id_nums):
@@ -985,6 +1286,7 @@ class NucleicAcidPart(Part):
         # 1. New id_num / virtual helix insert after all other points
         # expand offset and size as required
         self._resetOriginCache()
+        self._translate_cache = None
 
         len_offset_and_size = len(offset_and_size)
         number_of_new_elements = id_num - len_offset_and_size + 1
@@ -992,23 +1294,16 @@ class NucleicAcidPart(Part):
             offset_and_size += [None]*number_of_new_elements
             self.fwd_strandsets += [None]*number_of_new_elements
             self.rev_strandsets += [None]*number_of_new_elements
-        # find the next highest insertion offset
-        next_o = self.total_points
-        for next_o_and_s in offset_and_size[id_num + 1:]:
-            if next_o_and_s:
-                next_o, next_s = next_o_and_s
-                break
-        # this_offset = num_points
-        # print("total points", self.total_points, next_o, id_num)
-        offset_and_size[id_num] = (next_o, 0)
-        # the other offsets will be adjusted later
+        # allocate a chunk of the point arrays
+        self._maybeCompactPoints()
+        offset_and_size[id_num] = (self._allocPointChunk(id_num, num_points), 0)
+        # the points will be added later
 
         # 2. Assign origin on creation, resizing as needed
         len_origin_pts = len(self._origin_pts)
         if id_num >= len_origin_pts:
-            diff = id_num - len_origin_pts
-            number_of_new_elements = math.ceil(diff / DEFAULT_SIZE)*DEFAULT_SIZE
-            total_rows = len_origin_pts + number_of_new_elements
+            # grow geometrically to amortize the copies
+            total_rows = max(id_num + 1, 2*len_origin_pts)
             # resize adding zeros
             self._origin_pts.resize((total_rows, 2))
             self._origin_pts[len_origin_pts:] = np.inf
@@ -1016,10 +1311,10 @@ class NucleicAcidPart(Part):
             self.directions.resize((total_rows, 3))
             self.directions[len_origin_pts:] = 0  # unnecessary as resize fills with zeros
 
-            self.vh_properties = self.vh_properties.append(_defaultDataFrame(number_of_new_elements),
-                                                           ignore_index=True)
+            self.vh_properties.resize(total_rows)
 
         self._origin_pts[id_num] = origin[:2]
+        self._origin_tree.insert((id_num,), (origin[:2],))
         new_x, new_y = origin[:2]
         xLL, yLL, xUR, yUR = self.origin_limits
         if new_x < xLL:
@@ -1032,7 +1327,7 @@ class NucleicAcidPart(Part):
             yUR = new_y
         self.origin_limits = (xLL, yLL, xUR, yUR)
         self.directions[id_num] = direction
-        self.vh_properties.loc[id_num, ['name', 'color', 'length']] = "vh%d" % (id_num), color, num_points
+        self.vh_properties.set(id_num, ('name', 'color', 'length'), ("vh%d" % (id_num), color, num_points))
 
         if self.fwd_strandsets[id_num] is None:
             self.fwd_strandsets[id_num] = StrandSet(True, id_num, self, num_points)
@@ -1051,6 +1346,175 @@ class NucleicAcidPart(Part):
         return vh
     # end def
 
+    def _createHelices(self, id_nums, origins, num_points_list, color,
+                       keys=None, columns=None):
+        """Create many virtual helices in the group that have a Z_ONLY
+        direction.  The point arrays are grown once and the points of all
+        virtual helices are generated in one vectorized pass after the
+        properties are set so no virtual helix needs its coordinates reset
+
+        Args:
+            id_nums (list): of :obj:`int` virtual helix ID numbers
+            origins (array-like): (n, 3) of :obj:`float` origins referenced
+                from an index of 0
+            num_points_list (list): of :obj:`int` number of bases in each
+                virtual helix
+            color (str): hexadecimal color code in the form: `#RRGGBB`
+            keys (list): optional, of :obj:`str` property names
+            columns (list): optional, of :obj:`list` one list of values per
+                key in the order of `id_nums`
+
+        Returns:
+            list: of :obj:`VirtualHelix`
+
+        Raises:
+            IndexError:
+        """
+        offset_and_size = self._offset_and_size
+        for id_num in id_nums:
+            if self.getOffsetAndSize(id_num) is not None:
+                raise IndexError("id_num {} already exists".format(id_num))
+        if len(set(id_nums)) != len(id_nums):
+            raise IndexError("id_nums are not unique")
+        if not id_nums:
+            return []
+
+        for id_num in id_nums:
+            self._reserveIdNum(id_num)
+        self._resetOriginCache()
+        self._translate_cache = None
+        self._resetPointCache()
+
+        # 1. expand offset and size and origins as required
+        max_id_num = max(id_nums)
+        number_of_new_elements = max_id_num - len(offset_and_size) + 1
+        if number_of_new_elements > 0:
+            offset_and_size += [None]*number_of_new_elements
+            self.fwd_strandsets += [None]*number_of_new_elements
+            self.rev_strandsets += [None]*number_of_new_elements
+
+        len_origin_pts = len(self._origin_pts)
+        if max_id_num >= len_origin_pts:
+            total_rows = max(max_id_num + 1, 2*len_origin_pts)
+            self._origin_pts.resize((total_rows, 2))
+            self._origin_pts[len_origin_pts:] = np.inf
+            self.directions.resize((total_rows, 3))
+            self.directions[len_origin_pts:] = 0
+            self.vh_properties.resize(total_rows)
+
+        origins = np.asarray(origins, dtype=float).reshape((len(id_nums), 3))
+        self._origin_pts[id_nums] = origins[:, :2]
+        self._origin_tree.insert(id_nums, origins[:, :2])
+        xLL, yLL, xUR, yUR = self.origin_limits
+        self.origin_limits = (min(xLL, np.amin(origins[:, 0])),
+                              min(yLL, np.amin(origins[:, 1])),
+                              max(xUR, np.amax(origins[:, 0])),
+                              max(yUR, np.amax(origins[:, 1])))
+        self.directions[id_nums] = (0, 0, 1)
+
+        # 2. properties before points since the points depend on them
+        vh_properties = self.vh_properties
+        vh_properties.setColumns(id_nums, ('name', 'color', 'length'),
+                                 (["vh%d" % (id_num) for id_num in id_nums],
+                                  [color]*len(id_nums),
+                                  num_points_list))
+        if keys is not None:
+            vh_properties.setColumns(id_nums, keys, columns)
+
+        for id_num, num_points in zip(id_nums, num_points_list):
+            if self.fwd_strandsets[id_num] is None:
+                self.fwd_strandsets[id_num] = StrandSet(True, id_num, self, num_points)
+                self.rev_strandsets[id_num] = StrandSet(False, id_num, self, num_points)
+            else:
+                self.fwd_strandsets[id_num]._reset(num_points)
+                self.rev_strandsets[id_num]._reset(num_points)
+        self.total_id_nums += len(id_nums)
+
+        # 3. allocate all chunks at once
+        self._maybeCompactPoints()
+        self._reservePoints(sum(self._chunkCapacity(n) for n in num_points_list))
+        offsets = [self._allocPointChunk(id_num, n) for id_num, n in zip(id_nums, num_points_list)]
+        for id_num, offset, num_points in zip(id_nums, offsets, num_points_list):
+            offset_and_size[id_num] = (offset, num_points)
+
+        # 4. create points
+        axis_pts, fwd_pts, rev_pts, idxs = self._pointsAlongZ(id_nums, origins, num_points_list)
+        num_points_arr = np.asarray(num_points_list, dtype=int)
+        starts = np.cumsum(num_points_arr) - num_points_arr
+        dest = np.repeat(np.asarray(offsets, dtype=int) - starts, num_points_arr) + np.arange(len(idxs))
+        self.axis_pts[dest] = axis_pts
+        self.fwd_pts[dest] = fwd_pts
+        self.rev_pts[dest] = rev_pts
+        self.id_nums[dest] = np.repeat(id_nums, num_points_arr)
+        self.indices[dest] = idxs
+        self.total_points += len(idxs)
+
+        self._point_grid.setIdNums(id_nums, axis_pts, num_points_list)
+        self._invalidateCrossoverMap(id_nums)
+
+        vh_list = []
+        vh_order = self._group_properties['virtual_helix_order']
+        for id_num in id_nums:
+            vh_order.append(id_num)
+            self._virtual_helices_set[id_num] = vh = VirtualHelix(id_num, self)
+            vh_list.append(vh)
+        return vh_list
+    # end def
+
+    def _pointsAlongZ(self, id_nums, origins, num_points_list):
+        """Vectorized version of :meth:`_pointsFromDirection` for many virtual
+        helices with a Z_ONLY direction starting at index 0
+
+        Args:
+            id_nums (list): of :obj:`int` virtual helix ID numbers
+            origins (ndarray): (n, 3) of :obj:`float`
+            num_points_list (list): of :obj:`int` number of bases in each
+                virtual helix
+
+        Returns:
+            tuple: (coord_pts, fwd_pts, rev_pts, idxs) of the points of all
+            virtual helices concatenated in the order of `id_nums`, and the
+            index of each point in its virtual helix
+        """
+        rad = self._radius
+        BW = self._BASE_WIDTH
+        column = self.vh_properties.column
+        bpr = column('bases_per_repeat')[id_nums]
+        tpr = column('turns_per_repeat')[id_nums]
+        eulerZ = column('eulerZ')[id_nums]
+        mgroove = column('minor_groove_angle')[id_nums]
+        twist_per_base = np.radians(tpr*360./bpr)
+
+        num_points_arr = np.asarray(num_points_list, dtype=int)
+        total = int(num_points_arr.sum())
+        starts = np.cumsum(num_points_arr) - num_points_arr
+        idxs = np.arange(total) - np.repeat(starts, num_points_arr)
+
+        # right handed rotates clockwise with increasing index / z
+        fwd_angles = -idxs*np.repeat(twist_per_base, num_points_arr) + \
+            np.repeat(np.radians(eulerZ), num_points_arr)
+        rev_angles = fwd_angles + np.repeat(np.radians(mgroove), num_points_arr)
+        origin_pts = np.repeat(origins, num_points_arr, axis=0)
+        z_pts = BW*idxs.astype(float)
+
+        fwd_pts = np.empty((total, 3))
+        fwd_pts[:, 0] = rad*np.cos(fwd_angles)
+        fwd_pts[:, 1] = rad*np.sin(fwd_angles)
+        fwd_pts[:, 2] = z_pts
+        fwd_pts += origin_pts
+
+        rev_pts = np.empty((total, 3))
+        rev_pts[:, 0] = rad*np.cos(rev_angles)
+        rev_pts[:, 1] = rad*np.sin(rev_angles)
+        rev_pts[:, 2] = z_pts
+        rev_pts += origin_pts
+
+        coord_pts = np.zeros((total, 3))
+        coord_pts[:, 2] = z_pts
+        coord_pts += origin_pts
+        return coord_pts, fwd_pts, rev_pts, idxs
+    # end def
+
     def _pointsFromDirection(self, id_num, origin, direction, num_points, index):
         """Assumes always prepending or appending points.  no insertions.
         changes eulerZ of the id_num vh_properties as required for prepending
@@ -1069,12 +1533,12 @@ class NucleicAcidPart(Part):
         """
         rad = self._radius
         BW = self._BASE_WIDTH
-        hp, bpr, tpr, eulerZ, mgroove = self.vh_properties.loc[id_num,
+        hp, bpr, tpr, eulerZ, mgroove = self.vh_properties.get(id_num,
                                                                ['helical_pitch',
                                                                 'bases_per_repeat',
                                                                 'turns_per_repeat',
                                                                 'eulerZ',
-                                                                'minor_groove_angle']]
+                                                                'minor_groove_angle'])
         twist_per_base = tpr*360./bpr
         """
         + angle is CCW
@@ -1120,7 +1584,7 @@ class NucleicAcidPart(Part):
         np.add(np.dot(m, coord_pts.T, out=scratch).T, origin, out=coord_pts)
 
         if index < 0:
-            self.vh_properties.loc[id_num, 'eulerZ'] = math.degrees(eulerZ_new)
+            self.vh_properties.set(id_num, 'eulerZ', math.degrees(eulerZ_new))
 
         return (coord_pts, fwd_pts, rev_pts)
     # end def
@@ -1141,11 +1605,7 @@ class NucleicAcidPart(Part):
             # 1. Find insert indices
             if offset_and_size_tuple is None:
                 raise IndexError("id_num {} does not exists".format(id_num))
-        props = self.vh_properties.loc[id_num, keys]
-        if isinstance(props, pd.Series):
-            return [v.item() if isinstance(v, (np.float64, np.int64, np.bool_)) else v for v in props]
-        else:
-            return props.item() if isinstance(props, (np.float64, np.int64, np.bool_)) else props
+        return self.vh_properties.get(id_num, keys)
     # end
 
     def helixPropertiesAndOrigins(self, id_num_list=None):
@@ -1165,14 +1625,12 @@ class NucleicAcidPart(Part):
         """
         if id_num_list is None:
             lim = self._highest_id_num_used + 1
-            props = self.vh_properties.iloc[:lim]
-            props = props.to_dict(orient='list')
+            props = self.vh_properties.getRows(slice(0, lim))
             origins = self._origin_pts[:lim]
             return props, origins
         elif isinstance(id_num_list, list):
             # select by list of indices
-            props = self.vh_properties.iloc[id_num_list].reset_index(drop=True)
-            props = props.to_dict(orient='list')
+            props = self.vh_properties.getRows(id_num_list)
             origins = self._origin_pts[id_num_list]
             return props, origins
         else:
@@ -1200,11 +1658,7 @@ class NucleicAcidPart(Part):
             # 1. Find insert indices
             if offset_and_size_tuple is None:
                 raise IndexError("id_num {} does not exists".format(id_num))
-        series = self.vh_properties.loc[id_num]
-        # to_dict doesn't promote to python native types needed by QVariant
-        # leaves as numpy integers and floats
-        out = dict((k, v.item()) if isinstance(v, (np.float64, np.int64, np.bool_))
-                   else (k, v) for k, v in zip(series.index, series.tolist()))
+        out = self.vh_properties.getRow(id_num)
         if inject_extras:
             bpr = out['bases_per_repeat']
             tpr = out['turns_per_repeat']
@@ -1258,10 +1712,12 @@ class NucleicAcidPart(Part):
             # 1. Find insert indices
             if offset_and_size_tuple is None:
                 raise IndexError("id_num {} does not exists".format(id_num))
-        self.vh_properties.loc[id_num, keys] = values
+        self.vh_properties.set(id_num, keys, values)
 
         if not isinstance(values, (tuple, list)):
             keys, values = (keys,), (values,)
+        if not XOVER_PROPERTY_KEYS.isdisjoint(keys):
+            self._invalidateCrossoverMap((id_num,))
         if emit_signals:
             self.partVirtualHelixPropertyChangedSignal.emit(
                 self, id_num, self.getVirtualHelix(id_num), keys, values)
@@ -1342,7 +1798,7 @@ class NucleicAcidPart(Part):
             return
         _, final_size = self.getOffsetAndSize(id_num)
         # print("final_size", final_size)
-        self.vh_properties.loc[id_num, 'length'] = final_size
+        self.vh_properties.set(id_num, 'length', final_size)
         # print("New max:", self.vh_properties['length'].idxmax(),
         #         self.vh_properties['length'].max())
         # return 0, self.vh_properties['length'].idxmax()
@@ -1356,11 +1812,17 @@ class NucleicAcidPart(Part):
         Returns:
             tuple: of :obj:`int`, of form (ID_z_min, ID_z_max)
         """
-        test = self.axis_pts[:, 2]
-        id_z_min = self.id_nums[np.argmin(test)]
-        # use numpy masked arrays to mask out infinites
-        id_z_max = self.id_nums[np.argmax(np.ma.array(test,
-                                                      mask=np.isinf(test)))]
+        # virtual helices are straight so the z bounds of each are at its
+        # ends, no need to scan the slack of the point arrays
+        id_nums = [i for i, x in enumerate(self._offset_and_size) if x and x[1]]
+        if not id_nums:
+            return -1, -1
+        ends = np.array([self._offset_and_size[i] for i in id_nums])
+        z = self.axis_pts[:, 2]
+        z_first = z[ends[:, 0]]
+        z_last = z[ends[:, 0] + ends[:, 1] - 1]
+        id_z_min = id_nums[np.argmin(np.minimum(z_first, z_last))]
+        id_z_max = id_nums[np.argmax(np.maximum(z_first, z_last))]
         return id_z_min, id_z_max
     # end def
 
@@ -1439,10 +1901,13 @@ class NucleicAcidPart(Part):
         self.axis_pts[lo:hi] = new_axis_pts
         self.fwd_pts[lo:hi] = new_fwd_pts
         self.rev_pts[lo:hi] = new_rev_pts
+        self._resetPointCache()
+        self._updatePointGrid(id_num)
     # end def
 
     def _removeCoordinates(self, id_num, length, is_right):
-        """Remove coordinates given a length, reindex as necessary
+        """Remove coordinates given a length, reindex as necessary.  The
+        removed points become slack of the chunk of the virtual helix
 
         Args:
             id_num (int): virtual helix ID number
@@ -1475,51 +1940,21 @@ class NucleicAcidPart(Part):
         offset_and_size = self._offset_and_size
         current_offset_and_size_length = len(offset_and_size)
 
-        # 1. Move the good data
-        total_points = self.total_points
-        relocate_idx_end = total_points - length
-
-        axis_pts = self.axis_pts
-        try:
-            axis_pts[idx_start:relocate_idx_end] = axis_pts[idx_stop:total_points]
-        except:
-            err = "idx_start {}, relocate_idx_end {}, idx_stop {}, total_points {}, length {}"
-            print(err.format(idx_start, relocate_idx_end, idx_stop, total_points, length))
-            raise
-        axis_pts[relocate_idx_end:total_points] = np.inf
-
-        fwd_pts = self.fwd_pts
-        fwd_pts[idx_start:relocate_idx_end] = fwd_pts[idx_stop:total_points]
-        fwd_pts[relocate_idx_end:total_points] = np.inf
-
-        rev_pts = self.rev_pts
-        rev_pts[idx_start:relocate_idx_end] = rev_pts[idx_stop:total_points]
-        rev_pts[relocate_idx_end:total_points] = np.inf
-
-        id_nums = self.id_nums
-        id_nums[idx_start:relocate_idx_end] = id_nums[idx_stop:total_points]
-        id_nums[relocate_idx_end:total_points] = -1
-
-        indices = self.indices
-        indices[idx_start:relocate_idx_end] = indices[idx_stop:total_points]
-        indices[relocate_idx_end:total_points] = 0
+        # 1. Clear the removed points, nothing else moves
+        self._clearPoints(idx_start, idx_stop)
         if not is_right:
             # We need to adjust the base index
-            # lo offset index should not change for a given id_num
-            indices[lo:lo + length] -= length
-
-        # 2. Adjust the offsets of id_nums greater than id_num
-        for i, item in enumerate(offset_and_size[id_num + 1:], start=1):
-            if item is not None:
-                offset_other, size_other = item
-                offset_and_size[i + id_num] = (offset_other - length, size_other)
+            offset = idx_stop
+            self.indices[offset:hi] -= length
 
-        # 3. Check if we need to remove Virtual Helix
+        # 2. Check if we need to remove Virtual Helix
         if size == length:
             self.total_id_nums -= 1
             self._resetOriginCache()
+            self._translate_cache = None
             offset_and_size[id_num] = None
             self._origin_pts[id_num, :] = (np.inf, np.inf)  # set off to infinity
+            self._origin_tree.remove((id_num,))
             # trim the unused id_nums at the end
             remove_count = 0
             for i in range(current_offset_and_size_length - 1, id_num - 1, -1):
@@ -1528,10 +1963,15 @@ class NucleicAcidPart(Part):
                 else:
                     break
             self._offset_and_size = offset_and_size[:current_offset_and_size_length - remove_count]
+            self._freePointChunk(id_num)
+            self._point_grid.removeIdNum(id_num)
+            self._invalidateCrossoverMap((id_num,))
+            self._neighbors_cache.pop(id_num, None)
             did_remove = True
         else:
             # print("Did remove", size, length)
             offset_and_size[id_num] = (offset, size - length)
+            self._updatePointGrid(id_num)
             did_remove = False
         self.total_points -= length
         return did_remove
@@ -1565,26 +2005,36 @@ class NucleicAcidPart(Part):
     def _queryBasePoint(self, radius, point):
         """ return the indices of all virtual helices closer than radius
 
+        Only the index ranges of the candidate virtual helices found in the
+        `PointGrid` are tested, so the cost scales with the number of nearby
+        bases rather than with `total_points`
+
         Args:
             radius (float): distance to consider
             point (array-like): of :obj:`float` of length 3
 
         Returns:
-            tuple: of :obj:`ndarray`
+            tuple: of :obj:`ndarray`, (id_nums, indices) ordered by ID number
+            then index
         """
-        difference = self.axis_pts - point
-        ldiff = len(difference)
-        delta = self.delta3D_scratch
-        if ldiff != len(delta):
-            self.delta3D_scratch = delta = np.empty((ldiff,), dtype=float)
-
-        # compute square of distance to point
-        delta = inner1d(difference, difference, out=delta)
-        close_points, = np.where(delta < radius*radius)
-        # return list(zip(    np.take(self.id_nums, close_points),
-        #                     np.take(self.indices, close_points) ))
-        return (np.take(self.id_nums, close_points),
-                np.take(self.indices, close_points))
+        candidates = self._point_grid.query(point, radius)
+        rsquared = radius*radius
+        axis_pts = self.axis_pts
+        offset_and_size = self._offset_and_size
+        id_num_hits = []
+        index_hits = []
+        # sort to return hits in ID number order
+        for id_num in sorted(candidates):
+            idx_low, idx_high = candidates[id_num]
+            offset = offset_and_size[id_num][0]
+            difference = axis_pts[offset + idx_low:offset + idx_high + 1] - point
+            close_points, = np.where(inner1d(difference, difference) < rsquared)
+            if len(close_points) > 0:
+                id_num_hits.append(np.full(len(close_points), id_num, dtype=int))
+                index_hits.append(close_points + idx_low)
+        if not id_num_hits:
+            return np.empty((0,), dtype=int), np.empty((0,), dtype=int)
+        return np.concatenate(id_num_hits), np.concatenate(index_hits)
     # end def
 
     def queryVirtualHelixOrigin(self, radius, point):
@@ -1622,28 +2072,17 @@ class NucleicAcidPart(Part):
 
     def _queryVirtualHelixOrigin(self, radius, point):
         """Return the indices of all id_nums closer
-        than radius, sorted by distance
+        than radius, sorted by distance.  Only the origins in the leaves of
+        the `ArrayQuadtree` near `point` are tested
 
         Args:
             radius (float): distance to consider
-            point (array-like): of :obj:`float` of length 3
+            point (array-like): of :obj:`float` of length 2
 
         Returns:
             ndarray: close origin points to `point`
         """
-        difference = self._origin_pts - point
-        ldiff = len(difference)
-        delta = self.delta2D_scratch
-        if ldiff != len(delta):
-            self.delta2D_scratch = delta = np.empty((ldiff,), dtype=float)
-
-        # compute square of distance to point
-        inner1d(difference, difference, out=delta)
-        close_points, = np.where(delta <= radius*radius)
-        # take then sort the indices of the points in range
-        sorted_idxs = np.argsort(np.take(delta, close_points))
-
-        return close_points[sorted_idxs]
+        return self._origin_tree.queryPoint(point, radius)
     # end def
 
     def _queryVirtualHelixOriginRect(self, rect):
@@ -1660,18 +2099,7 @@ class NucleicAcidPart(Part):
         Returns:
             ndarray: list of ID numbers satisfying the query
         """
-        # search children
-        x1, y1, x2, y2 = rect
-        origin_pts = self._origin_pts
-        xs = origin_pts[:, 0]
-        ys = origin_pts[:, 1]
-        x_lo_mask = xs > x1
-        x_hi_mask = xs < x2
-        combo_x = np.logical_and(x_lo_mask, x_hi_mask)
-        np.logical_and(ys > y1, ys < y2, out=x_lo_mask)
-        np.logical_and(x_lo_mask, combo_x, out=x_hi_mask)
-        id_nums, = np.where(x_hi_mask)
-        return id_nums
+        return self._origin_tree.queryRect(rect)
     # end def
 
     def _queryIdNumRange(self, id_num, radius, index_slice=None):
@@ -1755,7 +2183,7 @@ class NucleicAcidPart(Part):
                 (start index, bases per repeat)
         """
         offset, size = self.getOffsetAndSize(id_num)
-        bpr = self.vh_properties.loc[id_num, 'bases_per_repeat']
+        bpr = self.vh_properties.get(id_num, 'bases_per_repeat')
         half_period = bpr // 2
         if size - index < bpr:
             start = size - bpr
@@ -1786,8 +2214,8 @@ class NucleicAcidPart(Part):
 
         """
         offset, size = self.getOffsetAndSize(id_num)
-        bpr, tpr = self.vh_properties.loc[id_num,
-                                          ['bases_per_repeat', 'turns_per_repeat']]
+        bpr, tpr = self.vh_properties.get(id_num,
+                                          ['bases_per_repeat', 'turns_per_repeat'])
         bases_per_turn = bpr / tpr
         if index is None:
             start, length = 0, size
@@ -1822,7 +2250,7 @@ class NucleicAcidPart(Part):
         key_prop_list = ['eulerZ', 'bases_per_repeat',
                          'turns_per_repeat', 'minor_groove_angle']
         for neighbor_id in neighbors:
-            eulerZ, bpr, tpr, mgroove = self.vh_properties.loc[neighbor_id, key_prop_list]
+            eulerZ, bpr, tpr, mgroove = self.vh_properties.get(neighbor_id, key_prop_list)
             twist_per_base = tpr*360./bpr
             half_period = math.floor(bpr / 2)
             tpb = math.radians(twist_per_base)
@@ -1926,11 +2354,14 @@ class NucleicAcidPart(Part):
         """Get indices of all virtual helices phosphates within a bond
         length of each phosphate for the id_num Virtual Helix.
 
+        The hits of each (id_num, neighbor_id) pair are cached for the whole
+        virtual helix, see `prebuildCrossoverMap`
+
         Args:
             id_num (int): virtual helix ID number
             neighbors (array-like): neighbors of id_num
-            index_slice (tuple):  optional, of :obj:`int` (start_index, length) into a virtual
-                helix
+            index (int):  optional, index into the virtual helix to limit the
+                query to a window of `bases_per_repeat` bases around
 
         Returns:
             dict: of :obj:`tuple` of form::
@@ -1949,9 +2380,7 @@ class NucleicAcidPart(Part):
             raise ValueError("offset_and_size is None for {}".format(id_num))
         else:
             offset, size = offset_and_size
-        bpr, tpr = self.vh_properties.loc[id_num,
-                                          ['bases_per_repeat', 'turns_per_repeat']]
-        bases_per_turn = bpr / tpr
+        bpr = int(self.vh_properties.get(id_num, 'bases_per_repeat'))
         if index is None:
             start, length = 0, size
         else:
@@ -1960,24 +2389,138 @@ class NucleicAcidPart(Part):
                 start, length = size - bpr, bpr
             else:
                 start, length = max(index - half_period, 0), bpr
-        # norm = np.linalg.norm
-        # cross = np.cross
-        # dot = np.dot
-        # normalize = self.normalize
+        end = start + length
+
+        per_neighbor_hits = {}
+
+        fwd_axis_pairs = {}
+        rev_axis_pairs = {}
+        isAGreaterThanB_Z = self.isAGreaterThanB_Z
+
+        for neighbor_id in neighbors:
+            fwd_axis_hits, rev_axis_hits = self._getNeighborHits(id_num, neighbor_id, start, end)
+
+            # Scan for pairs of bases in AP xovers
+            idx_last = -2
+            fwd_axis_pairs = {}
+            for i, f_idxs, r_idxs in fwd_axis_hits:
+                if r_idxs:
+                    if idx_last + 1 == i:
+                        # print("pair", idx_last, i)
+                        fwd_axis_pairs[idx_last] = (True, neighbor_id)  # 5 prime  most strand
+                        fwd_axis_pairs[i] = (False, neighbor_id)        # 3 prime most strand
+                    idx_last = i
+                if f_idxs:
+                    for idxB in f_idxs:
+                        if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
+                            fwd_axis_pairs[i] = (False, neighbor_id)
+                        else:
+                            fwd_axis_pairs[i] = (True, neighbor_id)
+
+            # Scan for pairs of bases in AP xovers
+            idx_last = -2
+            for i, f_idxs, r_idxs in rev_axis_hits:
+                if f_idxs:
+                    if idx_last + 1 == i:
+                        # print("pair", idx_last, i)
+                        rev_axis_pairs[idx_last] = (False, neighbor_id)    # 3 prime  most strand
+                        rev_axis_pairs[i] = (True, neighbor_id)            # 5 prime most strand
+                    idx_last = i
+                if r_idxs:
+                    for idxB in r_idxs:
+                        if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
+                            rev_axis_pairs[i] = (True, neighbor_id)
+                        else:
+                            rev_axis_pairs[i] = (False, neighbor_id)
+
+            per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
+        # end for
+        return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+    # end def
+
+    def _getNeighborHits(self, id_num, neighbor_id, start, end):
+        """Get the crossover hits of a virtual helix on one of its neighbors
+        in an index range, computing and caching the hits of the whole
+        virtual helix if required
+
+        Args:
+            id_num (int): virtual helix ID number
+            neighbor_id (int): ID number of the neighbor
+            start (int): first index of the range
+            end (int): index past the end of the range
+
+        Returns:
+            tuple: of :obj:`list`, (fwd_axis_hits, rev_axis_hits) of the
+            form returned by `_pairwiseHits`
+        """
+        key = (id_num, neighbor_id)
+        entry = self._xover_cache.get(key)
+        if entry is None:
+            version = self._xover_cache_version
+            entry = self._computeNeighborHits(id_num, neighbor_id)
+            self._storeNeighborHits(key, entry, version)
+        fwd_axis_hits, fwd_idxs, rev_axis_hits, rev_idxs = entry
+        return (fwd_axis_hits[bisect_left(fwd_idxs, start):bisect_left(fwd_idxs, end)],
+                rev_axis_hits[bisect_left(rev_idxs, start):bisect_left(rev_idxs, end)])
+    # end def
+
+    def _crossoverGeometry(self, id_num):
+        """Get what the crossover hits of a virtual helix are computed from
+
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            tuple: (fwd_pts, rev_pts, bases_per_turn) with views onto the
+            point arrays
+        """
+        offset, size = self.getOffsetAndSize(id_num)
+        bpr, tpr = self.vh_properties.get(id_num,
+                                          ['bases_per_repeat', 'turns_per_repeat'])
+        return (self.fwd_pts[offset:offset + size],
+                self.rev_pts[offset:offset + size],
+                bpr / tpr)
+    # end def
+
+    def _computeNeighborHits(self, id_num, neighbor_id):
+        """Compute the crossover hits of every base of a virtual helix on one
+        of its neighbors
+
+        Args:
+            id_num (int): virtual helix ID number
+            neighbor_id (int): ID number of the neighbor
+
+        Returns:
+            tuple: of form::
+
+                (fwd_axis_hits, fwd_idxs, rev_axis_hits, rev_idxs)
+
+            where the hits lists are of the form returned by `_pairwiseHits`
+            and the idxs lists are the indices of each hit for bisection
+        """
+        nfwd_pts, nrev_pts, _ = self._crossoverGeometry(neighbor_id)
+        return self._neighborHits(self._crossoverGeometry(id_num), nfwd_pts, nrev_pts)
+    # end def
+
+    def _neighborHits(self, geometry, nfwd_pts, nrev_pts):
+        """Compute the crossover hits of every base of a virtual helix on one
+        of its neighbors from their points only, so it can run on a snapshot
+        of the points away from the main thread
+
+        Args:
+            geometry (tuple): of the virtual helix as returned by
+                `_crossoverGeometry`
+            nfwd_pts (ndarray): (m, 3) fwd points of the neighbor
+            nrev_pts (ndarray): (m, 3) rev points of the neighbor
+
+        Returns:
+            tuple: as returned by `_computeNeighborHits`
+        """
+        this_fwd_pts, this_rev_pts, bases_per_turn = geometry
         PI = math.pi
-        # TWOPI = 2*PI
         RADIUS = self._radius
         BW = self._BASE_WIDTH
 
-        # theta, radius = self.radiusForAngle(alpha, RADIUS, bases_per_turn, BW)
-        # convert to a list since we can't speed this loop up without cython or something
-        # axis_pts = self.axis_pts
-        fwd_pts = self.fwd_pts
-        rev_pts = self.rev_pts
-        # this_axis_pts = axis_pts[offset + start:offset + start + length].tolist()
-        this_fwd_pts = fwd_pts[offset + start:offset + start + length].tolist()
-        this_rev_pts = rev_pts[offset + start:offset + start + length].tolist()
-
         """TODO: decide how we want to handle maintaining bond length
         ideal adjacent ANTI-PARALLEL xover strands project to a plane normal
         to the helical axis and point in the SAME direction
@@ -2015,106 +2558,96 @@ class NucleicAcidPart(Part):
         rsquared_p = r2_tangent + r2_radial + r2_axial
         rsquared_p_min = r2_axial
         rsquared_p_max = rsquared_p + 0.25*r2_axial
-        per_neighbor_hits = {}
-
-        fwd_axis_pairs = {}
-        rev_axis_pairs = {}
-
-        for neighbor_id in neighbors:
-            offset, size = self.getOffsetAndSize(neighbor_id)
 
-            # 1. Finds points that point at neighbors axis point
-            nfwd_pts = fwd_pts[offset:offset + size]
-            nrev_pts = rev_pts[offset:offset + size]
-
-            # direction = self.directions[neighbor_id]
-            len_neighbor_pts = len(nfwd_pts)
-            delta = self.delta3D_scratch
-            if len_neighbor_pts != len(delta):
-                self.delta3D_scratch = delta = np.empty((len_neighbor_pts,), dtype=float)
+        # the bounds of both types of hits and the largest possible distance
+        # of a hit
+        p_bounds = (rsquared_p_min, rsquared_p_max, 0.3*r2_axial, 1.1*r2_axial)
+        ap_bounds = (rsquared_ap_min, rsquared_ap_max, -1., 0.3*r2_axial)
+        max_dist = math.sqrt(max(rsquared_p_max, rsquared_ap_max))
 
-            fwd_axis_hits = []
-            for i, point in enumerate(this_fwd_pts):
-                difference = nfwd_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                f_idxs = np.where((delta > rsquared_p_min) &
-                                  (delta < rsquared_p_max) &
-                                  (zdelta > 0.3*r2_axial) &
-                                  (zdelta < 1.1*r2_axial)
-                                  )[0].tolist()
-                difference = nrev_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                r_idxs = np.where((delta > rsquared_ap_min) &
-                                  (delta < rsquared_ap_max) &
-                                  (zdelta < 0.3*r2_axial))[0].tolist()
-                if f_idxs or r_idxs:
-                    fwd_axis_hits.append((start + i, f_idxs, r_idxs))
-            # end for
+        # assume there is only one possible index of intersection with the neighbor
+        fwd_axis_hits = self._pairwiseHits(0, this_fwd_pts, nfwd_pts, nrev_pts,
+                                           p_bounds, ap_bounds, max_dist)
+        rev_axis_hits = self._pairwiseHits(0, this_rev_pts, nfwd_pts, nrev_pts,
+                                           ap_bounds, p_bounds, max_dist)
+        return (fwd_axis_hits, [x[0] for x in fwd_axis_hits],
+                rev_axis_hits, [x[0] for x in rev_axis_hits])
+    # end def
 
-            # Scan for pairs of bases in AP xovers
-            idx_last = -2
-            fwd_axis_pairs = {}
-            isAGreaterThanB_Z = self.isAGreaterThanB_Z
-            for i, f_idxs, r_idxs in fwd_axis_hits:
-                if r_idxs:
-                    if idx_last + 1 == i:
-                        # print("pair", idx_last, i)
-                        fwd_axis_pairs[idx_last] = (True, neighbor_id)  # 5 prime  most strand
-                        fwd_axis_pairs[i] = (False, neighbor_id)        # 3 prime most strand
-                    idx_last = i
-                if f_idxs:
-                    for idxB in f_idxs:
-                        if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
-                            fwd_axis_pairs[i] = (False, neighbor_id)
-                        else:
-                            fwd_axis_pairs[i] = (True, neighbor_id)
+    @staticmethod
+    def _pairwiseHits(start, pts, nfwd_pts, nrev_pts, fwd_bounds, rev_bounds, max_dist):
+        """Find the fwd and rev points of a neighboring virtual helix that are
+        at crossover distance of each of `pts`.
 
-            rev_axis_hits = []
-            for i, point in enumerate(this_rev_pts):
-                difference = nfwd_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                f_idxs = np.where((delta > rsquared_ap_min) &
-                                  (delta < rsquared_ap_max) &
-                                  (zdelta < 0.3*r2_axial))[0].tolist()
+        The distances of a block of `pts` to both strands of the neighbor are
+        computed in a single broadcast.  No hit can be further than `max_dist`
+        in z, so only the band of neighbor points within `max_dist` of the
+        block's z range is compared.
 
-                difference = nrev_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                r_idxs = np.where((delta > rsquared_p_min) &
-                                  (delta < rsquared_p_max) &
-                                  (zdelta > 0.3*r2_axial) &
-                                  (zdelta < 1.1*r2_axial)
-                                  )[0].tolist()
-                if f_idxs or r_idxs:
-                    rev_axis_hits.append((start + i, f_idxs, r_idxs))
-            # end for
+        Args:
+            start (int): index of the first point of `pts`
+            pts (ndarray): (n, 3) points of the active virtual helix
+            nfwd_pts (ndarray): (m, 3) fwd points of the neighbor
+            nrev_pts (ndarray): (m, 3) rev points of the neighbor
+            fwd_bounds (tuple): of :obj:`float` exclusive bounds
+                (rsquared_min, rsquared_max, zsquared_min, zsquared_max)
+                of a hit in `nfwd_pts`
+            rev_bounds (tuple): same as `fwd_bounds` for `nrev_pts`
+            max_dist (float): maximum distance of a hit
 
-            # Scan for pairs of bases in AP xovers
-            idx_last = -2
-            for i, f_idxs, r_idxs in rev_axis_hits:
-                if f_idxs:
-                    if idx_last + 1 == i:
-                        # print("pair", idx_last, i)
-                        rev_axis_pairs[idx_last] = (False, neighbor_id)    # 3 prime  most strand
-                        rev_axis_pairs[i] = (True, neighbor_id)            # 5 prime most strand
-                    idx_last = i
-                if r_idxs:
-                    for idxB in r_idxs:
-                        if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
-                            rev_axis_pairs[i] = (True, neighbor_id)
-                        else:
-                            rev_axis_pairs[i] = (False, neighbor_id)
+        Returns:
+            list: of :obj:`tuple` of form::
 
-            per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
-        # end for
-        return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+                [(index, forward_neighbor_idxs, reverse_neighbor_idxs), ...]
+        """
+        BLOCK_SIZE = 32
+        # (m, 2, 3) fwd and rev point of each neighbor index
+        n_pts = np.stack((nfwd_pts, nrev_pts), axis=1)
+        rsq_min, rsq_max, zsq_min, zsq_max = np.array((fwd_bounds, rev_bounds)).T
+        n_z_lo = np.minimum(nfwd_pts[:, 2], nrev_pts[:, 2])
+        n_z_hi = np.maximum(nfwd_pts[:, 2], nrev_pts[:, 2])
+        # virtual helices usually run up the z axis so the band can be found
+        # with a binary search
+        is_sorted = bool(np.all(n_z_lo[1:] >= n_z_lo[:-1]) and
+                         np.all(n_z_hi[1:] >= n_z_hi[:-1]))
+
+        hits = []
+        for block_start in range(0, len(pts), BLOCK_SIZE):
+            block = pts[block_start:block_start + BLOCK_SIZE]
+            block_z = block[:, 2]
+            z_lo, z_hi = block_z.min() - max_dist, block_z.max() + max_dist
+            if is_sorted:
+                band_lo = int(np.searchsorted(n_z_hi, z_lo, side='left'))
+                band_hi = int(np.searchsorted(n_z_lo, z_hi, side='right'))
+                band = None
+                band_pts = n_pts[band_lo:band_hi]
+            else:
+                band, = np.where((n_z_hi >= z_lo) & (n_z_lo <= z_hi))
+                band_pts = n_pts[band]
+            if len(band_pts) == 0:
+                continue
+
+            difference = band_pts - block[:, np.newaxis, np.newaxis, :]
+            zdelta = np.square(difference[..., 2])
+            delta = (np.square(difference[..., 0]) +
+                     np.square(difference[..., 1]) +
+                     zdelta)
+            rows, cols, strands = np.where((delta > rsq_min) &
+                                           (delta < rsq_max) &
+                                           (zdelta > zsq_min) &
+                                           (zdelta < zsq_max))
+            if band is None:
+                idxs = (cols + band_lo).tolist()
+            else:
+                idxs = band[cols].tolist()
+            idx_hits = {}
+            for i, idx, j in zip(rows.tolist(), idxs, strands.tolist()):
+                hit = idx_hits.get(i)
+                if hit is None:
+                    idx_hits[i] = hit = (start + block_start + i, [], [])
+                hit[j + 1].append(idx)
+            hits += [idx_hits[i] for i in sorted(idx_hits)]
+        return hits
     # end def
 
     @staticmethod
@@ -2297,7 +2830,7 @@ class NucleicAcidPart(Part):
 
 
         """
-        neighbors = literal_eval(self.vh_properties.loc[id_num, 'neighbors'])
+        neighbors = self._getNeighbors(id_num)
         # alpha = self.getProperty('crossover_span_angle')
 
         # idx = None # FORCE this for now to prevent animation GC crashes
@@ -2308,6 +2841,91 @@ class NucleicAcidPart(Part):
         return per_neighbor_hits
 
     # end def
+
+    def _getNeighbors(self, id_num):
+        """Get the neighbors of a virtual helix, only parsing the `neighbors`
+        property when it has changed
+
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            list: of :obj:`int` neighbor ID numbers
+        """
+        neighbors_str = self.vh_properties.get(id_num, 'neighbors')
+        cached = self._neighbors_cache.get(id_num)
+        if cached is None or cached[0] != neighbors_str:
+            cached = (neighbors_str, literal_eval(neighbors_str))
+            self._neighbors_cache[id_num] = cached
+        return cached[1]
+    # end def
+
+    def prebuildCrossoverMap(self, id_nums=None, background=False):
+        """Compute and cache the crossover hits of virtual helices on all
+        their neighbors so that `potentialCrossoverMap` only has to look
+        them up.
+
+        In the background the hits are computed from copies of the points
+        taken on the calling thread, since the point arrays are changed and
+        reallocated by edits, and entries computed while the part changes
+        are discarded
+
+        Args:
+            id_nums (iterable): optional, of :obj:`int` virtual helix ID
+                numbers, defaults to all virtual helices
+            background (bool): optional, compute in a daemon thread
+
+        Returns:
+            threading.Thread: the worker thread if `background` is True
+            otherwise :obj:`None`
+        """
+        if id_nums is None:
+            id_nums = sorted(self.reserved_ids)
+        else:
+            id_nums = list(id_nums)
+        keys = [(id_num, neighbor_id)
+                for id_num in id_nums if id_num in self.reserved_ids
+                for neighbor_id in self._getNeighbors(id_num)
+                if (neighbor_id in self.reserved_ids and
+                    (id_num, neighbor_id) not in self._xover_cache)]
+        if not background:
+            for id_num, neighbor_id in keys:
+                self._getNeighborHits(id_num, neighbor_id, 0, 0)
+            return None
+
+        version = self._xover_cache_version
+        snapshot = {}
+        for key in keys:
+            for id_num in key:
+                if id_num not in snapshot:
+                    fwd_pts, rev_pts, bases_per_turn = self._crossoverGeometry(id_num)
+                    snapshot[id_num] = (fwd_pts.copy(), rev_pts.copy(), bases_per_turn)
+        thread = threading.Thread(target=self._prebuildCrossoverMapSnapshot,
+                                  args=(keys, snapshot, version),
+                                  name="prebuildCrossoverMap",
+                                  daemon=True)
+        thread.start()
+        return thread
+    # end def
+
+    def _prebuildCrossoverMapSnapshot(self, keys, snapshot, version):
+        """Worker of `prebuildCrossoverMap`, only touching the part to store
+        entries, which is skipped once the part has changed
+
+        Args:
+            keys (list): of :obj:`tuple` (id_num, neighbor_id) to compute
+            snapshot (dict): of :obj:`int` ID number:
+                `_crossoverGeometry` of copied points
+            version (int): `_xover_cache_version` of the snapshot
+        """
+        for id_num, neighbor_id in keys:
+            if version != self._xover_cache_version:
+                return
+            nfwd_pts, nrev_pts, _ = snapshot[neighbor_id]
+            entry = self._neighborHits(snapshot[id_num], nfwd_pts, nrev_pts)
+            self._storeNeighborHits((id_num, neighbor_id), entry, version)
+    # end def
+
     def boundDimensions(self, scale_factor=1.0):
         """Returns a tuple of rectangle definining the XY limits of a part"""
         DMIN = 10  # 30
@@ -2323,17 +2941,64 @@ class NucleicAcidPart(Part):
         return xLL * scale_factor, yLL * scale_factor, xUR * scale_factor, yUR * scale_factor
     # end def
 
-    def getSequences(self):
-        """getSequences"""
-        # s = "Start\tEnd\tColor\tMod5\tSequence\tMod3\tAbstractSequence\n"
-        keys = ['Start','End','Color', 'Mod5',
-                'Sequence','Mod3','AbstractSequence']
-        out = {key: [] for key in keys}
+    def getSequences(self, fmt='csv', sort=False, dedupe=False):
+        """Get the sequence export of every oligo as a string
+
+        Args:
+            fmt (:obj:`str`, optional): see `writeSequences`, default='csv'
+            sort (:obj:`bool`, optional): see `writeSequences`, default=False
+            dedupe (:obj:`bool`, optional): see `writeSequences`, default=False
+
+        Returns:
+            str:
+        """
+        f = io.StringIO()
+        self.writeSequences(f, fmt=fmt, sort=sort, dedupe=dedupe)
+        return f.getvalue()
+    # end def
+
+    def writeSequences(self, f, fmt='csv', sort=False, dedupe=False):
+        """Write the sequence export of every oligo to a file object, a row
+        at a time as the oligos are visited
+
+        Args:
+            f (file): text file object
+            fmt (:obj:`str`, optional): one of
+                `sequenceexport.EXPORT_FORMATS`, 'csv', 'tsv', 'plate96' or
+                'plate384', default='csv'
+            sort (:obj:`bool`, optional): order the oligos by their 5' end,
+                default=False
+            dedupe (:obj:`bool`, optional): skip oligos with a sequence already
+                written, default=False
+
+        Returns:
+            int: the number of rows written
+        """
+        return writeSequences(f, self.iterSequenceRows(), fmt=fmt, sort=sort, dedupe=dedupe)
+    # end def
+
+    def iterSequenceRows(self):
+        """Iterate the rows of the sequence export of every oligo
+
+        Yields:
+            tuple: of :obj:`str` in `SEQUENCE_EXPORT_KEYS` order
+        """
+        for oligo in self._oligos:
+            yield oligo.sequenceRow()
+    # end def
+
+    def getSequenceTable(self):
+        """Get the columns of the sequence export of every oligo
+
+        Returns:
+            dict: of :obj:`list` of :obj:`str` keyed by the names in
+            `SEQUENCE_EXPORT_KEYS`
+        """
+        out = {key: [] for key in SEQUENCE_EXPORT_KEYS}
         for oligo in self._oligos:
             oligo.sequenceExport(out)
-        df = pd.DataFrame(out, columns=keys)
-        s = df.to_csv(index=False)
-        return s
+        return out
+    # end def
 
     def getIdNums(self):
         """return the set of all ids used"""
@@ -2469,6 +3134,37 @@ class NucleicAcidPart(Part):
         util.doCmd(self, c, use_undostack=use_undostack)
     # end def
 
+    def createVirtualHelices(self, origins, zs, lengths, id_nums=None,
+                             properties=None, property_columns=None,
+                             safe=True, use_undostack=True):
+        """Create many new VirtualHelix by calling CreateVirtualHelicesCommand.
+        The coordinates of all virtual helices are allocated and generated at
+        once and a single `partVirtualHelicesAddedSignal` is emitted.  Use
+        this for bulk operations such as file import.
+
+        Args:
+            origins (list): of (x, y) :obj:`tuple` of :obj:`float`
+            zs (list): of :obj:`float` z coordinates
+            lengths (list): of :obj:`int` sizes of the virtual helices
+            id_nums (list): optional, of :obj:`int` ID numbers.  New ID numbers
+                are assigned if None
+            properties (tuple): Tuple of two lists: `keys` and `values`, where
+                `values` contains one list of values per VirtualHelix matching
+                the order of `keys`
+            property_columns (tuple): optional, in place of `properties`,
+                Tuple of `keys` and `columns`, where `columns` contains one
+                list or :obj:`ndarray` of values per key in the order of the
+                virtual helices, as read from a columnar file
+            safe (bool): Update neighbors otherwise,
+                neighbors need to be explicitly updated
+            use_undostack (bool): Set to False to disable undostack
+        """
+        c = CreateVirtualHelicesCommand(self, origins, zs, lengths, id_nums=id_nums,
+                                        properties=properties,
+                                        property_columns=property_columns, safe=safe)
+        util.doCmd(self, c, use_undostack=use_undostack)
+    # end def
+
     def removeVirtualHelix(self, id_num, use_undostack=True):
         """Removes a VirtualHelix from the model. Accepts a reference to the
         VirtualHelix, or a (row,col) lattice coordinate to perform a lookup.
@@ -2486,6 +3182,52 @@ class NucleicAcidPart(Part):
             c.redo()
     # end def
 
+    def importStrands(self, strands, xovers, allow_reordering=False, use_undostack=False):
+        """Create many deserialized strands and the crossovers between them
+        in one pass by calling ImportStrandsCommand.  Strands, their
+        connections and oligos are built at once and segments are refreshed
+        once per virtual helix.  Use this for bulk operations such as file
+        import instead of calling `createDeserializedStrand` and
+        `createXover` per item.
+
+        Crossovers that do not join the 3' end of one new strand to the 5'
+        end of another new strand are installed with `createXover`
+
+        Args:
+            strands (dict): of form::
+
+                    {(id_num, is_fwd): [(idx_low, idx_high, color), ...], ...}
+
+                where color may be None for the part color
+            xovers (list): of :obj:`tuple` of form::
+
+                    (from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx)
+
+                where `from_idx` is the 3' end of the 5' strand and `to_idx`
+                is the 5' end of the 3' strand
+            allow_reordering (bool): accept crossovers listed in reverse, see
+                `createXover`
+            use_undostack (bool): Set to False to disable undostack
+        """
+        if use_undostack:
+            self.undoStack().beginMacro("Import strands")
+        c = ImportStrandsCommand(self, strands, xovers, allow_reordering=allow_reordering)
+        util.doCmd(self, c, use_undostack=use_undostack)
+        unlinked_xovers = c.unlinkedXovers()
+        for from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx in unlinked_xovers:
+            from_strand = self.getStrand(from_is_fwd, from_id, from_idx)
+            to_strand = self.getStrand(to_is_fwd, to_id, to_idx)
+            self.createXover(from_strand, from_idx,
+                             to_strand, to_idx,
+                             allow_reordering=allow_reordering,
+                             update_oligo=use_undostack,
+                             use_undostack=use_undostack)
+        if use_undostack:
+            self.undoStack().endMacro()
+        elif unlinked_xovers:
+            RefreshOligosCommand(self).redo()
+    # end def
+
     def createXover(self, strand5p, idx5p, strand3p, idx3p,
             update_oligo=True, allow_reordering=False, use_undostack=True):
         """Xovers are ALWAYS installed FROM the 3' end of the 5' most
@@ -2714,7 +3456,7 @@ class NucleicAcidPart(Part):
     # end def
 
     def setVirtualHelixSize(self, id_num, new_size, use_undostack=True):
-        old_size = self.vh_properties.loc[id_num, 'length']
+        old_size = self.vh_properties.get(id_num, 'length')
         delta = new_size - old_size
         if delta > 0:
             c = ResizeVirtualHelixCommand(self, id_num, True, delta)
@@ -2737,6 +3479,81 @@ class NucleicAcidPart(Part):
             self._translateVirtualHelices(vh_set, dx, dy, dz, False)
     # end def
 
+    def beginTranslatePreview(self, vh_set):
+        """Start previewing a translation of virtual helices, like a drag in
+        the slice view.  The views move their items while the model is left
+        alone, so no coordinates, caches or neighbors are updated and no
+        signals are emitted until `endTranslatePreview`
+
+        Args:
+            vh_set (set): of :obj:`int` virtual helix ID numbers
+        """
+        self._translate_preview = [set(vh_set), 0., 0., 0.]
+    # end def
+
+    def previewTranslateVirtualHelices(self, dx, dy, dz):
+        """Add a step to the translation being previewed
+
+        Args:
+            dx (float): delta x
+            dy (float): delta y
+            dz (float): delta z
+
+        Raises:
+            ValueError: no translation is being previewed
+        """
+        preview = self._translate_preview
+        if preview is None:
+            raise ValueError("previewTranslateVirtualHelices: no preview, "
+                             "call beginTranslatePreview first")
+        preview[1] += dx
+        preview[2] += dy
+        preview[3] += dz
+    # end def
+
+    def translatePreview(self):
+        """
+        Returns:
+            tuple: (vh_set, dx, dy, dz) of the translation being previewed
+            or None
+        """
+        preview = self._translate_preview
+        return None if preview is None else tuple(preview)
+    # end def
+
+    def endTranslatePreview(self, commit=True, use_undostack=True, threshold=0.):
+        """Stop previewing a translation and apply it to the model as a
+        single translation
+
+        Args:
+            commit (bool): optional, apply the translation or drop it
+            use_undostack (bool): optional, push one command for the whole
+                translation
+            threshold (float): optional, drop translations with every delta
+                at most this large
+
+        Returns:
+            bool: whether the model was translated
+        """
+        preview = self._translate_preview
+        self._translate_preview = None
+        if preview is None or not commit:
+            return False
+        vh_set, dx, dy, dz = preview
+        vh_set = {id_num for id_num in vh_set if id_num in self.reserved_ids}
+        if not vh_set or max(abs(dx), abs(dy), abs(dz)) <= threshold:
+            return False
+        c = TranslateVirtualHelicesCommand(self, vh_set, dx, dy, dz)
+        if use_undostack:
+            undo_stack = self.undoStack()
+            undo_stack.beginMacro("Translate VHs")
+            undo_stack.push(c)
+            undo_stack.endMacro()
+        else:
+            self._translateVirtualHelices(vh_set, dx, dy, dz, False)
+        return True
+    # end def
+
     def _translateVirtualHelices(self, vh_set, dx, dy, dz, do_deselect):
         """
         do_deselect tells a view to clear selections that might have
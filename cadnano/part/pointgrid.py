@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import defaultdict
+
+import numpy as np
+
+
+class PointGrid(object):
+    """Uniform grid spatial index over the per base points of a
+    :class:`NucleicAcidPart`.
+
+    Points are bucketed into cubic cells of edge `cell_size`.  Entries are
+    stored by virtual helix ID number and base index rather than by offset
+    into the coordinate arrays so that resizing one virtual helix does not
+    invalidate the entries of any other.  Each cell looks like::
+
+        cells[(i, j, k)] = {id_num: (idx_low, idx_high), ...}
+
+    Since virtual helices are straight, the bases of a virtual helix that fall
+    in a given cell form one contiguous range of indices.
+
+    The cell of a coordinate is ``floor(coordinate / cell_size)`` everywhere,
+    which is several times faster over arrays than `np.floor_divide`.
+
+    Args:
+        cell_size (float): edge length of a cell in nanometers
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(dict)
+        self.id_num_cells = {}
+    # end def
+
+    def __len__(self):
+        return len(self.id_num_cells)
+    # end def
+
+    def copy(self):
+        """Copy the index
+
+        Returns:
+            PointGrid: a new copy of this grid
+        """
+        new_grid = PointGrid(self.cell_size)
+        for key, cell in self.cells.items():
+            new_grid.cells[key] = cell.copy()
+        new_grid.id_num_cells = {k: v.copy() for k, v in self.id_num_cells.items()}
+        return new_grid
+    # end def
+
+    def cellKeys(self, points):
+        """
+        Args:
+            points (ndarray): (n, 3) array of points
+
+        Returns:
+            ndarray: (n, 3) :obj:`int` array of the cell of each point
+        """
+        return np.floor(points / self.cell_size).astype(int)
+    # end def
+
+    def removeIdNum(self, id_num):
+        """Remove all entries of a virtual helix from the index
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        cells = self.cells
+        for key in self.id_num_cells.pop(id_num, ()):
+            cell = cells[key]
+            del cell[id_num]
+            if not cell:
+                del cells[key]
+    # end def
+
+    def setIdNum(self, id_num, points):
+        """Replace all entries of a virtual helix in the index
+
+        Args:
+            id_num (int): virtual helix ID number
+            points (ndarray): (n, 3) array of the points of the virtual helix
+                in index order
+        """
+        self.removeIdNum(id_num)
+        num_points = len(points)
+        if num_points == 0:
+            return
+        keys = self.cellKeys(points)
+
+        # find the runs of consecutive points in the same cell
+        is_new_cell = np.any(keys[1:] != keys[:-1], axis=1)
+        starts = np.concatenate(([0], np.nonzero(is_new_cell)[0] + 1))
+        ends = np.append(starts[1:] - 1, num_points - 1)
+
+        cells = self.cells
+        keys = keys[starts].tolist()
+        key_list = []
+        for key, start, end in zip(keys, starts.tolist(), ends.tolist()):
+            key = tuple(key)
+            cell = cells[key]
+            idx_range = cell.get(id_num)
+            if idx_range is None:
+                cell[id_num] = (start, end)
+                key_list.append(key)
+            else:
+                # should not happen for straight helices, but be safe
+                cell[id_num] = (min(idx_range[0], start), max(idx_range[1], end))
+        self.id_num_cells[id_num] = key_list
+    # end def
+
+    def setIdNums(self, id_nums, points, sizes):
+        """Replace all entries of many virtual helices in the index at once
+
+        Args:
+            id_nums (list): of :obj:`int` virtual helix ID numbers
+            points (ndarray): (n, 3) array of the points of all the virtual
+                helices concatenated in the order of `id_nums` and each in
+                index order
+            sizes (list): of :obj:`int` number of points of each virtual helix
+        """
+        for id_num in id_nums:
+            self.removeIdNum(id_num)
+        num_points = len(points)
+        if num_points == 0:
+            return
+        sizes = np.asarray(sizes, dtype=int)
+        helix_starts = np.cumsum(sizes) - sizes
+        keys = self.cellKeys(points)
+
+        # find the runs of consecutive points in the same cell of a helix
+        is_new_cell = np.zeros((num_points,), dtype=bool)
+        is_new_cell[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+        is_new_cell[helix_starts[sizes > 0]] = True
+        starts = np.nonzero(is_new_cell)[0]
+        ends = np.append(starts[1:] - 1, num_points - 1)
+        helix_of_run = np.searchsorted(helix_starts, starts, side='right') - 1
+
+        cells = self.cells
+        id_num_cells = self.id_num_cells
+        for id_num, size in zip(id_nums, sizes.tolist()):
+            if size > 0:
+                id_num_cells[id_num] = []
+        keys = map(tuple, keys[starts].tolist())
+        run_id_nums = np.asarray(id_nums, dtype=int)[helix_of_run].tolist()
+        helix_offsets = helix_starts[helix_of_run]
+        idx_ranges = zip((starts - helix_offsets).tolist(), (ends - helix_offsets).tolist())
+        for key, id_num, idx_range in zip(keys, run_id_nums, idx_ranges):
+            cell = cells[key]
+            existing = cell.get(id_num)
+            if existing is None:
+                cell[id_num] = idx_range
+                id_num_cells[id_num].append(key)
+            else:
+                cell[id_num] = (min(existing[0], idx_range[0]), max(existing[1], idx_range[1]))
+    # end def
+
+    def moveIdNums(self, id_nums, old_points, points, sizes):
+        """Update the entries of many virtual helices whose points moved,
+        like `setIdNums`, skipping the virtual helices whose points all stay
+        in the same cells, as they mostly do for the small steps of a drag
+
+        Args:
+            id_nums (list): of :obj:`int` virtual helix ID numbers
+            old_points (ndarray): (n, 3) array of the points before the move
+                in the layout of `points`
+            points (ndarray): (n, 3) array of the points of all the virtual
+                helices concatenated in the order of `id_nums` and each in
+                index order
+            sizes (list): of :obj:`int` number of points of each virtual helix
+
+        Returns:
+            list: of :obj:`int` ID numbers of the virtual helices reindexed
+        """
+        if len(points) == 0:
+            return []
+        is_moved = np.any(self.cellKeys(old_points) != self.cellKeys(points), axis=1)
+        sizes = np.asarray(sizes, dtype=int)
+        helix_starts = np.cumsum(sizes) - sizes
+        has_points = sizes > 0
+        is_helix_moved = np.zeros((len(sizes),), dtype=bool)
+        is_helix_moved[has_points] = np.logical_or.reduceat(is_moved, helix_starts[has_points])
+        if not is_helix_moved.any():
+            return []
+        moved, = np.nonzero(is_helix_moved)
+        moved_id_nums = np.asarray(id_nums, dtype=int)[moved].tolist()
+        is_moved_point = np.repeat(is_helix_moved, sizes)
+        self.setIdNums(moved_id_nums, points[is_moved_point], sizes[moved].tolist())
+        return moved_id_nums
+    # end def
+
+    def query(self, point, radius):
+        """Get the index ranges of all virtual helices with points in cells
+        that intersect the bounding box of a sphere.  The result is a
+        superset of the points actually within `radius` of `point`
+
+        Args:
+            point (array-like): of :obj:`float` of length 3
+            radius (float): distance to consider
+
+        Returns:
+            dict: of form::
+
+                {id_num: (idx_low, idx_high), ...}
+        """
+        cs = self.cell_size
+        cells = self.cells
+        px, py, pz = point
+        floor = math.floor
+        xlo, ylo, zlo = floor((px - radius) / cs), floor((py - radius) / cs), floor((pz - radius) / cs)
+        xhi, yhi, zhi = floor((px + radius) / cs), floor((py + radius) / cs), floor((pz + radius) / cs)
+
+        out = {}
+
+        def merge(cell):
+            for id_num, idx_range in cell.items():
+                existing = out.get(id_num)
+                if existing is None:
+                    out[id_num] = idx_range
+                else:
+                    out[id_num] = (min(existing[0], idx_range[0]),
+                                   max(existing[1], idx_range[1]))
+        # end def
+
+        num_query_cells = (xhi - xlo + 1)*(yhi - ylo + 1)*(zhi - zlo + 1)
+        if num_query_cells > len(cells):
+            # large radius, cheaper to scan the occupied cells
+            for (i, j, k), cell in cells.items():
+                if xlo <= i <= xhi and ylo <= j <= yhi and zlo <= k <= zhi:
+                    merge(cell)
+        else:
+            get = cells.get
+            for i in range(xlo, xhi + 1):
+                for j in range(ylo, yhi + 1):
+                    for k in range(zlo, zhi + 1):
+                        cell = get((i, j, k))
+                        if cell:
+                            merge(cell)
+        return out
+    # end def
+# end class
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from cadnano.fileio.npzencode import POINT_ARRAY_NAMES
+from cadnano.strandset import StrandSet
+from .nucleicacidpart import NucleicAcidPart, DEFAULT_SIZE, DEFAULT_GRID_CELL_SIZE
+from .nucleicacidpart import SEQUENCE_EXPORT_KEYS
+from .pointgrid import PointGrid
+from .virtualhelix import VirtualHelix
+
+
+class _StrandAttribute(object):
+    """Attribute of a :class:`ReadOnlyNucleicAcidPart` holding Python model
+    objects that are only created the first time the attribute is read
+
+    Args:
+        name (str): name of the attribute
+    """
+    def __init__(self, name):
+        self.key = '_lazy_' + name.lstrip('_')
+    # end def
+
+    def __get__(self, part, owner):
+        if part is None:
+            return self
+        if part._strand_loader is not None:
+            part._materializeStrands()
+        return part.__dict__[self.key]
+    # end def
+
+    def __set__(self, part, value):
+        part.__dict__[self.key] = value
+    # end def
+# end class
+
+
+class _PointGridAttribute(object):
+    """The :class:`PointGrid` of a :class:`ReadOnlyNucleicAcidPart`, built
+    from the point arrays the first time a radius query needs it
+    """
+    def __get__(self, part, owner):
+        if part is None:
+            return self
+        grid = part.__dict__.get('_lazy_point_grid')
+        if grid is None:
+            grid = part.__dict__['_lazy_point_grid'] = part._buildPointGrid()
+        return grid
+    # end def
+
+    def __set__(self, part, value):
+        part.__dict__['_lazy_point_grid'] = value
+    # end def
+# end class
+
+
+class ReadOnlyNucleicAcidPart(NucleicAcidPart):
+    """A :class:`NucleicAcidPart` loaded read-only from a binary save file.
+
+    The per base point arrays are views of the memory-mapped file rather than
+    copies so opening a design costs little more than reading the properties
+    of its virtual helices.  The `StrandSet`, `Strand` and `Oligo` objects are
+    only created, from the memory-mapped strand tables, the first time one of
+    them is touched, and `getSequences` is answered from the sequence table
+    saved with the file until then.  The point arrays are not writeable so
+    editing the geometry raises a ValueError.
+    """
+    fwd_strandsets = _StrandAttribute('fwd_strandsets')
+    rev_strandsets = _StrandAttribute('rev_strandsets')
+    segment_dict = _StrandAttribute('segment_dict')
+    _oligos = _StrandAttribute('_oligos')
+    _insertions = _StrandAttribute('_insertions')
+    _virtual_helices_set = _StrandAttribute('_virtual_helices_set')
+    _point_grid = _PointGridAttribute()
+
+    def __init__(self, *args, **kwargs):
+        self._strand_loader = None
+        self._sequence_loader = None
+        super(ReadOnlyNucleicAcidPart, self).__init__(*args, **kwargs)
+    # end def
+
+    def isMaterialized(self):
+        """Whether the `Strand` and `Oligo` objects of this part exist
+
+        Returns:
+            bool:
+        """
+        return self._strand_loader is None
+    # end def
+
+    def loadVirtualHelices(self, id_nums, origins, num_points_list,
+                           keys, columns, points=None):
+        """Set up the virtual helices of the part without creating any
+        `StrandSet`.  Call once on a new part.
+
+        Args:
+            id_nums (list): of :obj:`int` virtual helix ID numbers
+            origins (array-like): (n, 3) of :obj:`float` origins referenced
+                from an index of 0
+            num_points_list (list): of :obj:`int` number of bases in each
+                virtual helix
+            keys (list): of :obj:`str` property names
+            columns (list): of :obj:`list` one list of values per key in the
+                order of `id_nums`
+            points (tuple): optional, the arrays named in
+                `POINT_ARRAY_NAMES` with the points of every virtual helix
+                concatenated in the order of `id_nums`.  default computes the
+                points
+        """
+        id_nums = list(id_nums)
+        num_points_list = list(num_points_list)
+        num_rows = max(max(id_nums, default=-1) + 1, DEFAULT_SIZE)
+        for id_num in id_nums:
+            self._reserveIdNum(id_num)
+        self.total_id_nums = len(id_nums)
+
+        origins = np.asarray(origins, dtype=float).reshape((len(id_nums), 3))
+        self._origin_pts = np.full((num_rows, 2), np.inf, dtype=float)
+        self._origin_pts[id_nums] = origins[:, :2]
+        self._origin_tree.insert(id_nums, origins[:, :2])
+        if id_nums:
+            self.origin_limits = (min(0., np.amin(origins[:, 0])),
+                                  min(0., np.amin(origins[:, 1])),
+                                  max(0., np.amax(origins[:, 0])),
+                                  max(0., np.amax(origins[:, 1])))
+        self.directions = np.zeros((num_rows, 3), dtype=float)
+        self.directions[id_nums] = (0, 0, 1)
+
+        vh_properties = self.vh_properties
+        vh_properties.resize(num_rows)
+        vh_properties.setColumns(id_nums, ('name', 'color', 'length'),
+                                 (["vh%d" % (id_num) for id_num in id_nums],
+                                  [self.getColor()]*len(id_nums),
+                                  num_points_list))
+        vh_properties.setColumns(id_nums, keys, columns)
+
+        if points is None:
+            axis_pts, fwd_pts, rev_pts, idxs = self._pointsAlongZ(id_nums, origins, num_points_list)
+            points = (axis_pts, fwd_pts, rev_pts,
+                      np.repeat(np.asarray(id_nums, dtype=int), num_points_list), idxs)
+        for name, array in zip(POINT_ARRAY_NAMES, points):
+            if array.flags.writeable:
+                array.flags.writeable = False
+            setattr(self, name, array)
+
+        offset_and_size = self._offset_and_size = [None]*num_rows
+        offset = 0
+        for id_num, num_points in zip(id_nums, num_points_list):
+            offset_and_size[id_num] = (offset, num_points)
+            self._point_chunks[id_num] = (offset, offset + num_points)
+            offset += num_points
+        self.total_points = self._points_end = self._points_in_chunks = offset
+        self._point_grid = None
+        self._group_properties['virtual_helix_order'] = id_nums
+    # end def
+
+    def setStrandLoader(self, strand_loader, sequence_loader=None):
+        """Set the functions that read the strand tables of the part
+
+        Args:
+            strand_loader (function): called as ``strand_loader(part)`` to
+                create the strands, oligos and insertions of the part once
+                its `StrandSet` objects exist
+            sequence_loader (function): optional, called with no arguments to
+                get the saved result of `getSequenceTable`
+        """
+        self._strand_loader = strand_loader
+        self._sequence_loader = sequence_loader
+    # end def
+
+    def _materializeStrands(self):
+        """Create the `VirtualHelix`, `StrandSet`, `Strand` and `Oligo`
+        objects of the part
+        """
+        strand_loader = self._strand_loader
+        self._strand_loader = None
+        self._sequence_loader = None
+        fwd_strandsets = self.fwd_strandsets = [None]*len(self._offset_and_size)
+        rev_strandsets = self.rev_strandsets = [None]*len(self._offset_and_size)
+        vh_set = self._virtual_helices_set
+        for id_num, offset_and_size in enumerate(self._offset_and_size):
+            if offset_and_size is not None:
+                num_points = offset_and_size[1]
+                fwd_strandsets[id_num] = StrandSet(True, id_num, self, num_points)
+                rev_strandsets[id_num] = StrandSet(False, id_num, self, num_points)
+                vh_set[id_num] = VirtualHelix(id_num, self)
+        strand_loader(self)
+    # end def
+
+    def _buildPointGrid(self):
+        """Index the point arrays for radius queries
+
+        Returns:
+            PointGrid:
+        """
+        point_grid = PointGrid(DEFAULT_GRID_CELL_SIZE)
+        id_nums = []
+        num_points_list = []
+        for id_num, offset_and_size in enumerate(self._offset_and_size):
+            if offset_and_size is not None:
+                id_nums.append(id_num)
+                num_points_list.append(offset_and_size[1])
+        if id_nums:
+            point_grid.setIdNums(id_nums, self.axis_pts[:self.total_points], num_points_list)
+        return point_grid
+    # end def
+
+    def getSequenceTable(self):
+        """Get the columns of the sequence export of every oligo, from the
+        table saved with the file while the oligos have not been created
+
+        Returns:
+            dict: of :obj:`list` of :obj:`str` keyed by the names in
+            `SEQUENCE_EXPORT_KEYS`
+        """
+        if self._sequence_loader is not None:
+            return self._sequence_loader()
+        return super(ReadOnlyNucleicAcidPart, self).getSequenceTable()
+    # end def
+
+    def iterSequenceRows(self):
+        """Iterate the rows of the sequence export of every oligo, from the
+        table saved with the file while the oligos have not been created
+
+        Yields:
+            tuple: of :obj:`str` in `SEQUENCE_EXPORT_KEYS` order
+        """
+        if self._sequence_loader is not None:
+            table = self._sequence_loader()
+            return zip(*[table[key] for key in SEQUENCE_EXPORT_KEYS])
+        return super(ReadOnlyNucleicAcidPart, self).iterSequenceRows()
+    # end def
+# end class
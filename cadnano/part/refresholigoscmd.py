@@ -1,3 +1,5 @@
+from itertools import islice
+
 from cadnano.cnproxy import UndoCommand
 from cadnano.strand import Strand
 
@@ -11,7 +13,11 @@ class RefreshOligosCommand(UndoCommand):
     strands.
 
     Hence, we disable oligo assignment during the xover creation step,
-    and then do it all in one pass at the end with this command.
+    and then do it all in one pass at the end with this command.  Every
+    strand is visited once: the oligo, 5' strand, loop flag and length of
+    each oligo are found in the same walk, and the views are notified once
+    with `partOligosRefreshedSignal` rather than per strand.  The removals
+    and length changes of the oligos are coalesced in a signal batch.
 
     This command is meant for non-undoable steps, like file-io.
     """
@@ -21,51 +27,53 @@ class RefreshOligosCommand(UndoCommand):
     # end def
 
     def redo(self):
-        visited = {}
         part = self._part
+        strands = []
         for id_num in part.getIdNums():
             fwd_ss, rev_ss = part.getStrandSets(id_num)
-            for strand in rev_ss:
-                visited[strand] = False
-            for strand in fwd_ss:
-                visited[strand] = False
+            strands += rev_ss.strand_heap
+            strands += fwd_ss.strand_heap
 
-        fSetOligo = Strand.setOligo
-        for strand in list(visited.keys()):
-            if visited[strand]:
-                continue
-            visited[strand] = True
-            start_oligo = strand.oligo()
+        with part.document().batchUpdates():
+            visited = set()
+            removed = set()
+            fSetOligo = Strand.setOligo
+            for strand in strands:
+                if strand in visited:
+                    continue
+                start_oligo = strand.oligo()
+                length = 0
 
-            strand5gen = strand.generator5pStrand()
-            # this gets the oligo and burns a strand in the generator
-            strand5 = next(strand5gen)
-            for strand5 in strand5gen:
-                oligo5 = strand5.oligo()
-                if oligo5 != start_oligo:
-                    oligo5.removeFromPart(emit_signals=True)
-                    fSetOligo(strand5, start_oligo, emit_signals=True)  # emits strandHasNewOligoSignal
-                visited[strand5] = True
-            # end for
-            start_oligo.setStrand5p(strand5)
-            # is it a loop?
-            if strand.connection3p() == strand5:
-                start_oligo._setLoop(True)
-            else:
-                strand3gen = strand.generator3pStrand()
-                strand3 = next(strand3gen)   # burn one
-                for strand3 in strand3gen:
-                    oligo3 = strand3.oligo()
-                    if oligo3 != start_oligo:
-                        oligo3.removeFromPart(emit_signals=True)
-                        fSetOligo(strand3, start_oligo, emit_signals=True)  # emits strandHasNewOligoSignal
-                    visited[strand3] = True
+                # the strand and the strands 5' of it, ending at the 5' end
+                for strand5 in strand.generator5pStrand():
+                    oligo5 = strand5.oligo()
+                    if oligo5 is not start_oligo:
+                        if oligo5 not in removed:
+                            oligo5.removeFromPart(emit_signals=True)
+                            removed.add(oligo5)
+                        fSetOligo(strand5, start_oligo)
+                    visited.add(strand5)
+                    length += strand5.totalLength()
                 # end for
-            start_oligo.refreshLength(emit_signals=True)
-        # end for
+                start_oligo.setStrand5p(strand5)
+                # is it a loop?
+                if strand.connection3p() == strand5:
+                    start_oligo._setLoop(True)
+                else:
+                    for strand3 in islice(strand.generator3pStrand(), 1, None):
+                        oligo3 = strand3.oligo()
+                        if oligo3 is not start_oligo:
+                            if oligo3 not in removed:
+                                oligo3.removeFromPart(emit_signals=True)
+                                removed.add(oligo3)
+                            fSetOligo(strand3, start_oligo)
+                        visited.add(strand3)
+                        length += strand3.totalLength()
+                    # end for
+                start_oligo._setLength(length, emit_signals=True)
+            # end for
 
-        for strand in visited.keys():
-            strand.strandUpdateSignal.emit(strand)
+            part.partOligosRefreshedSignal.emit(part, strands)
     # end def
 
     def undo(self):
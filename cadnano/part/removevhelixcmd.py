@@ -30,7 +30,7 @@ class RemoveVirtualHelixCommand(UndoCommand):
                             part.getVirtualHelixProperties(neighbor_id, 'neighbors')
                         )
             nneighbors.remove(id_num)
-            part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+            part.vh_properties.set(neighbor_id, 'neighbors', str(list(nneighbors)))
         # signaling the view is two parts to clean up signals properly
         # and then allow the views to refresh
         part.partVirtualHelixRemovingSignal.emit(
@@ -47,7 +47,7 @@ class RemoveVirtualHelixCommand(UndoCommand):
                             part.getVirtualHelixProperties(neighbor_id, 'neighbors')
                         )
             bisect.insort_left(nneighbors, id_num)
-            part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+            part.vh_properties.set(neighbor_id, 'neighbors', str(list(nneighbors)))
         vh = part._createHelix(id_num, self.origin_pt, (0, 0, 1), self.length, self.color)
         keys = list(self.props.keys())
         vals = list(self.props.values())
@@ -1,9 +1,6 @@
+from cadnano.cnenum import CommandId
 from cadnano.cnproxy import UndoCommand
 
-# prevent circular imports
-# from cadnano.part.nucleicacidpart import Z_PROP_INDEX
-Z_PROP_INDEX = -1  # index for Dataframe.iloc calls
-
 class TranslateVirtualHelicesCommand(UndoCommand):
     """ Move Virtual Helices around"""
     def __init__(self, part, virtual_helix_set, dx, dy, dz):
@@ -31,16 +28,26 @@ class TranslateVirtualHelicesCommand(UndoCommand):
 
     def doSignals(self, part, vh_set):
         vh_list = list(vh_set)
-        z_vals = part.vh_properties.iloc[vh_list, Z_PROP_INDEX]
         if self.delta[2] > 0:
-            if isinstance(z_vals, float):
-                z_vals = (z_vals, )
+            z_vals = part.vh_properties.column('z')[vh_list].tolist()
             for id_num, z_val in zip(vh_list, z_vals):
                 part.partVirtualHelixPropertyChangedSignal.emit(
                                         part, id_num, part.getVirtualHelix(id_num), ('z',), (z_val,))
             part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), False)
     # end def
 
+    def id(self):
+        return CommandId.TRANSLATE_VIRTUAL_HELICES
+    # end def
+
+    def mergeWith(self, other):
+        """Merge a later translation of the same virtual helices"""
+        if other._part is not self._part or other._vhelix_set != self._vhelix_set:
+            return False
+        self.delta = tuple(a + b for a, b in zip(self.delta, other.delta))
+        return True
+    # end def
+
     def specialUndo(self):
         """ does not deselect
         """
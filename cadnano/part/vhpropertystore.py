@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class VHPropertyStore(object):
+    """Columnar store of the properties of the virtual helices of a
+    :class:`NucleicAcidPart`, one row per virtual helix ID number.
+
+    Numeric and boolean properties are stored in typed `ndarray` columns and
+    string properties in plain :obj:`list` columns so that getting or setting
+    a single value is O(1) and reading many rows is a vectorized slice.
+    Capacity grows geometrically so adding virtual helices is amortized O(1).
+
+    All getters return native python types as needed by QVariant.
+
+    Args:
+        keys (tuple): of :obj:`str` property names
+        defaults (tuple): default value of each property, the type of which
+            sets the type of the column
+        size (int): initial number of rows
+    """
+    def __init__(self, keys, defaults, size):
+        self._keys = list(keys)
+        self._defaults = dict(zip(keys, defaults))
+        self._size = size
+        self._columns = {}
+        for key, default in zip(keys, defaults):
+            self._columns[key] = self._newColumn(default, size)
+    # end def
+
+    @staticmethod
+    def _newColumn(default, size):
+        if isinstance(default, (bool, np.bool_)):
+            return np.full((size,), default, dtype=bool)
+        elif isinstance(default, (int, np.integer)):
+            return np.full((size,), default, dtype=np.int64)
+        elif isinstance(default, (float, np.floating)):
+            return np.full((size,), default, dtype=float)
+        else:
+            return [default] * size
+    # end def
+
+    def __len__(self):
+        return self._size
+    # end def
+
+    def keys(self):
+        """Get the property names
+
+        Returns:
+            list: of :obj:`str`
+        """
+        return list(self._keys)
+    # end def
+
+    def copy(self):
+        """Copy the store
+
+        Returns:
+            VHPropertyStore: a new copy of this store
+        """
+        new_store = VHPropertyStore((), (), self._size)
+        new_store._keys = list(self._keys)
+        new_store._defaults = self._defaults.copy()
+        new_store._columns = {k: v.copy() for k, v in self._columns.items()}
+        return new_store
+    # end def
+
+    def resize(self, min_size):
+        """Grow the store to hold at least `min_size` rows.  New rows hold
+        the default values
+
+        Args:
+            min_size (int): number of rows required
+        """
+        size = self._size
+        if min_size <= size:
+            return
+        new_size = max(min_size, 2*size)
+        num_new = new_size - size
+        columns = self._columns
+        for key in self._keys:
+            column = columns[key]
+            default = self._defaults[key]
+            if isinstance(column, list):
+                column.extend([default] * num_new)
+            else:
+                new_column = np.empty((new_size,), dtype=column.dtype)
+                new_column[:size] = column
+                new_column[size:] = default
+                columns[key] = new_column
+        self._size = new_size
+    # end def
+
+    def column(self, key):
+        """Get a column for vectorized operations.  Numeric columns are
+        returned as the stored `ndarray` so in place operations modify the
+        store
+
+        Args:
+            key (str): property name
+
+        Returns:
+            object: :obj:`ndarray` or :obj:`list`
+        """
+        return self._columns[key]
+    # end def
+
+    def get(self, id_num, keys):
+        """Get one or more properties of a virtual helix
+
+        Args:
+            id_num (int): virtual helix ID number
+            keys (object): :obj:`str` or :obj:`list`/:obj:`tuple` of :obj:`str`
+
+        Returns:
+            object: value or :obj:`list` of values depending on the type of
+            `keys`
+        """
+        columns = self._columns
+        if isinstance(keys, str):
+            value = columns[keys][id_num]
+            return value.item() if isinstance(value, np.generic) else value
+        out = []
+        for key in keys:
+            value = columns[key][id_num]
+            out.append(value.item() if isinstance(value, np.generic) else value)
+        return out
+    # end def
+
+    def set(self, id_num, keys, values):
+        """Set one or more properties of a virtual helix.  Unknown keys add a
+        column.  Setting a non integral value in an integer column promotes
+        the column to float
+
+        Args:
+            id_num (int): virtual helix ID number
+            keys (object): :obj:`str` or :obj:`list`/:obj:`tuple` of :obj:`str`
+            values (object): value or :obj:`list`/:obj:`tuple` of values
+                matching the key order
+        """
+        if isinstance(keys, str):
+            keys, values = (keys,), (values,)
+        columns = self._columns
+        for key, value in zip(keys, values):
+            column = columns.get(key)
+            if column is None:
+                self._keys.append(key)
+                self._defaults[key] = None
+                columns[key] = column = [None] * self._size
+            elif (column.__class__ is np.ndarray and
+                    column.dtype == np.int64 and
+                    isinstance(value, (float, np.floating)) and
+                    not float(value).is_integer()):
+                columns[key] = column = column.astype(float)
+            column[id_num] = value
+    # end def
+
+    def setColumns(self, id_num_list, keys, columns):
+        """Set properties of many virtual helices at once.  Numeric columns
+        are assigned in one vectorized operation.  Unknown keys add a column.
+        Setting non integral values in an integer column promotes the column
+        to float
+
+        Args:
+            id_num_list (list): of :obj:`int` virtual helix ID numbers
+            keys (list): of :obj:`str` property names
+            columns (list): of :obj:`list` or :obj:`ndarray` of values, one
+                per key in the order of `id_num_list`
+        """
+        store_columns = self._columns
+        for key, values in zip(keys, columns):
+            column = store_columns.get(key)
+            if column is None:
+                self._keys.append(key)
+                self._defaults[key] = None
+                store_columns[key] = column = [None] * self._size
+            if isinstance(column, list):
+                if isinstance(values, np.ndarray):
+                    values = values.tolist()
+                for id_num, value in zip(id_num_list, values):
+                    column[id_num] = value
+                continue
+            values = np.asarray(values)
+            if (column.dtype == np.int64 and
+                    values.dtype.kind == 'f' and
+                    not np.all(np.mod(values, 1) == 0)):
+                store_columns[key] = column = column.astype(float)
+            column[id_num_list] = values
+    # end def
+
+    def getRow(self, id_num):
+        """Get all properties of a virtual helix
+
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            dict: of property values keyed by name in column order
+        """
+        return dict(zip(self._keys, self.get(id_num, self._keys)))
+    # end def
+
+    def getRows(self, id_num_list):
+        """Get all properties of many virtual helices
+
+        Args:
+            id_num_list (object): :obj:`slice` or :obj:`list` of :obj:`int`
+                virtual helix ID numbers
+
+        Returns:
+            dict: of form::
+
+                {key: [value, ...], ...}
+
+            where each list is in the order of `id_num_list`
+        """
+        columns = self._columns
+        out = {}
+        is_slice = isinstance(id_num_list, slice)
+        for key in self._keys:
+            column = columns[key]
+            if is_slice:
+                values = column[id_num_list]
+                out[key] = values if isinstance(values, list) else values.tolist()
+            elif isinstance(column, list):
+                out[key] = [column[i] for i in id_num_list]
+            else:
+                out[key] = column[id_num_list].tolist()
+        return out
+    # end def
+# end class
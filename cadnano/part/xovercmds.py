@@ -1,10 +1,23 @@
 # -*- coding: utf-8 -*-
 import random
 
-from cadnano import getBatch
 from cadnano import preferences as prefs
 from cadnano.cnproxy import UndoCommand
-from cadnano.strand import Strand
+from cadnano.strand.oligonode import joinOligos, separateOligos, shorterSide
+
+
+def _emitStrandsHaveNewOligo(doc, strands):
+    """Emit `strandHasNewOligoSignal` of `strands`.  Only views listen to
+    it so the strands are not visited if the document has no controller
+
+    Args:
+        doc (Document):
+        strands (iterable): of :class:`Strand`
+    """
+    if doc.controller() is not None:
+        for strand in strands:
+            strand.strandHasNewOligoSignal.emit(strand)
+# end def
 
 class CreateXoverCommand(UndoCommand):
     """
@@ -39,7 +52,6 @@ class CreateXoverCommand(UndoCommand):
         doc.removeStrandFromSelection(strand5p)
         doc.removeStrandFromSelection(strand3p)
 
-        fSetOligo = Strand.setOligo
         if self._update_oligo:
             # Test for Loopiness
             if olg5p == strand3p.oligo():
@@ -49,9 +61,8 @@ class CreateXoverCommand(UndoCommand):
                 olg5p._incrementLength(old_olg3p.length(), emit_signals=True)
                 # 2. Remove the old oligo and apply the 5' oligo to the 3' strand
                 old_olg3p.removeFromPart(emit_signals=True)
-                for strand in strand3p.generator3pStrand():
-                    # emits strandHasNewOligoSignal
-                    fSetOligo(strand, olg5p, emit_signals=True)
+                joinOligos(strand5p, strand3p, olg5p)
+                _emitStrandsHaveNewOligo(doc, strand3p.generator3pStrand())
 
         # 3. install the Xover
         strand5p.setConnection3p(strand3p)
@@ -96,9 +107,10 @@ class CreateXoverCommand(UndoCommand):
                 olg5p._decrementLength(old_olg3p.length(), emit_signals=True)
                 # 3. apply the old oligo to strand3p
                 old_olg3p.addToPart(part, emit_signals=True)
-                for strand in strand3p.generator3pStrand():
-                    # emits strandHasNewOligoSignal
-                    fSetOligo(strand, old_olg3p, emit_signals=True)
+                is_3p_shorter, strands = separateOligos(strand5p, strand3p,
+                                                        olg5p, old_olg3p)
+                _emitStrandsHaveNewOligo(doc, strands if is_3p_shorter else
+                                         strand3p.generator3pStrand())
 
         if self._update_oligo:
             strand5p.strandUpdateSignal.emit(strand5p)
@@ -122,17 +134,22 @@ class RemoveXoverCommand(UndoCommand):
         self._strand5p_idx = strand5p.idx3Prime()
         self._strand3p = strand3p
         self._strand3p_idx = strand3p.idx5Prime()
-        n_o3p = self._new_oligo3p = strand3p.oligo().shallowCopy()
+        olg = strand3p.oligo()
+        n_o3p = self._new_oligo3p = olg.shallowCopy()
 
         color_list = prefs.STAP_COLORS
         n_o3p._setColor(random.choice(color_list))
-        n_o3p._setLength(0, emit_signals=True)
-        for strand in strand3p.generator3pStrand():
-            n_o3p._incrementLength(strand.totalLength(), emit_signals=True)
-        # end def
+        self._isLoop = olg.isLoop()
+        if self._isLoop:
+            length = olg.length()
+        else:
+            # sum the shorter side and get the other from the oligo length
+            is_3p_shorter, strands = shorterSide(strand5p, strand3p)
+            length = sum(strand.totalLength() for strand in strands)
+            if not is_3p_shorter:
+                length = olg.length() - length
+        n_o3p._setLength(length, emit_signals=True)
         n_o3p.setStrand5p(strand3p)
-
-        self._isLoop = strand3p.oligo().isLoop()
     # end def
 
     def redo(self):
@@ -144,8 +161,6 @@ class RemoveXoverCommand(UndoCommand):
         new_olg3p = self._new_oligo3p
         olg5p = self._strand5p.oligo()
 
-        fSetOligo = Strand.setOligo
-
         # 0. Deselect the involved strands
         doc = strand5p.document()
         doc.removeStrandFromSelection(strand5p)
@@ -161,11 +176,12 @@ class RemoveXoverCommand(UndoCommand):
         else:
             # 2. restore the modified oligo length
             olg5p._decrementLength(new_olg3p.length(), emit_signals=True)
-            # 3. apply the old oligo to strand3p
+            # 3. apply the new oligo to strand3p
             new_olg3p.addToPart(part, emit_signals=True)
-            for strand in strand3p.generator3pStrand():
-                # emits strandHasNewOligoSignal
-                fSetOligo(strand, new_olg3p, emit_signals=True)
+            is_3p_shorter, strands = separateOligos(strand5p, strand3p,
+                                                    olg5p, new_olg3p)
+            _emitStrandsHaveNewOligo(doc, strands if is_3p_shorter else
+                                     strand3p.generator3pStrand())
 
         strand5p.strandUpdateSignal.emit(strand5p)
         strand3p.strandUpdateSignal.emit(strand3p)
@@ -180,8 +196,6 @@ class RemoveXoverCommand(UndoCommand):
         olg5p = strand5p.oligo()
         new_olg3p = self._new_oligo3p
 
-        fSetOligo = Strand.setOligo
-
         # 0. Deselect the involved strands
         doc = strand5p.document()
         doc.removeStrandFromSelection(strand5p)
@@ -195,9 +209,8 @@ class RemoveXoverCommand(UndoCommand):
             olg5p._incrementLength(new_olg3p.length(), emit_signals=True)
             # 2. Remove the old oligo and apply the 5' oligo to the 3' strand
             new_olg3p.removeFromPart(emit_signals=True)
-            for strand in strand3p.generator3pStrand():
-                # emits strandHasNewOligoSignal
-                fSetOligo(strand, olg5p, emit_signals=True)
+            joinOligos(strand5p, strand3p, olg5p)
+            _emitStrandsHaveNewOligo(doc, strand3p.generator3pStrand())
         # end else
 
         # 3. install the Xover
@@ -5,6 +5,8 @@ adds in joins and ability to remove nodes
 """
 from math import sqrt
 
+import numpy as np
+
 
 def allClose(a, b):
     for x, y in zip(a, b):
@@ -438,6 +440,244 @@ class Quadtree(QuadtreeBase):
     # end def
 # end class
 
+
+class ArrayQuadtree(object):
+    """Quadtree over 2D points keyed by non-negative integers, like the
+    origins of virtual helices keyed by ID number.
+
+    Rather than the per node objects of :class:`Quadtree`, the nodes are
+    laid out in flat lists: node ``n`` is the square of half size
+    ``half[n]`` centered at ``(cx[n], cy[n])`` and ``first_child[n]`` is
+    the index of the first of its four consecutive children, in the
+    :class:`QuadtreeBase` order (-x -y, -x +y, +x -y, +x +y), or -1 for a
+    leaf whose keys are in ``items[n]``.  The points are rows of the
+    ``points`` array indexed by key, unused rows are inf, and ``leaf_of``
+    maps a key to its leaf.  A leaf splits when it holds more than
+    `LEAF_SIZE` points and the tree is rebuilt around the points when one
+    falls outside the root.
+
+    Queries gather the keys of the leaves intersecting the bounding box of
+    the query and test the distances of those points in one numpy
+    operation.
+    """
+    LEAF_SIZE = 16
+    MAX_DEPTH = 24
+
+    def __init__(self):
+        self.points = np.full((16, 2), np.inf, dtype=float)
+        self._reset(0., 0., 1.)
+    # end def
+
+    def __len__(self):
+        return len(self.leaf_of)
+    # end def
+
+    def __contains__(self, key):
+        return key in self.leaf_of
+    # end def
+
+    def _reset(self, x, y, half):
+        self.cx = [x]
+        self.cy = [y]
+        self.half = [half]
+        self.depth = [0]
+        self.first_child = [-1]
+        self.items = [[]]
+        self.leaf_of = {}
+    # end def
+
+    def copy(self):
+        """
+        Returns:
+            ArrayQuadtree: a new copy of this tree
+        """
+        new_tree = ArrayQuadtree()
+        new_tree.points = self.points.copy()
+        new_tree.cx = self.cx[:]
+        new_tree.cy = self.cy[:]
+        new_tree.half = self.half[:]
+        new_tree.depth = self.depth[:]
+        new_tree.first_child = self.first_child[:]
+        new_tree.items = [items[:] for items in self.items]
+        new_tree.leaf_of = self.leaf_of.copy()
+        return new_tree
+    # end def
+
+    def _grow(self, max_key):
+        points = self.points
+        num_rows = len(points)
+        if max_key >= num_rows:
+            new_points = np.full((max(max_key + 1, 2*num_rows), 2), np.inf, dtype=float)
+            new_points[:num_rows] = points
+            self.points = new_points
+    # end def
+
+    def _covers(self, xs, ys):
+        half = self.half[0]
+        cx, cy = self.cx[0], self.cy[0]
+        return (cx - half <= xs.min() and xs.max() <= cx + half and
+                cy - half <= ys.min() and ys.max() <= cy + half)
+    # end def
+
+    def _rebuild(self, xs, ys):
+        """Rebuild the tree around all its points and the points `xs`, `ys`
+        about to be inserted
+        """
+        keys = list(self.leaf_of)
+        if keys:
+            xy = self.points[keys]
+            xs = np.concatenate((xs, xy[:, 0]))
+            ys = np.concatenate((ys, xy[:, 1]))
+        x_lo, x_hi, y_lo, y_hi = np.amin(xs), np.amax(xs), np.amin(ys), np.amax(ys)
+        # leave room to grow before the next rebuild
+        half = max(x_hi - x_lo, y_hi - y_lo, 1.)
+        self._reset((x_lo + x_hi) / 2, (y_lo + y_hi) / 2, half)
+        for key, (x, y) in zip(keys, self.points[keys].tolist()):
+            self._insert(key, x, y)
+    # end def
+
+    def _insert(self, key, x, y):
+        cx, cy, first_child = self.cx, self.cy, self.first_child
+        n = 0
+        child = first_child[0]
+        while child != -1:
+            if x > cx[n]:
+                child += 2
+            if y > cy[n]:
+                child += 1
+            n = child
+            child = first_child[n]
+        items = self.items[n]
+        items.append(key)
+        self.leaf_of[key] = n
+        if len(items) > self.LEAF_SIZE and self.depth[n] < self.MAX_DEPTH:
+            self._split(n)
+    # end def
+
+    def _split(self, n):
+        quarter = self.half[n] / 2
+        x, y = self.cx[n], self.cy[n]
+        depth = self.depth[n] + 1
+        first = len(self.cx)
+        for dx, dy in ((-quarter, -quarter), (-quarter, quarter),
+                       (quarter, -quarter), (quarter, quarter)):
+            self.cx.append(x + dx)
+            self.cy.append(y + dy)
+            self.half.append(quarter)
+            self.depth.append(depth)
+            self.first_child.append(-1)
+            self.items.append([])
+        self.first_child[n] = first
+        keys = self.items[n]
+        self.items[n] = []
+        for key, (kx, ky) in zip(keys, self.points[keys].tolist()):
+            self._insert(key, kx, ky)
+    # end def
+
+    def insert(self, keys, points):
+        """Insert or move points
+
+        Args:
+            keys (list): of :obj:`int` keys
+            points (array-like): (n, 2) of :obj:`float` finite points
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        points = np.asarray(points, dtype=float).reshape((len(keys), 2))
+        self.remove(key for key in keys if key in self.leaf_of)
+        self._grow(max(keys))
+        self.points[keys] = points
+        xs, ys = points[:, 0], points[:, 1]
+        if not self._covers(xs, ys):
+            self._rebuild(xs, ys)
+        for key, (x, y) in zip(keys, points.tolist()):
+            self._insert(key, x, y)
+    # end def
+
+    def remove(self, keys):
+        """Remove points, ignoring keys not in the tree
+
+        Args:
+            keys (iterable): of :obj:`int` keys
+        """
+        leaf_of = self.leaf_of
+        items = self.items
+        for key in keys:
+            n = leaf_of.pop(key, None)
+            if n is not None:
+                items[n].remove(key)
+                self.points[key] = np.inf
+    # end def
+
+    def _gather(self, x1, y1, x2, y2):
+        """Get the keys of the leaves intersecting a rectangle"""
+        cx, cy, first_child, items = self.cx, self.cy, self.first_child, self.items
+        found = []
+        stack = [0]
+        pop, push = stack.pop, stack.append
+        while stack:
+            n = pop()
+            child = first_child[n]
+            if child == -1:
+                found += items[n]
+                continue
+            if x1 <= cx[n]:
+                if y1 <= cy[n]:
+                    push(child)
+                if y2 > cy[n]:
+                    push(child + 1)
+            if x2 > cx[n]:
+                if y1 <= cy[n]:
+                    push(child + 2)
+                if y2 > cy[n]:
+                    push(child + 3)
+        found.sort()
+        return np.array(found, dtype=int)
+    # end def
+
+    def queryPoint(self, point, radius):
+        """Get the keys of the points within `radius` of a point
+
+        Args:
+            point (array-like): of :obj:`float` x, y
+            radius (float): distance to consider
+
+        Returns:
+            ndarray: of :obj:`int` keys sorted by distance, ties by key
+        """
+        x, y = point[0], point[1]
+        keys = self._gather(x - radius, y - radius, x + radius, y + radius)
+        if len(keys) == 0:
+            return keys
+        difference = self.points[keys] - (x, y)
+        delta = np.einsum('ij,ij->i', difference, difference)
+        close, = np.where(delta <= radius*radius)
+        order = np.argsort(delta[close], kind='mergesort')
+        return keys[close[order]]
+    # end def
+
+    def queryRect(self, rect):
+        """Get the keys of the points strictly inside a rectangle
+
+        Args:
+            rect (array-like): of :obj:`float` (x1, y1, x2, y2) lower left
+                and upper right corners
+
+        Returns:
+            ndarray: of :obj:`int` keys in ascending order
+        """
+        x1, y1, x2, y2 = rect
+        keys = self._gather(x1, y1, x2, y2)
+        if len(keys) == 0:
+            return keys
+        pts = self.points[keys]
+        xs, ys = pts[:, 0], pts[:, 1]
+        inside = (xs > x1) & (xs < x2) & (ys > y1) & (ys < y2)
+        return keys[inside]
+    # end def
+# end class
+
 if __name__ == '__main__':
     class DummyNode(object):
         def __init__(self, x, y, radius):
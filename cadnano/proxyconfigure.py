@@ -27,8 +27,8 @@ def proxyConfigure(signal_type=None):
     elif signal_type == "PyQt":
         from PyQt5.QtCore import QObject, pyqtSignal
         from PyQt5.QtWidgets import QUndoCommand, QUndoStack
-        cnp.ProxySignal = pyqtSignal
-        cnp.BaseObject = QObject
+        cnp.ProxySignal = cnp.batchedSignal(pyqtSignal)
+        cnp.BaseObject = cnp.batchedBaseObject(QObject)
         cnp.UndoCommand = QUndoCommand
         cnp.UndoStack = QUndoStack
     else:
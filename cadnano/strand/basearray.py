@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Bases of the strands of a :class:`StrandSet` as ASCII codes in ``uint8``
+arrays.
+
+A strand's sequence read left to right, from its low index to its high
+index, is the base at each index followed by the bases of the insertion at
+that index, with the base of a skip left out.  The forward and reverse
+strands of a virtual helix share their insertions so a base of one
+direction and the base of the other at the same position are complements.
+A zero code is a base without a sequence and reads as a space.
+"""
+import numpy as np
+
+BLANK = 0
+SPACE = ord(' ')
+
+COMPLEMENT = np.arange(256, dtype=np.uint8)
+"""ndarray: lookup table of the code of the complement of each code"""
+COMPLEMENT[np.frombuffer(b'ACGTacgt', dtype=np.uint8)] = np.frombuffer(b'TGCATGCA',
+                                                                      dtype=np.uint8)
+
+BLANK_TO_SPACE = bytes.maketrans(b'\x00', b' ')
+
+
+def stringToBases(sequence_string, length):
+    """Convert a sequence to codes, truncating or padding it with blanks
+
+    Args:
+        sequence_string (str):
+        length (int): number of codes
+
+    Returns:
+        ndarray: of ``uint8`` codes, spaces converted to blanks
+    """
+    values = np.zeros(length, dtype=np.uint8)
+    encoded = sequence_string[:length].encode('ascii', 'replace')
+    values[:len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+    values[values == SPACE] = BLANK
+    return values
+# end def
+
+
+def basesToString(values):
+    """Convert codes to a sequence, blanks converted to spaces
+
+    Args:
+        values (ndarray): of ``uint8`` codes
+
+    Returns:
+        str:
+    """
+    return values.tobytes().translate(BLANK_TO_SPACE).decode('ascii')
+# end def
+
+
+class BaseArray(object):
+    """The bases of one direction of a virtual helix indexed by base index,
+    with the bases of insertions kept per index
+
+    Args:
+        length (int): initial number of base indices
+    """
+    __slots__ = 'bases', 'insertion_bases'
+
+    def __init__(self, length):
+        self.bases = np.zeros(length, dtype=np.uint8)
+        self.insertion_bases = {}
+    # end def
+
+    def _fit(self, idx_high):
+        """Grow the array to hold `idx_high`, for virtual helices lengthened
+        after it was allocated
+        """
+        if idx_high >= len(self.bases):
+            bases = np.zeros(max(idx_high + 1, 2*len(self.bases)), dtype=np.uint8)
+            bases[:len(self.bases)] = self.bases
+            self.bases = bases
+    # end def
+
+    def _insertionBases(self, idx, length):
+        """Get the codes of an insertion, blanks for the bases of an
+        insertion that changed length after its bases were set
+        """
+        values = self.insertion_bases.get(idx)
+        if values is None or len(values) != length:
+            out = np.zeros(length, dtype=np.uint8)
+            if values is not None:
+                n = min(length, len(values))
+                out[:n] = values[:n]
+            return out
+        return values
+    # end def
+
+    def read(self, idx_low, idx_high, insertions):
+        """Get the codes of a range of indices left to right
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+            insertions (list): of :class:`Insertion` in the range sorted
+                by index
+
+        Returns:
+            ndarray: of ``uint8`` codes, a view of the array if the range
+            has no insertions
+        """
+        self._fit(idx_high)
+        bases = self.bases
+        if not insertions:
+            return bases[idx_low:idx_high + 1]
+        chunks = []
+        start = idx_low
+        for insertion in insertions:
+            idx, length = insertion.idx(), insertion.length()
+            if length < 0:
+                chunks.append(bases[start:idx])
+            else:
+                chunks.append(bases[start:idx + 1])
+                chunks.append(self._insertionBases(idx, length))
+            start = idx + 1
+        chunks.append(bases[start:idx_high + 1])
+        return np.concatenate(chunks)
+    # end def
+
+    def write(self, idx_low, idx_high, insertions, values):
+        """Set the codes of a range of indices left to right
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+            insertions (list): of :class:`Insertion` in the range sorted
+                by index
+            values (ndarray): as many codes as the range has bases
+        """
+        self._fit(idx_high)
+        bases = self.bases
+        if not insertions:
+            bases[idx_low:idx_high + 1] = values
+            return
+        i = 0
+        start = idx_low
+        for insertion in insertions:
+            idx, length = insertion.idx(), insertion.length()
+            stop = idx if length < 0 else idx + 1
+            bases[start:stop] = values[i:i + stop - start]
+            i += stop - start
+            if length > 0:
+                self.insertion_bases[idx] = np.array(values[i:i + length])
+                i += length
+            start = idx + 1
+        bases[start:idx_high + 1] = values[i:]
+    # end def
+
+    def clear(self, idx_low, idx_high):
+        """Blank a range of indices and their insertions
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+        """
+        self.bases[idx_low:idx_high + 1] = BLANK
+        insertion_bases = self.insertion_bases
+        for idx in [idx for idx in insertion_bases if idx_low <= idx <= idx_high]:
+            del insertion_bases[idx]
+    # end def
+
+    def take(self, idx_low, idx_high):
+        """Blank a range of indices and their insertions, keeping what they
+        held so `restore` can put it back
+
+        Args:
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+
+        Returns:
+            tuple: of form::
+
+                (bases, {idx: insertion_bases, ...})
+
+            or None if the range held no bases
+        """
+        bases = self.bases[idx_low:idx_high + 1]
+        insertion_bases = self.insertion_bases
+        taken = {idx: insertion_bases.pop(idx)
+                 for idx in [idx for idx in insertion_bases if idx_low <= idx <= idx_high]}
+        if not taken and not bases.any():
+            return None
+        out = bases.copy(), taken
+        bases[:] = BLANK
+        return out
+    # end def
+
+    def restore(self, idx_low, taken):
+        """Put back the bases of a range taken by `take`
+
+        Args:
+            idx_low (int): low index the range was taken from
+            taken (tuple): as returned by `take`
+        """
+        bases, insertion_bases = taken
+        self._fit(idx_low + len(bases) - 1)
+        self.bases[idx_low:idx_low + len(bases)] = bases
+        self.insertion_bases.update(insertion_bases)
+    # end def
+
+    def copyComplement(self, other, idx_low, idx_high, insertions):
+        """Set a range of indices to the complement of the same range of the
+        other direction of the virtual helix
+
+        Args:
+            other (BaseArray): of the other direction
+            idx_low (int): inclusive
+            idx_high (int): inclusive
+            insertions (list): of :class:`Insertion` in the range
+        """
+        self._fit(idx_high)
+        other._fit(idx_high)
+        self.bases[idx_low:idx_high + 1] = COMPLEMENT[other.bases[idx_low:idx_high + 1]]
+        for insertion in insertions:
+            idx, length = insertion.idx(), insertion.length()
+            if length > 0:
+                self.insertion_bases[idx] = COMPLEMENT[other._insertionBases(idx, length)]
+    # end def
+# end class
@@ -103,7 +103,8 @@ class ChangeInsertionCommand(UndoCommand):
         strand = self._strand
         c_strand = self._comp_strand
         inst = self._insertions[self._idx]
-        inst.setLength(self._new_length, emit_signals=True)
+        inst.setLength(self._new_length)
+        self._insertions.lengthChanged()
         strand.oligo()._incrementLength(self._new_length - self._old_length,
                                         emit_signals=True)
         strand.strandInsertionChangedSignal.emit(strand, inst)
@@ -119,6 +120,7 @@ class ChangeInsertionCommand(UndoCommand):
         c_strand = self._comp_strand
         inst = self._insertions[self._idx]
         inst.setLength(self._old_length)
+        self._insertions.lengthChanged()
         strand.oligo()._decrementLength(self._new_length - self._old_length,
                                         emit_signals=True)
         strand.strandInsertionChangedSignal.emit(strand, inst)
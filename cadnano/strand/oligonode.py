@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Oligo membership of strands as a disjoint set forest.
+
+Each :class:`Strand` points to an :class:`OligoNode` and its oligo is the
+label of the root of that node's tree, so joining two oligos with a
+crossover links two roots instead of reassigning every strand of the 3'
+oligo.  Strands are never interior nodes, which lets a crossover removal
+give the strands of the shorter side a new root without disturbing the
+tree of the longer side.
+"""
+from itertools import zip_longest
+
+
+class OligoNode(object):
+    """Node of the oligo membership forest
+
+    Args:
+        oligo (Oligo): label of the node while it is a root
+    """
+    __slots__ = 'parent', 'rank', 'oligo'
+
+    def __init__(self, oligo):
+        self.parent = None
+        self.rank = 0
+        self.oligo = oligo
+    # end def
+# end class
+
+
+def findRoot(node):
+    """Find the root of the tree of a node, compressing the path to it
+
+    Args:
+        node (OligoNode):
+
+    Returns:
+        OligoNode: the root
+    """
+    root = node
+    while root.parent is not None:
+        root = root.parent
+    while node.parent is not None and node.parent is not root:
+        node.parent, node = root, node.parent
+    return root
+# end def
+
+
+def joinOligos(strand5p, strand3p, oligo):
+    """Make the strands of the oligos of two strands members of one oligo
+    in near constant time
+
+    Args:
+        strand5p (Strand): a strand of the first oligo
+        strand3p (Strand): a strand of the second oligo
+        oligo (Oligo): the oligo of all the strands
+    """
+    root_a = findRoot(strand5p._oligo_node)
+    root_b = findRoot(strand3p._oligo_node)
+    if root_a is root_b:
+        root = root_a
+    else:
+        if root_a.rank < root_b.rank:
+            root_a, root_b = root_b, root_a
+        root_b.parent = root_a
+        root_b.oligo = None
+        if root_a.rank == root_b.rank:
+            root_a.rank += 1
+        root = root_a
+    root.oligo = oligo
+    oligo._node = root
+# end def
+
+
+def separateOligos(strand5p, strand3p, oligo5p, oligo3p):
+    """Assign `oligo5p` to `strand5p` and the strands 5' of it and `oligo3p`
+    to `strand3p` and the strands 3' of it after the connection between the
+    two is removed.  Only the strands of the shorter side are visited.
+
+    Args:
+        strand5p (Strand): 3' end of the 5' side
+        strand3p (Strand): 5' end of the 3' side
+        oligo5p (Oligo): oligo of the 5' side
+        oligo3p (Oligo): oligo of the 3' side
+
+    Returns:
+        tuple: (:obj:`bool`, :obj:`list`) whether the 3' side is the
+        shorter one and its strands
+    """
+    is_3p_shorter, strands = shorterSide(strand5p, strand3p)
+    if is_3p_shorter:
+        short_oligo, long_oligo, long_strand = oligo3p, oligo5p, strand5p
+    else:
+        short_oligo, long_oligo, long_strand = oligo5p, oligo3p, strand3p
+    root = findRoot(long_strand._oligo_node)
+    root.oligo = long_oligo
+    long_oligo._node = root
+    short_root = short_oligo._node = OligoNode(short_oligo)
+    for strand in strands:
+        strand._oligo_node = short_root
+    return is_3p_shorter, strands
+# end def
+
+
+def shorterSide(strand5p, strand3p):
+    """Walk from `strand5p` in the 5' direction and from `strand3p` in the
+    3' direction in lock step until one of the walks ends
+
+    Args:
+        strand5p (Strand):
+        strand3p (Strand):
+
+    Returns:
+        tuple: (:obj:`bool`, :obj:`list`) whether the 3' walk ended first
+        and the strands of the walk that ended first
+    """
+    strands5p = []
+    strands3p = []
+    for s5p, s3p in zip_longest(strand5p.generator5pStrand(),
+                                strand3p.generator3pStrand()):
+        if s3p is None:
+            return True, strands3p
+        if s5p is None:
+            return False, strands5p
+        strands5p.append(s5p)
+        strands3p.append(s3p)
+    return True, strands3p
+# end def
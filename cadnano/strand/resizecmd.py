@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from cadnano.cnenum import CommandId
 from cadnano.cnproxy import UndoCommand
 
 class ResizeCommand(UndoCommand):
@@ -67,4 +68,17 @@ class ResizeCommand(UndoCommand):
         if std5p:
             std5p.strandResizedSignal.emit(std5p, std5p.idxs())
     # end def
+
+    def id(self):
+        return CommandId.RESIZE_STRAND
+    # end def
+
+    def mergeWith(self, other):
+        """Merge a later resize of the same strand"""
+        if other.strand is not self.strand or other.update_segments != self.update_segments:
+            return False
+        self.new_idxs = other.new_idxs
+        self.delta += other.delta
+        return True
+    # end def
 # end class
@@ -1,17 +1,15 @@
 # -*- coding: utf-8 -*-
-from array import array
 from operator import attrgetter
+from sys import getsizeof
 from cadnano import util
 from cadnano.cnobject import CNObject
 from cadnano.cnproxy import ProxySignal
+from .basearray import stringToBases, basesToString
 from .insertioncmd import AddInsertionCommand, RemoveInsertionCommand
 from .insertioncmd import ChangeInsertionCommand
 from .modscmd import AddModsCommand, RemoveModsCommand
 from .resizecmd import ResizeCommand
-
-sixb = lambda x: x.encode('utf-8')
-ARRAY_TYPE = 'B'
-tostring = lambda x: x.tobytes().decode('utf-8')
+from .oligonode import findRoot
 
 class Strand(CNObject):
     """A Strand is a continuous stretch of bases that are all in the same
@@ -44,15 +42,16 @@ class Strand(CNObject):
         self._strandset = strandset
         self._id_num = strandset.idNum()
 
-        """Keep track of its own segments.  Updated on creation and resizing
+        """Keep track of its own segments.  Updated lazily by the
+        SegmentIndex of the StrandSet after creation and resizing
         """
 
         self._base_idx_low = base_idx_low  # base index of the strand's left bound
         self._base_idx_high = base_idx_high  # base index of the right bound
-        self._oligo = oligo
+        self._oligo_node = None if oligo is None else oligo._rootNode()
         self._strand5p = None  # 5' connection to another strand
         self._strand3p = None  # 3' connection to another strand
-        self._sequence = None
+        self._taken_bases = None  # bases kept while out of the StrandSet
 
         self.segments = []
         self.abstract_sequence = []
@@ -88,6 +87,19 @@ class Strand(CNObject):
     def __lt__(self, other):
         return self._base_idx_low < other._base_idx_low
 
+    @property
+    def segments(self):
+        """list: of (:obj:`int`, :obj:`int`) segments of this strand, see
+        :meth:`NucleicAcidPart.refreshSegments`.  Computed on read if an edit
+        of the virtual helix changed them
+        """
+        self._strandset._flushSegments(self)
+        return self._segments
+
+    @segments.setter
+    def segments(self, segments):
+        self._segments = segments
+
     def generator5pStrand(self):
         """Iterate from self to the final _strand5p is None
         3' to 5'
@@ -179,22 +191,65 @@ class Strand(CNObject):
     # end def
 
     def oligo(self):
-        return self._oligo
+        node = self._oligo_node
+        if node is None:
+            return None
+        if node.parent is not None:
+            node = self._oligo_node = findRoot(node)
+        return node.oligo
     # end def
 
     def getColor(self):
-        return self._oligo.getColor()
+        return self.oligo().getColor()
     # end def
 
     def sequence(self, for_export=False):
-        seq = self._sequence
-        if seq:
+        """Get the sequence of this strand 5' to 3', read from the bases of
+        its :class:`StrandSet`
+
+        Args:
+            for_export (:obj:`bool`, optional): mark bases without a sequence
+                with '?', default=False
+
+        Returns:
+            str: empty if no base has a sequence and not `for_export`
+        """
+        seq = basesToString(self.bases())
+        if seq.strip():
             return util.markwhite(seq) if for_export else seq
         elif for_export:
             return ''.join(['?' for x in range(self.totalLength())])
         return ''
     # end def
 
+    def bases(self):
+        """Get the ASCII codes of the bases of this strand 5' to 3', zero for
+        a base without a sequence
+
+        Returns:
+            ndarray: of ``uint8``, a view of the bases of the
+            :class:`StrandSet` if the strand has no insertions
+        """
+        values = self._strandset._baseArray().read(self._base_idx_low,
+                                                   self._base_idx_high,
+                                                   self.insertionsOnStrand())
+        return values if self._is_forward else values[::-1]
+    # end def
+
+    def _setBases(self, values):
+        """Set the bases of this strand 5' to 3'
+
+        Args:
+            values (ndarray): ``uint8`` codes, one per base of the strand
+        """
+        if not self._is_forward:
+            values = values[::-1]
+        self._strandset._baseArray().write(self._base_idx_low,
+                                           self._base_idx_high,
+                                           self.insertionsOnStrand(),
+                                           values)
+    # end def
+
     def abstractSeq(self):
         return ','.join([str(i) for i in self.abstract_sequence])
 
@@ -221,19 +276,17 @@ class Strand(CNObject):
                 (used, unused)
         """
         if sequence_string is None:
-            self._sequence = None
+            self._strandset._baseArray().clear(self._base_idx_low, self._base_idx_high)
             return None, None
         length = self.totalLength()
-        if len(sequence_string) < length:
-            bonus = length - len(sequence_string)
-            sequence_string += ''.join([' ' for x in range(bonus)])
-        temp = sequence_string[0:length]
-        self._sequence = temp
-        return temp, sequence_string[length:]
+        values = stringToBases(sequence_string, length)
+        self._setBases(values)
+        return basesToString(values), sequence_string[length:]
     # end def
 
     def reapplySequence(self):
-        """
+        """Set the sequence of this strand to the complement of the strands it
+        overlaps on the complementary :class:`StrandSet`
         """
         comp_ss = self.strandSet().complementStrandSet()
 
@@ -241,13 +294,11 @@ class Strand(CNObject):
         # as there are no guarantees about the entirety of the strand moving
         # i.e. both endpoints thanks to multiple selections so just redo the
         # whole thing
-        self._sequence = None
+        self._strandset._baseArray().clear(self._base_idx_low, self._base_idx_high)
 
         for comp_strand in comp_ss.getOverlappingStrands(self._base_idx_low,
                                                          self._base_idx_high):
-            comp_seq = comp_strand.sequence()
-            used_seq = util.comp(comp_seq) if comp_seq else None
-            used_seq = self.setComplementSequence(used_seq, comp_strand)
+            self.applyComplementSequence(comp_strand)
         # end for
     # end def
 
@@ -259,76 +310,24 @@ class Strand(CNObject):
                 comp_ss.getOverlappingStrands(self._base_idx_low, self._base_idx_high)]
     # end def
 
-    def setComplementSequence(self, sequence_string, strand):
-        """This version takes anothers strand and only sets the indices that
-        align with the given complimentary strand.
-
-        As it depends which direction this is going, and strings are stored in
-        memory left to right, we need to test for is_forward to map the
-        reverse compliment appropriately, as we traverse overlapping strands.
-
-        We reverse the sequence ahead of time if we are applying it 5' to 3',
-        otherwise we reverse the sequence post parsing if it's 3' to 5'
-
-        Again, sequences are stored as strings in memory 5' to 3' so we need
-        to jump through these hoops to iterate 5' to 3' through them correctly
+    def applyComplementSequence(self, strand):
+        """Set the bases of this strand that pair with the bases of a strand
+        on the complementary :class:`StrandSet` to their complements.
 
-        Perhaps it's wiser to merely store them left to right and reverse them
-        at draw time, or export time
+        The bases of both directions of a virtual helix are stored left to
+        right with the same layout of insertions, so this copies the
+        overlapping range of the other direction's bases through a
+        complement lookup rather than reversing and slicing strings.
 
         Args:
-            sequence_string (str):
-            strand (Strand):
-
-        Returns:
-            str: the used portion of the sequence_string
+            strand (Strand): overlapping strand on the complementary
+                :class:`StrandSet`
         """
-        s_low_idx, s_high_idx = self._base_idx_low, self._base_idx_high
-        c_low_idx, c_high_idx = strand.idxs()
-        is_forward = self._is_forward
-        self_seq = self._sequence
-        # get the ovelap
-        low_idx, high_idx = util.overlap(s_low_idx, s_high_idx, c_low_idx, c_high_idx)
-
-        # only get the characters we're using, while we're at it, make it the
-        # reverse compliment
-
-        total_length = self.totalLength()
-
-        # see if we are applying
-        if sequence_string is None:
-            # clear out string for in case of not total overlap
-            use_seq = ''.join([' ' for x in range(total_length)])
-        else:  # use the string as is
-            use_seq = sequence_string[::-1] if is_forward else sequence_string
-
-        temp = array(ARRAY_TYPE, sixb(use_seq))
-        if self_seq is None:
-            temp_self = array(ARRAY_TYPE, sixb(''.join([' ' for x in range(total_length)])))
-        else:
-            temp_self = array(ARRAY_TYPE, sixb(self_seq) if is_forward else sixb(self_seq[::-1]))
-
-        # generate the index into the compliment string
-        a = self.insertionLengthBetweenIdxs(s_low_idx, low_idx - 1)
-        b = self.insertionLengthBetweenIdxs(low_idx, high_idx)
-        c = strand.insertionLengthBetweenIdxs(c_low_idx, low_idx - 1)
-        start = low_idx - c_low_idx + c
-        end = start + b + high_idx - low_idx + 1
-        temp_self[low_idx - s_low_idx + a:high_idx - s_low_idx + 1 + a + b] = temp[start:end]
-        # print("old sequence", self_seq)
-        self._sequence = tostring(temp_self)
-
-        # if we need to reverse it do it now
-        if not is_forward:
-            self._sequence = self._sequence[::-1]
-
-        # test to see if the string is empty(), annoyingly expensive
-        # if len(self._sequence.strip()) == 0:
-        if not self._sequence:
-            self._sequence = None
-
-        # print("new sequence", self._sequence)
-        return self._sequence
+        low_idx, high_idx = util.overlap(self._base_idx_low, self._base_idx_high,
+                                         *strand.idxs())
+        self._strandset._baseArray().copyComplement(strand.strandSet()._baseArray(),
+                                                    low_idx, high_idx,
+                                                    self.insertionsOnStrand(low_idx, high_idx))
     # end def
 
     def clearAbstractSequence(self):
@@ -360,8 +359,7 @@ class Strand(CNObject):
 
     def copyAbstractSequenceToSequence(self):
         abstract_seq = self.abstract_sequence
-        # self._sequence = ''.join([ascii_letters[i % 52] for i in abstract_seq])
-        self._sequence = ''.join(['|' for i in abstract_seq])
+        self.setSequence(''.join(['|' for i in abstract_seq]))
     # end def
 
     ### PUBLIC METHODS FOR QUERYING THE MODEL ###
@@ -414,7 +412,9 @@ class Strand(CNObject):
         """
         seqList = []
         is_forward = self._is_forward
-        seq = self._sequence if is_forward else self._sequence[::-1]
+        seq = self.sequence()
+        if not is_forward:
+            seq = seq[::-1]
         # assumes a sequence has been applied correctly and is up to date
         tL = self.totalLength()
 
@@ -566,28 +566,15 @@ class Strand(CNObject):
     def insertionLengthBetweenIdxs(self, idxL, idxH):
         """includes the length of insertions in addition to the bases
         """
-        tL = 0
-        insertions = self.insertionsOnStrand(idxL, idxH)
-        for insertion in insertions:
-            tL += insertion.length()
-        return tL
+        return self.part().insertions()[self._id_num].lengthBetween(idxL, idxH)
     # end def
 
     def insertionsOnStrand(self, idxL=None, idxH=None):
         """if passed indices it will use those as a bounds
         """
-        insertions = []
-        insertionsDict = self.part().insertions()[self._id_num]
-        sortedIndices = sorted(insertionsDict.keys())
         if idxL is None:
             idxL, idxH = self.idxs()
-        for index in sortedIndices:
-            insertion = insertionsDict[index]
-            if idxL <= insertion.idx() <= idxH:
-                insertions.append(insertion)
-            # end if
-        # end for
-        return insertions
+        return self.part().insertions()[self._id_num].insertionsBetween(idxL, idxH)
     # end def
 
     def modifersOnStrand(self):
@@ -614,12 +601,25 @@ class Strand(CNObject):
     def totalLength(self):
         """includes the length of insertions in addition to the bases
         """
-        tL = 0
-        insertions = self.insertionsOnStrand()
+        insertions = self.part().insertions()[self._id_num]
+        return (insertions.lengthBetween(self._base_idx_low, self._base_idx_high) +
+                self.length())
+    # end def
 
-        for insertion in insertions:
-            tL += insertion.length()
-        return tL + self.length()
+    def byteSize(self):
+        """Approximate memory held by this strand, its attributes and the
+        bases it keeps while out of its :class:`StrandSet`, for the undo
+        commands that retain it
+
+        Returns:
+            int: the size in bytes
+        """
+        size = getsizeof(self) + getsizeof(self.__dict__) + getsizeof(self.segments)
+        taken = self._taken_bases
+        if taken is not None:
+            bases, insertion_bases = taken
+            size += bases.nbytes + sum(values.nbytes for values in insertion_bases.values())
+        return size
     # end def
 
     ### PUBLIC METHODS FOR EDITING THE MODEL ###
@@ -783,14 +783,14 @@ class Strand(CNObject):
     # end def
 
     def setOligo(self, new_oligo, emit_signals=False):
-        self._oligo = new_oligo
+        self._oligo_node = None if new_oligo is None else new_oligo._rootNode()
         if emit_signals:
             self.strandHasNewOligoSignal.emit(self)
     # end def
 
-    def split(self, idx, update_sequence=True):
+    def split(self, idx):
         """Called by view items to split this strand at idx."""
-        self._strandset.splitStrand(self, idx, update_sequence)
+        self._strandset.splitStrand(self, idx)
 
     ### PUBLIC SUPPORT METHODS ###
     def getRemoveInsertionCommands(self, new_idxs):
@@ -868,20 +868,17 @@ class Strand(CNObject):
         """
         """
         new_s = Strand(self._strandset, *self.idxs())
-        new_s._oligo = self._oligo
+        new_s._oligo_node = self._oligo_node
         new_s._strand5p = self._strand5p
         new_s._strand3p = self._strand3p
-        # required to shallow copy the dictionary
-        new_s._sequence = None  # self._sequence
         return new_s
     # end def
 
     def _deepCopy(self, strandset, oligo):
         """
         """
-        new_s = Strand(strandset, *self.idxs())
-        new_s._oligo = oligo
-        new_s._sequence = self._sequence
+        new_s = Strand(strandset, *self.idxs(), oligo=oligo)
+        new_s._setBases(self.bases())
         return new_s
     # end def
 # end class
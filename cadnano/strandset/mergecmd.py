@@ -48,17 +48,6 @@ class MergeCommand(UndoCommand):
         self._new_strand = new_strand
         # Update the oligo for things like its 5prime end and isLoop
         self._new_oligo._strandMergeUpdate(strand_low, strand_high, new_strand)
-
-        # set the new sequence by concatenating the sequence properly
-        if strand_low._sequence or strand_high._sequence:
-            tL = strand_low.totalLength()
-            tH = strand_high.totalLength()
-            seqL = strand_low._sequence if strand_low._sequence else "".join([" " for i in range(tL)])
-            seqH = strand_high._sequence if strand_high._sequence else "".join([" " for i in range(tH)])
-            if new_strand.isForward():
-                new_strand._sequence = seqL + seqH
-            else:
-                new_strand._sequence = seqH + seqL
     # end def
 
     def redo(self):
@@ -75,8 +64,8 @@ class MergeCommand(UndoCommand):
         fSetOligo = Strand.setOligo
 
         # Remove old strands from the s_set (reusing idx, so order matters)
-        ss._removeFromStrandList(s_low, update_segments=False)
-        ss._removeFromStrandList(s_high, update_segments=False)
+        ss._removeFromStrandList(s_low, update_segments=False, keep_bases=True)
+        ss._removeFromStrandList(s_high, update_segments=False, keep_bases=True)
         # Add the new_strand to the s_set
         ss._addToStrandList(new_strand)
 
@@ -125,7 +114,7 @@ class MergeCommand(UndoCommand):
         l_olg = self._s_low_oligo
         h_olg = self._s_high_oligo
         # Remove the new_strand from the s_set
-        ss._removeFromStrandList(new_strand, update_segments=False)
+        ss._removeFromStrandList(new_strand, update_segments=False, keep_bases=True)
         # Add old strands to the s_set (reusing idx, so order matters)
         ss._addToStrandList(s_high, update_segments=False)
         ss._addToStrandList(s_low)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from collections import Counter
+
+
+class SegmentIndex(object):
+    """Incremental version of `NucleicAcidPart._refreshSegments` for the
+    forward and reverse :class:`StrandSet` of one virtual helix.
+
+    The segments of a strand split it at every base that ends a strand of
+    either set or comes just before the start of one.  These boundaries are
+    kept as a sorted list with a count of the strand ends producing each so
+    adding, removing or resizing a strand only changes the boundaries of its
+    own ends.  A boundary appearing or disappearing only changes the
+    segments of the strands spanning it, which are marked dirty along with
+    the edited strand, and the segments of dirty strands are computed the
+    next time any of them is read.
+
+    Args:
+        strandsets (tuple): of the forward and reverse :class:`StrandSet`
+    """
+    def __init__(self, strandsets):
+        self._strandsets = tuple(strandsets)
+        self._indexed = {}  # strand: (idx_low, idx_high) it is indexed at
+        self._counts = Counter()
+        for strandset in self._strandsets:
+            for strand in strandset.strands():
+                idx_low, idx_high = self._indexed[strand] = strand.idxs()
+                self._counts[idx_low - 1] += 1
+                self._counts[idx_high] += 1
+        self._boundaries = sorted(self._counts)
+        self._dirty = set(self._indexed)
+    # end def
+
+    def strandSets(self):
+        """Get the strand sets this indexes
+
+        Returns:
+            tuple: of :class:`StrandSet`
+        """
+        return self._strandsets
+    # end def
+
+    def isDirty(self, strand):
+        """Whether the segments of a strand need to be computed
+
+        Args:
+            strand (Strand):
+
+        Returns:
+            bool:
+        """
+        return strand in self._dirty
+    # end def
+
+    def addStrand(self, strand):
+        """Index a strand added to one of the strand sets
+
+        Args:
+            strand (Strand):
+        """
+        idx_low, idx_high = self._indexed[strand] = strand.idxs()
+        self._addBoundary(idx_low - 1)
+        self._addBoundary(idx_high)
+        self._dirty.add(strand)
+    # end def
+
+    def removeStrand(self, strand):
+        """Remove a strand removed from one of the strand sets
+
+        Args:
+            strand (Strand):
+        """
+        idx_low, idx_high = self._indexed.pop(strand)
+        self._dirty.discard(strand)
+        self._removeBoundary(idx_low - 1)
+        self._removeBoundary(idx_high)
+    # end def
+
+    def updateStrand(self, strand):
+        """Reindex a strand whose indices changed
+
+        Args:
+            strand (Strand):
+        """
+        self.removeStrand(strand)
+        self.addStrand(strand)
+    # end def
+
+    def flush(self):
+        """Compute the segments of every dirty strand
+        """
+        boundaries = self._boundaries
+        indexed = self._indexed
+        for strand in self._dirty:
+            start, idx_high = indexed[strand]
+            segments = []
+            i = 0
+            while start <= idx_high:
+                i = bisect_left(boundaries, start, lo=i)
+                end = boundaries[i]
+                segments.append((start, end))
+                start = end + 1
+            strand._segments = segments
+        self._dirty.clear()
+    # end def
+
+    def _addBoundary(self, idx):
+        counts = self._counts
+        counts[idx] += 1
+        if counts[idx] == 1:
+            boundaries = self._boundaries
+            boundaries.insert(bisect_left(boundaries, idx), idx)
+            self._touch(idx)
+    # end def
+
+    def _removeBoundary(self, idx):
+        counts = self._counts
+        counts[idx] -= 1
+        if counts[idx] == 0:
+            del counts[idx]
+            boundaries = self._boundaries
+            boundaries.pop(bisect_left(boundaries, idx))
+            self._touch(idx)
+    # end def
+
+    def _touch(self, idx):
+        """Mark dirty the strands split by a boundary at `idx`, those
+        covering both `idx` and `idx` + 1
+
+        Args:
+            idx (int): the boundary
+        """
+        if idx < 0:
+            return
+        dirty = self._dirty
+        for strandset in self._strandsets:
+            i = strandset._findIdx(idx)
+            if i != -1:
+                strand = strandset.strand_heap[i]
+                if strand.highIdx() > idx and strand in self._indexed:
+                    dirty.add(strand)
+    # end def
+# end class
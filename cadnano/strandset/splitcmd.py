@@ -16,11 +16,10 @@ class SplitCommand(UndoCommand):
     original strand, resizes each and modifies their connections.
     On undo, the new copies are removed and the original is restored.
     """
-    def __init__(self, strand, base_idx, update_sequence=True):
+    def __init__(self, strand, base_idx):
         super(SplitCommand, self).__init__("split strand")
         # Store inputs
         self._old_strand = strand
-        old_sequence  = strand._sequence
         is5to3 = strand.isForward()
 
         self._s_set = s_set = strand.strandSet()
@@ -79,17 +78,6 @@ class SplitCommand(UndoCommand):
             olg5p._setLength(olg5p.length() - length, emit_signals=True)
             olg3p._setLength(length, emit_signals=True)
         # end if
-
-        if update_sequence and old_sequence:
-            if is5to3:  # strand_low has priority
-                tL = strand_low.totalLength()
-                strand_low._sequence = old_sequence[0:tL]
-                strand_high._sequence = old_sequence[tL:]
-            else:
-                tH = strand_high.totalLength()
-                strand_high._sequence = old_sequence[0:tH]
-                strand_low._sequence = old_sequence[tH:]
-
     # end def
 
     def redo(self):
@@ -105,7 +93,7 @@ class SplitCommand(UndoCommand):
         was_not_loop = l_olg != h_olg
 
         # Remove old Strand from the s_set
-        ss._removeFromStrandList(o_strand, update_segments=False)
+        ss._removeFromStrandList(o_strand, update_segments=False, keep_bases=True)
 
         # Add new strands to the s_set (reusing idx, so order matters)
         ss._addToStrandList(s_high, update_segments=False)
@@ -161,8 +149,8 @@ class SplitCommand(UndoCommand):
         was_not_loop = l_olg != h_olg
 
         # Remove new strands from the s_set (reusing idx, so order matters)
-        ss._removeFromStrandList(s_low, update_segments=False)
-        ss._removeFromStrandList(s_high, update_segments=False)
+        ss._removeFromStrandList(s_low, update_segments=False, keep_bases=True)
+        ss._removeFromStrandList(s_high, update_segments=False, keep_bases=True)
         # Add the old strand to the s_set
         ss._addToStrandList(o_strand)
 
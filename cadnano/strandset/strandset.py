@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from bisect import bisect_left, insort_left
+from bisect import bisect_left, bisect_right
+from heapq import merge as heapq_merge
 import cadnano.util as util
 from cadnano.cnproxy import ProxySignal
 from cadnano.cnobject import CNObject
@@ -8,6 +9,8 @@ from .createstrandcmd import CreateStrandCommand
 from .removestrandcmd import RemoveStrandCommand
 from .mergecmd import MergeCommand
 from .splitcmd import SplitCommand
+from .segmentindex import SegmentIndex
+from cadnano.strand.basearray import BaseArray
 
 
 class StrandSet(CNObject):
@@ -19,17 +22,26 @@ class StrandSet(CNObject):
     determining if edits can be made, such as the bounds of empty space in
     which a strand can be created or resized.
 
-    Internally :class:`StrandSet` uses redundant heap and a list data structures
-    to track :class:`Strands` objects, with the list of length of a virtual
-    helix looking like::
+    Internally :class:`StrandSet` tracks :class:`Strands` objects with a
+    sorted endpoint index.  Since the strands of a set never overlap,
+    sorting them by low index also sorts them by high index, so the
+    strand_heap::
 
-        strand_array = [strandA, strandA, strandA, ..., None, strandB, strandB, ...]
+        strand_heap = [strandA, strandB, strandC, ...]
 
-    Where every index strandA spans has a reference to strandA and strand_heap::
+    is a sorted list from low index to high index of strand objects and the
+    parallel list of their low indices::
 
-        strand_heap = [strandA, strandB, strandC, ...]
+        _strand_lows = [strandA.lowIdx(), strandB.lowIdx(), ...]
+
+    answers point and overlap queries with one binary search rather than
+    storing a reference per base.  Adding, removing and resizing a strand
+    costs a binary search and shifting the references of the other strands
+    of the set, independent of the length of the strand.
 
-    is merely a sorted list from low index to high index of strand objects
+    The sequences of the strands are the bases of the whole set, kept in
+    one :class:`BaseArray` rather than a string per strand, so splitting,
+    merging and applying sequences never copy strings.
 
     Args:
         is_fwd (bool):  is this a forward or reverse StrandSet?
@@ -60,7 +72,7 @@ class StrandSet(CNObject):
             part (Part): part to copy this into
         """
         return StrandSet(self._is_fwd, self._id_num,
-                         part, len(self.strand_array))
+                         part, self._length)
     # end def
 
     def __iter__(self):
@@ -121,23 +133,148 @@ class StrandSet(CNObject):
         Args:
             initial_size (int): size to revert to
         """
-        self.strand_array = [None]*(initial_size)
+        self._length = initial_size
         self.strand_heap = []
+        self._strand_lows = []
+        self._segment_index = None
+        self._base_array = None
     # end def
 
     def resize(self, delta_low, delta_high):
-        """Resize this StrandSet.  Pad each end when growing otherwise
-        don't do anything
+        """Resize this StrandSet.  The indices of the strands are not changed
 
         Args:
             delta_low (int):  amount to resize the low index end
             delta_high (int):  amount to resize the high index end
         """
-        if delta_low < 0:
-            self.strand_array = self.strand_array[delta_low:]
-        if delta_high < 0:
-            self.strand_array = self.strand_array[:delta_high]
-        self.strand_array = [None]*delta_low + self.strand_array + [None]*delta_high
+        self._length += delta_low + delta_high
+    # end def
+
+    def _findStrand(self, strand, idx_low=None):
+        """Get the position of a strand in the strand_heap
+
+        Args:
+            strand (Strand): the strand
+            idx_low (int): optional, low index the strand was added at.
+                default is the current low index of the strand
+
+        Returns:
+            int: the position or -1 if the strand is not in the set
+        """
+        if idx_low is None:
+            idx_low = strand.lowIdx()
+        i = bisect_left(self._strand_lows, idx_low)
+        if i < len(self.strand_heap) and self.strand_heap[i] is strand:
+            return i
+        return -1
+    # end def
+
+    def _findIdx(self, base_idx):
+        """Get the position in the strand_heap of the strand covering a base
+
+        Args:
+            base_idx (int): the index of interest
+
+        Returns:
+            int: the position or -1 if no strand covers `base_idx`
+        """
+        i = bisect_right(self._strand_lows, base_idx) - 1
+        if i >= 0 and self.strand_heap[i].highIdx() >= base_idx:
+            return i
+        return -1
+    # end def
+
+    def _segmentIndex(self):
+        """Get the :class:`SegmentIndex` shared with the complementary
+        StrandSet, creating it from the current strands if needed
+
+        Returns:
+            SegmentIndex:
+        """
+        segment_index = self._segment_index
+        if segment_index is None:
+            strandsets = self._part.getStrandSets(self._id_num)
+            segment_index = SegmentIndex(strandsets)
+            for strandset in strandsets:
+                strandset._segment_index = segment_index
+        return segment_index
+    # end def
+
+    def _dropSegmentIndex(self):
+        """Discard the :class:`SegmentIndex` so it is recreated on the next
+        read of the segments.  Cheaper than updating it for bulk edits
+        """
+        segment_index = self._segment_index
+        if segment_index is not None:
+            for strandset in segment_index.strandSets():
+                strandset._segment_index = None
+    # end def
+
+    def _baseArray(self):
+        """Get the :class:`BaseArray` holding the sequence of the strands of
+        this set, creating it if needed
+
+        Returns:
+            BaseArray:
+        """
+        base_array = self._base_array
+        if base_array is None:
+            base_array = self._base_array = BaseArray(self._length)
+        return base_array
+    # end def
+
+    def _takeBases(self, strand):
+        """Blank the bases of a strand leaving the set so a strand later
+        created over its range starts without a sequence.  They are kept on
+        the strand for :meth:`_restoreBases`.  The range of the complementary
+        StrandSet not covered by its strands is blanked too, since no strand
+        owns those bases
+
+        Args:
+            strand (Strand): the strand
+        """
+        idx_low, idx_high = strand.idxs()
+        if self._base_array is not None:
+            strand._taken_bases = self._base_array.take(idx_low, idx_high)
+        comp_ss = self.complementStrandSet()
+        comp_array = comp_ss._base_array
+        if comp_array is not None:
+            start = idx_low
+            for comp_strand in comp_ss.getOverlappingStrands(idx_low, idx_high):
+                comp_low, comp_high = comp_strand.idxs()
+                if comp_low > start:
+                    comp_array.clear(start, comp_low - 1)
+                start = comp_high + 1
+            if start <= idx_high:
+                comp_array.clear(start, idx_high)
+    # end def
+
+    def _restoreBases(self, strand):
+        """Put back the bases of a strand rejoining the set, see
+        :meth:`_takeBases`
+
+        Args:
+            strand (Strand): the strand
+        """
+        taken = strand._taken_bases
+        if taken is not None:
+            strand._taken_bases = None
+            self._baseArray().restore(strand.lowIdx(), taken)
+    # end def
+
+    def _flushSegments(self, strand):
+        """Compute the segments of `strand` if they are out of date
+
+        Args:
+            strand (Strand): the strand
+        """
+        segment_index = self._segment_index
+        if segment_index is None:
+            if self._findStrand(strand) == -1:
+                return
+            segment_index = self._segmentIndex()
+        if segment_index.isDirty(strand):
+            segment_index.flush()
     # end def
 
     ### PUBLIC METHODS FOR QUERYING THE MODEL ###
@@ -169,7 +306,7 @@ class StrandSet(CNObject):
         Returns:
             int: length of the set
         """
-        return len(self.strand_array)
+        return self._length
 
     def idNum(self):
         """Get the associated virtual helix ID number
@@ -191,8 +328,8 @@ class StrandSet(CNObject):
             tuple: (low neighbor, high neighbor) of types :class:`Strand` or :obj:`None`
         """
         sh = self.strand_heap
-        i = bisect_left(sh, strand)
-        if sh[i] != strand:
+        i = self._findStrand(strand)
+        if i == -1:
             raise ValueError("getNeighbors: strand not in set")
         if i == 0:
             low_strand = None
@@ -227,22 +364,15 @@ class StrandSet(CNObject):
 
                 (low_idx, high_idx)
         """
-        class DummyStrand(object):
-            _base_idx_low = base_idx
-
-            def __lt__(self, other):
-                return self._base_idx_low < other._base_idx_low
-
-        ds = DummyStrand()
         sh = self.strand_heap
         lsh = len(sh)
         if lsh == 0:
-            return 0, len(self.strand_array) - 1
+            return 0, self._length - 1
 
         # the i-th index is the high-side strand and the i-1 index
         # is the low-side strand since bisect_left gives the index
-        # to insert the dummy strand at
-        i = bisect_left(sh, ds)
+        # to insert a strand starting at base_idx at
+        i = bisect_left(self._strand_lows, base_idx)
         if i == 0:
             low_idx = 0
         else:
@@ -250,7 +380,7 @@ class StrandSet(CNObject):
 
         # would be an append to the list effectively if inserting the dummy strand
         if i == lsh:
-            high_idx = len(self.strand_array) - 1
+            high_idx = self._length - 1
         else:
             high_idx = sh[i].lowIdx() - 1
         return (low_idx, high_idx)
@@ -328,11 +458,7 @@ class StrandSet(CNObject):
     # end def
 
     def isStrandInSet(self, strand):
-        sl = self.strand_array
-        if sl[strand.lowIdx()] == strand and sl[strand.highIdx()] == strand:
-            return True
-        else:
-            return False
+        return self._findStrand(strand) != -1
     # end def
 
     def removeStrand(self, strand, use_undostack=True, solo=True):
@@ -431,13 +557,13 @@ class StrandSet(CNObject):
             return None
     # end def
 
-    def splitStrand(self, strand, base_idx, update_sequence=True, use_undostack=True):
-        """Break strand into two strands. Reapply sequence by default.
+    def splitStrand(self, strand, base_idx, use_undostack=True):
+        """Break strand into two strands.  The halves keep the sequence of
+        the strand.
 
         Args:
             strand (Strand): the :class:`Strand`
             base_idx (int): the index
-            update_sequence (:obj:`bool`, optional): whether to emit signal, default=True
             use_undostack (:obj:`bool`, optional): default=True
 
         Returns:
@@ -446,7 +572,7 @@ class StrandSet(CNObject):
         """
         if self.strandCanBeSplit(strand, base_idx):
             if self.isStrandInSet(strand):
-                c = SplitCommand(strand, base_idx, update_sequence)
+                c = SplitCommand(strand, base_idx)
                 util.doCmd(self, c, use_undostack=use_undostack)
                 return True
             else:
@@ -508,32 +634,10 @@ class StrandSet(CNObject):
             bool: True if strandset has a strand in the region between idx_low
             and idx_high (both included). False otherwise
         """
-        sa = self.strand_array
-        sh = self.strand_heap
-        lsh = len(sh)
-        strand = sa[idx_low]
-
-        if strand is None:
-            class DummyStrand(object):
-                _base_idx_low = idx_low
-
-                def __lt__(self, other):
-                    return self._base_idx_low < other._base_idx_low
-
-            ds = DummyStrand()
-            i = bisect_left(sh, ds)
-
-            while i < lsh:
-                strand = sh[i]
-                if strand.lowIdx() > idx_high:
-                    return False
-                elif idx_low <= strand.highIdx():
-                    return True
-                else:
-                    i += 1
-            return False
-        else:
-            return True
+        # the last strand starting at or below idx_high is the only
+        # candidate since the high indices are sorted too
+        i = bisect_right(self._strand_lows, idx_high) - 1
+        return i >= 0 and self.strand_heap[i].highIdx() >= idx_low
     # end def
 
     def getOverlappingStrands(self, idx_low, idx_high):
@@ -546,35 +650,11 @@ class StrandSet(CNObject):
         Returns:
             :obj:`list` of :class:`Strand`: all :class:`Strand` objects in range
         """
-        sa = self.strand_array
-        sh = self.strand_heap
-        lsh = len(sh)
-
-        strand = sa[idx_low]
-        out = []
-        if strand is None:
-            class DummyStrand(object):
-                _base_idx_low = idx_low
-
-                def __lt__(self, other):
-                    return self._base_idx_low < other._base_idx_low
-
-            ds = DummyStrand()
-            i = bisect_left(sh, ds)
-        else:
-            out.append(strand)
-            i = bisect_left(sh, strand) + 1
-
-        while i < lsh:
-            strand = sh[i]
-            if strand.lowIdx() > idx_high:
-                break
-            elif idx_low <= strand.highIdx():
-                out.append(strand)
-                i += 1
-            else:
-                i += 1
-        return out
+        lows = self._strand_lows
+        start = self._findIdx(idx_low)
+        if start == -1:
+            start = bisect_right(lows, idx_low)
+        return self.strand_heap[start:bisect_right(lows, idx_high)]
     # end def
 
     # def hasStrandAtAndNoXover(self, idx):
@@ -586,8 +666,7 @@ class StrandSet(CNObject):
     #     Returns:
     #         bool: True if hasStrandAtAndNoXover, False otherwise
     #     """
-    #     sl = self.strand_array
-    #     strand = sl[idx]
+    #     strand = self.getStrand(idx)
     #     if strand is None:
     #         return False
     #     elif strand.hasXoverAt(idx):
@@ -605,8 +684,7 @@ class StrandSet(CNObject):
     #     Returns:
     #         bool: True if hasNoStrandAtOrNoXover, False otherwise
     #     """
-    #     sl = self.strand_array
-    #     strand = sl[idx]
+    #     strand = self.getStrand(idx)
     #     if strand is None:
     #         return True
     #     elif strand.hasXoverAt(idx):
@@ -624,11 +702,12 @@ class StrandSet(CNObject):
         Returns:
             Strand: :class:`Strand` at `base_idx` if it exists
         """
-        try:
-            return self.strand_array[base_idx]
-        except:
-            print(self.strand_array)
-            raise
+        if base_idx < 0:
+            base_idx += self._length
+        if not 0 <= base_idx < self._length:
+            raise IndexError("StrandSet.getStrand: index {} out of range for {}".format(base_idx, self))
+        i = self._findIdx(base_idx)
+        return None if i == -1 else self.strand_heap[i]
     # end def
 
     def dump(self, xover_list):
@@ -657,49 +736,116 @@ class StrandSet(CNObject):
 
     ### PRIVATE SUPPORT METHODS ###
     def _addToStrandList(self, strand, update_segments=True):
-        """Inserts strand into the strand_array at idx
+        """Inserts strand into the sorted strand index, restoring the bases
+        it had when it was removed
 
         Args:
             strand (Strand): the strand to add
             update_segments (:obj:`bool`, optional): whether to signal default=True
         """
+        self._restoreBases(strand)
         # print("Adding to strandlist")
-        idx_low, idx_high = strand.idxs()
-        for i in range(idx_low, idx_high+1):
-            self.strand_array[i] = strand
-        insort_left(self.strand_heap, strand)
+        idx_low = strand.lowIdx()
+        i = bisect_left(self._strand_lows, idx_low)
+        self.strand_heap.insert(i, strand)
+        self._strand_lows.insert(i, idx_low)
+        if self._segment_index is not None:
+            self._segment_index.addStrand(strand)
         if update_segments:
             self._part.refreshSegments(self._id_num)
 
     def _updateStrandIdxs(self, strand, old_idxs, new_idxs):
-        """update indices in the strand array/list of an existing strand
+        """update the indices of an existing strand in the strand index.  A
+        resize can not move a strand past its neighbors so only its low index
+        changes
 
         Args:
             strand (Strand): the strand
-            old_idxs (tuple): range (:obj:`int`) to clear
-            new_idxs (tuple): range (:obj:`int`) to set to `strand`
+            old_idxs (tuple): range (:obj:`int`) the strand was indexed at
+            new_idxs (tuple): range (:obj:`int`) to index the strand at
         """
-        for i in range(old_idxs[0], old_idxs[1] + 1):
-            self.strand_array[i] = None
-        for i in range(new_idxs[0], new_idxs[1] + 1):
-            self.strand_array[i] = strand
+        i = self._findStrand(strand, old_idxs[0])
+        if i == -1:
+            raise IndexError("StrandSet._updateStrandIdxs: strand not in set")
+        self._strand_lows[i] = new_idxs[0]
+        if self._segment_index is not None:
+            self._segment_index.updateStrand(strand)
 
-    def _removeFromStrandList(self, strand, update_segments=True):
-        """Remove strand from strand_array.
+    def _removeFromStrandList(self, strand, update_segments=True, keep_bases=False):
+        """Remove strand from the sorted strand index.
 
         Args:
             strand (Strand): the strand
             update_segments (:obj:`bool`, optional): whether to signal default=True
+            keep_bases (:obj:`bool`, optional): leave the bases of the strand
+                in place for strands replacing it over the same range, as in
+                a split or merge, rather than taking them with the strand.
+                default=False
         """
         self._document.removeStrandFromSelection(strand)  # make sure the strand is no longer selected
-        idx_low, idx_high = strand.idxs()
-        for i in range(idx_low, idx_high + 1):
-            self.strand_array[i] = None
-        i = bisect_left(self.strand_heap, strand)
+        i = self._findStrand(strand)
+        if i == -1:
+            raise IndexError("StrandSet._removeFromStrandList: strand not in set")
         self.strand_heap.pop(i)
+        self._strand_lows.pop(i)
+        if not keep_bases:
+            self._takeBases(strand)
+        if self._segment_index is not None:
+            self._segment_index.removeStrand(strand)
         if update_segments:
             self._part.refreshSegments(self._id_num)
 
+    def _addStrandsToStrandList(self, strands):
+        """Bulk version of :meth:`_addToStrandList` that does not refresh
+        segments.  The strands must not overlap each other or any strand
+        already in the set
+
+        Args:
+            strands (list): of :class:`Strand` sorted from low to high index
+
+        Raises:
+            IndexError: if a strand is out of bounds or overlaps another
+        """
+        length = self._length
+        heap = self.strand_heap
+        if heap:
+            new_heap = list(heapq_merge(heap, strands))
+        else:
+            new_heap = list(strands)
+        new_lows = []
+        last_idx_high = -1
+        for strand in new_heap:
+            idx_low, idx_high = strand.idxs()
+            if idx_low <= last_idx_high or idx_low > idx_high or idx_high >= length:
+                raise IndexError("StrandSet._addStrandsToStrandList: "
+                                 "bad strand {} in {}".format(strand.idxs(), self))
+            new_lows.append(idx_low)
+            last_idx_high = idx_high
+        self.strand_heap = new_heap
+        self._strand_lows = new_lows
+        for strand in strands:
+            self._restoreBases(strand)
+        self._dropSegmentIndex()
+    # end def
+
+    def _removeStrandsFromStrandList(self, strands):
+        """Bulk version of :meth:`_removeFromStrandList` that does not refresh
+        segments
+
+        Args:
+            strands (list): of :class:`Strand` in the set
+        """
+        remove_from_selection = self._document.removeStrandFromSelection
+        for strand in strands:
+            remove_from_selection(strand)
+        strand_set = set(strands)
+        self.strand_heap = [strand for strand in self.strand_heap if strand not in strand_set]
+        self._strand_lows = [strand.lowIdx() for strand in self.strand_heap]
+        for strand in strands:
+            self._takeBases(strand)
+        self._dropSegmentIndex()
+    # end def
+
     def getStrandIndex(self, strand):
         """Get the 5' end index of strand if it exists for forward strands
         and the 3' end index of the strand for reverse strands
@@ -707,11 +853,9 @@ class StrandSet(CNObject):
         Returns:
             tuple: (:obj:`bool`, :obj:`int`)
         """
-        try:
-            ind = self.strand_array.index(strand)
-            return (True, ind)
-        except ValueError:
+        if self._findStrand(strand) == -1:
             return (False, 0)
+        return (True, strand.lowIdx())
     # end def
 
     def _deepCopy(self, virtual_helix):
@@ -0,0 +1,799 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of the model.  Not collected by pytest, run with::
+
+    python benchmarks.py [name ...]
+
+from the tests directory.
+"""
+import sys, os, math, time
+pjoin = os.path.join
+
+import numpy as np
+from numpy.core.umath_tests import inner1d
+
+from pathsetup import TEST_PATH
+
+from ast import literal_eval
+
+BENCHMARK_FILES = ["super_barcode_hex.json", "Nature09_monolith.json"]
+
+
+def loadPart(designname):
+    from cadnano.document import Document
+    doc = Document()
+    doc.readFile(pjoin(TEST_PATH, "data", designname))
+    return doc.activePart()
+# end def
+
+
+def timeIt(func, *args, repeat=3):
+    """Get the best wall time of `repeat` calls of func(*args)
+
+    Returns:
+        tuple: (best time in seconds, result of the last call)
+    """
+    best = float('inf')
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        res = func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, res
+# end def
+
+
+def queryIdNumNeighborLoop(part, id_num, neighbors, index=None):
+    """Reference per base loop implementation of
+    `NucleicAcidPart.queryIdNumNeighbor` used before it was vectorized
+
+    Args:
+        id_num (int): virtual helix ID number
+        neighbors (array-like): neighbors of id_num
+        index_slice (tuple):  optional, of :obj:`int` (start_index, length) into a virtual
+            helix
+
+    Returns:
+        dict: of :obj:`tuple` of form::
+
+            neighbor_id_num: (fwd_hit_list, rev_hit_list)
+
+        where each list has the form:
+
+            [(id_num_index, forward_neighbor_idxs, reverse_neighbor_idxs), ...]]
+
+    Raises:
+        ValueError:
+    """
+    offset_and_size = part.getOffsetAndSize(id_num)
+    if offset_and_size is None:
+        raise ValueError("offset_and_size is None for {}".format(id_num))
+    else:
+        offset, size = offset_and_size
+    bpr, tpr = part.vh_properties.get(id_num,
+                                      ['bases_per_repeat', 'turns_per_repeat'])
+    bases_per_turn = bpr / tpr
+    if index is None:
+        start, length = 0, size
+    else:
+        half_period = bpr // 2
+        if size - index < bpr:
+            start, length = size - bpr, bpr
+        else:
+            start, length = max(index - half_period, 0), bpr
+    # norm = np.linalg.norm
+    # cross = np.cross
+    # dot = np.dot
+    # normalize = part.normalize
+    PI = math.pi
+    # TWOPI = 2*PI
+    RADIUS = part._radius
+    BW = part._BASE_WIDTH
+
+    # theta, radius = part.radiusForAngle(alpha, RADIUS, bases_per_turn, BW)
+    # convert to a list since we can't speed this loop up without cython or something
+    # axis_pts = part.axis_pts
+    fwd_pts = part.fwd_pts
+    rev_pts = part.rev_pts
+    # this_axis_pts = axis_pts[offset + start:offset + start + length].tolist()
+    this_fwd_pts = fwd_pts[offset + start:offset + start + length].tolist()
+    this_rev_pts = rev_pts[offset + start:offset + start + length].tolist()
+
+    """TODO: decide how we want to handle maintaining bond length
+    ideal adjacent ANTI-PARALLEL xover strands project to a plane normal
+    to the helical axis and point in the SAME direction
+
+    ideal adjacent PARALLEL xover strands  project to a plane normal
+    to the helical axis and point in the OPPOSITE directions
+
+    NOTE:
+    For now we use zdelta to get the right results for this 2.5 release
+    for PARALLEL and ANTI-PARALLEL.
+    """
+    # 1. compute generallized r squared values for an ideal crossover of
+    # both types
+    half_twist_per_base = PI/bases_per_turn
+    # r2_radial = (2.*RADIUS*(1. - math.cos(half_twist_per_base)))**2
+    # r2_tangent = (2.*RADIUS*math.sin(half_twist_per_base))**2
+    # r2_axial = BW*BW
+
+    # MISALIGNED by 27.5% twist per base so that's 1.55*half_twist_per_base
+    # ma_f = 1.55 # NC should be this if we wanted to be strict
+    ma_f = 2.55  # NC changed to this to show all xovers in legacy Honeycomb
+    r2_radial = (RADIUS*((1. - math.cos(half_twist_per_base)) +
+                         (1. - math.cos(ma_f*half_twist_per_base))))**2
+    r2_tangent = (RADIUS*(math.sin(half_twist_per_base) +
+                          math.sin(ma_f*half_twist_per_base)))**2
+    r2_axial = BW*BW
+
+    # print("r2:", r2_radial, r2_tangent, r2_axial)
+    # 2. ANTI-PARALLEL
+    rsquared_ap = r2_tangent + r2_radial
+    rsquared_ap_min = 0
+    rsquared_ap_max = rsquared_ap
+
+    # 3. PARALLEL
+    rsquared_p = r2_tangent + r2_radial + r2_axial
+    rsquared_p_min = r2_axial
+    rsquared_p_max = rsquared_p + 0.25*r2_axial
+    per_neighbor_hits = {}
+
+    fwd_axis_pairs = {}
+    rev_axis_pairs = {}
+
+    for neighbor_id in neighbors:
+        offset, size = part.getOffsetAndSize(neighbor_id)
+
+        # 1. Finds points that point at neighbors axis point
+        nfwd_pts = fwd_pts[offset:offset + size]
+        nrev_pts = rev_pts[offset:offset + size]
+
+        # direction = part.directions[neighbor_id]
+        len_neighbor_pts = len(nfwd_pts)
+        delta = part.delta3D_scratch
+        if len_neighbor_pts != len(delta):
+            part.delta3D_scratch = delta = np.empty((len_neighbor_pts,), dtype=float)
+
+        fwd_axis_hits = []
+        for i, point in enumerate(this_fwd_pts):
+            difference = nfwd_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            f_idxs = np.where((delta > rsquared_p_min) &
+                              (delta < rsquared_p_max) &
+                              (zdelta > 0.3*r2_axial) &
+                              (zdelta < 1.1*r2_axial)
+                              )[0].tolist()
+            difference = nrev_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            r_idxs = np.where((delta > rsquared_ap_min) &
+                              (delta < rsquared_ap_max) &
+                              (zdelta < 0.3*r2_axial))[0].tolist()
+            if f_idxs or r_idxs:
+                fwd_axis_hits.append((start + i, f_idxs, r_idxs))
+        # end for
+
+        # Scan for pairs of bases in AP xovers
+        idx_last = -2
+        fwd_axis_pairs = {}
+        isAGreaterThanB_Z = part.isAGreaterThanB_Z
+        for i, f_idxs, r_idxs in fwd_axis_hits:
+            if r_idxs:
+                if idx_last + 1 == i:
+                    # print("pair", idx_last, i)
+                    fwd_axis_pairs[idx_last] = (True, neighbor_id)  # 5 prime  most strand
+                    fwd_axis_pairs[i] = (False, neighbor_id)        # 3 prime most strand
+                idx_last = i
+            if f_idxs:
+                for idxB in f_idxs:
+                    if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
+                        fwd_axis_pairs[i] = (False, neighbor_id)
+                    else:
+                        fwd_axis_pairs[i] = (True, neighbor_id)
+
+        rev_axis_hits = []
+        for i, point in enumerate(this_rev_pts):
+            difference = nfwd_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            f_idxs = np.where((delta > rsquared_ap_min) &
+                              (delta < rsquared_ap_max) &
+                              (zdelta < 0.3*r2_axial))[0].tolist()
+
+            difference = nrev_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            r_idxs = np.where((delta > rsquared_p_min) &
+                              (delta < rsquared_p_max) &
+                              (zdelta > 0.3*r2_axial) &
+                              (zdelta < 1.1*r2_axial)
+                              )[0].tolist()
+            if f_idxs or r_idxs:
+                rev_axis_hits.append((start + i, f_idxs, r_idxs))
+        # end for
+
+        # Scan for pairs of bases in AP xovers
+        idx_last = -2
+        for i, f_idxs, r_idxs in rev_axis_hits:
+            if f_idxs:
+                if idx_last + 1 == i:
+                    # print("pair", idx_last, i)
+                    rev_axis_pairs[idx_last] = (False, neighbor_id)    # 3 prime  most strand
+                    rev_axis_pairs[i] = (True, neighbor_id)            # 5 prime most strand
+                idx_last = i
+            if r_idxs:
+                for idxB in r_idxs:
+                    if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
+                        rev_axis_pairs[i] = (True, neighbor_id)
+                    else:
+                        rev_axis_pairs[i] = (False, neighbor_id)
+
+        per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
+    # end for
+    return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+# end def
+
+
+def translateCoordinatesLoop(part, id_nums, delta):
+    """Reference per virtual helix implementation of
+    `NucleicAcidPart._translateCoordinates` used before it was vectorized
+
+    Args:
+        id_nums (array-like): of :obj:`int` virtual helix ID numbers
+        delta (array-like):  of :obj:`float` of length 3
+    """
+    part._resetOriginCache()
+    part._resetPointCache()
+    origin_pts = part._origin_pts
+    delta_origin = delta[:2]
+    for id_num in id_nums:
+        coord_pts, fwd_pts, rev_pts = part.getCoordinates(id_num)
+        coord_pts += delta
+        fwd_pts += delta
+        rev_pts += delta
+        origin_pts[id_num, :] += delta_origin
+        part._updatePointGrid(id_num)
+    id_nums = list(id_nums)
+    part._origin_tree.insert(id_nums, origin_pts[id_nums])
+    part.vh_properties.column('z')[id_nums] += delta[2]
+    part._setVirtualHelixOriginLimits()
+# end def
+
+
+def benchmarkApplySequence(designnames=("Nature09_monolith.json",
+                                         "Science09_beachball_v1.json"),
+                           num_rounds=5):
+    """Time applying the scaffold sequence to the longest oligo of the
+    largest designs and generating the staple sequences
+    """
+    from cadnano.data.dnasequences import sequences
+    for designname in designnames:
+        part = loadPart(designname)
+        scaffold = max(part.oligos(), key=lambda oligo: oligo.length())
+        sequence = sequences['p8064']
+
+        def applySequence():
+            for _ in range(num_rounds):
+                scaffold.applySequence(sequence, use_undostack=False)
+        t_apply, _ = timeIt(applySequence)
+        t_export, _ = timeIt(part.getSequences)
+        print("apply %d bases to %s x%d: %0.3fs, export staples %0.3fs" %
+              (scaffold.length(), designname, num_rounds, t_apply, t_export))
+# end def
+
+
+def benchmarkQueryIdNumNeighbor():
+    """Compare `queryIdNumNeighbor` with the per base loop implementation
+    on every virtual helix of the benchmark designs
+    """
+    for designname in BENCHMARK_FILES:
+        part = loadPart(designname)
+        args_list = []
+        for id_num in sorted(part.getIdNums()):
+            neighbors = literal_eval(part.vh_properties.get(id_num, 'neighbors'))
+            size = part.getOffsetAndSize(id_num)[1]
+            # whole helix as in the slice view and a window as when dragging
+            args_list.append((id_num, neighbors, None))
+            args_list.append((id_num, neighbors, size // 2))
+
+        def runNew():
+            part._resetCrossoverMap()
+            return [part.queryIdNumNeighbor(*args) for args in args_list]
+
+        def runCached():
+            return [part.queryIdNumNeighbor(*args) for args in args_list]
+
+        def runLoop():
+            return [queryIdNumNeighborLoop(part, *args) for args in args_list]
+        t_new, res_new = timeIt(runNew)
+        t_cached, res_cached = timeIt(runCached)
+        t_loop, res_loop = timeIt(runLoop, repeat=1)
+        assert res_new == res_loop, "results differ for %s" % (designname)
+        assert res_cached == res_loop, "cached results differ for %s" % (designname)
+        print("queryIdNumNeighbor %s: %d queries, loop %0.3fs, vectorized %0.3fs, %0.1fx, cached %0.4fs" %
+              (designname, len(args_list), t_loop, t_new, t_loop / t_new, t_cached))
+# end def
+
+
+def benchmarkResizeHelix(num_helices=400, length=588, num_resizes=200):
+    """Time extending the first virtual helix of a large part, which used to
+    move the points of every other virtual helix
+    """
+    from cadnano.document import Document
+    doc = Document()
+    part = doc.createNucleicAcidPart()
+    radius = part.radius()
+    for id_num in range(num_helices):
+        x, y = divmod(id_num, 20)
+        part.createVirtualHelix(3*radius*x, 3*radius*y, 0, id_num=id_num, length=length)
+
+    def resize():
+        for i in range(num_resizes):
+            part._resizeHelix(0, i % 2 == 0, 21)
+    t, _ = timeIt(resize, repeat=1)
+    print("resizeHelix: %d helices of %d bases, %d resizes of helix 0 %0.3fs, %0.1fus per resize" %
+          (num_helices, length, num_resizes, t, 1e6*t / num_resizes))
+# end def
+
+
+def benchmarkSequenceExport(designnames=("Nature09_monolith.json",
+                                          "Science09_beachball_v1.json"),
+                            num_rounds=20):
+    """Time exporting the staples of designs with a scaffold sequence
+    applied to a string and streamed to a file
+    """
+    import tempfile
+    from cadnano.data.dnasequences import sequences
+    for designname in designnames:
+        part = loadPart(designname)
+        scaffold = max(part.oligos(), key=lambda oligo: oligo.length())
+        scaffold.applySequence(sequences['p8064'], use_undostack=False)
+
+        def export():
+            for _ in range(num_rounds):
+                part.getSequences()
+
+        def stream():
+            with tempfile.TemporaryFile('w') as f:
+                for _ in range(num_rounds):
+                    part.writeSequences(f)
+        t_export, _ = timeIt(export)
+        t_stream, _ = timeIt(stream)
+        print("export %d staples of %s x%d: string %0.3fs, streamed to a file %0.3fs" %
+              (len(part.oligos()), designname, num_rounds, t_export, t_stream))
+# end def
+
+
+def benchmarkStrandSetIndex(length=21000, num_strands=50, num_ops=2000):
+    """Time adding, resizing and removing long scaffold strands of a
+    `StrandSet` and querying it, which used to touch every base of a strand
+    """
+    import random
+    from cadnano.document import Document
+    from cadnano.strand import Strand
+    part = Document().createNucleicAcidPart()
+    part.createVirtualHelix(0., 0., 0., length, id_num=0, use_undostack=False)
+    fwd_ss, _ = part.getStrandSets(0)
+    span = length // num_strands
+    strands = [Strand(fwd_ss, i*span, (i + 1)*span - 2) for i in range(num_strands)]
+    rng = random.Random(0)
+
+    def addRemove():
+        for _ in range(num_ops // (2*num_strands)):
+            for strand in strands:
+                fwd_ss._addToStrandList(strand, update_segments=False)
+            for strand in strands:
+                fwd_ss._removeFromStrandList(strand, update_segments=False)
+
+    def resize():
+        for i in range(num_ops):
+            strand = strands[i % num_strands]
+            old_idxs = strand.idxs()
+            new_idxs = (old_idxs[0], old_idxs[1] + (1 if i % (2*num_strands) < num_strands else -1))
+            strand.setIdxs(new_idxs)
+            fwd_ss._updateStrandIdxs(strand, old_idxs, new_idxs)
+
+    def query():
+        for _ in range(num_ops):
+            idx = rng.randrange(length - span)
+            fwd_ss.getStrand(idx)
+            fwd_ss.hasStrandAt(idx, idx + span)
+            fwd_ss.getOverlappingStrands(idx, idx + span)
+            fwd_ss.getBoundsOfEmptyRegionContaining(idx)
+            fwd_ss.getStrandIndex(strands[idx % num_strands])
+    t_add, _ = timeIt(addRemove)
+    for strand in strands:
+        fwd_ss._addToStrandList(strand, update_segments=False)
+    t_resize, _ = timeIt(resize)
+    t_query, _ = timeIt(query)
+    print("strandSetIndex: %d strands of %d bases, %d add/removes %0.3fs, "
+          "%d resizes %0.3fs, %d query rounds %0.3fs" %
+          (num_strands, span - 1, num_ops, t_add, num_ops, t_resize, num_ops, t_query))
+# end def
+
+
+def benchmarkXoverOligo(num_strands=2000, num_edits=200):
+    """Time connecting a short oligo to the 5' end of a long oligo with a
+    crossover and removing it again, which used to reassign the oligo of
+    every strand of the long oligo
+    """
+    from cadnano.document import Document
+    from cadnano.part.refresholigoscmd import RefreshOligosCommand
+    part = Document().createNucleicAcidPart()
+    length = 10*num_strands
+    part.createVirtualHelix(0., 0., 0., length, id_num=0, use_undostack=False)
+    part.createVirtualHelix(0., 2.25, 0., 42, id_num=1, use_undostack=False)
+    fwd_ss, _ = part.getStrandSets(0)
+    for i in range(num_strands):
+        fwd_ss.createStrand(10*i, 10*i + 7, use_undostack=False)
+    strands = fwd_ss.strands()
+    for strand5p, strand3p in zip(strands, strands[1:]):
+        part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime(),
+                         update_oligo=False, use_undostack=False)
+    RefreshOligosCommand(part).redo()
+    short_ss, _ = part.getStrandSets(1)
+    short_ss.createStrand(0, 20, use_undostack=False)
+    short = short_ss.getStrand(0)
+    long_5p = strands[0]
+
+    def connectDisconnect():
+        for _ in range(num_edits):
+            part.createXover(short, short.idx3Prime(), long_5p, long_5p.idx5Prime(),
+                             use_undostack=False)
+            part.removeXover(short, long_5p, use_undostack=False)
+    t_xover, _ = timeIt(connectDisconnect)
+    print("xoverOligo: %d crossover create/removes on an oligo of %d strands %0.3fs" %
+          (num_edits, num_strands, t_xover))
+# end def
+
+
+def benchmarkDragResize(length=2000, num_strands=100, num_ticks=2000):
+    """Time dragging the end of a strand across a helix crowded with
+    strands, refreshing the segments of the helix on every tick
+    """
+    from cadnano.document import Document
+    part = Document().createNucleicAcidPart()
+    part.createVirtualHelix(0., 0., 0., length, id_num=0, use_undostack=False)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    span = length // num_strands
+    for i in range(num_strands):
+        fwd_ss.createStrand(i*span, (i + 1)*span - 3, use_undostack=False)
+        rev_ss.createStrand(i*span + span//2, (i + 1)*span + span//2 - 3, use_undostack=False)
+    strand = fwd_ss.getStrand(0)
+    idx_low, idx_high = strand.idxs()
+    part.initializeAbstractSegmentId()
+
+    def drag():
+        for i in range(num_ticks):
+            delta = i % 4 if i % 8 < 4 else 4 - i % 4
+            strand.resize((idx_low, idx_high - delta), use_undostack=False)
+            strand.applyAbstractSequence()
+    t_drag, _ = timeIt(drag)
+    print("dragResize: %d ticks on a helix of %d strands %0.3fs" %
+          (num_ticks, 2*num_strands, t_drag))
+# end def
+
+
+def benchmarkCreateVirtualHelices(num_helices=400, length=588):
+    """Compare creating the virtual helices of a large part one at a time
+    with `createVirtualHelices` and time loading the benchmark designs
+    against parsing their JSON alone
+    """
+    import json
+    from cadnano.document import Document
+    radius = Document().createNucleicAcidPart().radius()
+    origins = [(3*radius*x, 3*radius*y) for x, y in (divmod(i, 20) for i in range(num_helices))]
+
+    def createSingle():
+        part = Document().createNucleicAcidPart()
+        for id_num, (x, y) in enumerate(origins):
+            part.createVirtualHelix(x, y, 0., length, id_num=id_num, use_undostack=False)
+
+    def createBulk():
+        part = Document().createNucleicAcidPart()
+        part.createVirtualHelices(origins, [0.]*num_helices, [length]*num_helices,
+                                  id_nums=list(range(num_helices)), use_undostack=False)
+    t_single, _ = timeIt(createSingle)
+    t_bulk, _ = timeIt(createBulk)
+    print("createVirtualHelices: %d helices of %d bases, single %0.3fs, bulk %0.3fs, %0.1fx" %
+          (num_helices, length, t_single, t_bulk, t_single / t_bulk))
+
+    for designname in BENCHMARK_FILES:
+        filename = pjoin(TEST_PATH, "data", designname)
+
+        def parse():
+            with open(filename) as fd:
+                return json.load(fd)
+        t_json, _ = timeIt(parse)
+        t_load, _ = timeIt(loadPart, designname)
+        print("load %s: json %0.3fs, total %0.3fs" % (designname, t_json, t_load))
+# end def
+
+
+def benchmarkStreamDecode(designnames=("Nature09_monolith.json",
+                                       "Science09_beachball_v1.json")):
+    """Compare the time and peak traced memory of loading designs whole and
+    streaming them.  The decode overhead is the peak less the memory held by
+    the decoded model
+    """
+    import gc
+    import tracemalloc
+    from cadnano.fileio.nnodecode import decodeFile
+    for designname in designnames:
+        filename = pjoin(TEST_PATH, "data", designname)
+        file_size = os.path.getsize(filename)
+        for stream in (False, True):
+            t, _ = timeIt(decodeFile, filename, None, False, stream)
+            gc.collect()
+            tracemalloc.start()
+            doc = decodeFile(filename, stream=stream)
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print("decode %s stream=%s: %0.3fs, peak %0.2fMB, "
+                  "overhead %0.2fMB (%0.1fx file size)" %
+                  (designname, stream, t, peak / 1e6, (peak - retained) / 1e6,
+                   (peak - retained) / file_size))
+            del doc
+# end def
+
+
+def benchmarkInsertionLength(length=4200, num_insertions=400, num_rounds=20):
+    """Time the total length of every strand of a helix with many insertions
+    and skips, as done when refreshing oligo lengths and applying sequences
+    """
+    from cadnano.document import Document
+    part = Document().createNucleicAcidPart()
+    part.createVirtualHelix(0., 0., 0., length, id_num=0, use_undostack=False)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    fwd_ss.createStrand(0, length - 1, use_undostack=False)
+    for i in range(0, length - 32, 32):
+        rev_ss.createStrand(i, i + 31, use_undostack=False)
+    scaffold = fwd_ss.getStrand(0)
+    step = length // num_insertions
+    for i in range(num_insertions):
+        scaffold.addInsertion(i*step + 1, 1 if i % 3 else -1, use_undostack=False)
+    strands = fwd_ss.strands() + rev_ss.strands()
+
+    def totalLengths():
+        for _ in range(num_rounds):
+            for strand in strands:
+                strand.totalLength()
+                strand.insertionLengthBetweenIdxs(strand.lowIdx(), strand.lowIdx() + 15)
+    t_length, _ = timeIt(totalLengths)
+    print("insertionLength: %d rounds over %d strands with %d insertions %0.3fs" %
+          (num_rounds, len(strands), num_insertions, t_length))
+# end def
+
+
+def benchmarkMinorGridPath(num_helices=1000, length=588, num_zooms=5):
+    """Time setting the minor grid paths of the path view items of a large
+    part, building a path per item and sharing the cached path of each
+    size, then rendering the scene at several zooms.  Runs with the
+    offscreen Qt platform
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtGui import QImage, QPainter
+    from PyQt5.QtWidgets import QApplication, QGraphicsPathItem, QGraphicsScene
+    from cadnano.gui.views.pathview import virtualhelixitem
+    app = QApplication.instance() or QApplication([])
+    scene = QGraphicsScene()
+    items = []
+    for i in range(num_helices):
+        item = QGraphicsPathItem()
+        item.setPos(0, 30*i)
+        scene.addItem(item)
+        items.append(item)
+    paths = virtualhelixitem._MINOR_GRID_PATHS
+
+    def buildEach():
+        for item in items:
+            paths.clear()
+            item.setPath(virtualhelixitem.minorGridPath(length, 7))
+
+    def shareCached():
+        for item in items:
+            item.setPath(virtualhelixitem.minorGridPath(length, 7))
+
+    def renderZooms():
+        image = QImage(1024, 768, QImage.Format_ARGB32)
+        for zoom in range(1, num_zooms + 1):
+            painter = QPainter(image)
+            scene.render(painter, source=scene.itemsBoundingRect().adjusted(0, 0, 0, -zoom*1000))
+            painter.end()
+    t_build, _ = timeIt(buildEach)
+    t_render_built, _ = timeIt(renderZooms)
+    t_shared, _ = timeIt(shareCached)
+    t_render_shared, _ = timeIt(renderZooms)
+    print("minor grid paths %d helices of %d bases: build each %0.3fs, shared %0.4fs, "
+          "render %d zooms %0.3fs built, %0.3fs shared" %
+          (num_helices, length, t_build, t_shared, num_zooms, t_render_built,
+           t_render_shared))
+# end def
+
+
+def benchmarkNpzFormat(designname="Science09_beachball_v1.json", num_parts=20):
+    """Compare serializing, parsing and loading a document of `num_parts`
+    copies of a design as v3 JSON and in the binary `.npz` format
+    """
+    import io
+    import json
+    import tempfile
+    from cadnano.fileio import nnoencode, npzencode, npzdecode
+    from cadnano.fileio.nnodecode import decodeFile
+    doc = decodeFile(pjoin(TEST_PATH, "data", designname))
+    obj = json.loads(nnoencode.encode(doc))
+    obj['parts'] = obj['parts']*num_parts
+    tmp_dir = tempfile.mkdtemp()
+    json_file = pjoin(tmp_dir, "design.json")
+    npz_file = pjoin(tmp_dir, "design.npz")
+
+    def writeJSON():
+        with io.open(json_file, 'w', encoding='utf-8') as fd:
+            fd.write(json.dumps(obj, separators=(',', ':'), cls=nnoencode.EncoderforPandas))
+
+    def readJSON():
+        with io.open(json_file, 'r', encoding='utf-8') as fd:
+            return json.load(fd)
+    results = []
+    for write, read, filename in ((writeJSON, readJSON, json_file),
+                                  (lambda: npzencode.writeObject(npz_file, obj),
+                                   lambda: npzdecode.readObject(npz_file), npz_file)):
+        t_write, _ = timeIt(write)
+        t_read, _ = timeIt(read)
+        t_load, _ = timeIt(decodeFile, filename)
+        print("%s x%d %s: %d bytes, write %0.3fs, parse %0.3fs, load %0.3fs" %
+              (designname, num_parts, os.path.splitext(filename)[1],
+               os.path.getsize(filename), t_write, t_read, t_load))
+# end def
+
+def benchmarkReadOnlyLoad(designname="Science09_beachball_v1.json", num_files=20):
+    """Compare loading a design saved in the binary `.npz` format `num_files`
+    times to read its coordinates and sequences with and without the
+    memory-mapped read-only mode
+    """
+    import tempfile
+    from cadnano.fileio import npzencode
+    from cadnano.fileio.nnodecode import decodeFile
+    npz_file = pjoin(tempfile.mkdtemp(), "design.npz")
+    npzencode.encodeToFile(npz_file, decodeFile(pjoin(TEST_PATH, "data", designname)))
+
+    def readDesigns(read_only):
+        for _ in range(num_files):
+            part = decodeFile(npz_file, read_only=read_only).activePart()
+            for id_num in part.getIdNums():
+                part.getCoordinates(id_num)
+            part.getSequences()
+
+    def materialize():
+        part = decodeFile(npz_file, read_only=True).activePart()
+        return len(part.oligos())
+    t_open, _ = timeIt(lambda: [decodeFile(npz_file, read_only=True) for _ in range(num_files)])
+    t_read_only, _ = timeIt(readDesigns, True)
+    t_load, _ = timeIt(readDesigns, False)
+    t_materialize, _ = timeIt(materialize)
+    print("%s x%d: open %0.3fs, read-only queries %0.3fs, load and query %0.3fs, "
+          "open and create strands once %0.3fs" %
+          (designname, num_files, t_open, t_read_only, t_load, t_materialize))
+# end def
+
+
+def benchmarkOriginQuery(num_helices=10000, num_queries=2000):
+    """Compare the origin point and rectangle queries of a large lattice of
+    virtual helices, like slice view hovering and rubber band selection,
+    against scanning every origin
+    """
+    from cadnano.document import Document
+    part = Document().createNucleicAcidPart()
+    radius = part.radius()
+    side = int(math.sqrt(num_helices))
+    origins = [(2*radius*x, 2*radius*y) for x, y in (divmod(i, side) for i in range(num_helices))]
+    part.createVirtualHelices(origins, [0.]*num_helices, [42]*num_helices,
+                              id_nums=list(range(num_helices)), use_undostack=False)
+    rng = np.random.RandomState(0)
+    points = [tuple(pt) for pt in rng.uniform(0, 2*radius*side, (num_queries, 2))]
+    origin_pts = part._origin_pts
+
+    def scanPoints():
+        for point in points:
+            difference = origin_pts - point
+            delta = inner1d(difference, difference)
+            close_points, = np.where(delta <= radius*radius)
+            close_points[np.argsort(np.take(delta, close_points))]
+
+    def scanRects():
+        xs, ys = origin_pts[:, 0], origin_pts[:, 1]
+        for x, y in points:
+            np.where((xs > x) & (xs < x + 10*radius) & (ys > y) & (ys < y + 10*radius))
+
+    def queryPoints():
+        for point in points:
+            part._queryVirtualHelixOrigin(radius, point)
+
+    def queryRects():
+        for x, y in points:
+            part._queryVirtualHelixOriginRect((x, y, x + 10*radius, y + 10*radius))
+    t_scan, _ = timeIt(scanPoints)
+    t_tree, _ = timeIt(queryPoints)
+    print("origin point queries: %d helices, %d queries, scan %0.3fs, quadtree %0.3fs, %0.1fx" %
+          (num_helices, num_queries, t_scan, t_tree, t_scan / t_tree))
+    t_scan, _ = timeIt(scanRects)
+    t_tree, _ = timeIt(queryRects)
+    print("origin rect queries: %d helices, %d queries, scan %0.3fs, quadtree %0.3fs, %0.1fx" %
+          (num_helices, num_queries, t_scan, t_tree, t_scan / t_tree))
+# end def
+
+
+def benchmarkTranslateHelices(num_helices=1000, num_selected=250, num_ticks=100):
+    """Time the ticks of dragging a selection of virtual helices in the
+    slice view, moving the points of the selection with a loop per virtual
+    helix and with the cached index of the selection
+    """
+    from cadnano.document import Document
+    part = Document().createNucleicAcidPart()
+    radius = part.radius()
+    side = int(math.sqrt(num_helices))
+    origins = [(2*radius*x, 2*radius*y) for x, y in (divmod(i, side) for i in range(num_helices))]
+    part.createVirtualHelices(origins, [0.]*num_helices, [588]*num_helices,
+                              id_nums=list(range(num_helices)), use_undostack=False)
+    selection = set(range(0, num_helices, num_helices // num_selected))
+    delta = np.array((0.01, -0.01, 0.))
+
+    def dragLoop():
+        for _ in range(num_ticks):
+            translateCoordinatesLoop(part, selection, delta)
+
+    def dragVectorized():
+        for _ in range(num_ticks):
+            part._translateCoordinates(selection, delta)
+    t_loop, _ = timeIt(dragLoop)
+    t_vectorized, _ = timeIt(dragVectorized)
+    print("translate %d of %d helices x%d ticks: loop %0.3fs, vectorized %0.3fs, %0.1fx" %
+          (len(selection), num_helices, num_ticks, t_loop, t_vectorized,
+           t_loop / t_vectorized))
+# end def
+
+
+def benchmarkRefreshOligos(designnames=("Nature09_monolith.json",
+                                         "nanorobot.v2.json",
+                                         "Science09_beachball_v1.json")):
+    """Time refreshing the oligos of every strand of the largest designs, the
+    last step of importing strands without the undo stack
+    """
+    from cadnano.part.refresholigoscmd import RefreshOligosCommand
+    for designname in designnames:
+        part = loadPart(designname)
+        num_strands = sum(len(ss.strand_heap) for id_num in part.getIdNums()
+                          for ss in part.getStrandSets(id_num))
+        t, _ = timeIt(lambda: RefreshOligosCommand(part).redo())
+        print("refresh oligos %s (%d strands, %d oligos): %0.4fs" %
+              (designname, num_strands, len(part.oligos()), t))
+# end def
+
+
+
+BENCHMARKS = {
+    'applySequence': benchmarkApplySequence,
+    'createVirtualHelices': benchmarkCreateVirtualHelices,
+    'dragResize': benchmarkDragResize,
+    'insertionLength': benchmarkInsertionLength,
+    'minorGridPath': benchmarkMinorGridPath,
+    'npzFormat': benchmarkNpzFormat,
+    'originQuery': benchmarkOriginQuery,
+    'queryIdNumNeighbor': benchmarkQueryIdNumNeighbor,
+    'readOnlyLoad': benchmarkReadOnlyLoad,
+    'refreshOligos': benchmarkRefreshOligos,
+    'resizeHelix': benchmarkResizeHelix,
+    'sequenceExport': benchmarkSequenceExport,
+    'streamDecode': benchmarkStreamDecode,
+    'strandSetIndex': benchmarkStrandSetIndex,
+    'translateHelices': benchmarkTranslateHelices,
+    'xoverOligo': benchmarkXoverOligo,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or sorted(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -23,7 +23,7 @@ class CNTestApp(object):
     def tearDown(self):
         pass
 
-    def getTestSequences(self, designname, sequences_to_apply):
+    def getTestSequences(self, designname, sequences_to_apply, stream=False):
         """
         Called by a sequence-verification functional test to read in a file
         (designname), apply scaffold sequence(s) to that design, and return
@@ -32,7 +32,7 @@ class CNTestApp(object):
         inputfile = pjoin(TEST_PATH,
                             "data", designname)
         document = self.document
-        document.readFile(inputfile)
+        document.readFile(inputfile, stream=stream)
 
         part = document.activePart()
         # apply one or more sequences to the design
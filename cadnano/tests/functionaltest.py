@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
-import sys, os, io, time
+import sys, os, io, time, json
 
 import pytest
 
 from cntestcase import CNTestApp
+from pathsetup import TEST_PATH, PROJECT_PATH
 
 @pytest.fixture()
 def cnapp():
@@ -95,3 +96,250 @@ def testStapleOutput_Science09_prot120_98_v3(cnapp):
 #     # cnapp.writeRefSequences("gap_vs_skip.csv_2.csv", test_set)
 #     ref_set = cnapp.getRefSequences(refname)
 #     assert test_set == ref_set
+
+####################### Streaming Decode Tests ########################
+@pytest.mark.parametrize('designname, refname, sequences', [
+    ("simple42legacy.json", "simple42legacy.csv", [("p7308", 0, 0)]),
+    ("loops_and_skips.json", "loops_and_skips.csv", [("M13mp18", 0, 0)]),
+    ("Science09_prot120_98_v3.json", "Science09_prot120_98_v3.csv", [("p7704", 0, 105)])
+])
+def testStapleOutput_stream(cnapp, designname, refname, sequences):
+    """Staples of a streamed design match the reference set"""
+    test_set = cnapp.getTestSequences(designname, sequences, stream=True)
+    ref_set = cnapp.getRefSequences(refname)
+    assert test_set == ref_set
+
+def testJSONStreamReader():
+    """Values read across chunk boundaries match json.loads"""
+    from cadnano.fileio.jsonstream import JSONStreamReader
+    obj = {"a": [1, -2.5e-3, "x\u00e9\"y", None, True, [], {}],
+           "b": {"c": [[1, 2], [3, 4]], "d": 123456789},
+           "é": "ünïcode"}
+    data = json.dumps(obj, indent=1, ensure_ascii=False).encode('utf-8')
+    for chunk_size in (1, 2, 7, 1 << 16):
+        progress = []
+        reader = JSONStreamReader(io.BytesIO(data), chunk_size=chunk_size,
+                                  progress_callback=lambda n, total: progress.append(n),
+                                  total_bytes=len(data))
+        out = {}
+        reader.beginObject()
+        key = reader.nextKey()
+        while key is not None:
+            if key == 'a':
+                out[key] = list(reader.iterItems())
+            else:
+                out[key] = reader.readValue()
+            key = reader.nextKey()
+        assert out == obj
+        assert progress[-1] == len(data)
+
+def testStreamDecode(cnapp, tmpdir):
+    """Streaming v2 and v3 files decodes the same model as loading them"""
+    from cadnano.document import Document
+    from cadnano.fileio.nnodecode import decodeFile
+    from cadnano.fileio.nnoencode import encode
+
+    def encodeDoc(doc):
+        obj = json.loads(encode(doc))
+        del obj['date']
+        for part_dict in obj['parts']:
+            del part_dict['uuid'], part_dict['name']
+            for oligo in part_dict['oligos']:
+                del oligo['name']
+            part_dict['oligos'].sort(key=lambda o: (o['id_num'], o['idx5p'], o['is_5p_fwd']))
+        return obj
+
+    for designname in ("super_barcode_hex.json", "octa.13.c25"):
+        inputfile = os.path.join(TEST_PATH, "data", designname)
+        expected = encodeDoc(decodeFile(inputfile))
+        progress = []
+        doc = decodeFile(inputfile, stream=True,
+                         progress_callback=lambda n, total: progress.append((n, total)))
+        assert encodeDoc(doc) == expected
+        assert progress[-1] == (os.path.getsize(inputfile),)*2
+
+        v3_file = str(tmpdir.join("stream.json"))
+        doc.writeToFile(v3_file)
+        assert (encodeDoc(decodeFile(v3_file, stream=True)) ==
+                encodeDoc(decodeFile(v3_file)))
+
+def testStreamDecodeMemory():
+    """Streaming a legacy design peaks at less memory than loading it"""
+    import tracemalloc
+    from cadnano.fileio.nnodecode import decodeFile
+    inputfile = os.path.join(TEST_PATH, "data", "Nature09_monolith.json")
+    peaks = []
+    for stream in (False, True):
+        tracemalloc.start()
+        decodeFile(inputfile, stream=stream)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < peaks[0]
+
+####################### Binary Format Tests ########################
+@pytest.mark.parametrize('designname, sequences', [
+    ("simple42legacy.json", [("p7308", 0, 0)]),
+    ("loops_and_skips.json", [("M13mp18", 0, 0)])
+])
+def testNpzFormat(cnapp, tmpdir, designname, sequences):
+    """Designs with sequences save to .npz losslessly with respect to v3 JSON
+    and load to the same staples
+    """
+    from cadnano.document import Document
+    from cadnano.fileio import npzdecode
+    from cadnano.fileio.nnoencode import encode
+    cnapp.getTestSequences(designname, sequences)
+    json_file = str(tmpdir.join("design.json"))
+    npz_file = str(tmpdir.join("design.npz"))
+    cnapp.document.writeToFile(json_file)
+    cnapp.document.writeToFile(npz_file)
+    with io.open(json_file, 'r', encoding='utf-8') as fd:
+        expected = json.load(fd)
+    assert npzdecode.readObject(npz_file) == expected
+
+    staples = []
+    encoded = []
+    for filename in (json_file, npz_file):
+        doc = Document()
+        doc.readFile(filename)
+        staples.append(set(doc.activePart().getSequences().splitlines()))
+        part_dict = json.loads(encode(doc))['parts'][0]
+        encoded.append({key: part_dict[key] for key in
+                        ('vh_list', 'origins', 'virtual_helices', 'strands', 'xovers',
+                         'insertions')})
+    assert staples[0] == staples[1]
+    # loading the typed columns directly gives the same model as v3 JSON
+    assert encoded[0] == encoded[1]
+
+def testReadOnlyLoad(cnapp, tmpdir):
+    """A read-only load answers geometry and sequence queries from the
+    memory-mapped file without creating strands, which are created on first
+    touch
+    """
+    import numpy as np
+    from cadnano.document import Document
+    cnapp.getTestSequences("loops_and_skips.json", [("M13mp18", 0, 0)])
+    part = cnapp.document.activePart()
+    npz_file = str(tmpdir.join("design.npz"))
+    cnapp.document.writeToFile(npz_file)
+
+    doc = Document()
+    doc.readFile(npz_file, read_only=True)
+    ro_part = doc.activePart()
+    assert isinstance(ro_part.axis_pts, np.memmap)
+    for id_num in part.getIdNums():
+        for expected, points in zip(part.getCoordinates(id_num),
+                                    ro_part.getCoordinates(id_num)):
+            assert np.array_equal(expected, points)
+        point = tuple(part.getCoordinate(id_num, 3))
+        for expected, hits in zip(part.queryBasePoint(2.0, point),
+                                  ro_part.queryBasePoint(2.0, point)):
+            assert np.array_equal(expected, hits)
+    assert set(ro_part.getSequences().splitlines()) == set(part.getSequences().splitlines())
+    assert not ro_part.isMaterialized()
+
+    assert len(ro_part.oligos()) == len(part.oligos())
+    assert ro_part.isMaterialized()
+    loaded = Document()
+    loaded.readFile(npz_file)
+    assert (set(ro_part.getSequences().splitlines()) ==
+            set(loaded.activePart().getSequences().splitlines()))
+    with pytest.raises(ValueError):
+        ro_part.axis_pts[0] = 0.
+
+def testConvertCLI(tmpdir):
+    """The converter round trips v3 JSON through .npz"""
+    from cadnano.bin.convert import main
+    inputfile = os.path.join(TEST_PATH, "data", "super_barcode_hex.json")
+    v3_file = str(tmpdir.join("v3.json"))
+    npz_file = str(tmpdir.join("design.npz"))
+    out_file = str(tmpdir.join("out.json"))
+    main([inputfile, v3_file])
+    main([v3_file, npz_file])
+    main([npz_file, out_file])
+    with io.open(v3_file, 'r', encoding='utf-8') as fd:
+        expected = json.load(fd)
+    with io.open(out_file, 'r', encoding='utf-8') as fd:
+        assert json.load(fd) == expected
+
+def testSequenceExportFormats(cnapp):
+    """Staples stream to CSV, TSV and plate maps, sorted and deduplicated on
+    request, without importing pandas
+    """
+    import csv
+    import subprocess
+    from cadnano.fileio.sequenceexport import SEQUENCE_EXPORT_KEYS, startKey, writeSequences
+    cnapp.getTestSequences("Science09_prot120_98_v3.json", [("p7704", 0, 105)])
+    part = cnapp.document.activePart()
+    rows = list(csv.reader(io.StringIO(part.getSequences())))
+    assert rows[0] == SEQUENCE_EXPORT_KEYS
+    rows = rows[1:]
+    assert len(rows) == len(part.oligos())
+    assert sorted(rows) == sorted(list(row) for row in part.iterSequenceRows())
+
+    tsv_rows = list(csv.reader(io.StringIO(part.getSequences(fmt='tsv', sort=True)),
+                               delimiter='\t'))
+    assert tsv_rows[1:] == sorted(rows, key=startKey)
+
+    f = io.StringIO()
+    assert writeSequences(f, rows + rows[:10], dedupe=True) == len(rows)
+    assert list(csv.reader(io.StringIO(f.getvalue())))[1:] == rows
+
+    f = io.StringIO()
+    assert part.writeSequences(f, fmt='plate96', sort=True, dedupe=True) == len(rows)
+    plate_rows = list(csv.reader(io.StringIO(f.getvalue())))
+    assert plate_rows[0] == ['Plate Name', 'Well Position', 'Name', 'Sequence']
+    assert [row[3] for row in plate_rows[1:]] == [row[4] for row in tsv_rows[1:]]
+    assert plate_rows[1][:2] == ['Plate 1', 'A1']
+    assert plate_rows[13][:2] == ['Plate 1', 'B1']
+    assert plate_rows[96][:2] == ['Plate 1', 'H12']
+    assert plate_rows[97][:2] == ['Plate 2', 'A1']
+    plate_rows = list(csv.reader(io.StringIO(part.getSequences(fmt='plate384'))))
+    assert plate_rows[25][:2] == ['Plate 1', 'B1']
+    assert plate_rows[-1][0] == 'Plate 1'
+    with pytest.raises(ValueError):
+        part.getSequences(fmt='xlsx')
+
+    script = ("import sys\n"
+              "from cadnano.document import Document\n"
+              "doc = Document()\n"
+              "doc.readFile(%r)\n"
+              "doc.activePart().getSequences()\n"
+              "assert 'pandas' not in sys.modules\n" %
+              os.path.join(TEST_PATH, "data", "simple42legacy.json"))
+    subprocess.check_call([sys.executable, '-c', script], cwd=PROJECT_PATH)
+
+def testBatchCLI(tmpdir):
+    """The batch command runs a job over a directory in worker processes,
+    writing an output and a report line per design and reporting failures
+    """
+    import shutil
+    from cadnano.bin.batch import main, loadDesign, applyScaffold
+    in_dir = tmpdir.mkdir("in")
+    for designname in ("simple42legacy.json", "skip.json", "octa.13.c25"):
+        shutil.copy(os.path.join(TEST_PATH, "data", designname), str(in_dir))
+    in_dir.join("broken.json").write("{")
+    out_dir = str(tmpdir.join("out"))
+    report = str(tmpdir.join("report.jsonl"))
+    assert main(['export-staples', str(in_dir), '-o', out_dir, '--report', report,
+                 '--scaffold', 'p7308', '-j', '2']) == 1
+    with io.open(report, 'r', encoding='utf-8') as fd:
+        results = {os.path.basename(result['file']): result
+                   for result in map(json.loads, fd)}
+    assert sorted(results) == ["broken.json", "octa.13.c25", "simple42legacy.json", "skip.json"]
+    assert not results["broken.json"]['ok']
+    assert all(result['ok'] and result['time'] >= 0 for name, result in results.items()
+               if name != "broken.json")
+    assert sorted(os.listdir(out_dir)) == ["octa.13.csv", "simple42legacy.csv", "skip.csv"]
+
+    part = loadDesign(os.path.join(TEST_PATH, "data", "simple42legacy.json"))
+    applyScaffold(part, "p7308")
+    expected = set(part.getSequences().splitlines())
+    with io.open(os.path.join(out_dir, "simple42legacy.csv"), 'r', encoding='utf-8') as fd:
+        assert set(fd.read().splitlines()) == expected
+
+    assert main(['validate', str(in_dir.join("*.json")), '-j', '1']) == 1
+    assert main(['stats', str(in_dir.join("skip.json")), '--report', report, '-j', '1']) == 0
+    with io.open(report, 'r', encoding='utf-8') as fd:
+        stats = json.loads(fd.read().splitlines()[-1])
+    assert stats['skips'] == 1 and stats['oligos'] == 2
@@ -2,9 +2,13 @@
 import pytest
 import math
 
+import numpy as np
+
 from cntestcase import cnapp
 
+from cadnano.fileio.lattice import HoneycombDnaPart, SquareDnaPart
 from cadnano.part.nucleicacidpart import NucleicAcidPart
+from cadnano.part.refresholigoscmd import RefreshOligosCommand
 
 def create3Helix(doc, direction, length):
     part = doc.createNucleicAcidPart()
@@ -49,6 +53,567 @@ def testRemove(cnapp):
     us.undo()
     assert len(doc.children()) == 1
 
+def testQueryBasePoint(cnapp):
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    part.setVirtualHelixSize(1, 84)
+    radius = part.radius()
+    for point in [(0, 0, 0), (radius, radius, 5.), (0, 2*radius, 20.), (50., 50., 50.)]:
+        for query_radius in [radius, 3*radius, 20*radius]:
+            id_nums, indices = part._queryBasePoint(query_radius, point)
+            # brute force over all points
+            difference = part.axis_pts - point
+            close_points, = np.where(np.sum(difference*difference, axis=1) < query_radius*query_radius)
+            expected = sorted(zip(part.id_nums[close_points], part.indices[close_points]))
+            assert list(zip(id_nums, indices)) == expected
+    part.removeVirtualHelix(1)
+    id_nums, indices = part._queryBasePoint(20*radius, (0, 0, 0))
+    assert 1 not in set(id_nums)
+
+def testQueryVirtualHelixOrigin(cnapp):
+    """The origin queries served by the quadtree match a scan of all the
+    origins after virtual helices are created, translated and removed
+    """
+    doc = cnapp.document
+    part = doc.createNucleicAcidPart()
+    radius = part.radius()
+    rng = np.random.RandomState(21)
+    num_helices = 200
+    origins = rng.uniform(-40*radius, 40*radius, (num_helices, 2)).tolist()
+    part.createVirtualHelices(origins, [0.]*num_helices, [42]*num_helices,
+                              id_nums=list(range(num_helices)), use_undostack=False)
+    part.translateVirtualHelices(set(range(0, num_helices, 3)), 100*radius, 0., 0., False)
+    for id_num in range(0, num_helices, 5):
+        part.removeVirtualHelix(id_num, use_undostack=False)
+
+    origin_pts = part._origin_pts
+    xs, ys = origin_pts[:, 0], origin_pts[:, 1]
+    for x, y in rng.uniform(-60*radius, 140*radius, (50, 2)):
+        query_radius = rng.uniform(radius, 20*radius)
+        difference = origin_pts - (x, y)
+        distances = np.sum(difference*difference, axis=1)
+        close_points, = np.where(distances <= query_radius*query_radius)
+        expected = close_points[np.argsort(distances[close_points], kind='mergesort')]
+        assert part.queryVirtualHelixOrigin(query_radius, (x, y)) == expected.tolist()
+        rect = (x, y, x + query_radius, y + 2*query_radius)
+        expected, = np.where((xs > rect[0]) & (xs < rect[2]) & (ys > rect[1]) & (ys < rect[3]))
+        assert part.getVirtualHelicesInArea(rect) == set(expected.tolist())
+    assert part.getVirtualHelixAtPoint(tuple(origin_pts[1])) == 1
+    assert part.getVirtualHelixAtPoint(tuple(origin_pts[0])) is None
+
+@pytest.mark.parametrize('lattice', [HoneycombDnaPart, SquareDnaPart])
+def testPositionToLatticeCoord(lattice):
+    """positionToLatticeCoord finds the closest lattice site, negative
+    coordinates included, as used for hit testing the slice view grid
+    """
+    radius, scale_factor = 1.125, 13.
+    rng = np.random.RandomState(25)
+    for x, y in rng.uniform(-400, 400, (2000, 2)):
+        row, column = lattice.positionToLatticeCoord(radius, x, y, scale_factor=scale_factor)
+        sites = [(i, j) for i in range(row - 3, row + 4) for j in range(column - 3, column + 4)]
+        distances = [math.hypot(site_x - x, site_y - y) for site_x, site_y in
+                     (lattice.latticeCoordToPositionXY(radius, i, j, scale_factor)
+                      for i, j in sites)]
+        assert math.isclose(distances[sites.index((row, column))], min(distances))
+    for row, column in [(0, 0), (-3, 4), (5, -7), (-2, -2)]:
+        x, y = lattice.latticeCoordToPositionXY(radius, row, column, scale_factor)
+        assert lattice.positionToLatticeCoord(radius, x, y, scale_factor) == (row, column)
+
+def testTranslateVirtualHelices(cnapp):
+    """Translating a selection over several ticks moves exactly its points,
+    origins and z, and keeps the origin limits and point grid in step
+    """
+    doc = cnapp.document
+    part = doc.createNucleicAcidPart()
+    radius = part.radius()
+    rng = np.random.RandomState(22)
+    num_helices = 60
+    origins = rng.uniform(-20*radius, 20*radius, (num_helices, 2)).tolist()
+    sizes = rng.randint(21, 84, num_helices).tolist()
+    part.createVirtualHelices(origins, [0.]*num_helices, sizes,
+                              id_nums=list(range(num_helices)), use_undostack=False)
+    part.removeVirtualHelix(7, use_undostack=False)
+    selection = set(range(0, num_helices, 4)) - {0}
+    others = sorted(set(part.getIdNums()) - selection)
+    before = {id_num: [pts.copy() for pts in part.getCoordinates(id_num)]
+              for id_num in part.getIdNums()}
+    origins_before = part._origin_pts.copy()
+
+    deltas = rng.uniform(-radius, radius, (10, 3))
+    deltas[:, 0] += 5*radius
+    for dx, dy, dz in deltas:
+        part.translateVirtualHelices(selection, dx, dy, dz, False)
+    total = deltas.sum(axis=0)
+
+    for id_num, pts_before in before.items():
+        delta = total if id_num in selection else 0.
+        for pts, expected in zip(part.getCoordinates(id_num), pts_before):
+            assert np.allclose(pts, expected + delta)
+    assert np.allclose(part._origin_pts[others], origins_before[others])
+    assert np.allclose(part._origin_pts[sorted(selection)],
+                       origins_before[sorted(selection)] + total[:2])
+    valid_pts = part._origin_pts[np.isfinite(part._origin_pts[:, 0])]
+    expected_limits = np.concatenate((valid_pts.min(axis=0), valid_pts.max(axis=0)))
+    assert np.allclose(part.getVirtualHelixOriginLimits(), expected_limits)
+    id_num = max(selection)
+    point = tuple(part.getCoordinates(id_num)[0][3])
+    id_nums, indices = part.queryBasePoint(0.01, point)
+    assert list(zip(id_nums.tolist(), indices.tolist())) == [(id_num, 3)]
+    assert part.getVirtualHelixAtPoint(tuple(part._origin_pts[id_num])) == id_num
+
+def testTranslatePreview(cnapp):
+    """A previewed drag leaves the model alone until it ends, then is one
+    undoable translation
+    """
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    origins = part._origin_pts[:3].copy()
+    translated = []
+
+    def translatedSlot(part, vh_set, left_overs, do_deselect):
+        translated.append(set(vh_set))
+    part.partVirtualHelicesTranslatedSignal.connect(translatedSlot)
+    undo_stack = doc.undoStack()
+    num_undo = len(undo_stack.undostack)
+    try:
+        part.beginTranslatePreview({1, 2})
+        for _ in range(10):
+            part.previewTranslateVirtualHelices(0.5, -0.25, 0.)
+        assert np.array_equal(part._origin_pts[:3], origins)
+        assert translated == []
+        vh_set, dx, dy, dz = part.translatePreview()
+        assert vh_set == {1, 2} and (dx, dy, dz) == (5., -2.5, 0.)
+
+        assert part.endTranslatePreview()
+        assert part.translatePreview() is None
+        assert translated == [{1, 2}]
+        assert len(undo_stack.undostack) == num_undo + 1
+        assert np.allclose(part._origin_pts[1:3], origins[1:3] + (5., -2.5))
+        assert np.array_equal(part._origin_pts[0], origins[0])
+        undo_stack.undo()
+        assert np.allclose(part._origin_pts[:3], origins)
+
+        part.beginTranslatePreview({0})
+        part.previewTranslateVirtualHelices(0.001, 0., 0.)
+        assert not part.endTranslatePreview(threshold=0.01)
+        part.beginTranslatePreview({0})
+        part.previewTranslateVirtualHelices(1., 0., 0.)
+        assert not part.endTranslatePreview(commit=False)
+        assert np.allclose(part._origin_pts[:3], origins)
+        with pytest.raises(ValueError):
+            part.previewTranslateVirtualHelices(1., 0., 0.)
+    finally:
+        part.partVirtualHelicesTranslatedSignal.disconnect(translatedSlot)
+
+def testPotentialCrossoverMapCache(cnapp):
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    assert part.potentialCrossoverMap(0) == part.queryIdNumNeighbor(0, [1, 2])
+    part.prebuildCrossoverMap(background=True).join()
+    assert (0, 1) in part._xover_cache and (2, 0) in part._xover_cache
+    part.setVirtualHelixSize(1, 84)
+    assert (0, 1) not in part._xover_cache and (1, 2) not in part._xover_cache
+    assert (0, 2) in part._xover_cache
+    part.translateVirtualHelices([2], 0.1, 0, 0, True)
+    assert (0, 2) not in part._xover_cache
+    cached = [part.potentialCrossoverMap(id_num, idx) for id_num in range(3) for idx in (None, 20)]
+    part._resetCrossoverMap()
+    assert cached == [part.potentialCrossoverMap(id_num, idx) for id_num in range(3) for idx in (None, 20)]
+
+    # edits racing the background prebuild must not leave stale entries
+    part._resetCrossoverMap()
+    thread = part.prebuildCrossoverMap(background=True)
+    part.setVirtualHelixSize(0, 63)
+    part.translateVirtualHelices([1], 0.2, 0, 0, True)
+    thread.join()
+    cached = [part.potentialCrossoverMap(id_num, idx) for id_num in range(3) for idx in (None, 20)]
+    part._resetCrossoverMap()
+    assert cached == [part.potentialCrossoverMap(id_num, idx) for id_num in range(3) for idx in (None, 20)]
+
+def testVirtualHelixProperties(cnapp):
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    part.createVirtualHelix(0, 10*part.radius(), 0, id_num=300, length=42)
+    part.setVirtualHelixProperties(300, ['eulerZ', 'color'], [12.5, '#ff0000'])
+    assert part.getVirtualHelixProperties(300, ['eulerZ', 'color', 'length']) == [12.5, '#ff0000', 42]
+    assert isinstance(part.getVirtualHelixProperties(1, 'bases_per_repeat'), int)
+    props, origins = part.helixPropertiesAndOrigins([0, 300])
+    assert props['name'] == ['vh0', 'vh300']
+    assert props['eulerZ'][1] == 12.5
+    assert len(origins) == 2
+    part.translateVirtualHelices([300], 0, 0, 1.5, True)
+    assert part.getAllVirtualHelixProperties(300)['z'] == 1.5
+
+def checkCoordinates(part):
+    total = 0
+    coords = {}
+    for id_num in part.getIdNums():
+        offset, size = part.getOffsetAndSize(id_num)
+        assert list(part.id_nums[offset:offset + size]) == [id_num]*size
+        assert list(part.getIndices(id_num)) == list(range(size))
+        coords[id_num] = np.hstack(part.getCoordinates(id_num))
+        assert np.all(np.isfinite(coords[id_num]))
+        total += size
+    assert part.total_points == total
+    assert np.count_nonzero(part.id_nums != -1) == total
+    assert np.count_nonzero(np.isfinite(part.axis_pts[:, 2])) == total
+    return coords
+
+@pytest.mark.parametrize('full_size', [12288, 64])
+def testResizeCoordinates(cnapp, monkeypatch, full_size):
+    import random
+    import cadnano.part.nucleicacidpart as nap
+    # a small full size forces compaction of the point arrays
+    monkeypatch.setattr(nap, 'DEFAULT_FULL_SIZE', full_size)
+    rng = random.Random(42)
+    doc = cnapp.document
+    part = doc.createNucleicAcidPart()
+    radius = part.radius()
+    for id_num in range(8):
+        part.createVirtualHelix(3*radius*id_num, 0, 0, id_num=id_num, length=42)
+    coords = checkCoordinates(part)
+    for i in range(200):
+        id_num = rng.choice(sorted(part.getIdNums()))
+        size = part.getOffsetAndSize(id_num)[1]
+        delta = rng.choice([-21, 21, 42, 105])
+        if delta < 0 and size <= -delta:
+            delta = 21
+        is_right = rng.random() < 0.5
+        part._resizeHelix(id_num, is_right, delta)
+        new_coords = checkCoordinates(part)
+        # the points of other virtual helices are untouched
+        for other_id_num in coords:
+            if other_id_num != id_num:
+                assert np.array_equal(coords[other_id_num], new_coords[other_id_num])
+        old, new = coords[id_num], new_coords[id_num]
+        if delta > 0:
+            assert np.array_equal(old, new[:size] if is_right else new[delta:])
+        else:
+            assert np.array_equal(old[:size + delta] if is_right else old[-delta:], new)
+        coords = new_coords
+        if i % 50 == 49:
+            part.removeVirtualHelix(id_num, use_undostack=False)
+            part.createVirtualHelix(3*radius*id_num, 0, 0, id_num=id_num, length=21)
+            coords = checkCoordinates(part)
+
+def testCreateVirtualHelices(cnapp):
+    doc = cnapp.document
+    radius = doc.createNucleicAcidPart().radius()
+    origins = [(3*radius*i, 2*radius*(i % 3), 0.5*i) for i in range(10)]
+    lengths = [21*(1 + i % 4) for i in range(10)]
+    id_nums = [2*i for i in range(10)]
+    keys = ['eulerZ', 'bases_per_repeat', 'turns_per_repeat']
+    vals_list = [[10.*i, 21, 2] for i in range(10)]
+
+    single_part = doc.createNucleicAcidPart()
+    for (x, y, z), length, id_num, vals in zip(origins, lengths, id_nums, vals_list):
+        single_part.createVirtualHelix(x, y, z, length, id_num=id_num, properties=(keys, vals))
+    bulk_part = doc.createNucleicAcidPart()
+    bulk_part.createVirtualHelices([o[:2] for o in origins], [o[2] for o in origins], lengths,
+                                   id_nums=id_nums, properties=(keys, vals_list))
 
+    single_coords = checkCoordinates(single_part)
+    bulk_coords = checkCoordinates(bulk_part)
+    assert sorted(bulk_coords) == sorted(id_nums)
+    for id_num in id_nums:
+        assert np.array_equal(single_coords[id_num], bulk_coords[id_num])
+        assert (single_part.getAllVirtualHelixProperties(id_num) ==
+                bulk_part.getAllVirtualHelixProperties(id_num))
+    assert single_part.getVirtualHelixOriginLimits() == bulk_part.getVirtualHelixOriginLimits()
+    point = origins[4]
+    assert (list(zip(*single_part._queryBasePoint(3*radius, point))) ==
+            list(zip(*bulk_part._queryBasePoint(3*radius, point))))
+
+    bulk_part.undoStack().undo()
+    assert len(bulk_part.getIdNums()) == 0
+    bulk_part.undoStack().redo()
+    for id_num in id_nums:
+        assert np.array_equal(single_coords[id_num], np.hstack(bulk_part.getCoordinates(id_num)))
+
+
+def strandSummary(part):
+    """Summarize strands, connections and oligos for comparing parts"""
+    summary = []
+    for id_num in part.getIdNums():
+        for strandset in part.getStrandSets(id_num):
+            for strand in strandset.strands():
+                oligo = strand.oligo()
+                s5p, s3p = strand.connection5p(), strand.connection3p()
+                summary.append((id_num, strandset.isForward(), strand.idxs(),
+                                s5p.idxs() if s5p is not None else None,
+                                s3p.idxs() if s3p is not None else None,
+                                oligo.length(), oligo.isLoop(), oligo.getColor()))
+    return sorted(summary, key=str)
+
+
+def testImportStrands(cnapp):
+    doc = cnapp.document
+    parts = []
+    for i in range(2):
+        part = doc.createNucleicAcidPart()
+        radius = part.radius()
+        part.createVirtualHelix(0, 0, 0, 42)
+        part.createVirtualHelix(2*radius, 0, 0, 42)
+        parts.append(part)
+    single_part, bulk_part = parts
+
+    fwd0, rev0 = single_part.getStrandSets(0)
+    fwd1, rev1 = single_part.getStrandSets(1)
+    a = fwd0.createStrand(2, 10)
+    b = rev1.createStrand(2, 10)
+    c = fwd0.createStrand(20, 30, color='#ff0000')
+    d = rev1.createStrand(20, 30)
+    single_part.createXover(a, 10, b, 10)
+    single_part.createXover(c, 30, d, 30)
+    single_part.createXover(d, 20, c, 20)
+    # set the oligo lengths as the per strand decoders did
+    RefreshOligosCommand(single_part).redo()
+
+    strands = {(0, True): [(20, 30, '#ff0000'), (2, 10, None)],
+               (1, False): [(2, 10, None), (20, 30, None)]}
+    # the last crossover is listed from the 5' end so needs reordering
+    xovers = [(0, True, 10, 1, False, 10),
+              (0, True, 30, 1, False, 30),
+              (0, True, 20, 1, False, 20)]
+    bulk_part.importStrands(strands, xovers, allow_reordering=True, use_undostack=True)
+    expected = strandSummary(single_part)
+    assert strandSummary(bulk_part) == expected
+    assert len(bulk_part.oligos()) == 2
+
+    bulk_part.undoStack().undo()
+    assert strandSummary(bulk_part) == []
+    assert len(bulk_part.oligos()) == 0
+    bulk_part.undoStack().redo()
+    assert strandSummary(bulk_part) == expected
+
+def testOligoMembershipRandom(cnapp):
+    """Strand oligos, oligo lengths and loops match a walk of the strand
+    connections after random crossover edits, undo and redo, and every
+    strand whose oligo changes emits strandHasNewOligoSignal
+    """
+    import random
+    from cadnano.strand import Strand
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 126)
+    for id_num in range(3):
+        for strandset in part.getStrandSets(id_num):
+            for idx_low in range(0, 126, 14):
+                strandset.createStrand(idx_low, idx_low + 9)
+    strands = [strand for id_num in range(3)
+               for strandset in part.getStrandSets(id_num) for strand in strandset]
+    us = part.undoStack()
+    rng = random.Random(14)
+    num_redos = 0   # the stack keeps undone commands after a new push
+
+    emitted = set()
+    record = emitted.add
+    doc.setController(object())     # a view listening to the signals
+    Strand.strandHasNewOligoSignal.connect(record)
+    try:
+        for _ in range(300):
+            old_oligos = {strand: strand.oligo() for strand in strands}
+            emitted.clear()
+            op = rng.random()
+            if op < 0.45:
+                strand5p = rng.choice([s for s in strands if s.connection3p() is None])
+                strand3p = rng.choice([s for s in strands if s.connection5p() is None])
+                if strand5p is not strand3p:
+                    part.createXover(strand5p, strand5p.idx3Prime(),
+                                     strand3p, strand3p.idx5Prime())
+                    num_redos = 0
+            elif op < 0.7:
+                connected = [s for s in strands if s.connection3p() is not None]
+                if connected:
+                    strand5p = rng.choice(connected)
+                    part.removeXover(strand5p, strand5p.connection3p())
+                    num_redos = 0
+            elif op < 0.85:
+                if us.canUndo():
+                    us.undo()
+                    num_redos += 1
+            elif num_redos:
+                us.redo()
+                num_redos -= 1
+
+            for strand in strands:
+                if strand.oligo() is not old_oligos[strand]:
+                    assert strand in emitted
+            visited = set()
+            for oligo in part.oligos():
+                strand5p = oligo.strand5p()
+                oligo_strands = list(strand5p.generator3pStrand())
+                assert oligo.isLoop() == (strand5p.connection5p() is not None)
+                assert all(strand.oligo() is oligo for strand in oligo_strands)
+                assert oligo.length() == sum(strand.totalLength() for strand in oligo_strands)
+                visited.update(oligo_strands)
+            assert visited == set(strands)
+    finally:
+        Strand.strandHasNewOligoSignal.disconnect(record)
+
+def testRefreshOligos(cnapp):
+    """Refreshing the oligos after crossovers installed without updating
+    them gives one oligo per connected chain of strands with the right 5'
+    strand, loop flag and length, and notifies the views once
+    """
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 84)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    for idx_low in range(0, 84, 14):
+        fwd_ss.createStrand(idx_low, idx_low + 9)
+        rev_ss.createStrand(idx_low, idx_low + 9)
+    fwd, rev = fwd_ss.strands(), rev_ss.strands()
+    rev[2].addInsertion(rev[2].lowIdx() + 2, 3)
+    # a chain of three strands, a chain of two and a loop of two
+    chains = [(fwd[0], fwd[1], fwd[2]), (fwd[3], fwd[4]), (rev[2], rev[1], rev[2])]
+    for chain in chains:
+        for strand5p, strand3p in zip(chain, chain[1:]):
+            part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime(),
+                             update_oligo=False, use_undostack=False)
+
+    refreshed = []
+    part.partOligosRefreshedSignal.connect(lambda part, strands: refreshed.append(strands))
+    RefreshOligosCommand(part).redo()
+    assert len(refreshed) == 1
+    assert set(refreshed[0]) == set(fwd + rev)
+
+    assert len(part.oligos()) == len(fwd) + len(rev) - 4
+    for chain in chains:
+        oligo = chain[0].oligo()
+        assert all(strand.oligo() is oligo for strand in chain)
+        assert oligo in part.oligos()
+        assert oligo.strand5p() is chain[0]
+        assert oligo.isLoop() == (chain[0] is chain[-1])
+        assert oligo.length() == sum(s.totalLength() for s in set(chain))
+    assert rev[2].oligo().length() == 23
+
+def testBatchUpdates(cnapp):
+    """The signals emitted in nested batches reach the views when the
+    outermost one exits: the last resize of a strand, and nothing of a
+    strand both created and removed in the batch
+    """
+    from cadnano.cnproxy import isBatching
+    from cadnano.strand import Strand
+    from cadnano.strandset import StrandSet
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 84)
+    fwd_ss = part.getStrandSets(0)[0]
+    kept = fwd_ss.createStrand(0, 9)
+
+    emitted = []
+    slots = [(StrandSet.strandsetStrandAddedSignal,
+              lambda strandset, strand: emitted.append(('added', strand))),
+             (Strand.strandRemovedSignal,
+              lambda strand: emitted.append(('removed', strand))),
+             (Strand.strandResizedSignal,
+              lambda strand, idxs: emitted.append(('resized', strand, tuple(idxs))))]
+    for signal, slot in slots:
+        signal.connect(slot)
+    try:
+        with doc.batchUpdates():
+            kept.resize((0, 11))
+            with doc.batchUpdates():
+                temp = fwd_ss.createStrand(30, 39)
+                temp.resize((30, 41))
+                fwd_ss.removeStrand(temp)
+                kept.resize((0, 13))
+            assert isBatching()
+            assert emitted == []
+        assert not isBatching()
+        assert emitted == [('resized', kept, (0, 13))]
+
+        del emitted[:]
+        kept.resize((0, 9))
+        assert emitted == [('resized', kept, (0, 9))]
+    finally:
+        for signal, slot in slots:
+            signal.disconnect(slot)
+
+def testBatchUpdatesQt():
+    """In the PyQt configuration the emissions of the model objects reach
+    the connected slots coalesced when the batch exits
+    """
+    QtCore = pytest.importorskip('PyQt5.QtCore')
+    from cadnano.cnproxy import batchUpdates, batchedBaseObject, batchedSignal
+    ProxySignal = batchedSignal(QtCore.pyqtSignal)
+
+    class Model(batchedBaseObject(QtCore.QObject)):
+        modelResizedSignal = ProxySignal(object, tuple, name='strandResizedSignal')
+        modelUpdateSignal = ProxySignal(object, name='modelUpdateSignal')
+
+    assert Model._modelUpdateSignal is Model.__dict__['modelUpdateSignal'].signal
+    models = [Model(), Model()]
+    delivered = []
+    for model in models:
+        model.modelResizedSignal.connect(lambda m, idxs: delivered.append(('resized', m, idxs)))
+        model.modelUpdateSignal.connect(lambda m: delivered.append(('update', m)))
+    with batchUpdates():
+        for i in range(100):
+            for model in models:
+                model.modelResizedSignal.emit(model, (0, i))
+                model.modelUpdateSignal.emit(model)
+        assert delivered == []
+    assert len(delivered) == 4
+    assert ('resized', models[0], (0, 99)) in delivered
+    assert ('update', models[1]) in delivered
+    models[0].modelUpdateSignal.emit(models[0])
+    assert len(delivered) == 5
+
+def testBatchedBaseObject():
+    """The subclasses of a batchedBaseObject set the signal wrapped by each
+    BatchedSignal under its name with a leading underscore
+    """
+    from cadnano.cnproxy import BatchedSignal, DummySignal, batchedBaseObject, batchedSignal
+    ProxySignal = batchedSignal(DummySignal)
+
+    class Model(batchedBaseObject(object)):
+        modelUpdateSignal = ProxySignal(object, name='modelUpdateSignal')
+
+    class SubModel(Model):
+        subModelUpdateSignal = ProxySignal(object, name='subModelUpdateSignal')
+
+    assert isinstance(Model.__dict__['modelUpdateSignal'], BatchedSignal)
+    assert Model.__dict__['_modelUpdateSignal'] is Model.modelUpdateSignal
+    assert SubModel.__dict__['_subModelUpdateSignal'] is SubModel.subModelUpdateSignal
+    assert '_modelUpdateSignal' not in SubModel.__dict__
+
+def testUndoStackMergeAndMemoryLimit(cnapp):
+    """Consecutive resizes of a strand merge into one command, a push
+    clears the redo commands and the stack evicts its oldest commands to
+    stay within its memory limit
+    """
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 84)
+    us = part.undoStack()
+    fwd_ss = part.getStrandSets(0)[0]
+    strand = fwd_ss.createStrand(0, 9)
+    num_undo = us.stats()['undo']
+    for idx_high in range(10, 20):
+        strand.resize((0, idx_high))
+    stats = us.stats()
+    assert stats['undo'] == num_undo + 1
+    assert stats['merged'] == 9
+    assert strand.oligo().length() == 20
+    us.undo()
+    assert strand.idxs() == (0, 9) and strand.oligo().length() == 10
+    assert us.canRedo()
+    fwd_ss.createStrand(30, 39)
+    assert not us.canRedo()
 
+    oligo = strand.oligo()
+    us.setMemoryLimit(us.stats()['bytes'] + 4096)
+    for _ in range(100):
+        oligo.applySequence('ACGT'*100)
+    stats = us.stats()
+    assert stats['evicted'] > 0
+    assert stats['bytes'] <= stats['memory_limit']
+    assert stats['bytes'] == sum(us.command_sizes[cmd] for cmd in us.undostack)
+    assert stats['limit'] == 30
 
+    # the strands of a removed oligo are retained with their bases by the
+    # command removing it
+    us.setMemoryLimit(0)
+    long_strand = part.getStrandSets(1)[0].createStrand(0, 83)
+    long_strand.oligo().applySequence('ACGT'*21)
+    long_strand.oligo().remove()
+    assert long_strand._taken_bases is not None
+    assert us.command_sizes[us.undostack[-1]] > long_strand.byteSize() > 84
@@ -79,4 +79,251 @@ def testStrandset(cnapp):
 
 
     # resize --> resize Part???
-# end def
\ No newline at end of file
+# end def
+def testStrandsetIndexRandom(cnapp):
+    """Queries of the strand index match a per base scan after random
+    edits
+    """
+    import random
+    doc = cnapp.document
+    HELIX_LENGTH = 120
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, _ = part.getStrandSets(0)
+    rng = random.Random(11)
+
+    def strandAtIdx(idx):
+        for strand in fwd_ss.strands():
+            if strand.lowIdx() <= idx <= strand.highIdx():
+                return strand
+        return None
+
+    for _ in range(300):
+        strands = list(fwd_ss.strands())
+        op = rng.random()
+        if op < 0.4 or not strands:
+            idx_low = rng.randrange(HELIX_LENGTH)
+            fwd_ss.createStrand(idx_low, min(idx_low + rng.randrange(12), HELIX_LENGTH - 1))
+        elif op < 0.55:
+            fwd_ss.removeStrand(rng.choice(strands))
+        elif op < 0.8:
+            strand = rng.choice(strands)
+            # low bound of the empty region below the strand
+            low = fwd_ss.getBoundsOfEmptyRegionContaining(strand.lowIdx())[0]
+            new_low = rng.randint(low, strand.lowIdx())
+            new_high = max(new_low, strand.highIdx() - rng.randrange(2))
+            strand.resize((new_low, new_high))
+        elif op < 0.9:
+            strand = rng.choice(strands)
+            fwd_ss.splitStrand(strand, rng.randint(*strand.idxs()))
+        elif len(strands) > 1:
+            i = rng.randrange(len(strands) - 1)
+            fwd_ss.mergeStrands(strands[i], strands[i + 1])
+
+        strands = list(fwd_ss.strands())
+        assert [s.lowIdx() for s in strands] == sorted(s.lowIdx() for s in strands)
+        for idx in range(HELIX_LENGTH):
+            assert fwd_ss.getStrand(idx) is strandAtIdx(idx)
+        for _ in range(10):
+            idx_low = rng.randrange(HELIX_LENGTH)
+            idx_high = rng.randrange(idx_low, HELIX_LENGTH)
+            expected = [s for s in strands if s.lowIdx() <= idx_high and s.highIdx() >= idx_low]
+            assert fwd_ss.getOverlappingStrands(idx_low, idx_high) == expected
+            assert fwd_ss.hasStrandAt(idx_low, idx_high) == bool(expected)
+        for strand in strands:
+            assert fwd_ss.isStrandInSet(strand)
+            assert fwd_ss.getStrandIndex(strand) == (True, strand.lowIdx())
+
+def testStrandsetSegmentsRandom(cnapp):
+    """Incrementally maintained segments match a full partition of both
+    StrandSets after random edits, undo and redo
+    """
+    import random
+    doc = cnapp.document
+    HELIX_LENGTH = 120
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    strandsets = part.getStrandSets(0)
+    us = part.undoStack()
+    rng = random.Random(12)
+    num_redos = 0   # the stack keeps undone commands after a new push
+
+    for step in range(400):
+        strandset = rng.choice(strandsets)
+        strands = list(strandset.strands())
+        op = rng.random()
+        if op < 0.35 or not strands:
+            idx_low = rng.randrange(HELIX_LENGTH)
+            strandset.createStrand(idx_low, min(idx_low + rng.randrange(20), HELIX_LENGTH - 1))
+        elif op < 0.45:
+            strandset.removeStrand(rng.choice(strands))
+        elif op < 0.65:
+            strand = rng.choice(strands)
+            low = strandset.getBoundsOfEmptyRegionContaining(strand.lowIdx())[0]
+            new_low = rng.randint(low, strand.lowIdx())
+            new_high = max(new_low, strand.highIdx() - rng.randrange(3))
+            strand.resize((new_low, new_high))
+        elif op < 0.75:
+            strand = rng.choice(strands)
+            strandset.splitStrand(strand, rng.randint(*strand.idxs()))
+        elif op < 0.8 and len(strands) > 1:
+            i = rng.randrange(len(strands) - 1)
+            strandset.mergeStrands(strands[i], strands[i + 1])
+        elif op < 0.9:
+            if us.canUndo():
+                us.undo()
+                num_redos += 1
+        elif num_redos:
+            us.redo()
+            num_redos -= 1
+        if op < 0.8:
+            num_redos = 0
+
+        # read in a random order, every few edits, so dirty strands pile up
+        if step % 3:
+            continue
+        readers = [(ss, strand) for ss in strandsets for strand in ss.strands()]
+        rng.shuffle(readers)
+        segments = {strand: strand.segments for _, strand in readers}
+        fwd_segments, rev_segments = part.getSegments(0)
+        expected = part._refreshSegments(*strandsets)
+        assert (fwd_segments, rev_segments) == expected
+        for strandset, expected_segments in zip(strandsets, expected):
+            assert [segments[s] for s in strandset.strands()] == expected_segments
+
+def testInsertionIndexRandom(cnapp):
+    """Insertion lengths and ranges of strands match a scan of the
+    insertions of the helix after random insertion edits and undo
+    """
+    import random
+    doc = cnapp.document
+    HELIX_LENGTH = 84
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    fwd_ss.createStrand(0, HELIX_LENGTH - 1)
+    rev_ss.createStrand(10, 60)
+    strand = fwd_ss.getStrand(0)
+    insertions = part.insertions()[0]
+    us = part.undoStack()
+    rng = random.Random(13)
+
+    for _ in range(200):
+        idx = rng.randrange(HELIX_LENGTH)
+        op = rng.random()
+        if op < 0.4:
+            strand.addInsertion(idx, rng.choice([-1, 1, 2, 5]))
+        elif op < 0.6:
+            strand.changeInsertion(idx, rng.choice([-1, 0, 3]))
+        elif op < 0.8:
+            strand.removeInsertion(idx)
+        else:
+            us.undo()
+
+        idx_low = rng.randrange(HELIX_LENGTH)
+        idx_high = rng.randrange(idx_low, HELIX_LENGTH)
+        expected = [insertions[i] for i in sorted(insertions) if idx_low <= i <= idx_high]
+        assert strand.insertionsOnStrand(idx_low, idx_high) == expected
+        assert strand.insertionLengthBetweenIdxs(idx_low, idx_high) == sum(i.length() for i in expected)
+        assert strand.totalLength() == HELIX_LENGTH + sum(i.length() for i in insertions.values())
+
+
+def testApplySequence(cnapp):
+    """Applying a sequence sets the bases of the oligo and the complement of
+    the bases of the strands pairing with it, including insertions and
+    skips, and splitting, merging and undo keep them consistent
+    """
+    import random
+    from cadnano.util import comp
+    doc = cnapp.document
+    HELIX_LENGTH = 42
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    scaf = fwd_ss.createStrand(2, 37)
+    scaf.addInsertion(8, 2)
+    scaf.addInsertion(20, -1)
+    scaf.addInsertion(30, 3)
+    staples = [rev_ss.createStrand(0, 10), rev_ss.createStrand(15, 25),
+               rev_ss.createStrand(28, 41)]
+    ins_lengths = {idx: ins.length() for idx, ins in part.insertions()[0].items()}
+    rng = random.Random(5)
+    sequence = ''.join(rng.choice('ACGT') for _ in range(scaf.totalLength() - 4))
+    oligo = scaf.oligo()
+    assert oligo.sequence() is None
+
+    def expectedComplement(strand):
+        """the complement of the scaffold bases paired with `strand`, blank
+        where the strand is unpaired
+        """
+        seq = scaf.sequence()
+        pairs = {}
+        k = 0
+        for idx in range(scaf.lowIdx(), scaf.highIdx() + 1):
+            n = 1 + ins_lengths.get(idx, 0)
+            pairs[idx] = comp(seq[k:k + n])
+            k += n
+        chars = []
+        for idx in range(strand.lowIdx(), strand.highIdx() + 1):
+            n = 1 + ins_lengths.get(idx, 0)
+            chars.append(pairs.get(idx, ' '*n))
+        return ''.join(chars)[::-1]
+
+    oligo.applySequence(sequence)
+    assert scaf.sequence() == sequence + '    '
+    assert oligo.sequence() == sequence + '    '
+    assert scaf.sequence(for_export=True) == sequence + '????'
+    for staple in staples:
+        assert staple.sequence() == expectedComplement(staple)
+        assert len(staple.sequence()) == staple.totalLength()
+    assert staples[2].sequence(for_export=True).startswith('????')
+
+    # the halves of a split strand keep its bases
+    fwd_ss.splitStrand(scaf, 24)
+    low, high = fwd_ss.getStrand(2), fwd_ss.getStrand(30)
+    assert low.sequence() + high.sequence() == sequence + '    '
+    assert low.oligo().sequence() == low.sequence()
+    part.undoStack().undo()
+    assert fwd_ss.getStrand(2) is scaf
+    assert scaf.sequence() == sequence + '    '
+
+    # lengthening a staple exposes blank bases
+    staple_seq = staples[0].sequence()
+    staples[0].resize((0, 12))
+    assert staples[0].sequence() == '  ' + staple_seq
+
+    part.undoStack().undo()
+    part.undoStack().undo()
+    assert scaf.sequence() == ''
+    assert oligo.sequence() is None
+    assert all(staple.sequence() == '' for staple in staples)
+    part.undoStack().redo()
+    assert scaf.sequence() == sequence + '    '
+    oligo.applySequence(None)
+    assert scaf.sequence() == ''
+    assert staples[1].sequence() == ''
+
+
+def testRemoveOligoSequence(cnapp):
+    """The bases of the strands of a removed oligo go with it, so a strand
+    created over the same range starts without a sequence, and undo brings
+    them back
+    """
+    doc = cnapp.document
+    part = create3Helix(doc, [0, 0, 1], 42)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    strand = fwd_ss.createStrand(0, 23)
+    staple = rev_ss.createStrand(10, 30)
+    strand.oligo().applySequence('ACGT'*6)
+    staple_seq = staple.sequence()
+    assert staple_seq.strip()
+
+    strand.oligo().remove()
+    new_strand = fwd_ss.createStrand(5, 15)
+    assert new_strand.sequence() == ''
+    assert staple.sequence() == staple_seq
+
+    undo_stack = part.undoStack()
+    undo_stack.undo()
+    undo_stack.undo()
+    assert fwd_ss.getStrand(0) is strand
+    assert strand.sequence() == 'ACGT'*6
+    assert staple.sequence() == staple_seq
+    undo_stack.redo()
+    assert fwd_ss.createStrand(0, 4).sequence() == ''
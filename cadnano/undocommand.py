@@ -1,8 +1,50 @@
 # -*- coding: utf-8 -*-
 from collections import deque
+from sys import getsizeof
+
+from cadnano.cnenum import CommandId
+
+_PAYLOAD_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+_CONTAINER_TYPES = (list, tuple, set, frozenset, deque)
+
+
+def payloadSize(value, depth=2):
+    """Approximate memory of a value held by an undo command.  Strings,
+    numbers, numpy arrays and builtin containers of them, up to `depth`
+    levels deep, are counted.  Objects with a ``byteSize`` method, like
+    child commands and the strands a command keeps out of the model, count
+    as what it returns, for every command that holds them; other objects,
+    like the part, belong to the model and count as nothing.
+
+    Args:
+        value (object):
+        depth (int): optional, number of container levels to descend
+
+    Returns:
+        int: the size in bytes
+    """
+    if isinstance(value, _PAYLOAD_TYPES):
+        return getsizeof(value)
+    if hasattr(value, 'nbytes'):    # numpy arrays
+        return getsizeof(value) if value.base is None else value.nbytes
+    byte_size = getattr(value, 'byteSize', None)
+    if byte_size is not None:
+        return byte_size()
+    if depth == 0:
+        return 0
+    if isinstance(value, dict):
+        return getsizeof(value) + sum(payloadSize(k, depth - 1) + payloadSize(v, depth - 1)
+                                      for k, v in value.items())
+    if isinstance(value, _CONTAINER_TYPES):
+        return getsizeof(value) + sum(payloadSize(item, depth - 1) for item in value)
+    return 0
+# end def
 
 
 class UndoCommand(object):
+    """Headless stand-in for `QUndoCommand`, also the macro of an
+    `UndoStack`, redone in order and undone in reverse.
+    """
     def __init__(self, name=None):
         self.name = name
         self.commands = deque()
@@ -14,9 +56,53 @@ class UndoCommand(object):
     # end def
 
     def undo(self):
-        for cmd in self.commands:
+        for cmd in reversed(self.commands):
             cmd.undo()
     # end def
 
     def addCommand(self, cmd):
         self.commands.append(cmd)
+    # end def
+
+    def id(self):
+        """The undo stack merges a pushed command into the top command when
+        both have the same id other than `CommandId.NONE`.  A macro of one
+        command merges as the command.
+
+        Returns:
+            int: a `CommandId`
+        """
+        if len(self.commands) == 1:
+            return self.commands[0].id()
+        return CommandId.NONE
+    # end def
+
+    def mergeWith(self, other):
+        """Merge a command of the same `id` pushed after this one into this
+        one, so that redoing and undoing this command applies both
+
+        Args:
+            other (UndoCommand):
+
+        Returns:
+            bool: whether it merged, False leaves both commands unchanged
+        """
+        if len(self.commands) == 1 and len(other.commands) == 1:
+            return self.commands[0].mergeWith(other.commands[0])
+        return False
+    # end def
+
+    def byteSize(self):
+        """Approximate memory held by the command and its child commands,
+        see `payloadSize`
+
+        Returns:
+            int: the size in bytes
+        """
+        size = getsizeof(self)
+        for key, value in vars(self).items():
+            if key != 'commands':
+                size += payloadSize(value)
+        return size + sum(cmd.byteSize() for cmd in self.commands)
+    # end def
+# end class
@@ -1,14 +1,42 @@
 # -*- coding: utf-8 -*-
 from collections import deque
 
+from cadnano.cnenum import CommandId
 from cadnano.undocommand import UndoCommand
 
+DEFAULT_MEMORY_LIMIT = 64*2**20
+"""int: default bytes of commands an UndoStack keeps"""
+
 
 class UndoStack(object):
-    def __init__(self, limit=10):
+    """Headless stand-in for `QUndoStack`.
+
+    The stack is bounded by the approximate memory of its undo and redo
+    commands, `UndoCommand.byteSize` measured when they are pushed, and
+    optionally by the number of undo commands.  When a push exceeds either
+    limit the oldest commands are dropped, always keeping the newest.
+
+    As in `QUndoStack`, a pushed command is done at once, even within a
+    macro, nested macros are children of the enclosing macro and pushing
+    clears the redo commands.  A command with the same `id` as the top
+    command, other than `CommandId.NONE`, is offered to its `mergeWith`, so
+    that a run of small edits, like the ticks of a drag, is undone as one
+    command.
+
+    Args:
+        limit (int): optional, number of undo commands kept, 0 for no limit
+        memory_limit (int): optional, bytes of commands kept, 0 for no
+            limit
+    """
+    def __init__(self, limit=0, memory_limit=DEFAULT_MEMORY_LIMIT):
         self.undostack = deque()    # not using deque maxlen because pattern is awkward
         self.redostack = []
         self.limit = limit
+        self.memory_limit = memory_limit
+        self.command_sizes = {}     # command: bytes
+        self.memory_used = 0
+        self.num_merged = 0
+        self.num_evicted = 0
 
         self.top_macro = None
         self.current_macro = None
@@ -17,6 +45,7 @@ class UndoStack(object):
     # end def
 
     def push(self, undocommand):
+        undocommand.redo()
         if self.macro_count > 0:
             self.current_macro.addCommand(undocommand)
         else:
@@ -24,16 +53,52 @@ class UndoStack(object):
     # end def
 
     def appendUndoStack(self, undocommand):
+        """Append a command that was done, or the outermost macro when it
+        ends, merging it into the top command if they have the same `id`
+        """
         stack = self.undostack
-        stack.append(undocommand)
-        undocommand.redo()
-        if len(stack) > self.limit:
-            stack.popleft()
+        self._clearRedoStack()
+        command_id = undocommand.id()
+        if (stack and command_id != CommandId.NONE and
+                stack[-1].id() == command_id and stack[-1].mergeWith(undocommand)):
+            self.num_merged += 1
+            self._remeasure(stack[-1])
+        else:
+            stack.append(undocommand)
+            self._remeasure(undocommand)
+        self._evict()
+    # end def
+
+    def _remeasure(self, undocommand):
+        sizes = self.command_sizes
+        size = undocommand.byteSize()
+        self.memory_used += size - sizes.get(undocommand, 0)
+        sizes[undocommand] = size
+    # end def
+
+    def _clearRedoStack(self):
+        sizes = self.command_sizes
+        for cmd in self.redostack:
+            self.memory_used -= sizes.pop(cmd)
+        self.redostack = []
+    # end def
+
+    def _evict(self):
+        """Drop the oldest undo commands while a limit is exceeded"""
+        stack = self.undostack
+        limit = self.limit
+        memory_limit = self.memory_limit
+        sizes = self.command_sizes
+        while len(stack) > 1 and ((limit and len(stack) > limit) or
+                                  (memory_limit and self.memory_used > memory_limit)):
+            self.memory_used -= sizes.pop(stack.popleft())
+            self.num_evicted += 1
     # end def
 
     def beginMacro(self, message):
         new_macro = UndoCommand(message)
         if self.current_macro is not None:
+            self.current_macro.addCommand(new_macro)
             self.macro_stack.append(self.current_macro)
         self.current_macro = new_macro
         if self.macro_count == 0:
@@ -75,6 +140,41 @@ class UndoStack(object):
         return True if len(self.redostack) > 0 else False
     # end def
 
+    def clear(self):
+        """Drop every undo and redo command"""
+        self.undostack.clear()
+        self.redostack = []
+        self.command_sizes = {}
+        self.memory_used = 0
+    # end def
+
     def setUndoLimit(self, lim):
         self.limit = lim
-    # end def
\ No newline at end of file
+        self._evict()
+    # end def
+
+    def setMemoryLimit(self, num_bytes):
+        """
+        Args:
+            num_bytes (int): bytes of commands kept, 0 for no limit
+        """
+        self.memory_limit = num_bytes
+        self._evict()
+    # end def
+
+    def stats(self):
+        """
+        Returns:
+            dict: the number of `undo` and `redo` commands, the `bytes` they
+            hold, the `limit` and `memory_limit`, and the number of commands
+            `merged` into the top command and `evicted` since created
+        """
+        return {'undo': len(self.undostack),
+                'redo': len(self.redostack),
+                'bytes': self.memory_used,
+                'limit': self.limit,
+                'memory_limit': self.memory_limit,
+                'merged': self.num_merged,
+                'evicted': self.num_evicted}
+    # end def
+# end class
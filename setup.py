@@ -80,6 +80,8 @@ cn_files += test_files + test_data_files
 
 entry_points = {'console_scripts': [
         'cadnano = cadnano.bin.main:main',
+        'cadnanoconvert = cadnano.bin.convert:main',
+        'cadnano-batch = cadnano.bin.batch:main',
         'cadnanoinstall = cadnano.install_exe.cadnanoinstall:post_install'
         ]}
 
@@ -140,7 +142,6 @@ install_requires = [
         'sip==4.18',
         'PyQt5==5.7',
         'numpy>=1.10.0',
-        'pandas>=0.18',
         'pytz>=2011k',
         'python-dateutil>=2'
 ]